@@ -53,10 +53,12 @@ from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from crewai import Agent, Crew, Process, Task
 from dotenv import load_dotenv
+from tools.task_board import TASK_ID_RE, load_task_board
 from tools.task_status import (
     append_ledger_entry,
     get_latest_ledger_entry,
     infer_task_id,
+    render_status_view,
     write_status_entry,
 )
 from tools.tool_security import (
@@ -64,6 +66,7 @@ from tools.tool_security import (
     PROJECT_ROOT,
     SQUAD_ROOT,
     TARGET_REPO_NAME,
+    get_tool_audit_counters,
     get_tool_audit_snapshot,
     reset_tool_audit_snapshot,
 )
@@ -79,14 +82,17 @@ from tools.project_tools import (
     ReadFeatureContractPackTool,
     ReadGovernanceFileTool,
     ReadPendingTasksTool,
+    ReadProjectFilesTool,
     ReadProjectFileTool,
     ReadSchemaTool,
     ReadTasksSectionTool,
     RunTestsTool,
     RunRepoQualityGatesTool,
+    SearchProjectTool,
     UpdateTaskStatusTool,
     ValidateMigrationConsistencyTool,
     WriteFileTool,
+    get_write_journal,
 )
 
 load_dotenv(dotenv_path=SQUAD_ROOT / ".env")
@@ -109,9 +115,6 @@ MIGRATION_RULES = (
 )
 
 _STATUS_LINE_TASK_ID_RE = re.compile(r"^task_id:\s*(.+)$", re.IGNORECASE)
-_CHECKLIST_RE = re.compile(r"^\s*-\s*\[(?P<status>[ x~!])\]\s+\*\*(?P<id>[A-Z]+-\d+|[A-Z]+\d+)\*\*")
-_TABLE_ID_RE = re.compile(r"^[A-Z]+-\d+$|^[A-Z]+\d+$")
-_STATUS_VALUES = {"todo", "in progress", "blocked", "done"}
 _COMMIT_RE = re.compile(r"\b[0-9a-f]{7,40}\b")
 _QUALITY_GATE_RETURN_CODE_RE = re.compile(r"return_code:\s*(-?\d+)", re.IGNORECASE)
 _CRITICAL_AUDIT_TOOLS = {
@@ -160,42 +163,10 @@ def _resolve_task_id_for_repo(repo: str, briefing: str) -> str:
     if board is None:
         return "UNSPECIFIED"
 
-    in_progress: list[str] = []
-    todo: list[str] = []
-    lines = board.read_text(encoding="utf-8", errors="ignore").splitlines()
-    for line in lines:
-        checklist = _CHECKLIST_RE.match(line)
-        if checklist:
-            status = checklist.group("status")
-            task_id = checklist.group("id")
-            if status == "~":
-                in_progress.append(task_id)
-            elif status == " ":
-                todo.append(task_id)
-            continue
-
-        if "|" in line and line.strip().startswith("|"):
-            cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
-            if not cells:
-                continue
-            task_id = cells[0]
-            if not _TABLE_ID_RE.match(task_id):
-                continue
-            normalized_cells = [cell.lower() for cell in cells]
-            matched_status = next(
-                (value for value in normalized_cells if value in _STATUS_VALUES),
-                None,
-            )
-            if matched_status == "in progress":
-                in_progress.append(task_id)
-            elif matched_status == "todo":
-                todo.append(task_id)
-
-    if in_progress:
-        return in_progress[0]
-    if todo:
-        return todo[0]
-    return "UNSPECIFIED"
+    try:
+        return load_task_board(board).next_task_id
+    except OSError:
+        return "UNSPECIFIED"
 
 
 def _compute_policy_fingerprint() -> str:
@@ -711,6 +682,8 @@ class AuraxisSquad:
         self.rcf = ReadContextFileTool()
         self.rgf = ReadGovernanceFileTool()
         self.rpf = ReadProjectFileTool()
+        self.rpfs = ReadProjectFilesTool()
+        self.sp = SearchProjectTool()
         self.lpf = ListProjectFilesTool()
         self.glm = GetLatestMigrationTool()
         self.rah = ReadAlembicHistoryTool()
@@ -772,6 +745,8 @@ class AuraxisSquad:
                 self.rgf,
                 self.rah,
                 self.rpf,
+                self.rpfs,
+                self.sp,
             ],
             verbose=True,
             allow_delegation=True,
@@ -793,6 +768,8 @@ class AuraxisSquad:
             ),
             tools=[
                 self.rpf,
+                self.rpfs,
+                self.sp,
                 self.lpf,
                 self.glm,
                 self.rah,
@@ -883,11 +860,17 @@ class AuraxisSquad:
             description=(
                 "READ PHASE — execute before writing anything.\n\n"
                 "For every file listed in the plan:\n"
-                "1. list_project_files('<dir>') to confirm what exists\n"
-                "2. read_project_file('<path>') for FULL current content\n"
-                "3. read_schema() to read schema.graphql\n"
-                "4. get_latest_migration() for correct down_revision\n"
-                "5. read_alembic_history('<table>') for existing columns\n\n"
+                "1. list_project_files('<dir>') to confirm what exists; "
+                "search_project('<symbol or regex>') to locate definitions/usages\n"
+                "2. read_project_file('<path>', mode='outline') for Python files "
+                "(classes, fields, methods with line numbers)\n"
+                "3. read_project_file('<path>') for FULL current content of files "
+                "you will modify (start_line/end_line for just the relevant part); "
+                "use read_project_files('<path1>, <path2>, <dir>/*.py') to fetch "
+                "several related files in one call\n"
+                "4. read_schema() to read schema.graphql\n"
+                "5. get_latest_migration() for correct down_revision\n"
+                "6. read_alembic_history('<table>') for existing columns\n\n"
                 "Output a READING REPORT listing:\n"
                 "- Each file read: classes, fields, methods found\n"
                 "- The latest migration revision ID\n"
@@ -916,8 +899,10 @@ class AuraxisSquad:
                 "WRITE PHASE — implement based on plan + reading report.\n\n"
                 "RULES (non-negotiable):\n"
                 "1. Use the reading report as your base\n"
-                "2. For existing files: take the FULL content you read, "
-                "add new fields/methods, write the complete file\n"
+                "2. For existing files: prefer write_file_content(path, "
+                "content=<SEARCH/REPLACE blocks or unified diff>, mode='patch') "
+                "for targeted edits; for large rewrites take the FULL content "
+                "you read, add new fields/methods, write the complete file\n"
                 "3. For new files: follow project patterns\n"
                 "4. Use db.Model style (NOT declarative Base)\n"
                 "5. Use Graphene (NOT Ariadne) for GraphQL\n"
@@ -1166,6 +1151,8 @@ class AuraxisSquad:
                 self.rcf,
                 self.rgf,
                 self.rpf,
+                self.rpfs,
+                self.sp,
                 self.lfcp,
                 self.rfcp,
             ],
@@ -1185,6 +1172,8 @@ class AuraxisSquad:
             ),
             tools=[
                 self.rpf,
+                self.rpfs,
+                self.sp,
                 self.lpf,
                 self.rcf,
                 self.rfcp,
@@ -1247,7 +1236,8 @@ class AuraxisSquad:
             description=(
                 "READ PHASE:\n"
                 "1. list_project_files('<relevant dir>')\n"
-                "2. read_project_file('<each target file>')\n"
+                "2. read_project_files('<target file 1>, <target file 2>') "
+                "(or read_project_file for a single file)\n"
                 "3. report existing structures and risks.\n"
                 "Do not write code in this phase."
             ),
@@ -1263,7 +1253,9 @@ class AuraxisSquad:
                 "WRITE PHASE:\n"
                 "- Implement only planned changes.\n"
                 "- Preserve existing code and non-ASCII characters.\n"
-                "- Write complete file content when updating files.\n"
+                "- Update existing files with write_file_content(mode='patch') "
+                "(SEARCH/REPLACE blocks or unified diff); write complete file "
+                "content only for new files or full rewrites.\n"
                 "- Do not commit yet."
             ),
             expected_output="List of changed files and summary of changes.",
@@ -2298,7 +2290,7 @@ if __name__ == "__main__":
     )
     task_id = infer_task_id(briefing)
     task_id_hint = os.getenv("AURAXIS_RESOLVED_TASK_ID", "").strip().upper()
-    if task_id == "UNSPECIFIED" and _TABLE_ID_RE.match(task_id_hint):
+    if task_id == "UNSPECIFIED" and TASK_ID_RE.match(task_id_hint):
         task_id = task_id_hint
     if task_id == "UNSPECIFIED" and target_env.lower() not in ("all", "auraxis-all", "*"):
         task_id = _resolve_task_id_for_repo(TARGET_REPO_NAME, briefing)
@@ -2307,7 +2299,7 @@ if __name__ == "__main__":
         safe_task_id = blocked_task_id
         if safe_task_id == "UNSPECIFIED":
             safe_task_id = f"UNRESOLVED-{TARGET_REPO_NAME.upper()}"
-        status_file = write_status_entry(
+        write_status_entry(
             task_id=safe_task_id,
             status="blocked",
             phase="preflight-blocked",
@@ -2317,6 +2309,7 @@ if __name__ == "__main__":
             notify_manager=True,
             notify_parallel_agents=True,
         )
+        status_file = render_status_view(safe_task_id)
         print("=== AI_SQUAD RUN SUMMARY ===")
         print(f"task_id: {safe_task_id}")
         print("status: blocked")
@@ -2354,7 +2347,7 @@ if __name__ == "__main__":
         )
         rc, report_path = run_multi_repo_orchestration(briefing, execution_mode)
         final_status = "done" if rc == 0 else "blocked"
-        status_file = write_status_entry(
+        write_status_entry(
             task_id=task_id,
             status=final_status,
             phase="multi-run-end",
@@ -2375,6 +2368,7 @@ if __name__ == "__main__":
             notify_manager=True,
             notify_parallel_agents=True,
         )
+        status_file = render_status_view(task_id)
         print("=== AI_SQUAD MULTI-RUN SUMMARY ===")
         print(f"task_id: {task_id}")
         print(f"status: {final_status}")
@@ -2463,7 +2457,7 @@ if __name__ == "__main__":
         details = result_text
         if block_reasons:
             details = f"block_reasons={', '.join(block_reasons)}\n\n{result_text}"
-        status_file = write_status_entry(
+        write_status_entry(
             task_id=task_id,
             status=final_status,
             phase="run-end",
@@ -2475,6 +2469,7 @@ if __name__ == "__main__":
             notify_manager=True,
             notify_parallel_agents=True,
         )
+        status_file = render_status_view(task_id)
         print("=== AI_SQUAD RUN SUMMARY ===")
         print(f"task_id: {task_id}")
         print(f"status: {final_status}")
@@ -2488,6 +2483,18 @@ if __name__ == "__main__":
         )
         print(f"next_task_suggestion: {next_task}")
         print(f"status_file: {status_file}")
+        tool_counters = get_tool_audit_counters()
+        if tool_counters:
+            print(
+                "tool_counters: "
+                + ", ".join(f"{name}={value}" for name, value in sorted(tool_counters.items()))
+            )
+        write_journal = get_write_journal()
+        if len(write_journal):
+            print(
+                f"write_journal: {write_journal.path} "
+                f"({len(write_journal.changed_paths())} files changed)"
+            )
         if is_blocked:
             print(
                 "[NOTIFY_MANAGER] Workflow ended with blockers. Check tasks_status file."
@@ -2497,7 +2504,7 @@ if __name__ == "__main__":
             )
     except Exception:
         stack_trace = traceback.format_exc()
-        status_file = write_status_entry(
+        write_status_entry(
             task_id=task_id,
             status="blocked",
             phase="run-exception",
@@ -2507,6 +2514,7 @@ if __name__ == "__main__":
             notify_manager=True,
             notify_parallel_agents=True,
         )
+        status_file = render_status_view(task_id)
         print("=== AI_SQUAD RUN SUMMARY ===")
         print(f"task_id: {task_id}")
         print("status: blocked")
@@ -0,0 +1,184 @@
+"""
+Unit tests for ai_squad/tools/alembic_graph.py.
+
+Test Strategy:
+- Migrations are written under pytest's tmp_path with hash-like filenames,
+  so filename order never matches history order.
+- Linear, branched and merged histories are checked through heads, branch
+  points, merge points, missing parents and the parents-first order.
+- MigrationGraphCache is observed through its "hit"/"build"/"parse" events:
+  adding one migration to a long history must parse exactly one file.
+- Benchmark: a 500-migration history is rebuilt incrementally within a
+  small time budget.
+"""
+
+import os
+import time
+
+from tools.alembic_graph import MigrationGraphCache, RevisionGraph, parse_migration
+
+
+def _migration(revision: str, down_revision, extra: str = "") -> str:
+    return (
+        f'"""{revision}"""\n'
+        "from alembic import op\n"
+        "import sqlalchemy as sa\n\n"
+        f"revision = {revision!r}\n"
+        f"down_revision = {down_revision!r}\n"
+        "branch_labels = None\n"
+        "depends_on = None\n\n"
+        f"{extra}"
+        "def upgrade():\n"
+        "    pass\n"
+    )
+
+
+def _write(versions, name: str, revision: str, down_revision) -> None:
+    (versions / name).write_text(_migration(revision, down_revision), encoding="utf-8")
+
+
+def _versions(tmp_path):
+    versions = tmp_path / "migrations" / "versions"
+    versions.mkdir(parents=True)
+    (versions / "__init__.py").write_text("", encoding="utf-8")
+    return versions
+
+
+class TestParseMigration:
+    """Validate revision metadata extraction."""
+
+    def test_plain_annotated_and_tuple(self) -> None:
+        info = parse_migration(_migration("ab12", None), "ab12_init.py")
+        assert info is not None
+        assert (info.revision, info.down_revisions) == ("ab12", ())
+
+        annotated = (
+            'revision: str = "c3"\n'
+            'down_revision: Union[str, Sequence[str], None] = ("a1", "b2")\n'
+            'branch_labels = ("billing",)\n'
+        )
+        info = parse_migration(annotated, "c3_merge.py")
+        assert info is not None
+        assert info.down_revisions == ("a1", "b2")
+        assert info.branch_labels == ("billing",)
+
+    def test_revision_in_docstring_or_body_is_ignored(self) -> None:
+        source = '"""\nrevision = "fake"\n"""\n\ndef upgrade():\n    revision = "inner"\n'
+        assert parse_migration(source, "x.py") is None
+        assert parse_migration("revision = (\n", "broken.py") is None
+        assert parse_migration("revision = compute()\ndown_revision = None\n", "x.py") is None
+
+
+class TestRevisionGraph:
+    """Validate heads, branches and merges."""
+
+    def test_hash_named_linear_history(self, tmp_path) -> None:
+        versions = _versions(tmp_path)
+        _write(versions, "f00d_init.py", "f00d", None)
+        _write(versions, "0bad_add_users.py", "0bad", "f00d")
+        _write(versions, "7e57_add_email.py", "7e57", "0bad")
+
+        graph = MigrationGraphCache().graph(versions)
+        assert graph.heads == ("7e57",)
+        assert graph.bases == ("f00d",)
+        assert [info.revision for info in graph.ordered()] == ["f00d", "0bad", "7e57"]
+        assert graph.branch_points == graph.merge_points == graph.missing == ()
+
+    def test_branch_then_merge(self, tmp_path) -> None:
+        versions = _versions(tmp_path)
+        _write(versions, "a_init.py", "a", None)
+        _write(versions, "b_left.py", "b", "a")
+        _write(versions, "c_right.py", "c", "a")
+        cache = MigrationGraphCache()
+
+        branched = cache.graph(versions)
+        assert branched.heads == ("b", "c")
+        assert branched.branch_points == ("a",)
+
+        _write(versions, "d_merge.py", "d", ("b", "c"))
+        merged = cache.graph(versions)
+        assert merged.heads == ("d",)
+        assert merged.merge_points == ("d",)
+        assert [info.revision for info in merged.ordered()][-1] == "d"
+
+    def test_missing_parent_and_duplicates(self) -> None:
+        graph = RevisionGraph.build(
+            [
+                parse_migration(_migration("b", "gone"), "b.py"),
+                parse_migration(_migration("c", "b"), "c.py"),
+                parse_migration(_migration("c", "b"), "c_copy.py"),
+            ],
+            unparsed=["notes.py"],
+        )
+        assert graph.missing == ("gone",)
+        assert graph.duplicates == ("c",)
+        assert graph.unparsed == ("notes.py",)
+        assert graph.heads == ("c",)
+        assert [info.filename for info in graph.ordered()] == ["b.py", "c.py"]
+
+
+class TestMigrationGraphCache:
+    """Validate incremental rebuilds."""
+
+    def test_only_new_or_changed_files_are_parsed(self, tmp_path) -> None:
+        versions = _versions(tmp_path)
+        previous = None
+        for index in range(20):
+            _write(versions, f"{index:04x}_step.py", f"r{index}", previous)
+            previous = f"r{index}"
+        events: list[str] = []
+        cache = MigrationGraphCache(on_event=events.append)
+
+        cache.graph(versions)
+        assert events.count("parse") == 20
+        events.clear()
+        assert cache.graph(versions).heads == ("r19",)
+        assert events == ["hit"]
+
+        events.clear()
+        _write(versions, "ffff_step.py", "r20", "r19")
+        assert cache.graph(versions).heads == ("r20",)
+        assert events == ["build", "parse"]
+
+        # In-place edits keep the directory mtime; the file's own stat changes.
+        events.clear()
+        target = versions / "ffff_step.py"
+        target.write_text(_migration("r20", "r18"), encoding="utf-8")
+        stat_result = target.stat()
+        os.utime(target, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000))
+        assert cache.graph(versions).heads == ("r19", "r20")
+        assert events == ["build", "parse"]
+
+        events.clear()
+        target.unlink()
+        assert cache.graph(versions).heads == ("r19",)
+        assert events == ["build"]
+
+
+class TestMigrationGraphBenchmark:
+    """Incremental rebuilds stay cheap on long histories."""
+
+    def test_500_migrations(self, tmp_path) -> None:
+        versions = _versions(tmp_path)
+        body = "def downgrade():\n    op.drop_column('users', 'x')\n\n" * 20
+        previous = None
+        for index in range(500):
+            revision = f"{index * 7919 % 65536:04x}{index:04d}"
+            (versions / f"{revision}_step.py").write_text(
+                _migration(revision, previous, body), encoding="utf-8"
+            )
+            previous = revision
+        cache = MigrationGraphCache()
+
+        started = time.perf_counter()
+        full = cache.graph(versions)
+        cold = time.perf_counter() - started
+        assert full.heads == (previous,)
+        assert len(full.ordered()) == 500
+
+        _write(versions, "zzzz_head.py", "head", previous)
+        started = time.perf_counter()
+        assert cache.graph(versions).heads == ("head",)
+        incremental = time.perf_counter() - started
+        assert incremental < cold / 3, f"cold={cold:.4f}s incremental={incremental:.4f}s"
+        assert incremental < 0.1, f"incremental rebuild took {incremental:.4f}s"
@@ -0,0 +1,197 @@
+"""
+Unit tests for ai_squad/tools/alembic_schema.py.
+
+Test Strategy:
+- extract_ops() is checked on multi-line calls, keyword arguments, batch
+  operations and downgrade() bodies (which must be ignored).
+- Replays run over migrations written under pytest's tmp_path with
+  hash-like filenames; the column set per table must reflect drops, column
+  renames and table renames, not every sa.Column ever written.
+- SchemaSnapshotStore is observed through its events and through a second
+  store reading the persisted JSON: a new migration only replays itself.
+- state_before() is checked on a branched history: a migration only sees
+  its own ancestors.
+"""
+
+from tools.alembic_graph import MigrationGraphCache
+from tools.alembic_schema import SchemaSnapshotStore, extract_ops
+
+CREATE_USERS = """
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("nickname", sa.String(50)),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+"""
+
+
+def _migration(revision: str, down_revision, upgrade: str, downgrade: str = "    pass\n") -> str:
+    return (
+        "from alembic import op\n"
+        "import sqlalchemy as sa\n\n"
+        f"revision = {revision!r}\n"
+        f"down_revision = {down_revision!r}\n\n\n"
+        f"def upgrade():\n{upgrade}\n\n"
+        f"def downgrade():\n{downgrade}"
+    )
+
+
+def _versions(tmp_path):
+    versions = tmp_path / "migrations" / "versions"
+    versions.mkdir(parents=True)
+    return versions
+
+
+def _history(tmp_path):
+    versions = _versions(tmp_path)
+    (versions / "e1a0_create_users.py").write_text(
+        _migration("e1a0", None, CREATE_USERS, '    op.drop_table("users")\n'),
+        encoding="utf-8",
+    )
+    (versions / "0c4f_profile.py").write_text(
+        _migration(
+            "0c4f",
+            "e1a0",
+            '    op.add_column("users", sa.Column("bio", sa.Text()))\n'
+            '    op.drop_column("users", "nickname")\n',
+            '    op.add_column("users", sa.Column("nickname", sa.String(50)))\n',
+        ),
+        encoding="utf-8",
+    )
+    (versions / "9b2d_rename.py").write_text(
+        _migration(
+            "9b2d",
+            "0c4f",
+            '    with op.batch_alter_table("users") as batch_op:\n'
+            '        batch_op.alter_column("bio", new_column_name="about")\n'
+            '        batch_op.add_column(sa.Column("locale", sa.String(8)))\n'
+            '    op.rename_table("users", "accounts")\n',
+        ),
+        encoding="utf-8",
+    )
+    return versions
+
+
+class TestExtractOps:
+    """Validate AST interpretation of upgrade()."""
+
+    def test_create_table_and_other_ops(self) -> None:
+        ops = extract_ops(_migration("a", None, CREATE_USERS))
+        assert ops is not None
+        assert [op.kind for op in ops] == ["create_table", "create_index"]
+        assert ops[0].table == "users"
+        assert ops[0].columns == ("id", "email", "nickname")
+        assert ops[0].line == 10
+        assert ops[1].mentions == ("ix_users_email", "users")
+        assert ops[1].text == 'op.create_index("ix_users_email", "users", ["email"], unique=True)'
+
+    def test_keywords_batch_and_downgrade(self) -> None:
+        upgrade = (
+            "    op.add_column(table_name='users', column=sa.Column('age', sa.Integer()))\n"
+            "    op.alter_column('users', 'age', new_column_name='age_years')\n"
+            "    with op.batch_alter_table('users') as batch_op:\n"
+            "        batch_op.drop_column('legacy')\n"
+        )
+        ops = extract_ops(_migration("a", None, upgrade, "    op.drop_column('users', 'x')\n"))
+        assert ops is not None
+        assert [(op.kind, op.table, op.column, op.new_name) for op in ops] == [
+            ("add_column", "users", "age", ""),
+            ("alter_column", "users", "age", "age_years"),
+            ("drop_column", "users", "legacy", ""),
+        ]
+        assert extract_ops("def upgrade(:\n") is None
+
+
+class TestReplay:
+    """Validate the materialized state."""
+
+    def test_drops_and_renames(self, tmp_path) -> None:
+        versions = _history(tmp_path)
+        store = SchemaSnapshotStore(MigrationGraphCache())
+        state = store.state(versions)
+
+        assert state.columns("users") is None
+        assert state.columns("accounts") == ("id", "email", "about", "locale")
+        assert [entry.filename for entry in state.history["users"]] == [
+            "e1a0_create_users.py",
+            "e1a0_create_users.py",
+            "0c4f_profile.py",
+            "0c4f_profile.py",
+            "9b2d_rename.py",
+            "9b2d_rename.py",
+            "9b2d_rename.py",
+        ]
+        assert state.history["accounts"][0].text == 'op.rename_table("users", "accounts")'
+
+    def test_state_before_follows_ancestors(self, tmp_path) -> None:
+        versions = _history(tmp_path)
+        (versions / "77aa_side.py").write_text(
+            _migration(
+                "77aa", "0c4f", '    op.add_column("users", sa.Column("phone", sa.String()))\n'
+            ),
+            encoding="utf-8",
+        )
+        store = SchemaSnapshotStore(MigrationGraphCache())
+
+        before_side = store.state_before(versions, "77aa_side.py")
+        assert before_side.columns("users") == ("id", "email", "bio")
+        before_profile = store.state_before(versions, "0c4f_profile.py")
+        assert before_profile.columns("users") == ("id", "email", "nickname")
+        assert store.state_before(versions, "unknown.py") is store.state(versions)
+
+
+class TestSnapshotStore:
+    """Validate persistence and incremental replays."""
+
+    def test_new_migration_only_replays_itself(self, tmp_path) -> None:
+        versions = _history(tmp_path)
+        snapshot = tmp_path / "snapshot" / "api.json"
+        events: list[str] = []
+        store = SchemaSnapshotStore(MigrationGraphCache(), snapshot, on_event=events.append)
+
+        store.state(versions)
+        assert events == ["parse", "parse", "parse", "replay"]
+        assert snapshot.is_file()
+        events.clear()
+        store.state(versions)
+        assert events == ["hit"]
+
+        # A fresh process: ops come from the snapshot, not from parsing.
+        (versions / "f00d_phone.py").write_text(
+            _migration(
+                "f00d", "9b2d", '    op.add_column("accounts", sa.Column("phone", sa.String()))\n'
+            ),
+            encoding="utf-8",
+        )
+        events.clear()
+        fresh = SchemaSnapshotStore(MigrationGraphCache(), snapshot, on_event=events.append)
+        state = fresh.state(versions)
+        assert events == ["parse", "extend"]
+        assert state.columns("accounts") == ("id", "email", "about", "locale", "phone")
+
+    def test_edited_migration_replays_everything(self, tmp_path) -> None:
+        versions = _history(tmp_path)
+        snapshot = tmp_path / "snapshot.json"
+        SchemaSnapshotStore(MigrationGraphCache(), snapshot).state(versions)
+
+        (versions / "0c4f_profile.py").write_text(
+            _migration(
+                "0c4f", "e1a0", '    op.add_column("users", sa.Column("bio", sa.Text()))\n'
+            ),
+            encoding="utf-8",
+        )
+        events: list[str] = []
+        store = SchemaSnapshotStore(MigrationGraphCache(), snapshot, on_event=events.append)
+        state = store.state(versions)
+        assert events == ["parse", "replay"]
+        assert state.columns("accounts") == ("id", "email", "nickname", "about", "locale")
+
+    def test_corrupt_snapshot_is_ignored(self, tmp_path) -> None:
+        versions = _history(tmp_path)
+        snapshot = tmp_path / "snapshot.json"
+        snapshot.write_text("{not json", encoding="utf-8")
+        state = SchemaSnapshotStore(MigrationGraphCache(), snapshot).state(versions)
+        assert state.columns("accounts") == ("id", "email", "about", "locale")
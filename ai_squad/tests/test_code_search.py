@@ -0,0 +1,211 @@
+"""
+Unit tests for ai_squad/tools/code_search.py.
+
+Test Strategy:
+- A small git repo is built under pytest's tmp_path; the SQLite index lives
+  next to it, so nothing touches the real platform `.tmp/`.
+- Query planning is validated on regexes with literals, alternations,
+  optional parts and no literals at all.
+- Incremental refresh is validated through the number of re-indexed paths
+  after edits, deletions, untracked files and commits.
+- Worktree sharing is validated by indexing a second clone: known blobs
+  must not be re-read.
+"""
+
+import subprocess
+
+from tools import code_search
+from tools.code_search import CodeSearchIndex, extract_trigrams, git_blob_sha, query_trigrams
+
+USER_MODEL = '''class User(db.Model):
+    email = db.Column(db.String(255))
+
+    def get_wallets(self):
+        return self.wallets
+'''
+
+
+def _git(root, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.email=t@example.com", "-c", "user.name=t", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def _write(path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _repo(tmp_path):
+    root = tmp_path / "repo"
+    _write(root / "app" / "models" / "user.py", USER_MODEL)
+    _write(root / "app" / "services" / "wallet.py", "def create_wallet(user):\n    pass\n")
+    _write(root / "node_modules" / "lib" / "index.js", "get_wallets\n")
+    _write(root / "README.md", "# Demo\n")
+    (root / ".gitignore").write_text("node_modules/\n", encoding="utf-8")
+    _git(root, "init", "-q")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "init")
+    return root
+
+
+def _paths(result) -> list[str]:
+    return [hit.path for hit in result.hits]
+
+
+class TestQueryPlanning:
+    """Validate regex -> trigram reduction."""
+
+    def test_literal_and_alternation(self) -> None:
+        plans = query_trigrams(r"(foo|barbaz)\s+qux")
+        assert plans is not None and len(plans) == 2
+        assert extract_trigrams(b"qux") <= plans[0]
+        assert extract_trigrams(b"foo") <= plans[0]
+        assert extract_trigrams(b"barbaz") <= plans[1]
+
+    def test_optional_parts_are_not_required(self) -> None:
+        plans = query_trigrams(r"get_(wallets)?_by_id")
+        assert plans == [extract_trigrams(b"get_") | extract_trigrams(b"_by_id")]
+
+    def test_unconstrained_patterns(self) -> None:
+        assert query_trigrams(r".*") is None
+        assert query_trigrams(r"\w+_i") is None
+        assert query_trigrams(r"ab|wallet") is None
+
+    def test_case_folding(self) -> None:
+        assert query_trigrams("(?i)USER") == [extract_trigrams(b"user")]
+
+    def test_git_blob_sha_matches_git(self, tmp_path) -> None:
+        path = tmp_path / "a.txt"
+        path.write_bytes(b"hello\n")
+        expected = subprocess.run(
+            ["git", "hash-object", str(path)], check=True, capture_output=True, text=True
+        ).stdout.strip()
+        assert git_blob_sha(b"hello\n") == expected
+
+
+class TestSearch:
+    """Validate search results against a real git repo."""
+
+    def test_matches_with_context(self, tmp_path) -> None:
+        root = _repo(tmp_path)
+        index = CodeSearchIndex(tmp_path / "index.sqlite3")
+        result = index.search(root, r"def get_\w+", context_lines=1)
+        assert [(hit.path, hit.line_number) for hit in result.hits] == [
+            ("app/models/user.py", 4)
+        ]
+        hit = result.hits[0]
+        assert hit.before == ("",)
+        assert hit.after == ("        return self.wallets",)
+        assert result.candidate_files == 1
+
+    def test_ignored_dirs_prefix_and_glob(self, tmp_path) -> None:
+        root = _repo(tmp_path)
+        index = CodeSearchIndex(tmp_path / "index.sqlite3")
+        assert _paths(index.search(root, "wallet")) == [
+            "app/models/user.py",
+            "app/models/user.py",
+            "app/services/wallet.py",
+        ]
+        assert _paths(index.search(root, "wallet", prefix="app/services")) == [
+            "app/services/wallet.py"
+        ]
+        assert _paths(index.search(root, "(?i)DEMO", path_patterns=["*.md"])) == ["README.md"]
+
+    def test_matches_never_span_lines(self, tmp_path) -> None:
+        root = _repo(tmp_path)
+        index = CodeSearchIndex(tmp_path / "index.sqlite3")
+        assert index.search(root, r"String\(255\)\)\s+def").hits == ()
+        assert index.search(root, r"db\.Model[^x]*wallets").hits == ()
+        result = index.search(root, r"^\s+return self\.\w+$")
+        assert [(hit.path, hit.line_number) for hit in result.hits] == [
+            ("app/models/user.py", 5)
+        ]
+
+    def test_max_results_truncates(self, tmp_path) -> None:
+        root = _repo(tmp_path)
+        index = CodeSearchIndex(tmp_path / "index.sqlite3")
+        result = index.search(root, "e", max_results=2)
+        assert len(result.hits) == 2
+        assert result.truncated
+
+
+class TestIncrementalRefresh:
+    """Validate git-diff driven refreshes."""
+
+    def test_only_changed_paths_are_reindexed(self, tmp_path) -> None:
+        root = _repo(tmp_path)
+        index = CodeSearchIndex(tmp_path / "index.sqlite3")
+        assert index.refresh(root) == 4
+        assert index.refresh(root) == 0
+
+        _write(root / "app" / "services" / "wallet.py", "def close_wallet(user):\n    pass\n")
+        _write(root / "app" / "services" / "new.py", "def close_wallet_batch():\n    pass\n")
+        (root / "README.md").unlink()
+        assert index.refresh(root) == 3
+        assert _paths(index.search(root, "close_wallet")) == [
+            "app/services/new.py",
+            "app/services/wallet.py",
+        ]
+        assert index.search(root, "create_wallet").hits == ()
+        assert index.search(root, "Demo").hits == ()
+
+        _git(root, "add", "-A")
+        _git(root, "commit", "-q", "-m", "change")
+        assert index.refresh(root) == 0
+
+    def test_reverted_file_is_reindexed(self, tmp_path) -> None:
+        root = _repo(tmp_path)
+        index = CodeSearchIndex(tmp_path / "index.sqlite3")
+        index.refresh(root)
+        _write(root / "README.md", "# Changed\n")
+        index.refresh(root)
+        _git(root, "checkout", "--", "README.md")
+        index.refresh(root)
+        assert _paths(index.search(root, "Demo")) == ["README.md"]
+        assert index.search(root, "Changed").hits == ()
+
+    def test_worktrees_share_blobs(self, tmp_path, monkeypatch) -> None:
+        root = _repo(tmp_path)
+        index = CodeSearchIndex(tmp_path / "index.sqlite3")
+        index.refresh(root)
+        clone = tmp_path / "clone"
+        subprocess.run(["git", "clone", "-q", str(root), str(clone)], check=True)
+
+        stored: list[str] = []
+        original = CodeSearchIndex._store_blob
+
+        def counting(self, connection, sha, data):
+            stored.append(sha)
+            return original(self, connection, sha, data)
+
+        monkeypatch.setattr(CodeSearchIndex, "_store_blob", counting)
+        index.refresh(clone)
+        assert stored == []
+        assert _paths(index.search(clone, "get_wallets")) == ["app/models/user.py"]
+
+        index.forget_root(root)
+        assert _paths(index.search(clone, "get_wallets")) == ["app/models/user.py"]
+
+    def test_non_git_root_uses_walk(self, tmp_path) -> None:
+        root = tmp_path / "plain"
+        _write(root / "a.py", "VALUE = 1\n")
+        index = CodeSearchIndex(tmp_path / "index.sqlite3")
+        assert _paths(index.search(root, "VALUE")) == ["a.py"]
+        _write(root / "a.py", "OTHER = 2\n")
+        assert index.search(root, "VALUE").hits == ()
+
+    def test_binary_and_large_files_are_not_searchable(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(code_search, "MAX_INDEXED_FILE_BYTES", 64)
+        root = tmp_path / "plain"
+        root.mkdir()
+        (root / "blob.bin").write_bytes(b"\0needle")
+        _write(root / "big.txt", "needle " * 20)
+        _write(root / "small.txt", "needle\n")
+        index = CodeSearchIndex(tmp_path / "index.sqlite3")
+        assert _paths(index.search(root, "needle")) == ["small.txt"]
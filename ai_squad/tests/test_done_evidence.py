@@ -0,0 +1,238 @@
+"""
+Unit tests for ai_squad/tools/done_evidence.py.
+
+Test Strategy:
+- Projects are built under pytest's tmp_path and checked with the rules
+  shipped in ai_squad/config/done_evidence/, so the WEB3/APP3/B11 messages
+  are asserted exactly as update_task_status returns them.
+- A counting reader proves each file is read at most once per check.
+- find_patterns() is checked on overlapping patterns, where a single
+  consuming alternation would miss matches.
+- Benchmark: test_coverage over a 3,000-file tests/ tree stays within a
+  time budget.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+from tools.done_evidence import (
+    EvidenceChecker,
+    EvidenceRuleError,
+    find_patterns,
+    load_evidence_rules,
+    parse_evidence_rules,
+)
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "config" / "done_evidence"
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _check(root: Path, repo: str, task_id: str, **kwargs) -> str | None:
+    rules = load_evidence_rules(repo, CONFIG_DIR, root)
+    return EvidenceChecker(root, list_source="walk", **kwargs).first_failure(rules[task_id])
+
+
+def _web3(root: Path) -> None:
+    for rel in (
+        "app/layouts/default.vue",
+        "app/middleware/authenticated.ts",
+        "app/middleware/guest-only.ts",
+        "app/composables/useAuth/index.ts",
+    ):
+        _write(root / rel, "export {}\n")
+    _write(root / "app/pages/login.vue", "<template><UiButton /></template>\n")
+    _write(
+        root / "app/server/api/auth/login.post.ts",
+        "setCookie(event, 'token', value, { httpOnly: true })\n",
+    )
+
+
+def _b11(root: Path) -> None:
+    _write(
+        root / "app/models/user.py",
+        "investor_profile_suggested = 1\nprofile_quiz_score = 2\ntaxonomy_version = 3\n",
+    )
+    _write(root / "app/schemas/user_schemas.py", "class UserSchema:\n    pass\n")
+    _write(root / "migrations/versions/20240614_add_investor_profile_suggestion_fields.py", "")
+    _write(root / "tests/test_user.py", "def test_score():\n    assert 'profile_quiz_score'\n")
+
+
+class TestShippedRules:
+    """The shipped rule files reproduce the former hardcoded checks."""
+
+    def test_web3(self, tmp_path) -> None:
+        _web3(tmp_path)
+        assert _check(tmp_path, "auraxis-web", "WEB3") is None
+
+        _write(tmp_path / "app/pages/login.vue", "<template><button /></template>\n")
+        assert _check(tmp_path, "auraxis-web", "WEB3") == (
+            "BLOCKED: WEB3 cannot be marked Done. "
+            "Raw HTML controls still present in app/pages/login.vue."
+        )
+
+        _write(tmp_path / "app/pages/login.vue", "<template><UiButton /></template>\n")
+        _write(tmp_path / "app/server/api/auth/login.post.ts", "setCookie(event, 't', v)\n")
+        assert _check(tmp_path, "auraxis-web", "WEB3") == (
+            "BLOCKED: WEB3 requires setCookie(..., { httpOnly: true }) in server auth handlers."
+        )
+
+        (tmp_path / "app/middleware/guest-only.ts").unlink()
+        assert _check(tmp_path, "auraxis-web", "WEB3") == (
+            "BLOCKED: WEB3 cannot be marked Done. Missing required files: "
+            "app/middleware/guest-only.ts"
+        )
+
+    def test_app3(self, tmp_path) -> None:
+        for rel in ("app/(public)/login.tsx", "app/(private)/_layout.tsx"):
+            _write(tmp_path / rel, "export {}\n")
+        _write(
+            tmp_path / "lib/secure-storage.ts",
+            "SecureStore.setItemAsync(k, v)\nSecureStore.deleteItemAsync(k)\n",
+        )
+        _write(tmp_path / "stores/session-store.ts", "signIn: () => {},\nsignOut: () => {},\n")
+        assert _check(tmp_path, "auraxis-app", "APP3") == (
+            "BLOCKED: APP3 requires signIn/signOut actions and storage cleanup in session store."
+        )
+        _write(
+            tmp_path / "stores/session-store.ts",
+            "signIn: () => {},\nsignOut: () => clearStoredSession(),\n",
+        )
+        assert _check(tmp_path, "auraxis-app", "APP3") is None
+
+    def test_b11(self, tmp_path) -> None:
+        _b11(tmp_path)
+        assert _check(tmp_path, "auraxis-api", "B11") is None
+
+        _write(tmp_path / "app/schemas/user_schemas.py", "class UserSchema(\n")
+        assert _check(tmp_path, "auraxis-api", "B11").startswith(
+            "BLOCKED: B11 schema has syntax error: "
+        )
+
+        _write(tmp_path / "app/schemas/user_schemas.py", "x = 1\n")
+        (tmp_path / "tests/test_user.py").unlink()
+        assert _check(tmp_path, "auraxis-api", "B11") == (
+            "BLOCKED: B11 requires at least one automated test asserting "
+            "investor profile suggestion fields."
+        )
+
+    def test_each_file_is_read_once(self, tmp_path) -> None:
+        _b11(tmp_path)
+        reads: list[str] = []
+
+        def reader(path: Path) -> str:
+            reads.append(path.relative_to(tmp_path).as_posix())
+            return path.read_text(encoding="utf-8")
+
+        assert _check(tmp_path, "auraxis-api", "B11", read_text=reader) is None
+        assert sorted(reads) == sorted(set(reads))
+
+
+class TestRuleFiles:
+    """Validate loading, overrides and malformed rules."""
+
+    def test_project_override_replaces_task(self, tmp_path) -> None:
+        override = {
+            "tasks": {
+                "web3": [
+                    {
+                        "type": "required_paths",
+                        "paths": ["docs/auth.md"],
+                        "message": "need {missing}",
+                    }
+                ],
+                "WEB9": [
+                    {
+                        "type": "content",
+                        "dir": "app",
+                        "pattern": "*.vue",
+                        "forbid": ["<\\s*p\\b"],
+                        "message": "raw paragraph",
+                    }
+                ],
+            }
+        }
+        _write(tmp_path / ".context/done_evidence_rules.json", json.dumps(override))
+        _write(tmp_path / "app/pages/a.vue", "<Box />\n")
+        _write(tmp_path / "app/pages/b.vue", "<p>x</p>\n")
+
+        assert _check(tmp_path, "auraxis-web", "WEB3") == "need docs/auth.md"
+        assert _check(tmp_path, "auraxis-web", "WEB9") == "raw paragraph"
+
+    def test_malformed_rules_are_rejected(self) -> None:
+        with pytest.raises(EvidenceRuleError):
+            parse_evidence_rules({"tasks": {"X1": [{"type": "grep", "message": "m"}]}})
+        bad_regex = {"type": "content", "path": "a", "require": ["("], "message": "m"}
+        with pytest.raises(EvidenceRuleError):
+            parse_evidence_rules({"tasks": {"X1": [bad_regex]}})
+
+
+class TestFindPatterns:
+    """One combined scan must agree with individual searches."""
+
+    def test_overlapping_patterns(self) -> None:
+        patterns = (r"signIn\s*:", r"signIn", r"^export", r"missing")
+        text = "export const store = {\n  signIn: () => {},\n}\n"
+        assert find_patterns(text, patterns) == frozenset(patterns[:3])
+
+    def test_patterns_that_cannot_be_combined(self) -> None:
+        # Each compiles alone; joined they raise re.error or renumber groups.
+        patterns = (r"(?i)SIGNIN", r"(o)\1", r"(?P<key>sign)In", r"(?P<key>store)", r"(x)\1")
+        text = "const store = { signIn: () => {}, book: 1 }\n"
+        assert find_patterns(text, patterns) == frozenset(patterns[:4])
+
+    def test_inline_flag_rule_blocks_instead_of_raising(self, tmp_path) -> None:
+        override = {
+            "tasks": {
+                "WEB9": [
+                    {
+                        "type": "content",
+                        "path": "app/pages/a.vue",
+                        "require": ["(?i)<UIBUTTON", "(?P<tag>Ui)Button"],
+                        "forbid": ["(?i)<button\\b", "(?P<tag>onclick)"],
+                        "message": "raw button",
+                    }
+                ]
+            }
+        }
+        _write(tmp_path / ".context/done_evidence_rules.json", json.dumps(override))
+        _write(tmp_path / "app/pages/a.vue", "<UiButton />\n")
+        assert _check(tmp_path, "auraxis-web", "WEB9") is None
+        _write(tmp_path / "app/pages/a.vue", "<UiButton /><BUTTON>\n")
+        assert _check(tmp_path, "auraxis-web", "WEB9") == "raw button"
+
+
+class TestEvidenceBenchmark:
+    """test_coverage stays fast on large test trees."""
+
+    def test_3000_test_files(self, tmp_path) -> None:
+        filler = "def test_value():\n    assert compute(1) == 2\n" * 40
+        for index in range(3000):
+            _write(tmp_path / f"tests/unit/pkg{index % 30}/test_mod{index}.py", filler)
+        rules = parse_evidence_rules(
+            {
+                "tasks": {
+                    "B11": [
+                        {
+                            "type": "test_coverage",
+                            "require": ["taxonomy_version"],
+                            "message": "missing coverage",
+                        }
+                    ]
+                }
+            }
+        )["B11"]
+
+        started = time.perf_counter()
+        missing = EvidenceChecker(tmp_path, list_source="walk").first_failure(rules)
+        elapsed = time.perf_counter() - started
+        assert missing == "missing coverage"
+        assert elapsed < 3.0, f"3000 test files took {elapsed:.3f}s"
+
+        _write(tmp_path / "tests/unit/pkg7/test_mod7.py", filler + "taxonomy_version\n")
+        assert EvidenceChecker(tmp_path, list_source="walk").first_failure(rules) is None
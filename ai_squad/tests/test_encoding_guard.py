@@ -0,0 +1,133 @@
+"""
+Unit tests for ai_squad/tools/encoding_guard.py.
+
+Test Strategy:
+- Histograms from UTF-8 bytes must equal a per-character count of the
+  decoded text; invalid UTF-8 yields None.
+- corruption_message() is exercised with accent loss (raw count drops) and
+  mojibake (raw count grows), plus legitimate edits that must pass.
+- HistogramCache uses files under pytest's tmp_path and an event list to
+  observe hits and misses across rewrites.
+- Benchmark: a multi-megabyte Portuguese file is scanned faster than the
+  former per-character generator, and cached lookups stay in microseconds.
+"""
+
+import os
+import time
+from collections import Counter
+
+from tools.encoding_guard import (
+    HistogramCache,
+    corruption_message,
+    histogram_of_bytes,
+    histogram_of_text,
+)
+
+PORTUGUESE = (
+    "A configuração da função não está disponível; ação obrigatória é válida.\n"
+)
+
+
+class TestHistograms:
+    """Validate byte-level and text histograms."""
+
+    def test_bytes_match_text(self) -> None:
+        text = PORTUGUESE * 3 + "emoji 🚀 e símbolos €£\n"
+        expected = Counter(char for char in text if ord(char) > 127)
+        assert histogram_of_bytes(text.encode("utf-8")) == expected
+        assert histogram_of_text(text) == expected
+
+    def test_ascii_is_empty(self) -> None:
+        assert histogram_of_bytes(b"plain ascii\n") == Counter()
+        assert histogram_of_text("plain ascii\n") == Counter()
+
+    def test_invalid_utf8_is_none(self) -> None:
+        assert histogram_of_bytes("ação".encode("latin-1")) is None
+        assert histogram_of_bytes(b"ok \x80 stray") is None
+        assert histogram_of_bytes(b"short \xe3\x81 lead") is None
+
+
+class TestCorruptionMessage:
+    """Validate the blocking rules."""
+
+    def test_accent_loss_is_blocked(self) -> None:
+        old = histogram_of_text(PORTUGUESE)
+        new = histogram_of_text(PORTUGUESE.replace("ç", "c").replace("ã", "a").replace("á", "a"))
+        message = corruption_message(old, new) or ""
+        assert message.startswith("BLOCKED: encoding corruption detected. Existing file has 12")
+
+    def test_mojibake_is_blocked_although_count_grows(self) -> None:
+        old = histogram_of_text(PORTUGUESE)
+        mojibake = PORTUGUESE.encode("utf-8").decode("latin-1")
+        new = histogram_of_text(mojibake)
+        assert sum(new.values()) > sum(old.values())
+        message = corruption_message(old, new) or ""
+        assert "Accented characters disappeared" in message
+        assert "'Ã' 0->" in message
+
+    def test_legitimate_edits_pass(self) -> None:
+        old = histogram_of_text(PORTUGUESE * 2)
+        assert corruption_message(old, histogram_of_text(PORTUGUESE * 2 + "Preço\n")) is None
+        # Deleting half of the text is allowed; so is adding a marker char alone.
+        assert corruption_message(old, histogram_of_text(PORTUGUESE)) is None
+        assert corruption_message(old, histogram_of_text(PORTUGUESE * 2 + "Â\n")) is None
+        # Files with only a handful of accents are not checked.
+        assert corruption_message(histogram_of_text("ação"), Counter()) is None
+
+
+class TestHistogramCache:
+    """Validate (path, mtime, size) caching."""
+
+    def test_hits_until_file_changes(self, tmp_path) -> None:
+        events: list[str] = []
+        cache = HistogramCache(on_event=events.append)
+        target = tmp_path / "pt.md"
+        target.write_text(PORTUGUESE, encoding="utf-8")
+
+        first = cache.histogram(target)
+        assert cache.histogram(target) == first
+        assert events == ["miss", "hit"]
+
+        target.write_text(PORTUGUESE + "Atenção\n", encoding="utf-8")
+        stat_result = target.stat()
+        os.utime(target, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000))
+        changed = cache.histogram(target)
+        assert events[-1] == "miss"
+        assert changed is not None and changed["ç"] == first["ç"] + 1
+        assert len(cache) == 1
+
+    def test_lru_bound(self, tmp_path) -> None:
+        cache = HistogramCache(max_entries=2)
+        for index in range(3):
+            path = tmp_path / f"f{index}.md"
+            path.write_text(PORTUGUESE, encoding="utf-8")
+            cache.histogram(path)
+        assert len(cache) == 2
+
+
+def _best_of(runs: int, action) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+class TestEncodingBenchmark:
+    """Byte-level histograms and cached lookups on a large Portuguese file."""
+
+    def test_large_file(self, tmp_path) -> None:
+        text = PORTUGUESE * 50_000  # ~3.7 MB
+        data = text.encode("utf-8")
+        target = tmp_path / "large.md"
+        target.write_bytes(data)
+
+        scan = _best_of(3, lambda: histogram_of_bytes(data))
+        generator = _best_of(1, lambda: sum(1 for ch in text if ord(ch) > 127))
+        assert scan < generator / 2, f"scan={scan:.4f}s generator={generator:.4f}s"
+
+        cache = HistogramCache()
+        cache.histogram(target)
+        cached = _best_of(5, lambda: cache.histogram(target))
+        assert cached < 0.001, f"cached lookup took {cached * 1e6:.0f}us"
@@ -0,0 +1,259 @@
+"""
+Unit tests for ai_squad/tools/file_io.py.
+
+Test Strategy:
+- All files live under pytest's tmp_path.
+- JsonlAppender is hammered from several threads and processes; every line
+  must parse as JSON and no record may be lost or duplicated.
+- Group commit is validated through the pending-line counter.
+- Ranged reads are validated on small (bytes) and large (mmap) files.
+- ReadCache is validated through its hit/miss/eviction events.
+- Skip-if-unchanged writes are validated through mtime and file mode
+  (preserved on rewrites, umask-derived on creation).
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+
+import pytest
+from tools import file_io
+from tools.file_io import JsonlAppender, ReadCache, read_line_range, write_text_if_changed
+
+
+def _append_from_process(path: str, worker: int, count: int) -> None:
+    from pathlib import Path
+
+    appender = JsonlAppender(Path(path))
+    for index in range(count):
+        appender.append({"worker": worker, "index": index, "pad": "x" * 512})
+    appender.close()
+
+
+def _read_records(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestJsonlAppender:
+    """Validate whole-line, concurrent JSONL appends."""
+
+    def test_threads_never_interleave_lines(self, tmp_path) -> None:
+        path = tmp_path / "ledger.jsonl"
+        appender = JsonlAppender(path)
+
+        def writer(worker: int) -> None:
+            for index in range(200):
+                appender.append({"worker": worker, "index": index, "pad": "x" * 512})
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        appender.close()
+
+        records = _read_records(path)
+        assert len(records) == 800
+        assert {(r["worker"], r["index"]) for r in records} == {
+            (w, i) for w in range(4) for i in range(200)
+        }
+
+    def test_processes_never_interleave_lines(self, tmp_path) -> None:
+        path = tmp_path / "ledger.jsonl"
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=_append_from_process, args=(str(path), worker, 100))
+            for worker in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        assert len(_read_records(path)) == 300
+
+    def test_torn_tail_is_isolated(self, tmp_path) -> None:
+        path = tmp_path / "ledger.jsonl"
+        path.write_text('{"ok": 1}\n{"torn": ', encoding="utf-8")
+        appender = JsonlAppender(path)
+        appender.append({"ok": 2})
+        appender.close()
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert lines == ['{"ok": 1}', '{"torn": ', '{"ok": 2}']
+
+    def test_fsync_is_batched(self, tmp_path) -> None:
+        appender = JsonlAppender(tmp_path / "ledger.jsonl", fsync_every=3, fsync_interval=3600)
+        appender.append({"n": 1})
+        appender.append({"n": 2})
+        assert appender._pending == 2
+        appender.append({"n": 3})
+        assert appender._pending == 0
+        appender.append_many([{"n": 4}, {"n": 5}])
+        appender.sync()
+        assert appender._pending == 0
+        appender.close()
+        assert len(_read_records(tmp_path / "ledger.jsonl")) == 5
+
+
+def _numbered(count: int) -> str:
+    return "".join(f"line {index} ção\n" for index in range(1, count + 1))
+
+
+class TestReadLineRange:
+    """Validate ranged reads, byte caps and continuation cursors."""
+
+    def test_whole_small_file_is_complete(self, tmp_path) -> None:
+        path = tmp_path / "a.py"
+        path.write_text(_numbered(3), encoding="utf-8")
+        chunk = read_line_range(path)
+        assert chunk.complete
+        assert chunk.text == _numbered(3)
+        assert chunk.total_lines == 3
+
+    def test_line_range(self, tmp_path) -> None:
+        path = tmp_path / "a.py"
+        path.write_text(_numbered(10), encoding="utf-8")
+        chunk = read_line_range(path, start_line=4, end_line=5)
+        assert chunk.text == "line 4 ção\nline 5 ção\n"
+        assert (chunk.start_line, chunk.end_line, chunk.next_line) == (4, 5, 0)
+        assert not chunk.complete
+
+    def test_byte_cap_returns_whole_lines_and_cursor(self, tmp_path) -> None:
+        path = tmp_path / "a.py"
+        path.write_text(_numbered(100), encoding="utf-8")
+        line_bytes = len("line 10 ção\n".encode())
+        chunk = read_line_range(path, start_line=10, max_bytes=line_bytes * 3 + 1)
+        assert chunk.text.splitlines() == ["line 10 ção", "line 11 ção", "line 12 ção"]
+        assert chunk.next_line == 13
+
+    def test_oversized_single_line_is_paged(self, tmp_path) -> None:
+        path = tmp_path / "a.min.js"
+        line = "x" * 99 + "ção" * 300
+        path.write_text(line + "\nend\n", encoding="utf-8")
+        chunk = read_line_range(path, max_bytes=100)
+        assert chunk.text == "x" * 99  # never splits the two-byte "ç"
+        assert (chunk.end_line, chunk.next_line, chunk.next_byte) == (1, 1, 99)
+
+        pages = [chunk.text]
+        while chunk.next_byte:
+            chunk = read_line_range(
+                path, start_line=chunk.next_line, start_byte=chunk.next_byte, max_bytes=100
+            )
+            pages.append(chunk.text)
+        # The last page finishes the long line and continues with whole lines.
+        assert "".join(pages) == line + "\nend\n"
+        assert (chunk.start_line, chunk.end_line, chunk.next_line) == (1, 2, 0)
+        assert not chunk.complete  # it started mid-line
+
+    def test_large_file_uses_mmap_index(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(file_io, "MMAP_THRESHOLD_BYTES", 1024)
+        path = tmp_path / "big.lock"
+        path.write_text(_numbered(5000), encoding="utf-8")
+        chunk = read_line_range(path, start_line=2500, end_line=2501)
+        assert chunk.text == "line 2500 ção\nline 2501 ção\n"
+        assert chunk.total_lines == 5000
+        assert any(key[0] == str(path.resolve()) for key in file_io._LINE_INDEX_CACHE)
+
+    def test_no_trailing_newline_and_empty_file(self, tmp_path) -> None:
+        path = tmp_path / "a.txt"
+        path.write_text("a\nb", encoding="utf-8")
+        assert read_line_range(path, start_line=2).text == "b"
+        empty = tmp_path / "empty.txt"
+        empty.write_text("", encoding="utf-8")
+        assert read_line_range(empty).complete
+
+
+class TestReadCache:
+    """Validate the (path, mtime, size) keyed LRU read cache."""
+
+    def _cache(self, max_bytes: int = 1_000_000) -> tuple[ReadCache, list[str]]:
+        events: list[str] = []
+        return ReadCache(max_bytes, on_event=events.append), events
+
+    def test_repeated_reads_hit(self, tmp_path) -> None:
+        cache, events = self._cache()
+        path = tmp_path / "a.py"
+        path.write_text("ação\n", encoding="utf-8")
+        assert cache.read_text(path) == "ação\n"
+        assert cache.read_bytes(path) == "ação\n".encode()
+        assert events == ["miss", "hit"]
+
+    def test_changed_file_is_reread(self, tmp_path) -> None:
+        cache, events = self._cache()
+        path = tmp_path / "a.py"
+        path.write_text("one\n", encoding="utf-8")
+        cache.read_text(path)
+        path.write_text("three\n", encoding="utf-8")
+        assert cache.read_text(path) == "three\n"
+        assert events == ["miss", "miss"]
+
+    def test_invalidate_and_clear(self, tmp_path) -> None:
+        cache, events = self._cache()
+        path = tmp_path / "a.py"
+        path.write_text("x", encoding="utf-8")
+        cache.read_text(path)
+        cache.invalidate(path)
+        cache.read_text(path)
+        cache.clear()
+        cache.read_text(path)
+        assert events == ["miss", "miss", "miss"]
+        assert cache.used_bytes == 2  # bytes + decoded text
+
+    def test_lru_budget_evicts_oldest(self, tmp_path) -> None:
+        cache, events = self._cache(max_bytes=250)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / name
+            path.write_bytes(b"x" * 100)
+            paths.append(path)
+            cache.read_bytes(path)
+        assert events.count("eviction") == 1
+        assert cache.used_bytes == 200
+        cache.read_bytes(paths[0])
+        assert events[-2:] == ["miss", "eviction"]
+
+    def test_file_larger_than_budget_is_not_cached(self, tmp_path) -> None:
+        cache, events = self._cache(max_bytes=10)
+        path = tmp_path / "big"
+        path.write_bytes(b"x" * 100)
+        cache.read_bytes(path)
+        cache.read_bytes(path)
+        assert events == ["miss", "miss"]
+        assert cache.used_bytes == 0
+
+    def test_decode_error_is_raised(self, tmp_path) -> None:
+        cache, _ = self._cache()
+        path = tmp_path / "bin"
+        path.write_bytes(b"\xff\xfe")
+        with pytest.raises(UnicodeDecodeError):
+            cache.read_text(path)
+
+
+class TestWriteTextIfChanged:
+    """Validate atomic, skip-if-unchanged writes."""
+
+    def test_identical_content_is_not_rewritten(self, tmp_path) -> None:
+        path = tmp_path / "a.py"
+        assert write_text_if_changed(path, "ação\n") == "created"
+        before = path.stat().st_mtime_ns
+        assert write_text_if_changed(path, "ação\n") == "unchanged"
+        assert path.stat().st_mtime_ns == before
+
+    def test_changed_content_keeps_mode(self, tmp_path) -> None:
+        path = tmp_path / "run.sh"
+        path.write_text("echo 1\n", encoding="utf-8")
+        path.chmod(0o755)
+        assert write_text_if_changed(path, "echo 2\n") == "written"
+        assert path.read_text(encoding="utf-8") == "echo 2\n"
+        assert path.stat().st_mode & 0o777 == 0o755
+        assert [item.name for item in tmp_path.iterdir()] == ["run.sh"]
+
+    def test_created_file_follows_umask(self, tmp_path) -> None:
+        previous = os.umask(0o027)
+        try:
+            assert write_text_if_changed(tmp_path / "new.py", "x = 1\n") == "created"
+            file_io.atomic_write_text(tmp_path / "other.json", "{}")
+        finally:
+            os.umask(previous)
+        assert (tmp_path / "new.py").stat().st_mode & 0o777 == 0o640
+        assert (tmp_path / "other.json").stat().st_mode & 0o777 == 0o640
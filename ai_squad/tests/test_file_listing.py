@@ -0,0 +1,176 @@
+"""
+Unit tests for ai_squad/tools/file_listing.py.
+
+Test Strategy:
+- A small project tree is built under pytest's tmp_path, including a
+  symlinked node_modules (as in hydrated worktrees) and nested .gitignore.
+- Pruning, gitignore semantics, depth/glob filters and cursor pagination
+  are validated against the yielded relative paths.
+- The git-index source is validated against a real `git init` repo and
+  must agree with the walker (same paths, same order, same cursors).
+"""
+
+import os
+import subprocess
+
+from tools.file_listing import (
+    GitFileIndex,
+    is_ignored,
+    list_files,
+    paginate,
+    parse_gitignore,
+    walk_files,
+)
+
+
+def _touch(path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x", encoding="utf-8")
+
+
+def _project(tmp_path):
+    root = tmp_path / "repo"
+    for rel in (
+        "app/main.py",
+        "app/models/user.py",
+        "app/models/user.pyc",
+        "app/generated/schema.py",
+        "app/generated/keep.py",
+        "docs/readme.md",
+        "dist/bundle.js",
+        ".venv/lib/site.py",
+        "app/__pycache__/main.cpython-313.pyc",
+        "z.txt",
+    ):
+        _touch(root / rel)
+    (root / ".gitignore").write_text("*.pyc\n/docs/\n", encoding="utf-8")
+    (root / "app" / "generated" / ".gitignore").write_text("*\n!keep.py\n", encoding="utf-8")
+    external = tmp_path / "shared_node_modules"
+    _touch(external / "react" / "index.js")
+    os.symlink(external, root / "node_modules")
+    return root
+
+
+class TestWalkFiles:
+    """Validate pruning and filters."""
+
+    def test_prunes_dependencies_symlinks_and_ignored(self, tmp_path) -> None:
+        root = _project(tmp_path)
+        assert list(walk_files(root)) == [
+            ".gitignore",
+            "app/generated/keep.py",
+            "app/main.py",
+            "app/models/user.py",
+            "z.txt",
+        ]
+
+    def test_start_directory_and_max_depth(self, tmp_path) -> None:
+        root = _project(tmp_path)
+        assert list(walk_files(root, root / "app", max_depth=1)) == ["app/main.py"]
+
+    def test_glob_patterns(self, tmp_path) -> None:
+        root = _project(tmp_path)
+        assert list(walk_files(root, patterns=["app/models/*.py", "*.txt"])) == [
+            "app/models/user.py",
+            "z.txt",
+        ]
+
+    def test_gitignore_can_be_disabled(self, tmp_path) -> None:
+        root = _project(tmp_path)
+        paths = list(walk_files(root, respect_gitignore=False))
+        assert "docs/readme.md" in paths
+        assert not any(path.startswith(("node_modules", ".venv", "dist")) for path in paths)
+
+
+class TestPagination:
+    """Validate cursor-based continuation."""
+
+    def test_pages_cover_everything_exactly_once(self, tmp_path) -> None:
+        root = _project(tmp_path)
+        expected = list(walk_files(root))
+        collected: list[str] = []
+        cursor = ""
+        while True:
+            page = paginate(walk_files(root, cursor=cursor), 2)
+            collected.extend(page.paths)
+            if not page.next_cursor:
+                break
+            cursor = page.next_cursor
+        assert collected == expected
+
+    def test_last_page_has_no_cursor(self, tmp_path) -> None:
+        root = _project(tmp_path)
+        page = paginate(walk_files(root), 100)
+        assert page.next_cursor == ""
+
+
+class TestGitignoreRules:
+    """Validate the gitignore subset used by the walker."""
+
+    def test_negation_and_dir_only(self) -> None:
+        rules = parse_gitignore("build/\n*.log\n!keep.log\n")
+        assert is_ignored(rules, "a/build", True)
+        assert not is_ignored(rules, "a/build", False)
+        assert is_ignored(rules, "x/debug.log", False)
+        assert not is_ignored(rules, "x/keep.log", False)
+
+    def test_anchored_and_double_star(self) -> None:
+        rules = parse_gitignore("/top.txt\nsrc/**/gen/\n")
+        assert is_ignored(rules, "top.txt", False)
+        assert not is_ignored(rules, "sub/top.txt", False)
+        assert is_ignored(rules, "src/gen", True)
+        assert is_ignored(rules, "src/a/b/gen", True)
+
+
+def _git(root, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.email=t@example.com", "-c", "user.name=t", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _git_project(tmp_path):
+    root = _project(tmp_path)
+    _git(root, "init", "-q")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "init")
+    return root
+
+
+class TestGitFileIndex:
+    """Validate the git ls-files snapshot."""
+
+    def test_matches_walker(self, tmp_path) -> None:
+        root = _git_project(tmp_path)
+        _touch(root / "app" / "new_untracked.py")
+        (root / "z.txt").unlink()
+        assert list(list_files(root, source="git")) == list(walk_files(root))
+        assert list(list_files(root, root / "app", max_depth=1, source="git")) == [
+            "app/main.py",
+            "app/new_untracked.py",
+        ]
+
+    def test_cursor_is_shared_with_walker(self, tmp_path) -> None:
+        root = _git_project(tmp_path)
+        page = paginate(walk_files(root), 2)
+        assert list(list_files(root, cursor=page.next_cursor, source="git")) == list(
+            walk_files(root, cursor=page.next_cursor)
+        )
+
+    def test_snapshot_is_reused_until_index_changes(self, tmp_path) -> None:
+        root = _git_project(tmp_path)
+        index = GitFileIndex(root, max_age_seconds=3600)
+        first = index.keys()
+        assert index.keys() is first
+
+        _touch(root / "app" / "staged.py")
+        assert index.keys() is first  # untracked file, index untouched
+        _git(root, "add", "app/staged.py")
+        assert ("app", "staged.py") in index.keys()
+
+    def test_not_a_repository_falls_back_to_walker(self, tmp_path) -> None:
+        root = _project(tmp_path)
+        assert GitFileIndex(root).keys() is None
+        assert list(list_files(root)) == list(walk_files(root))
@@ -0,0 +1,128 @@
+"""
+Unit tests for ai_squad/tools/file_patch.py.
+
+Test Strategy:
+- Patches are applied to inline strings; no filesystem access is needed.
+- Unified diffs: exact position, shifted position, fuzzy trailing whitespace,
+  missing final newline, CRLF files and stale hunks.
+- SEARCH/REPLACE: single and multiple blocks, not-found and ambiguous text.
+- changed_lines / removed_text / added_text feed the policy checks, so their
+  values are asserted directly.
+"""
+
+import pytest
+from tools.file_patch import (
+    PatchError,
+    apply_patch,
+    base_hash_matches,
+    content_hash,
+    file_content_hash,
+    detect_patch_format,
+    policy_line_window,
+)
+
+ORIGINAL = "".join(f"line {index}\n" for index in range(1, 21))
+
+DIFF = """--- a/app/x.py
++++ b/app/x.py
+@@ -3,3 +3,4 @@
+ line 3
+-line 4
++line four
++line 4.5
+ line 5
+@@ -18,3 +19,2 @@
+ line 18
+-line 19
+ line 20
+"""
+
+
+def _block(search: str, replace: str) -> str:
+    return f"<<<<<<< SEARCH\n{search}=======\n{replace}>>>>>>> REPLACE\n"
+
+
+class TestUnifiedDiff:
+    """Validate hunk application."""
+
+    def test_applies_hunks(self) -> None:
+        result = apply_patch(ORIGINAL, DIFF)
+        lines = result.content.splitlines()
+        assert lines[2:6] == ["line 3", "line four", "line 4.5", "line 5"]
+        assert "line 19" not in lines
+        assert result.hunks == 2
+        assert result.removed_text == "line 4\nline 19\n"
+        assert result.added_text == "line four\nline 4.5\n"
+        assert result.changed_lines == frozenset({4, 5, 20})
+
+    def test_shifted_file_matches_by_context(self) -> None:
+        result = apply_patch("header\nheader\n" + ORIGINAL, DIFF)
+        assert result.content.splitlines()[5] == "line four"
+
+    def test_trailing_whitespace_is_tolerated(self) -> None:
+        result = apply_patch("a  \nb\n", "@@ -1,2 +1,2 @@\n a\n-b\n+c\n")
+        assert result.content == "a  \nc\n"
+
+    def test_missing_final_newline_is_preserved(self) -> None:
+        assert apply_patch("a\nb", "@@ -2 +2 @@\n-b\n+c\n").content == "a\nc"
+        added = apply_patch("a\nb", "@@ -2 +2 @@\n-b\n\\ No newline at end of file\n+c\n")
+        assert added.content == "a\nc\n"
+
+    def test_crlf_file_keeps_line_endings(self) -> None:
+        result = apply_patch("a\r\nb\r\n", "@@ -1,2 +1,2 @@\n a\n-b\n+c\n")
+        assert result.content == "a\r\nc\r\n"
+
+    def test_triple_dash_line_inside_hunk_is_content(self) -> None:
+        result = apply_patch("a\n--- x\nb\n", "@@ -1,3 +1,2 @@\n a\n---- x\n b\n")
+        assert result.content == "a\nb\n"
+
+    def test_stale_hunk_is_rejected(self) -> None:
+        with pytest.raises(PatchError, match="hunk 1"):
+            apply_patch(ORIGINAL, "@@ -4,1 +4,1 @@\n-line forty\n+line 40\n")
+
+    def test_multi_file_diff_is_rejected(self) -> None:
+        patch = DIFF + "--- a/other.py\n+++ b/other.py\n@@ -1 +1 @@\n-x\n+y\n"
+        with pytest.raises(PatchError, match="several files"):
+            apply_patch(ORIGINAL, patch)
+
+
+class TestSearchReplace:
+    """Validate anchored SEARCH/REPLACE blocks."""
+
+    def test_blocks_apply_in_order(self) -> None:
+        patch = _block("line 7\nline 8\n", "line 7 ção\n") + _block("line 20\n", "line 21\n")
+        result = apply_patch(ORIGINAL, patch)
+        assert "line 7 ção\nline 9\n" in result.content
+        assert result.content.endswith("line 21\n")
+        assert result.hunks == 2
+        assert result.changed_lines == frozenset({7, 19})
+
+    def test_not_found_and_ambiguous(self) -> None:
+        with pytest.raises(PatchError, match="not found"):
+            apply_patch(ORIGINAL, _block("line 99\n", "x\n"))
+        with pytest.raises(PatchError, match="matches 2 places"):
+            apply_patch("x\ny\nx\n", _block("x\n", "z\n"))
+
+    def test_unknown_format(self) -> None:
+        with pytest.raises(PatchError):
+            detect_patch_format("just some text")
+
+
+class TestHashesAndWindows:
+    """Validate base-hash checks and policy windows."""
+
+    def test_base_hash_prefix(self, tmp_path) -> None:
+        digest = content_hash(ORIGINAL)
+        assert base_hash_matches(digest, ORIGINAL)
+        assert base_hash_matches(digest[:8].upper(), ORIGINAL)
+        assert not base_hash_matches(digest[:7], ORIGINAL)
+        assert not base_hash_matches(digest, ORIGINAL + "x")
+        # Reads hash the file bytes; writes hash the decoded text.
+        path = tmp_path / "user.py"
+        path.write_text(ORIGINAL, encoding="utf-8")
+        assert file_content_hash(path) == digest
+        path.write_text(ORIGINAL + "x", encoding="utf-8")
+        assert file_content_hash(path) == content_hash(ORIGINAL + "x")
+
+    def test_policy_window_is_clamped(self) -> None:
+        assert policy_line_window(frozenset({1, 10}), 11, 2) == {1, 2, 3, 8, 9, 10, 11}
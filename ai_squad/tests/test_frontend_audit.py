@@ -0,0 +1,149 @@
+"""
+Unit tests for ai_squad/tools/frontend_audit.py.
+
+Test Strategy:
+- A small auraxis-web-like git repo is built under pytest's tmp_path; the
+  result cache and the JSON report live next to it.
+- Full audits are validated through the report (files, rules, exit code)
+  and the cache through hit counts across runs and edits.
+- --changed is validated on a feature branch: only files changed since the
+  merge base with main (plus untracked ones) are audited.
+- The process pool must return the same results as the inline path.
+"""
+
+import json
+import subprocess
+
+from tools import frontend_audit
+from tools.frontend_audit import AuditCache, audit_paths, main, run_audit
+
+CLEAN_COMPONENT = """<template>
+  <Box>{{ title }}</Box>
+</template>
+<script setup lang="ts">
+/** Title shown in the card. */
+const title = (): string => "Olá"
+</script>
+"""
+
+DIRTY_COMPONENT = """<template>
+  <p>raw</p>
+</template>
+<style scoped>
+.card { padding: 12px; }
+</style>
+"""
+
+
+def _git(root, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.email=t@example.com", "-c", "user.name=t", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def _write(path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _repo(tmp_path):
+    root = tmp_path / "auraxis-web"
+    _write(root / "app" / "components" / "Card.vue", CLEAN_COMPONENT)
+    _write(root / "app" / "components" / "Legacy.vue", DIRTY_COMPONENT)
+    _write(root / "app" / "theme" / "tokens.ts", "export const space = { padding: 12px }\n")
+    _write(root / "README.md", "padding: 12px\n")
+    _git(root, "init", "-q", "-b", "main")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "init")
+    return root
+
+
+class TestFullAudit:
+    """Validate full-tree audits and the content-hash cache."""
+
+    def test_reports_violations_per_file(self, tmp_path) -> None:
+        root = _repo(tmp_path)
+        report = run_audit(root, "auraxis-web", cache_path=tmp_path / "cache.json", workers=1)
+        payload = report.to_dict()
+        assert payload["mode"] == "full"
+        assert payload["files_scanned"] == 3
+        assert payload["by_rule"] == {"raw_html": 1, "token": 1}
+        assert [entry["path"] for entry in payload["files"]] == ["app/components/Legacy.vue"]
+        assert payload["files"][0]["violations"][0] == {
+            "rule": "raw_html",
+            "line": 2,
+            "text": "<p>raw</p>",
+        }
+
+    def test_cache_hits_until_content_changes(self, tmp_path) -> None:
+        root = _repo(tmp_path)
+        cache_path = tmp_path / "cache.json"
+        assert run_audit(root, "auraxis-web", cache_path=cache_path).cache_hits == 0
+        assert run_audit(root, "auraxis-web", cache_path=cache_path).cache_hits == 3
+
+        _write(root / "app" / "components" / "Legacy.vue", CLEAN_COMPONENT)
+        report = run_audit(root, "auraxis-web", cache_path=cache_path)
+        assert report.cache_hits == 2
+        assert report.violations_total == 0
+
+    def test_stale_rules_drop_the_cache(self, tmp_path, monkeypatch) -> None:
+        root = _repo(tmp_path)
+        cache_path = tmp_path / "cache.json"
+        run_audit(root, "auraxis-web", cache_path=cache_path)
+        monkeypatch.setattr(frontend_audit, "rules_fingerprint", lambda: "other-rules")
+        assert run_audit(root, "auraxis-web", cache_path=cache_path).cache_hits == 0
+
+    def test_process_pool_matches_inline(self, tmp_path, monkeypatch) -> None:
+        root = _repo(tmp_path)
+        for index in range(12):
+            _write(root / "app" / "components" / f"Gen{index}.vue", DIRTY_COMPONENT)
+        paths = frontend_audit.frontend_source_paths(root)
+        monkeypatch.setattr(frontend_audit, "PARALLEL_MIN_FILES", 4)
+        pooled, _ = audit_paths(root, "auraxis-web", paths, AuditCache(None, "v"), workers=2)
+        inline, _ = audit_paths(root, "auraxis-web", paths, AuditCache(None, "v"), workers=1)
+        assert pooled == inline
+        assert len(pooled) == 15
+
+
+class TestChangedAudit:
+    """Validate --changed against the default branch."""
+
+    def test_only_changed_and_untracked_files(self, tmp_path) -> None:
+        root = _repo(tmp_path)
+        _git(root, "checkout", "-q", "-b", "feature")
+        _write(root / "app" / "components" / "Card.vue", CLEAN_COMPONENT + "<!-- edit -->\n")
+        _git(root, "commit", "-q", "-am", "edit card")
+        _write(root / "app" / "pages" / "New.vue", DIRTY_COMPONENT)
+
+        assert frontend_audit.default_branch(root) == "main"
+        report = run_audit(root, "auraxis-web", changed=True, cache_path=None)
+        assert report.base == "main"
+        assert [result.path for result in report.results] == [
+            "app/components/Card.vue",
+            "app/pages/New.vue",
+        ]
+        assert report.violations_total == 2
+
+
+class TestCli:
+    """Validate the command-line entry point."""
+
+    def test_writes_json_and_exit_code(self, tmp_path, capsys) -> None:
+        root = _repo(tmp_path)
+        output = tmp_path / "report.json"
+        argv = ["--repo", "auraxis-web", "--root", str(root), "--no-cache"]
+        assert main([*argv, "--output", str(output)]) == 1
+        assert json.loads(output.read_text(encoding="utf-8"))["violations_total"] == 2
+        assert "2 violations" in capsys.readouterr().out
+
+        _write(root / "app" / "components" / "Legacy.vue", CLEAN_COMPONENT)
+        assert main([*argv, "--output", "-"]) == 0
+        assert json.loads(capsys.readouterr().out)["violations_total"] == 0
+
+    def test_missing_root(self, tmp_path) -> None:
+        assert main(["--repo", "auraxis-app", "--root", str(tmp_path / "nope")]) == 2
@@ -0,0 +1,304 @@
+"""
+Unit tests for ai_squad/tools/frontend_policy.py.
+
+Test Strategy:
+- Policies are evaluated on inline strings; no filesystem access is needed.
+- Each rule (web-root path, TypeScript-only, raw HTML, return types, JSDoc,
+  tokens) is exercised through check_frontend_policy() and blocked_message().
+- A multi-pass reference (one loop per rule, one regex at a time, like the
+  former detectors) is the oracle for equivalence and the benchmark baseline.
+- jsdoc_preceded_lines() is compared with the former backwards walk on
+  every line of hand-written and generated comment layouts.
+- Benchmarks: 5k-line .vue and .tsx files must be scanned faster than the
+  multi-pass baseline and within an absolute time budget; a 10k-line
+  TypeScript file full of functions must stay linear and under budget.
+"""
+
+import random
+import re
+import time
+
+from tools.frontend_policy import (
+    APP_TOKEN_POLICY_PATTERNS,
+    MISSING_RETURN_TYPE_PATTERNS,
+    WEB_RAW_HTML_TAG_PATTERNS,
+    WEB_TOKEN_POLICY_PATTERNS,
+    check_frontend_policy,
+    jsdoc_preceded_lines,
+    is_frontend_source_path,
+    is_theme_or_token_file,
+)
+
+
+def _has_jsdoc_block(lines: list[str], line_index: int) -> bool:
+    """Former per-function check: walk back from the line to its comment."""
+    cursor = line_index - 1
+    while cursor >= 0 and not lines[cursor].strip():
+        cursor -= 1
+    if cursor < 0:
+        return False
+    if lines[cursor].strip().startswith("/**") and lines[cursor].strip().endswith("*/"):
+        return True
+    if not lines[cursor].strip().endswith("*/"):
+        return False
+    while cursor >= 0:
+        stripped = lines[cursor].strip()
+        if stripped.startswith("/**"):
+            return True
+        if stripped.startswith("/*") and not stripped.startswith("/**"):
+            return False
+        cursor -= 1
+    return False
+
+
+def _multi_pass(repo: str, path: str, content: str) -> list[tuple[str, int]]:
+    """Former detector shape: every rule re-splits and loops its own regexes."""
+    found: list[tuple[str, int]] = []
+    suffix = "." + path.rsplit(".", 1)[-1].lower()
+    theme = is_theme_or_token_file(path)
+    source = is_frontend_source_path(repo, path)
+    if source and repo == "auraxis-web" and suffix == ".vue":
+        patterns = [re.compile(pattern) for pattern in WEB_RAW_HTML_TAG_PATTERNS]
+        for line_no, raw in enumerate(content.splitlines(), start=1):
+            stripped = raw.strip()
+            if stripped and any(pattern.search(stripped) for pattern in patterns):
+                found.append(("raw_html", line_no))
+    if source and suffix in {".ts", ".tsx", ".vue"} and not theme:
+        returns = [re.compile(r"^\s*" + pattern) for pattern in MISSING_RETURN_TYPE_PATTERNS]
+        lines = content.splitlines()
+        for index, raw in enumerate(lines):
+            stripped = raw.strip()
+            if not stripped or stripped.startswith(("//", "*", "/*")):
+                continue
+            if any(pattern.match(stripped) for pattern in returns):
+                found.append(("missing_return_type", index + 1))
+                continue
+            signature = "function " in stripped or "=> {" in stripped or stripped.endswith("=>")
+            if signature and not _has_jsdoc_block(lines, index):
+                if re.search(r"\bfunction\b", stripped) or re.search(
+                    r"\bconst\s+[A-Za-z_]\w+\b", stripped
+                ):
+                    found.append(("missing_jsdoc", index + 1))
+    if not theme:
+        sources = WEB_TOKEN_POLICY_PATTERNS if repo == "auraxis-web" else APP_TOKEN_POLICY_PATTERNS
+        tokens = [re.compile(pattern) for pattern in sources]
+        for line_no, raw in enumerate(content.splitlines(), start=1):
+            line = raw.strip()
+            if not line or line.startswith(("//", "/*", "*")):
+                continue
+            if any(pattern.search(line) for pattern in tokens):
+                found.append(("token", line_no))
+    return found
+
+
+def _rules(repo: str, path: str, content: str) -> list[tuple[str, int]]:
+    report = check_frontend_policy(repo, path, content)
+    return [(item.rule, item.line) for item in report.violations if item.line]
+
+
+VUE_BLOCK = """<template>
+  <Box>
+    <p>raw paragraph</p>
+    <Button @click="save">Salvar</Button>
+  </Box>
+</template>
+<script setup lang="ts">
+/** Saves the form. */
+const save = (): void => {
+  emit("save")
+}
+function load() {
+  return 1
+}
+const handler = async (event: Event): Promise<void> => {
+  await submit(event)
+}
+</script>
+<style scoped>
+.card { padding: 12px; }
+/* color: #fff; */
+.title { color: var(--chakra-colors-gray-700); }
+</style>
+"""
+
+TSX_BLOCK = """/**
+ * Card header.
+ */
+export function Header(props: Props): JSX.Element {
+  return <View style={{ fontSize: 14, marginTop: theme.space.md }} />
+}
+export const useThing = (value: string) => {
+  return value
+}
+const styles = StyleSheet.create({
+  title: { color: theme.colors.primary, lineHeight: 20 },
+})
+// fontSize: 12
+"""
+
+
+class TestRules:
+    """Validate each rule and the combined BLOCKED message."""
+
+    def test_vue_rules_match_multi_pass(self) -> None:
+        rules = _rules("auraxis-web", "app/components/Form.vue", VUE_BLOCK)
+        assert rules == _multi_pass("auraxis-web", "app/components/Form.vue", VUE_BLOCK)
+        assert ("raw_html", 3) in rules
+        assert ("missing_return_type", 12) in rules
+        assert ("missing_jsdoc", 15) in rules
+        assert ("token", 20) in rules
+        assert ("token", 21) not in rules
+
+    def test_tsx_rules_match_multi_pass(self) -> None:
+        rules = _rules("auraxis-app", "src/components/Header.tsx", TSX_BLOCK)
+        assert rules == _multi_pass("auraxis-app", "src/components/Header.tsx", TSX_BLOCK)
+        assert rules == [
+            ("missing_return_type", 7),
+            ("token", 5),
+            ("token", 11),
+        ]
+
+    def test_blocked_message_lists_every_policy(self) -> None:
+        report = check_frontend_policy("auraxis-web", "components/Form.vue", VUE_BLOCK)
+        message = report.blocked_message() or ""
+        sections = message.split("\n\n")
+        assert sections[0].startswith("BLOCKED: auraxis-web source files must live under `app/`")
+        assert sections[1].startswith("BLOCKED: frontend language/component policy")
+        assert "- L3: raw HTML tag found (`<p>raw paragraph</p>`)" in sections[1]
+        assert sections[2].startswith("BLOCKED: front-end token policy violation detected.")
+        assert "- L20: .card { padding: 12px; }" in sections[2]
+
+    def test_javascript_files_skip_language_rules(self) -> None:
+        report = check_frontend_policy("auraxis-app", "src/a.js", "function a() {\n}\n")
+        assert [item.rule for item in report.violations] == ["typescript_only"]
+
+    def test_theme_files_and_other_repos_are_exempt(self) -> None:
+        content = "export const tokens = { fontSize: 14 }\n"
+        assert not check_frontend_policy("auraxis-app", "src/theme/tokens.ts", content).blocked
+        assert not check_frontend_policy("auraxis-api", "src/a.ts", content).blocked
+        assert check_frontend_policy("auraxis-app", "src/a.ts", content).blocked
+
+    def test_only_lines_limits_line_rules(self) -> None:
+        report = check_frontend_policy(
+            "auraxis-web", "app/components/Form.vue", VUE_BLOCK, only_lines={19, 20, 21}
+        )
+        assert [(item.rule, item.line) for item in report.violations] == [("token", 20)]
+
+
+class TestJsdocMap:
+    """The forward map must agree with the backwards walk on every line."""
+
+    def test_layouts(self) -> None:
+        lines = [
+            "/** one-liner */",
+            "function a(): void {}",
+            "/**",
+            " * block",
+            " */",
+            "",
+            "function b(): void {}",
+            "/* plain */",
+            "function c(): void {}",
+            "/*",
+            " * plain block",
+            " */",
+            "function d(): void {}",
+            "const x = 1 /* trailing */",
+            "function e(): void {}",
+            "// note",
+            "function f(): void {}",
+        ]
+        preceded = jsdoc_preceded_lines(lines)
+        assert preceded == [_has_jsdoc_block(lines, index) for index in range(len(lines))]
+        assert [preceded[index] for index in (1, 6, 8, 12, 14, 16)] == [
+            True,
+            True,
+            False,
+            False,
+            False,
+            False,
+        ]
+
+    def test_generated_layouts(self) -> None:
+        pieces = ("/**", "/*", " * text", " */", "/** x */", "/* y */", "", "a */", "code()")
+        rng = random.Random(7)
+        for _ in range(200):
+            lines = [rng.choice(pieces) for _ in range(30)]
+            expected = [_has_jsdoc_block(lines, index) for index in range(len(lines))]
+            assert jsdoc_preceded_lines(lines) == expected
+
+
+def _large_file(block: str, target_lines: int) -> str:
+    lines: list[str] = []
+    while len(lines) < target_lines:
+        lines.extend(block.splitlines())
+        filler = f"  const value{len(lines)}: number = compute({len(lines)})"
+        lines.extend(filler for _ in range(20))
+    return "\n".join(lines[:target_lines]) + "\n"
+
+
+def _best_of(runs: int, action) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+class TestPolicyBenchmark:
+    """One pass with a combined matcher beats one pass per rule."""
+
+    def _compare(self, repo: str, path: str, content: str) -> None:
+        assert _rules(repo, path, content) == _multi_pass(repo, path, content)
+        engine = _best_of(3, lambda: check_frontend_policy(repo, path, content))
+        baseline = _best_of(3, lambda: _multi_pass(repo, path, content))
+        assert engine < baseline
+        assert engine < 0.25
+
+    def test_vue_5k_lines(self) -> None:
+        content = _large_file(VUE_BLOCK, 5000)
+        self._compare("auraxis-web", "app/components/Form.vue", content)
+
+    def test_tsx_5k_lines(self) -> None:
+        content = _large_file(TSX_BLOCK, 5000)
+        self._compare("auraxis-app", "src/components/Header.tsx", content)
+
+
+def _typescript_functions(target_lines: int) -> str:
+    """Functions after trailing-comment lines, with long comment blocks.
+
+    A line ending in `*/` made the backwards walk scan up to the nearest
+    comment opener (or the top of the file) for every function.
+    """
+    lines: list[str] = []
+    number = 0
+    while len(lines) < target_lines:
+        number += 1
+        lines.append(f"const limit{number}: number = {number} /* upper bound */")
+        lines.append(f"export function run{number}(value: number): number {{")
+        lines.append("  return value")
+        lines.append("}")
+        if number % 10 == 0:
+            lines.append("/*")
+            lines.extend(f" * detail {index}" for index in range(40))
+            lines.append(" */")
+            lines.append(f"export const helper{number} = (): void => {{")
+            lines.append("}")
+    return "\n".join(lines[:target_lines]) + "\n"
+
+
+class TestJsdocBenchmark:
+    """JSDoc lookups must keep the language check linear."""
+
+    def test_10k_line_typescript_file(self) -> None:
+        path = "src/services/limits.ts"
+        small_content = _typescript_functions(2_500)
+        large_content = _typescript_functions(10_000)
+        report = check_frontend_policy("auraxis-app", path, large_content)
+        assert len(report.by_rule("missing_jsdoc")) > 1_000
+        small = _best_of(3, lambda: check_frontend_policy("auraxis-app", path, small_content))
+        large = _best_of(3, lambda: check_frontend_policy("auraxis-app", path, large_content))
+        # 4x the input; allow noise but reject quadratic growth (16x).
+        assert large < small * 8, f"2.5k={small:.4f}s 10k={large:.4f}s"
+        assert large < 0.25, f"10k-line file took {large:.3f}s"
@@ -0,0 +1,186 @@
+"""
+Unit tests for ai_squad/tools/ledger_segments.py.
+
+Test Strategy:
+- Each test roots a ledger layout under pytest's tmp_path.
+- Rotation is driven through JsonlAppender, as append_ledger_entry does.
+- Compaction is validated on disk: snapshot keeps latest-per-key, rotated
+  segments end up gzip-archived, and lookups prefer newer segments.
+- append_ledger_entry is pointed at tmp_path: malformed rotation settings
+  fall back to the defaults, and compaction runs in the background once
+  enough segments piled up.
+"""
+
+import gzip
+import json
+from datetime import UTC, datetime, timedelta
+
+from tools.file_io import JsonlAppender
+from tools.ledger_segments import (
+    LedgerLayout,
+    compact_ledger,
+    find_latest_entry,
+    rotate_active_segment,
+    should_rotate,
+)
+
+
+def _entry(task_id: str, status: str, **extra: object) -> dict:
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "repo": "auraxis-api",
+        "task_id": task_id,
+        "briefing_hash": "h1",
+        "status": status,
+        **extra,
+    }
+
+
+def _latest(layout: LedgerLayout, task_id: str) -> dict | None:
+    return find_latest_entry(layout, repo="auraxis-api", task_id=task_id, briefing_hash="h1")
+
+
+class TestRotation:
+    """Validate size/age based rotation."""
+
+    def test_rotates_by_size(self, tmp_path) -> None:
+        layout = LedgerLayout(tmp_path / "ledger.jsonl")
+        appender = JsonlAppender(layout.active)
+        appender.append(_entry("B9", "done", pad="x" * 200))
+        assert not should_rotate(layout, max_bytes=10_000, max_age_seconds=3600)
+        assert should_rotate(layout, max_bytes=100, max_age_seconds=3600)
+
+        rotated = rotate_active_segment(layout, appender)
+        assert rotated is not None and rotated.parent == layout.segment_dir
+        assert not layout.active.exists()
+
+        appender.append(_entry("B10", "done"))
+        appender.close()
+        assert len(layout.active.read_text(encoding="utf-8").splitlines()) == 1
+
+    def test_rotates_by_age(self, tmp_path) -> None:
+        layout = LedgerLayout(tmp_path / "ledger.jsonl")
+        old = (datetime.now(UTC) - timedelta(hours=2)).isoformat()
+        layout.active.write_text(json.dumps({"timestamp": old}) + "\n", encoding="utf-8")
+        assert should_rotate(layout, max_bytes=10_000_000, max_age_seconds=3600)
+        assert not should_rotate(layout, max_bytes=10_000_000, max_age_seconds=3 * 3600)
+
+    def test_other_writer_follows_rotation(self, tmp_path) -> None:
+        layout = LedgerLayout(tmp_path / "ledger.jsonl")
+        first = JsonlAppender(layout.active)
+        second = JsonlAppender(layout.active)
+        first.append(_entry("B1", "done"))
+        second.append(_entry("B2", "done"))
+        rotate_active_segment(layout, first)
+        second.append(_entry("B3", "done"))
+        first.close()
+        second.close()
+        assert [json.loads(line)["task_id"] for line in layout.active.read_text().splitlines()] == [
+            "B3"
+        ]
+
+
+class TestCompaction:
+    """Validate snapshot compaction, archival and lookups."""
+
+    def test_snapshot_keeps_latest_entry_per_key(self, tmp_path) -> None:
+        layout = LedgerLayout(tmp_path / "ledger.jsonl")
+        appender = JsonlAppender(layout.active)
+        appender.append(_entry("B9", "blocked"))
+        appender.append(_entry("B9", "done", commit_hashes=["abc"]))
+        appender.append(_entry("B10", "blocked"))
+        rotate_active_segment(layout, appender)
+        appender.close()
+
+        result = compact_ledger(layout)
+        assert (result.snapshot_entries, result.compacted_segments) == (2, 1)
+        snapshot = [json.loads(line) for line in layout.snapshot.read_text().splitlines()]
+        assert [(item["task_id"], item["status"]) for item in snapshot] == [
+            ("B9", "done"),
+            ("B10", "blocked"),
+        ]
+        assert layout.recent_segments() == []
+        archived = list(layout.archive_dir.glob("*.jsonl.gz"))
+        assert len(archived) == 1
+        with gzip.open(archived[0], "rt", encoding="utf-8") as handle:
+            assert len(handle.read().splitlines()) == 3
+
+    def test_lookup_prefers_recent_segments_over_snapshot(self, tmp_path) -> None:
+        layout = LedgerLayout(tmp_path / "ledger.jsonl")
+        appender = JsonlAppender(layout.active)
+        appender.append(_entry("B9", "blocked"))
+        appender.append(_entry("B10", "done"))
+        rotate_active_segment(layout, appender)
+        compact_ledger(layout)
+
+        appender.append(_entry("B9", "done"))
+        rotate_active_segment(layout, appender)
+        appender.append(_entry("B11", "running"))
+        appender.close()
+
+        assert _latest(layout, "B9")["status"] == "done"
+        assert _latest(layout, "B10")["status"] == "done"
+        assert _latest(layout, "B11")["status"] == "running"
+        assert _latest(layout, "B12") is None
+
+    def test_sources_are_chronological(self, tmp_path) -> None:
+        layout = LedgerLayout(tmp_path / "ledger.jsonl")
+        appender = JsonlAppender(layout.active)
+        appender.append(_entry("B9", "blocked"))
+        rotate_active_segment(layout, appender)
+        compact_ledger(layout)
+        appender.append(_entry("B9", "done"))
+        rotate_active_segment(layout, appender)
+        appender.append(_entry("B9", "skipped"))
+        appender.close()
+        sources = layout.sources()
+        assert sources[0] == layout.snapshot
+        assert sources[-1] == layout.active
+        assert len(sources) == 3
+
+
+class TestAppendLedgerEntry:
+    """Validate rotation and compaction as driven by task_status."""
+
+    def _ledger(self, tmp_path, monkeypatch):
+        from tools import task_status
+
+        layout = LedgerLayout(tmp_path / "ledger.jsonl")
+        monkeypatch.setattr(task_status, "TASK_STATUS_DIR", tmp_path)
+        monkeypatch.setattr(task_status, "LEDGER_FILE", layout.active)
+        monkeypatch.setattr(task_status, "LEDGER_LAYOUT", layout)
+        monkeypatch.setattr(task_status, "_LEDGER_APPENDER", None)
+        monkeypatch.setattr(task_status, "_LEDGER_COMPACTION", None)
+        monkeypatch.setenv("AURAXIS_LEDGER_BACKEND", "jsonl")
+        return task_status, layout
+
+    def test_malformed_limits_use_defaults(self, tmp_path, monkeypatch) -> None:
+        task_status, layout = self._ledger(tmp_path, monkeypatch)
+        monkeypatch.setenv("AURAXIS_LEDGER_SEGMENT_MAX_MB", "16MB")
+        monkeypatch.setenv("AURAXIS_LEDGER_SEGMENT_MAX_AGE_HOURS", "a week")
+        assert task_status._ledger_rotation_limits() == (16 * 1024 * 1024, 168 * 3600)
+        task_status.append_ledger_entry(_entry("B9", "done"))
+        task_status._LEDGER_APPENDER.close()
+        assert layout.recent_segments() == []
+
+    def test_compaction_waits_for_segments_and_runs_in_background(
+        self, tmp_path, monkeypatch
+    ) -> None:
+        task_status, layout = self._ledger(tmp_path, monkeypatch)
+        monkeypatch.setenv("AURAXIS_LEDGER_SEGMENT_MAX_MB", "0.001")  # every append rotates
+        monkeypatch.setenv("AURAXIS_LEDGER_COMPACT_SEGMENTS", "3")
+
+        task_status.append_ledger_entry(_entry("B9", "blocked", pad="x" * 1100))
+        task_status.append_ledger_entry(_entry("B10", "blocked", pad="x" * 1100))
+        assert len(layout.recent_segments()) == 2
+        assert task_status._LEDGER_COMPACTION is None
+
+        for status in ("running", "done", "merged"):
+            task_status.append_ledger_entry(_entry("B9", status, pad="x" * 1100))
+        task_status._wait_for_ledger_compaction()
+        task_status._LEDGER_APPENDER.close()
+
+        assert layout.snapshot.exists()
+        assert len(layout.recent_segments()) < 3
+        assert _latest(layout, "B9")["status"] == "merged"
+        assert _latest(layout, "B10")["status"] == "blocked"
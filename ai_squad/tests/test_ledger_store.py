@@ -0,0 +1,205 @@
+"""
+Unit tests for ai_squad/tools/ledger_store.py.
+
+Test Strategy:
+- Each test opens a store under pytest's tmp_path (no shared tasks_status/).
+- Lookups are validated against the JSONL semantics (latest matching entry).
+- The one-shot JSONL import and the JSONL export are validated on disk.
+- Concurrency is exercised with several writer threads on one store.
+- Constant-time lookups are asserted through SQLite's query plan.
+- A store marked stale (after a failed insert) is rebuilt from the JSONL
+  on its next access, from any process, using the sources that exist at
+  rebuild time (rotated segments, compaction snapshot, a new active file).
+- The one-shot import is raced by several processes opening a new store.
+"""
+
+import json
+import multiprocessing
+import sqlite3
+import threading
+
+from tools.file_io import JsonlAppender
+from tools.ledger_segments import LedgerLayout, compact_ledger, rotate_active_segment
+from tools.ledger_store import LedgerStore
+
+
+def _entry(task_id: str, status: str, timestamp: str, **extra: object) -> dict:
+    return {
+        "timestamp": timestamp,
+        "repo": "auraxis-api",
+        "task_id": task_id,
+        "briefing_hash": "h1",
+        "status": status,
+        **extra,
+    }
+
+
+def _open_and_count(db_path: str, jsonl_path: str, results) -> None:
+    from pathlib import Path
+
+    results.put(LedgerStore(Path(db_path), jsonl_paths=[Path(jsonl_path)]).count())
+
+
+class TestLedgerStore:
+    """Validate append/latest semantics."""
+
+    def test_latest_returns_most_recent_match(self, tmp_path) -> None:
+        store = LedgerStore(tmp_path / "ledger.sqlite3")
+        store.append(_entry("B9", "blocked", "2026-01-01T00:00:00+00:00"))
+        store.append(_entry("B9", "done", "2026-01-02T00:00:00+00:00", commit_hashes=["abc"]))
+        store.append(_entry("B10", "blocked", "2026-01-03T00:00:00+00:00"))
+        latest = store.latest(repo="auraxis-api", task_id="B9", briefing_hash="h1")
+        assert latest is not None
+        assert latest["status"] == "done"
+        assert latest["commit_hashes"] == ["abc"]
+
+    def test_unknown_key_returns_none(self, tmp_path) -> None:
+        store = LedgerStore(tmp_path / "ledger.sqlite3")
+        store.append(_entry("B9", "done", "2026-01-01T00:00:00+00:00"))
+        assert store.latest(repo="auraxis-api", task_id="B9", briefing_hash="h2") is None
+
+    def test_lookup_uses_index(self, tmp_path) -> None:
+        store = LedgerStore(tmp_path / "ledger.sqlite3")
+        assert "idx_ledger_lookup" in store.lookup_plan()
+
+    def test_wal_mode_and_concurrent_writers(self, tmp_path) -> None:
+        store = LedgerStore(tmp_path / "ledger.sqlite3")
+
+        def writer(worker: int) -> None:
+            for index in range(50):
+                store.append(_entry(f"B{worker}", "done", f"2026-01-01T00:00:{index:02d}"))
+            store.close()
+
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert store.count() == 150
+        mode = store._connection().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+
+class TestJsonlCompatibility:
+    """Validate the one-shot importer and the JSONL export."""
+
+    def test_existing_jsonl_is_imported_once(self, tmp_path) -> None:
+        jsonl = tmp_path / "ledger.jsonl"
+        lines = [
+            json.dumps(_entry("B9", "blocked", "2026-01-01T00:00:00+00:00")),
+            "not json",
+            json.dumps(_entry("B9", "done", "2026-01-02T00:00:00+00:00")),
+        ]
+        jsonl.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        store = LedgerStore(tmp_path / "ledger.sqlite3", jsonl_paths=[jsonl])
+        assert store.count() == 2
+        assert store.latest(repo="auraxis-api", task_id="B9", briefing_hash="h1")["status"] == "done"
+        store.close()
+
+        reopened = LedgerStore(tmp_path / "ledger.sqlite3", jsonl_paths=[jsonl])
+        assert reopened.count() == 2
+
+    def test_concurrent_first_opens_import_once(self, tmp_path) -> None:
+        jsonl = tmp_path / "ledger.jsonl"
+        entries = [_entry(f"B{index}", "done", "2026-01-01T00:00:00+00:00") for index in range(500)]
+        jsonl.write_text("".join(json.dumps(entry) + "\n" for entry in entries), encoding="utf-8")
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=_open_and_count,
+                args=(str(tmp_path / "ledger.sqlite3"), str(jsonl), results),
+            )
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        counts = [results.get(timeout=60) for _ in workers]
+        for worker in workers:
+            worker.join()
+        assert counts == [500] * 4
+
+    def test_export_round_trip(self, tmp_path) -> None:
+        store = LedgerStore(tmp_path / "ledger.sqlite3")
+        entries = [
+            _entry("B9", "blocked", "2026-01-01T00:00:00+00:00"),
+            _entry("B9", "done", "2026-01-02T00:00:00+00:00"),
+        ]
+        for entry in entries:
+            store.append(entry)
+        exported = tmp_path / "export.jsonl"
+        assert store.export_jsonl(exported) == 2
+        parsed = [json.loads(line) for line in exported.read_text(encoding="utf-8").splitlines()]
+        assert parsed == entries
+
+
+class TestStaleStore:
+    """A store that missed an entry is rebuilt from the JSONL."""
+
+    def test_stale_store_is_rebuilt_on_next_access(self, tmp_path) -> None:
+        jsonl = tmp_path / "ledger.jsonl"
+        first = _entry("B9", "blocked", "2026-01-01T00:00:00+00:00")
+        jsonl.write_text(json.dumps(first) + "\n", encoding="utf-8")
+        store = LedgerStore(tmp_path / "ledger.sqlite3", jsonl_paths=[jsonl])
+        assert store.count() == 1
+
+        # The SQLite insert failed, but the JSONL append went through.
+        missed = _entry("B9", "done", "2026-01-02T00:00:00+00:00")
+        with jsonl.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(missed) + "\n")
+        store.mark_stale("append failed: disk I/O error")
+        assert store.stale_marker.exists()
+
+        other_process = LedgerStore(tmp_path / "ledger.sqlite3", jsonl_paths=[jsonl])
+        latest = other_process.latest(repo="auraxis-api", task_id="B9", briefing_hash="h1")
+        assert latest == missed
+        assert not store.stale_marker.exists()
+        assert store.count() == 2
+
+    def test_rebuild_reads_sources_created_after_open(self, tmp_path) -> None:
+        layout = LedgerLayout(tmp_path / "ledger.jsonl")
+        # The active file does not exist yet when the store is built.
+        store = LedgerStore(tmp_path / "ledger.sqlite3", jsonl_paths=layout.sources)
+        assert store.count() == 0
+
+        appender = JsonlAppender(layout.active)
+        entries = [
+            _entry(f"B{index % 3}", f"s{index}", f"2026-01-01T00:00:{index:02d}+00:00")
+            for index in range(9)
+        ]
+        for index, entry in enumerate(entries):
+            appender.append(entry)
+            if index in (2, 5):
+                assert rotate_active_segment(layout, appender) is not None
+        appender.close()
+        store.mark_stale("append failed: disk I/O error")
+
+        assert store.count() == 9
+        exported = tmp_path / "export.jsonl"
+        store.export_jsonl(exported)
+        rows = [json.loads(line) for line in exported.read_text(encoding="utf-8").splitlines()]
+        assert rows == entries
+
+        # After compaction the snapshot keeps the latest entry per key.
+        compact_ledger(layout)
+        store.mark_stale("lookup failed: database is locked")
+        for task_id, status in (("B0", "s6"), ("B1", "s7"), ("B2", "s8")):
+            latest = store.latest(repo="auraxis-api", task_id=task_id, briefing_hash="h1")
+            assert latest is not None and latest["status"] == status
+
+    def test_task_status_marks_store_stale_on_error(self, tmp_path, monkeypatch) -> None:
+        from tools import task_status
+        from tools.tool_security import get_tool_audit_counters
+
+        store = LedgerStore(tmp_path / "ledger.sqlite3")
+        logged: list[tuple] = []
+        monkeypatch.setattr(task_status, "_LEDGER_STORE", store)
+        monkeypatch.setattr(
+            task_status, "audit_log", lambda *args, **kwargs: logged.append((args, kwargs))
+        )
+        before = get_tool_audit_counters().get("ledger_store.append_error", 0)
+        task_status._ledger_store_failed("append", sqlite3.OperationalError("disk I/O error"))
+        assert store.stale_marker.read_text(encoding="utf-8").endswith(
+            "append failed: disk I/O error\n"
+        )
+        assert get_tool_audit_counters()["ledger_store.append_error"] == before + 1
+        assert logged[0][1] == {"status": "ERROR"}
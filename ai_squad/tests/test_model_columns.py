@@ -0,0 +1,160 @@
+"""
+Unit tests for ai_squad/tools/model_columns.py.
+
+Test Strategy:
+- extract_models() is checked on the declarations the former line matcher
+  got wrong: multi-line db.Column calls, mapped_column with Mapped[...]
+  annotations, explicit column names, relationships and `=` inside
+  non-column lines.
+- Tables come from __tablename__ or the snake_case default; non-model
+  classes and __abstract__ bases are ignored, but their columns are merged
+  into the concrete models deriving from them.
+- ModelColumnCache is observed through "hit"/"miss" events: identical
+  content is parsed once, edits are re-parsed.
+- Benchmark: 200 model files are checked cold, then again from the cache
+  within a small time budget.
+"""
+
+import time
+
+from tools.model_columns import ModelColumnCache, default_table_name, extract_models
+
+MODELS = '''
+from app.extensions import db
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class TimestampMixin:
+    created_at = db.Column(db.DateTime)
+
+
+class User(db.Model, TimestampMixin):
+    __tablename__ = "users"
+
+    id = db.Column(db.Integer, primary_key=True)
+    email = db.Column(
+        db.String(255),
+        nullable=False,
+    )
+    display = db.Column("display_name", db.String(80))
+    locale: Mapped[str] = mapped_column(String(8), default="pt-BR")
+    wallets = db.relationship("Wallet", backref="owner")
+    LIMIT = 10  # not a column: note the "=" and db.Column( below
+    # retired = db.Column(db.Boolean)
+
+
+class InvestorProfile(User):
+    quiz_score = db.Column(db.Integer, name="profile_quiz_score")
+
+
+class Helper:
+    value = 1
+'''
+
+
+class TestExtractModels:
+    """Validate AST extraction of tables and columns."""
+
+    def test_columns_and_tables(self) -> None:
+        models = extract_models(MODELS)
+        assert models is not None
+        assert [(model.class_name, model.table) for model in models] == [
+            ("User", "users"),
+            ("InvestorProfile", "investor_profile"),
+        ]
+        user = models[0]
+        assert [(column.attribute, column.name) for column in user.columns] == [
+            ("id", "id"),
+            ("email", "email"),
+            ("display", "display_name"),
+            ("locale", "locale"),
+            ("created_at", "created_at"),
+        ]
+        assert models[1].column_names == ("profile_quiz_score",)
+
+    def test_declarative_base(self) -> None:
+        source = (
+            "class Base(DeclarativeBase):\n    pass\n\n"
+            "class Entry(Base):\n"
+            '    __tablename__ = "entries"\n'
+            "    id: Mapped[int] = orm.mapped_column(primary_key=True)\n"
+        )
+        models = extract_models(source)
+        assert models is not None
+        assert [(model.table, model.column_names) for model in models] == [("entries", ("id",))]
+        assert extract_models("class Broken(:\n") is None
+
+    def test_abstract_bases_and_mixins(self) -> None:
+        source = (
+            "class TimestampMixin:\n"
+            "    created_at = db.Column(db.DateTime)\n"
+            "    updated_at = db.Column(db.DateTime)\n\n"
+            "class SoftDeleteMixin:\n"
+            "    deleted_at = db.Column(db.DateTime)\n"
+            "    updated_at = db.Column('modified_at', db.DateTime)\n\n"
+            "class BaseModel(db.Model):\n"
+            "    __abstract__ = True\n"
+            "    id = db.Column(db.Integer, primary_key=True)\n\n"
+            "class AuditedModel(BaseModel, SoftDeleteMixin):\n"
+            "    __abstract__ = True\n\n"
+            "class User(BaseModel, TimestampMixin):\n"
+            '    __tablename__ = "users"\n'
+            "    email = db.Column(db.String(255))\n\n"
+            "class Wallet(AuditedModel, TimestampMixin):\n"
+            "    id = db.Column('wallet_id', db.Integer, primary_key=True)\n"
+        )
+        models = extract_models(source)
+        assert models is not None
+        assert [(model.table, model.column_names) for model in models] == [
+            ("users", ("email", "id", "created_at", "updated_at")),
+            ("wallet", ("wallet_id", "deleted_at", "modified_at", "created_at")),
+        ]
+
+    def test_default_table_name(self) -> None:
+        assert default_table_name("User") == "user"
+        assert default_table_name("UserProfile") == "user_profile"
+        assert default_table_name("HTTPSession") == "http_session"
+
+
+class TestModelColumnCache:
+    """Validate content-hash caching."""
+
+    def test_hits_until_content_changes(self, tmp_path) -> None:
+        events: list[str] = []
+        cache = ModelColumnCache(on_event=events.append)
+        first = tmp_path / "user.py"
+        copy = tmp_path / "user_copy.py"
+        first.write_text(MODELS, encoding="utf-8")
+        copy.write_text(MODELS, encoding="utf-8")
+
+        assert cache.models(first) == cache.models(copy)
+        assert events == ["miss", "hit"]
+
+        wallet = "\n\nclass Wallet(db.Model):\n    id = db.Column(db.Integer)\n"
+        first.write_text(MODELS + wallet, encoding="utf-8")
+        models = cache.models(first)
+        assert events[-1] == "miss"
+        assert models is not None and models[-1].table == "wallet"
+
+
+class TestModelColumnsBenchmark:
+    """Checking many models is cheap once parsed."""
+
+    def test_200_model_files(self, tmp_path) -> None:
+        paths = []
+        for index in range(200):
+            path = tmp_path / f"model_{index}.py"
+            path.write_text(MODELS.replace("users", f"users_{index}"), encoding="utf-8")
+            paths.append(path)
+        cache = ModelColumnCache()
+
+        started = time.perf_counter()
+        cold = [cache.models(path) for path in paths]
+        cold_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        warm = [cache.models(path) for path in paths]
+        warm_elapsed = time.perf_counter() - started
+        assert warm == cold
+        assert warm_elapsed < cold_elapsed, f"cold={cold_elapsed:.4f}s warm={warm_elapsed:.4f}s"
+        assert warm_elapsed < 0.1, f"200 cached lookups took {warm_elapsed:.4f}s"
@@ -0,0 +1,97 @@
+"""
+Unit tests for the CrewAI tools in ai_squad/tools/project_tools.py.
+
+Test Strategy:
+- The module imports CrewAI, so the tests are skipped where it is not
+  installed.
+- PROJECT_ROOT is pointed at pytest's tmp_path and listing uses the
+  filesystem walk (no git repo); audit_log is stubbed so runs never touch
+  ai_squad/logs/.
+- read_project_files is validated on glob expansion, project-root escapes,
+  the total byte budget with its NOT READ footer, missing paths and the
+  order of the sections.
+- read_tasks_section must answer a non-numeric page with a usage message
+  instead of raising.
+"""
+
+import re
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from tools import project_tools  # noqa: E402
+from tools.project_tools import ReadProjectFilesTool, ReadTasksSectionTool  # noqa: E402
+
+_SECTION_RE = re.compile(r"^=== FILE: (.+) ===$", re.MULTILINE)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    root = tmp_path.resolve()
+    monkeypatch.setattr(project_tools, "PROJECT_ROOT", root)
+    monkeypatch.setattr(project_tools, "audit_log", lambda *args, **kwargs: None)
+    monkeypatch.setenv("AURAXIS_FILE_LISTING_SOURCE", "walk")
+    for rel_path, text in {
+        "app/models/user.py": "class User:\n    email = 'ção'\n",
+        "app/models/wallet.py": "class Wallet:\n    pass\n",
+        "app/models/README.md": "# models\n",
+        "app/schemas/user_schema.py": "class UserSchema:\n    pass\n",
+    }.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return root
+
+
+def _sections(output: str) -> list[str]:
+    return _SECTION_RE.findall(output)
+
+
+class TestReadProjectFiles:
+    """Validate batched reads."""
+
+    def test_sections_follow_request_order(self, project) -> None:
+        output = ReadProjectFilesTool()._run(
+            '["app/schemas/user_schema.py", "app/models/user.py"]'
+        )
+        assert _sections(output) == ["app/schemas/user_schema.py", "app/models/user.py"]
+        assert "class User:\n    email = 'ção'\n--- read_project_file: CONTENT_HASH: " in output
+        assert "=== END (2 files," in output
+
+    def test_globs_expand_and_deduplicate(self, project) -> None:
+        output = ReadProjectFilesTool()._run("app/models/*.py, app/models/user.py")
+        assert _sections(output) == ["app/models/user.py", "app/models/wallet.py"]
+        assert "=== END (2 files," in output
+
+    def test_escape_is_blocked(self, project) -> None:
+        output = ReadProjectFilesTool()._run("app/models/user.py\n../outside.py")
+        assert output == "BLOCKED: '../outside.py' escape project root."
+
+    def test_missing_paths_are_reported(self, project) -> None:
+        output = ReadProjectFilesTool()._run("app/models/nope.py, app/models, app/none/*.py")
+        assert _sections(output) == ["app/models/nope.py", "app/models", "app/none/*.py"]
+        assert "FILE_NOT_FOUND: 'app/models/nope.py' does not exist yet." in output
+        assert "NOT_A_FILE: 'app/models' is a directory." in output
+        assert ReadProjectFilesTool()._run(" , ") == "Error: no paths given."
+
+    def test_budget_lists_files_not_read(self, project) -> None:
+        for name in ("a", "b", "c"):
+            (project / "app" / f"{name}.py").write_text("x = 1\n" * 100, encoding="utf-8")
+        output = ReadProjectFilesTool()._run("app/a.py, app/b.py, app/c.py", max_bytes=1500)
+        assert _sections(output) == ["app/a.py", "app/b.py"]
+        assert output.endswith(
+            "NOT READ (budget/file limit): app/c.py — request them in another call."
+        )
+
+
+class TestReadTasksSection:
+    """Validate section paging arguments."""
+
+    def test_non_numeric_page_returns_usage(self, project) -> None:
+        (project / "TASKS.md").write_text("# Tasks\n\n## Ciclo B\n\n- B1 login\n", encoding="utf-8")
+        tool = ReadTasksSectionTool()
+        for page in ("2/5", "next"):
+            output = tool._run("Ciclo B", page=page)
+            assert output.startswith("Error: page must be a whole number (1..1)")
+        assert "(lines 3-5, page 1/1)" in tool._run("Ciclo B", page="1")
@@ -0,0 +1,81 @@
+"""
+Unit tests for ai_squad/tools/python_outline.py.
+
+Test Strategy:
+- Outlines are built from inline model-like sources (no target repo needed).
+- Validate classes, db.Column fields, signatures and line spans.
+- Validate the content-hash cache and SyntaxError propagation.
+"""
+
+import pytest
+from tools import python_outline
+from tools.python_outline import build_outline, outline_python
+
+MODEL_SOURCE = '''"""User model."""
+from app.extensions.database import db
+
+
+class User(db.Model):
+    __tablename__ = "users"
+
+    id = db.Column(db.Integer, primary_key=True)
+    email: str = db.Column(db.String(255), unique=True, nullable=False)
+    wallets = db.relationship("Wallet", back_populates="user")
+
+    @property
+    def display_name(self) -> str:
+        return self.email.split("@")[0]
+
+    async def refresh(self, *, force: bool = False) -> None:
+        pass
+
+
+def build_user(email: str) -> User:
+    return User(email=email)
+'''
+
+
+class TestBuildOutline:
+    """Validate the rendered outline."""
+
+    def test_model_outline(self) -> None:
+        outline = build_outline(MODEL_SOURCE, label="app/models/user.py")
+        lines = outline.splitlines()
+        assert lines[0] == "# outline: app/models/user.py (21 lines)"
+        assert '"""User model."""' in lines
+        assert "class User(db.Model)  [L5-17]" in lines
+        assert "    id = db.Column(db.Integer, primary_key=True)  [L8]" in lines
+        assert any(line.startswith("    email = db.Column(db.String(255)") for line in lines)
+        assert "    wallets = db.relationship('Wallet', back_populates='user')  [L10]" in lines
+        assert "    @property" in lines
+        assert "    def display_name(self) -> str  [L13-14]" in lines
+        assert "    async def refresh(self, *, force: bool=False) -> None  [L16-17]" in lines
+        assert "def build_user(email: str) -> User  [L20-21]" in lines
+
+    def test_outline_omits_bodies(self) -> None:
+        outline = build_outline(MODEL_SOURCE)
+        assert "split(" not in outline
+        assert len(outline) < len(MODEL_SOURCE) * 1.5
+
+    def test_syntax_error_propagates(self) -> None:
+        with pytest.raises(SyntaxError):
+            build_outline("def broken(:\n")
+
+
+class TestOutlineCache:
+    """Validate memoization by content hash."""
+
+    def test_same_content_is_parsed_once(self, monkeypatch) -> None:
+        calls: list[str] = []
+        original = python_outline.build_outline
+
+        def counting(source: str, *, label: str = "") -> str:
+            calls.append(label)
+            return original(source, label=label)
+
+        monkeypatch.setattr(python_outline, "build_outline", counting)
+        data = (MODEL_SOURCE + "\n# cache-test\n").encode()
+        first = outline_python(data, label="a.py")
+        assert outline_python(data, label="a.py") == first
+        outline_python(data + b"X = 1\n", label="a.py")
+        assert calls == ["a.py", "a.py"]
@@ -0,0 +1,158 @@
+"""
+Unit tests for ai_squad/tools/status_journal.py.
+
+Test Strategy:
+- Journals live under pytest's tmp_path.
+- Details must be stored out-of-line (gzip, content-addressed).
+- Retention must cap the journal and garbage-collect unreferenced blobs,
+  except recent ones that a concurrent append may still reference.
+- Concurrent processes appending past the cap must not lose records: each
+  writer's surviving records form a gap-free suffix of what it wrote.
+- The markdown view must only render the last N records, truncated, and only
+  when it is read after the journal changed (never on append).
+"""
+
+import multiprocessing
+import os
+from dataclasses import replace
+
+from tools.status_journal import StatusJournal, StatusRecord
+
+
+def _record(index: int) -> StatusRecord:
+    return StatusRecord(
+        timestamp=f"2026-01-01T00:00:{index:02d}+00:00",
+        repo="auraxis-api",
+        task_id="B9",
+        phase=f"phase-{index}",
+        status="running",
+        notify_manager=True,
+        notify_parallel_agents=False,
+        implemented="Workflow step.",
+        next_task_suggestion="B10",
+    )
+
+
+def _append_from_process(status_dir: str, worker: int, count: int) -> None:
+    from pathlib import Path
+
+    journal = StatusJournal(Path(status_dir), "B9")
+    for index in range(count):
+        journal.append(
+            replace(_record(index), phase=f"w{worker}-{index}"),
+            f"details {worker}-{index}",
+            max_records=40,
+        )
+
+
+class TestStatusJournal:
+    """Validate storage, retention and rendering."""
+
+    def test_details_are_stored_out_of_line(self, tmp_path) -> None:
+        journal = StatusJournal(tmp_path, "b9")
+        stored = journal.append(_record(1), "trace " * 10_000, max_records=10)
+        assert stored.details_bytes == len(("trace " * 10_000).strip())
+        assert journal.journal_path.stat().st_size < 1_000
+        assert journal.load_details(journal.records()[0]).startswith("trace trace")
+
+    def test_identical_details_share_one_blob(self, tmp_path) -> None:
+        journal = StatusJournal(tmp_path, "B9")
+        journal.append(_record(1), "same failure", max_records=10)
+        journal.append(_record(2), "same failure", max_records=10)
+        assert len(list(journal.details_dir.iterdir())) == 1
+
+    def test_retention_caps_records_and_blobs(self, tmp_path) -> None:
+        journal = StatusJournal(tmp_path, "B9", blob_grace_seconds=0)
+        for index in range(8):
+            journal.append(_record(index), f"details {index}", max_records=3)
+        phases = [record.phase for record in journal.records()]
+        assert phases == ["phase-5", "phase-6", "phase-7"]
+        assert len(list(journal.details_dir.glob("*.txt.gz"))) == 3
+
+    def test_recent_unreferenced_blobs_survive_retention(self, tmp_path) -> None:
+        journal = StatusJournal(tmp_path, "B9")
+        for index in range(8):
+            journal.append(_record(index), f"details {index}", max_records=3)
+        assert len(journal.records()) == 3
+        assert len(list(journal.details_dir.glob("*.txt.gz"))) == 8
+
+    def test_concurrent_appends_survive_trimming(self, tmp_path) -> None:
+        workers = [
+            multiprocessing.Process(target=_append_from_process, args=(str(tmp_path), w, 30))
+            for w in range(4)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        journal = StatusJournal(tmp_path, "B9")
+        records = journal.records()
+        assert len(records) == 40
+        by_worker: dict[str, list[int]] = {}
+        for record in records:
+            worker, index = record.phase.split("-")
+            by_worker.setdefault(worker, []).append(int(index))
+        for indexes in by_worker.values():
+            assert indexes == list(range(30 - len(indexes), 30))
+        for record in records:
+            assert journal.load_details(record) == record.phase.replace("w", "details ", 1)
+
+    def test_view_renders_last_records_truncated(self, tmp_path) -> None:
+        journal = StatusJournal(tmp_path, "B9")
+        for index in range(5):
+            journal.append(_record(index), "x" * 500, max_records=10)
+        path = journal.write_view(last=2, details_chars=100)
+        text = path.read_text(encoding="utf-8")
+        assert path.name == "B9.md"
+        assert text.count("## 2026-01-01") == 2
+        assert "- phase: `phase-4`" in text
+        assert "- phase: `phase-2`" not in text
+        assert "truncated 500 bytes" in text
+
+    def test_view_renders_on_read_only_when_stale(self, tmp_path, monkeypatch) -> None:
+        journal = StatusJournal(tmp_path, "B9")
+        renders: list[int] = []
+        render = journal.render_markdown
+        monkeypatch.setattr(
+            journal,
+            "render_markdown",
+            lambda **kwargs: renders.append(1) or render(**kwargs),
+        )
+
+        def append(index: int) -> None:
+            journal.append(_record(index), "", max_records=10)
+            # Backdate the journal so the render below is not in its clock tick.
+            stamp = journal.journal_path.stat().st_mtime_ns - 10**9 * (10 - index)
+            os.utime(journal.journal_path, ns=(stamp, stamp))
+
+        append(1)
+        append(2)
+        assert not journal.view_path.exists()
+        assert renders == []
+
+        journal.ensure_view(last=5, details_chars=100)
+        journal.ensure_view(last=5, details_chars=100)
+        assert len(renders) == 1
+        assert journal.view_is_current()
+
+        append(3)
+        assert not journal.view_is_current()
+        path = journal.ensure_view(last=5, details_chars=100)
+        assert len(renders) == 2
+        assert "- phase: `phase-3`" in path.read_text(encoding="utf-8")
+
+    def test_view_rendered_in_the_journal_tick_stays_stale(self, tmp_path) -> None:
+        journal = StatusJournal(tmp_path, "B9")
+        journal.append(_record(1), "", max_records=10)
+        future = journal.journal_path.stat().st_mtime_ns + 10**12
+        os.utime(journal.journal_path, ns=(future, future))
+        journal.ensure_view(last=5, details_chars=100)
+        assert not journal.view_is_current()
+
+    def test_legacy_markdown_is_preserved(self, tmp_path) -> None:
+        (tmp_path / "B9.md").write_text("## old run\n", encoding="utf-8")
+        journal = StatusJournal(tmp_path, "B9")
+        journal.append(_record(1), "", max_records=10)
+        assert (tmp_path / "B9.legacy.md").read_text(encoding="utf-8") == "## old run\n"
@@ -0,0 +1,353 @@
+"""
+Unit tests for ai_squad/tools/task_board.py.
+
+Test Strategy:
+- Boards are written to pytest's tmp_path (no dependency on a target repo).
+- Parsing is validated for both board formats (table and checklist),
+  including status cells with trailing notes ("Blocked (waiting API)").
+- Cache behavior is validated through load_task_board() identity checks.
+- Batch status updates are validated on disk (single write, header date,
+  all-or-nothing on unknown IDs, file mode preserved).
+- The benchmark asserts linear scaling of the single-pass scanner on a
+  synthetic 50k-line board (ratio-based, so it is stable across machines).
+"""
+
+import os
+import stat
+import time
+from datetime import date
+
+import pytest
+from tools.task_board import (
+    TaskStatusUpdate,
+    apply_task_status_updates,
+    invalidate_task_board,
+    load_task_board,
+    parse_task_board,
+    render_pending_view,
+)
+
+TABLE_BOARD = """# TASKS
+
+Ultima atualizacao: 2026-01-01
+
+## Pendencias de execucao imediata
+
+1. Finalizar B9
+2. Revisar B10
+
+## Ciclo B
+
+| ID | Area | Tarefa | Status | Progresso | Risco | Commit | Data |
+|---|---|---|---|---|---|---|---|
+| B8 | Auth | Login | Done | 100% | Low | abc1234 | 2026-01-01 |
+| B9 | Perfil | Perfil investidor | Todo | 0% | Low | - | - |
+| B10 | Perfil | Quiz | In Progress | 40% | Med | - | - |
+"""
+
+CHECKLIST_BOARD = """# tasks
+
+## Web
+
+- [x] **WEB1** Setup
+- [ ] **WEB2** Login page
+- [~] **WEB3** Auth guard
+- [!] **WEB4** Blocked item
+"""
+
+
+class TestParseTaskBoard:
+    """Validate the parsed board model."""
+
+    def test_table_rows_are_indexed_by_task_id(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        row = board.find_row("B9")
+        assert row is not None
+        assert row.status == "todo"
+        assert board.lines[row.line_index].startswith("| B9 |")
+        assert len(row.cells) == 8
+
+    def test_header_and_separator_rows_are_not_tasks(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        assert [row.task_id for row in board.rows if row.task_id] == ["B8", "B9", "B10"]
+
+    def test_in_progress_wins_over_todo(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        assert board.next_task_id == "B10"
+
+    def test_checklist_items_and_next_task(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "tasks.md", CHECKLIST_BOARD)
+        markers = {item.task_id: item.marker for item in board.checklist}
+        assert markers == {"WEB1": "x", "WEB2": " ", "WEB3": "~", "WEB4": "!"}
+        assert board.next_task_id == "WEB3"
+
+    def test_pending_block_stops_after_ordered_list(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        assert board.pending_block == (
+            "## Pendencias de execucao imediata",
+            "",
+            "1. Finalizar B9",
+            "2. Revisar B10",
+        )
+
+    def test_sections_cover_nested_headings(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        titles = [(section.title, section.level) for section in board.sections]
+        assert titles == [
+            ("TASKS", 1),
+            ("Pendencias de execucao imediata", 2),
+            ("Ciclo B", 2),
+        ]
+        assert board.sections[0].end_index == len(board.lines)
+
+    def test_header_date_index(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        assert board.lines[board.header_date_index].startswith("Ultima atualizacao:")
+
+    def test_invalid_utf8_is_read_but_not_written(self, tmp_path) -> None:
+        path = tmp_path / "TASKS.md"
+        raw = TABLE_BOARD.replace("Perfil investidor", "Perfil investidor \xe7").encode("latin-1")
+        path.write_bytes(raw)
+        board = load_task_board(path)
+        assert board.lossy
+        assert board.next_task_id == "B10"
+        assert "Perfil investidor \ufffd" in board.lines[board.find_row("B9").line_index]
+        with pytest.raises(UnicodeDecodeError):
+            apply_task_status_updates(path, [TaskStatusUpdate("B9", "Done")])
+        assert path.read_bytes() == raw
+
+    def test_unresolved_board(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "tasks.md", "# empty\n")
+        assert board.next_task_id == "UNSPECIFIED"
+
+
+class TestLoadTaskBoard:
+    """Validate the (path, mtime, size) cache."""
+
+    def test_unchanged_file_is_served_from_cache(self, tmp_path) -> None:
+        path = tmp_path / "TASKS.md"
+        path.write_text(TABLE_BOARD, encoding="utf-8")
+        assert load_task_board(path) is load_task_board(path)
+
+    def test_modified_file_is_reparsed(self, tmp_path) -> None:
+        path = tmp_path / "TASKS.md"
+        path.write_text(TABLE_BOARD, encoding="utf-8")
+        first = load_task_board(path)
+        path.write_text(TABLE_BOARD.replace("| B9 |", "| B11 |"), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = load_task_board(path)
+        assert second is not first
+        assert second.find_row("B11") is not None
+
+    def test_invalidate_forces_reparse(self, tmp_path) -> None:
+        path = tmp_path / "tasks.md"
+        path.write_text(CHECKLIST_BOARD, encoding="utf-8")
+        first = load_task_board(path)
+        invalidate_task_board(path)
+        assert load_task_board(path) is not first
+
+
+class TestPendingView:
+    """Validate the pending view emitted by the single-pass scanner."""
+
+    def test_pending_rows_and_checklist(self, tmp_path) -> None:
+        table = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        checklist = parse_task_board(tmp_path / "tasks.md", CHECKLIST_BOARD)
+        assert [line.split("|")[1].strip() for line in table.pending_rows] == [
+            "B9",
+            "B10",
+        ]
+        assert len(checklist.pending_checklist) == 3
+
+    def test_status_cells_with_notes(self, tmp_path) -> None:
+        board_text = TABLE_BOARD + (
+            "| B11 | Perfil | Sugestao | Blocked (waiting API) | 10% | High | - | - |\n"
+            "| B12 | Perfil | Done criteria | In Progress - revisao | 60% | Low | - | - |\n"
+            "| B13 | Perfil | Todos os campos | Done | 100% | Low | - | - |\n"
+        )
+        board = parse_task_board(tmp_path / "TASKS.md", board_text)
+        statuses = {row.task_id: row.status for row in board.rows if row.task_id}
+        assert statuses["B11"] == "blocked"
+        assert statuses["B12"] == "in progress"
+        assert statuses["B13"] == "done"
+        assert [line.split("|")[1].strip() for line in board.pending_rows] == [
+            "B9",
+            "B10",
+            "B11",
+            "B12",
+        ]
+
+    def test_render_pending_view(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        output = render_pending_view(board)
+        assert output.startswith("# TASKS.md — Pending Tasks Only")
+        assert "1. Finalizar B9" in output
+        assert "| B8 |" not in output
+        assert "| B10 |" in output
+
+    def test_render_all_done(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "tasks.md", "- [x] **WEB1** Setup\n")
+        assert "No pending tasks found" in render_pending_view(board)
+
+
+def _synthetic_board(line_count: int) -> str:
+    statuses = ("Todo", "In Progress", "Blocked", "Done")
+    markers = (" ", "~", "!", "x")
+    lines = ["# TASKS", "", "## Pendencias de execucao imediata", "", "1. B1", ""]
+    index = 0
+    while len(lines) < line_count:
+        if index % 50 == 0:
+            lines.append(f"## Ciclo {index}")
+        lines.append(
+            f"| B{index} | Area | Tarefa {index} | {statuses[index % 4]} "
+            "| 0% | Low | - | - |"
+        )
+        lines.append(f"- [{markers[index % 4]}] **WEB{index}** Item {index}")
+        lines.append(f"Notes for task {index} without any special marker.")
+        index += 1
+    return "\n".join(lines[:line_count]) + "\n"
+
+
+def _best_parse_seconds(text: str, tmp_path) -> float:
+    timings = []
+    for _ in range(3):
+        started = time.perf_counter()
+        parse_task_board(tmp_path / "TASKS.md", text)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+class TestScannerBenchmark:
+    """Single-pass scanner must scale linearly with board size."""
+
+    def test_linear_time_on_50k_line_board(self, tmp_path) -> None:
+        small = _best_parse_seconds(_synthetic_board(10_000), tmp_path)
+        large = _best_parse_seconds(_synthetic_board(50_000), tmp_path)
+        # 5x the input; allow generous noise but reject quadratic growth (25x).
+        assert large < small * 10, f"10k={small:.4f}s 50k={large:.4f}s"
+        assert large < 2.0, f"50k-line board took {large:.3f}s"
+
+
+class TestSectionIndex:
+    """Validate heading/task ID lookups used by read_tasks_section."""
+
+    def test_task_id_returns_row_with_table_header(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        label, indices = board.locate_section("b9")
+        assert label == "B9 (Ciclo B)"
+        assert [board.lines[index][:6] for index in indices] == [
+            "| ID |",
+            "|---|-",
+            "| B9 |",
+        ]
+
+    def test_checklist_task_includes_continuation_lines(self, tmp_path) -> None:
+        text = CHECKLIST_BOARD.replace(
+            "- [ ] **WEB2** Login page\n",
+            "- [ ] **WEB2** Login page\n  - criterio: form\n  - criterio: erro\n",
+        )
+        board = parse_task_board(tmp_path / "tasks.md", text)
+        _, indices = board.locate_section("WEB2")
+        assert len(indices) == 3
+
+    def test_heading_returns_exact_section(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        label, indices = board.locate_section("pendencias")
+        assert label == "Pendencias de execucao imediata"
+        assert board.lines[indices[-1]] == ""
+        assert board.lines[indices[-1] + 1] == "## Ciclo B"
+
+    def test_plain_text_returns_enclosing_section(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        label, _ = board.locate_section("perfil investidor")
+        assert label == "Ciclo B"
+
+    def test_enclosing_section_walks_up_to_parent(self, tmp_path) -> None:
+        text = "# Root\n## A\n### A1\nx\n## B\ny\n"
+        board = parse_task_board(tmp_path / "TASKS.md", text)
+        assert board.enclosing_section(3).title == "A1"
+        assert board.enclosing_section(5).title == "B"
+        assert board.enclosing_section(1).title == "A"
+
+    def test_unknown_keyword(self, tmp_path) -> None:
+        board = parse_task_board(tmp_path / "TASKS.md", TABLE_BOARD)
+        assert board.locate_section("inexistente") is None
+
+
+class TestApplyTaskStatusUpdates:
+    """Validate batched, atomic status updates."""
+
+    TODAY = date(2026, 2, 3)
+
+    def test_batch_updates_rows_and_header_once(self, tmp_path) -> None:
+        path = tmp_path / "TASKS.md"
+        path.write_text(TABLE_BOARD, encoding="utf-8")
+        missing = apply_task_status_updates(
+            path,
+            [
+                TaskStatusUpdate("B9", "Done", "100%", "def5678"),
+                TaskStatusUpdate("B10", "Blocked", "40%"),
+            ],
+            today=self.TODAY,
+        )
+        assert missing == []
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert "| B9 | Perfil | Perfil investidor | Done | 100% | Low | def5678 | 2026-02-03 |" in lines
+        assert "| B10 | Perfil | Quiz | Blocked | 40% | Med | - | 2026-02-03 |" in lines
+        assert "| B8 | Auth | Login | Done | 100% | Low | abc1234 | 2026-01-01 |" in lines
+        assert lines[2] == "Ultima atualizacao: 2026-02-03"
+        assert load_task_board(path).find_row("B9").status == "done"
+
+    def test_repeated_task_keeps_earlier_commit(self, tmp_path) -> None:
+        path = tmp_path / "TASKS.md"
+        path.write_text(TABLE_BOARD, encoding="utf-8")
+        apply_task_status_updates(
+            path,
+            [
+                TaskStatusUpdate("B9", "In Progress", "50%", "aaa1111"),
+                TaskStatusUpdate("B9", "Done", "100%"),
+            ],
+            today=self.TODAY,
+        )
+        row = load_task_board(path).find_row("B9")
+        assert list(row.cells)[3:7] == ["Done", "100%", "Low", "aaa1111"]
+
+    def test_checklist_markers(self, tmp_path) -> None:
+        path = tmp_path / "tasks.md"
+        path.write_text(CHECKLIST_BOARD, encoding="utf-8")
+        apply_task_status_updates(
+            path,
+            [
+                TaskStatusUpdate("WEB2", "In Progress"),
+                TaskStatusUpdate("WEB3", "Done", commit_hash="abc"),
+            ],
+            today=self.TODAY,
+        )
+        text = path.read_text(encoding="utf-8")
+        assert "- [~] **WEB2** Login page" in text
+        assert "- [x] **WEB3** Auth guard" in text
+
+        apply_task_status_updates(
+            path, [TaskStatusUpdate("WEB2", "Blocked (waiting API)")], today=self.TODAY
+        )
+        assert "- [!] **WEB2** Login page" in path.read_text(encoding="utf-8")
+
+    def test_unknown_task_leaves_file_untouched(self, tmp_path) -> None:
+        path = tmp_path / "TASKS.md"
+        path.write_text(TABLE_BOARD, encoding="utf-8")
+        missing = apply_task_status_updates(
+            path,
+            [TaskStatusUpdate("B9", "Done"), TaskStatusUpdate("B99", "Done")],
+            today=self.TODAY,
+        )
+        assert missing == ["B99"]
+        assert path.read_text(encoding="utf-8") == TABLE_BOARD
+
+    def test_write_is_atomic_and_preserves_mode(self, tmp_path) -> None:
+        path = tmp_path / "TASKS.md"
+        path.write_text(TABLE_BOARD, encoding="utf-8")
+        path.chmod(0o640)
+        apply_task_status_updates(path, [TaskStatusUpdate("B9", "Done")], today=self.TODAY)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+        assert [item.name for item in tmp_path.iterdir()] == ["TASKS.md"]
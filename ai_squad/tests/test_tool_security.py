@@ -26,6 +26,9 @@ from tools.tool_security import (
     PROJECT_ROOT,
     PROTECTED_FILES,
     WRITABLE_DIRS,
+    get_tool_audit_counters,
+    increment_audit_counter,
+    reset_tool_audit_snapshot,
     validate_write_path,
 )
 
@@ -183,3 +186,16 @@ class TestSecurityConstants:
         assert (
             "*.pem" in GIT_STAGE_BLOCKLIST
         ), "GIT_STAGE_BLOCKLIST must block .pem files"
+
+
+class TestAuditCounters:
+    """Verify run counters exposed alongside the audit snapshot."""
+
+    def test_counters_accumulate_and_reset(self) -> None:
+        reset_tool_audit_snapshot()
+        increment_audit_counter("read_cache.hit")
+        increment_audit_counter("read_cache.hit", 2)
+        increment_audit_counter("read_cache.miss")
+        assert get_tool_audit_counters() == {"read_cache.hit": 3, "read_cache.miss": 1}
+        reset_tool_audit_snapshot()
+        assert get_tool_audit_counters() == {}
@@ -0,0 +1,55 @@
+"""
+Unit tests for ai_squad/tools/write_journal.py.
+
+Test Strategy:
+- The JSONL journal lives under pytest's tmp_path.
+- Listeners are plain lists collecting events.
+- changed_paths() must ignore unchanged writes and keep first-write order.
+"""
+
+import json
+from datetime import UTC, datetime
+
+import pytest
+from tools.write_journal import WriteJournal, run_journal_path
+
+
+class TestWriteJournal:
+    """Validate recording, listeners and persistence."""
+
+    def test_records_notify_listeners_and_persist(self, tmp_path) -> None:
+        journal = WriteJournal(tmp_path / "run.jsonl")
+        seen: list[str] = []
+        journal.subscribe(lambda event: seen.append(f"{event.status}:{event.path}"))
+        journal.record("app/a.py", "created", "aaaa", 10)
+        journal.record("app/a.py", "unchanged", "aaaa", 10)
+        journal.record("app/b.py", "written", "bbbb", 5)
+        journal.close()
+
+        assert seen == ["created:app/a.py", "unchanged:app/a.py", "written:app/b.py"]
+        assert journal.changed_paths() == ["app/a.py", "app/b.py"]
+        lines = (tmp_path / "run.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["status"] for line in lines] == [
+            "created",
+            "unchanged",
+            "written",
+        ]
+
+    def test_events_cursor_and_unsubscribe(self) -> None:
+        journal = WriteJournal()
+        seen: list[str] = []
+        journal.subscribe(seen.append)
+        journal.record("a", "written", "h", 1)
+        cursor = len(journal)
+        journal.unsubscribe(seen.append)
+        journal.record("b", "written", "h", 1)
+        assert [event.path for event in journal.events(cursor)] == ["b"]
+        assert len(seen) == 1
+
+    def test_unknown_status_is_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            WriteJournal().record("a", "deleted", "h", 0)
+
+    def test_run_journal_path(self, tmp_path) -> None:
+        now = datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+        assert run_journal_path(tmp_path, now, pid=42) == tmp_path / "20260102T030405Z-42.jsonl"
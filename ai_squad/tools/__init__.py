@@ -20,11 +20,13 @@ try:
         ReadFeatureContractPackTool,
         ReadGovernanceFileTool,
         ReadPendingTasksTool,
+        ReadProjectFilesTool,
         ReadProjectFileTool,
         ReadSchemaTool,
         ReadTasksSectionTool,
         ReadTasksTool,
         RunTestsTool,
+        SearchProjectTool,
         UpdateTaskStatusTool,
         ValidateMigrationConsistencyTool,
         WriteFileTool,
@@ -0,0 +1,283 @@
+"""Alembic revision graph for `get_latest_migration`.
+
+Migration files are named by revision hash (or by date, or by hand), so the
+lexicographically last file is not the head of the history, and a branched
+history has several heads. The graph is built from the module-level
+`revision` / `down_revision` / `branch_labels` assignments of every file in
+`migrations/versions`, read with `ast` (never by importing the migration):
+
+- heads: revisions no other revision builds on;
+- branch points: revisions with more than one child;
+- merge points: revisions with more than one `down_revision`;
+- missing: `down_revision` values no file declares (broken chain).
+
+`MigrationGraphCache` keeps one parse per file, keyed by (mtime_ns, size),
+and the assembled graph per directory. An unchanged directory mtime skips
+the listing; files are only re-parsed when their own stat changes, so a
+new migration in a history of hundreds costs one parse.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import ast
+import heapq
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+_GRAPH_FIELDS = frozenset({"revision", "down_revision", "branch_labels"})
+
+
+@dataclass(frozen=True)
+class MigrationInfo:
+    revision: str
+    down_revisions: tuple[str, ...]
+    filename: str
+    branch_labels: tuple[str, ...] = ()
+
+
+def _as_revisions(value: object) -> tuple[str, ...] | None:
+    """`None`, a string or a tuple/list of strings; None when it is neither."""
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,) if value else ()
+    if isinstance(value, (tuple, list)) and all(isinstance(item, str) for item in value):
+        return tuple(value)
+    return None
+
+
+def parse_migration(source: str, filename: str) -> MigrationInfo | None:
+    """Revision metadata of one migration file (None when it declares none)."""
+    try:
+        module = ast.parse(source, filename=filename)
+    except SyntaxError:
+        return None
+    values: dict[str, object] = {}
+    for node in module.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target, value = node.targets[0], node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            target, value = node.target, node.value
+        else:
+            continue
+        if not isinstance(target, ast.Name) or target.id not in _GRAPH_FIELDS:
+            continue
+        try:
+            values[target.id] = ast.literal_eval(value)
+        except (ValueError, TypeError):
+            values[target.id] = value  # not a literal: rejected below
+    revision = values.get("revision")
+    down_revisions = _as_revisions(values.get("down_revision"))
+    if not isinstance(revision, str) or not revision or down_revisions is None:
+        return None
+    return MigrationInfo(
+        revision=revision,
+        down_revisions=down_revisions,
+        filename=filename,
+        branch_labels=_as_revisions(values.get("branch_labels")) or (),
+    )
+
+
+@dataclass
+class RevisionGraph:
+    migrations: dict[str, MigrationInfo] = field(default_factory=dict)
+    children: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    unparsed: tuple[str, ...] = ()  # files without readable revision metadata
+    duplicates: tuple[str, ...] = ()  # revisions declared by more than one file
+
+    @classmethod
+    def build(
+        cls, infos: Iterable[MigrationInfo], unparsed: Iterable[str] = ()
+    ) -> RevisionGraph:
+        migrations: dict[str, MigrationInfo] = {}
+        duplicates: set[str] = set()
+        for info in sorted(infos, key=lambda item: item.filename):
+            if info.revision in migrations:
+                duplicates.add(info.revision)
+                continue
+            migrations[info.revision] = info
+        children: dict[str, list[str]] = {revision: [] for revision in migrations}
+        for info in migrations.values():
+            for parent in info.down_revisions:
+                children.setdefault(parent, []).append(info.revision)
+        return cls(
+            migrations=migrations,
+            children={parent: tuple(sorted(kids)) for parent, kids in children.items()},
+            unparsed=tuple(sorted(unparsed)),
+            duplicates=tuple(sorted(duplicates)),
+        )
+
+    @property
+    def heads(self) -> tuple[str, ...]:
+        return tuple(
+            sorted(revision for revision in self.migrations if not self.children.get(revision))
+        )
+
+    @property
+    def bases(self) -> tuple[str, ...]:
+        return tuple(
+            sorted(
+                revision
+                for revision, info in self.migrations.items()
+                if not info.down_revisions
+            )
+        )
+
+    @property
+    def branch_points(self) -> tuple[str, ...]:
+        return tuple(
+            sorted(
+                revision
+                for revision in self.migrations
+                if len(self.children.get(revision, ())) > 1
+            )
+        )
+
+    @property
+    def merge_points(self) -> tuple[str, ...]:
+        return tuple(
+            sorted(
+                revision
+                for revision, info in self.migrations.items()
+                if len(info.down_revisions) > 1
+            )
+        )
+
+    @property
+    def missing(self) -> tuple[str, ...]:
+        return tuple(sorted(parent for parent in self.children if parent not in self.migrations))
+
+    def ordered(self) -> list[MigrationInfo]:
+        """Migrations parents-first; ties broken by filename.
+
+        Revisions whose parents are missing are treated as bases; revisions
+        on a cycle are left out.
+        """
+        pending = {
+            revision: sum(1 for parent in info.down_revisions if parent in self.migrations)
+            for revision, info in self.migrations.items()
+        }
+        ready = [
+            (self.migrations[revision].filename, revision)
+            for revision, count in pending.items()
+            if count == 0
+        ]
+        heapq.heapify(ready)
+        ordered: list[MigrationInfo] = []
+        while ready:
+            _, revision = heapq.heappop(ready)
+            ordered.append(self.migrations[revision])
+            for child in self.children.get(revision, ()):
+                pending[child] -= 1
+                if pending[child] == 0:
+                    heapq.heappush(ready, (self.migrations[child].filename, child))
+        return ordered
+
+
+def migration_files(versions_dir: Path) -> list[Path]:
+    return sorted(
+        path
+        for path in versions_dir.iterdir()
+        if path.suffix == ".py" and path.name != "__init__.py" and path.is_file()
+    )
+
+
+_MISSING_FILE = (-1, -1)
+
+
+def _stat_key(path: Path) -> tuple[int, int]:
+    try:
+        stat_result = path.stat()
+    except OSError:  # removed between listing and stat
+        return _MISSING_FILE
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+class MigrationGraphCache:
+    """Revision graphs per versions directory, re-parsing only changed files.
+
+    `reader` supplies file text on a parse (e.g. the tools' shared
+    ReadCache). `on_event` receives "hit" (graph reused), "build" (graph
+    re-assembled) and "parse" (one file parsed) for telemetry.
+    """
+
+    def __init__(
+        self,
+        reader: Callable[[Path], str] | None = None,
+        *,
+        on_event: Callable[[str], None] | None = None,
+    ) -> None:
+        self.reader = reader or (lambda path: path.read_text(encoding="utf-8"))
+        self.on_event = on_event
+        self._lock = threading.Lock()
+        # path -> ((mtime_ns, size), parsed metadata)
+        self._files: dict[str, tuple[tuple[int, int], MigrationInfo | None]] = {}
+        # directory -> (directory mtime_ns, files, their stat keys, graph)
+        self._graphs: dict[
+            str, tuple[int, list[Path], tuple[tuple[int, int], ...], RevisionGraph]
+        ] = {}
+
+    def _emit(self, event: str) -> None:
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def _info(self, path: Path, key: tuple[int, int]) -> MigrationInfo | None:
+        with self._lock:
+            cached = self._files.get(str(path))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        self._emit("parse")
+        try:
+            info = parse_migration(self.reader(path), path.name)
+        except (OSError, UnicodeDecodeError):
+            info = None
+        with self._lock:
+            self._files[str(path)] = (key, info)
+        return info
+
+    def graph(self, versions_dir: Path) -> RevisionGraph:
+        """Revision graph of `versions_dir` as it is on disk now."""
+        directory = versions_dir.resolve()
+        dir_mtime = directory.stat().st_mtime_ns
+        with self._lock:
+            cached = self._graphs.get(str(directory))
+        if cached is not None and cached[0] == dir_mtime:
+            files = cached[1]
+        else:
+            files = migration_files(directory)
+
+        keys = [_stat_key(path) for path in files]
+        if cached is not None and cached[0] == dir_mtime and cached[2] == tuple(keys):
+            self._emit("hit")
+            return cached[3]
+
+        self._emit("build")
+        infos: list[MigrationInfo] = []
+        unparsed: list[str] = []
+        for path, key in zip(files, keys, strict=True):
+            info = self._info(path, key) if key != _MISSING_FILE else None
+            if info is None:
+                unparsed.append(path.name)
+            else:
+                infos.append(info)
+        graph = RevisionGraph.build(infos, unparsed)
+        live = {str(path) for path in files}
+        with self._lock:
+            self._graphs[str(directory)] = (dir_mtime, files, tuple(keys), graph)
+            prefix = str(directory)
+            for stale in [
+                path
+                for path in self._files
+                if path not in live and str(Path(path).parent) == prefix
+            ]:
+                del self._files[stale]
+        return graph
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+            self._graphs.clear()
@@ -0,0 +1,441 @@
+"""Per-table column state replayed from Alembic migrations.
+
+`read_alembic_history` and `validate_migration_consistency` need to know
+which columns exist *now*, which a grep for `sa.Column(` cannot tell once a
+column has been dropped or renamed. This module walks the revision graph
+(`alembic_graph`) parents-first and interprets the `upgrade()` body of each
+migration with `ast`:
+
+- `op.create_table(name, sa.Column("col", ...), ...)` / `op.drop_table`;
+- `op.rename_table(old, new)`;
+- `op.add_column(table, sa.Column("col", ...))` / `op.drop_column(table, col)`;
+- `op.alter_column(table, col, new_column_name=...)`;
+- the same calls on `with op.batch_alter_table(table) as batch_op:` aliases.
+
+Any other `op.*` call is kept in the history of the tables it names. Table
+and column names must be string literals; anything else is skipped.
+
+`SchemaSnapshotStore` persists the materialized state (tables, per-table
+history, the applied revision chain and the extracted ops per file, keyed
+by content hash) as JSON. When new migrations extend the applied chain only
+they are replayed on top of the snapshot; other changes replay the cached
+ops, re-parsing only files whose content changed.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .alembic_graph import MigrationGraphCache, MigrationInfo, RevisionGraph
+from .file_io import atomic_write_text
+
+SNAPSHOT_FORMAT_VERSION = 1
+STATE_CHANGING_OPS = frozenset(
+    {"create_table", "drop_table", "rename_table", "add_column", "drop_column", "alter_column"}
+)
+
+
+@dataclass(frozen=True)
+class MigrationOp:
+    kind: str  # op method name (create_table, add_column, create_index, ...)
+    table: str = ""
+    column: str = ""
+    new_name: str = ""  # rename_table target / alter_column(new_column_name=)
+    columns: tuple[str, ...] = ()  # create_table
+    mentions: tuple[str, ...] = ()  # string arguments of any other op
+    line: int = 0
+    text: str = ""
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> MigrationOp:
+        return cls(
+            kind=str(raw["kind"]),
+            table=str(raw.get("table", "")),
+            column=str(raw.get("column", "")),
+            new_name=str(raw.get("new_name", "")),
+            columns=tuple(raw.get("columns", ())),
+            mentions=tuple(raw.get("mentions", ())),
+            line=int(raw.get("line", 0)),
+            text=str(raw.get("text", "")),
+        )
+
+
+def _literal(node: ast.expr | None) -> str:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return ""
+
+
+def _keyword(call: ast.Call, keyword: str) -> ast.expr | None:
+    return next((item.value for item in call.keywords if item.arg == keyword), None)
+
+
+def _argument(call: ast.Call, index: int, keyword: str) -> ast.expr | None:
+    if index < len(call.args) and not isinstance(call.args[index], ast.Starred):
+        return call.args[index]
+    return _keyword(call, keyword)
+
+
+def _callee_name(call: ast.Call) -> str:
+    func = call.func
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    if isinstance(func, ast.Name):
+        return func.id
+    return ""
+
+
+def _column_name(node: ast.expr | None) -> str:
+    """Name of a `sa.Column("name", ...)` call (also `Column`, `db.Column`)."""
+    if isinstance(node, ast.Call) and _callee_name(node) == "Column":
+        return _literal(_argument(node, 0, "name"))
+    return ""
+
+
+class _UpgradeVisitor(ast.NodeVisitor):
+    """Collects `op.*` / batch-alias calls of one `upgrade()` body in order."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.aliases: dict[str, str] = {}  # batch_op name -> table
+        self.ops: list[MigrationOp] = []
+
+    def visit_With(self, node: ast.With) -> None:
+        for item in node.items:
+            context = item.context_expr
+            if (
+                isinstance(context, ast.Call)
+                and self._receiver(context) == ("op", "")
+                and _callee_name(context) == "batch_alter_table"
+                and isinstance(item.optional_vars, ast.Name)
+            ):
+                self.aliases[item.optional_vars.id] = _literal(
+                    _argument(context, 0, "table_name")
+                )
+        self.generic_visit(node)
+
+    def _receiver(self, call: ast.Call) -> tuple[str, str] | None:
+        """("op", "") or (alias, table) when the call is an Alembic operation."""
+        func = call.func
+        if not isinstance(func, ast.Attribute) or not isinstance(func.value, ast.Name):
+            return None
+        name = func.value.id
+        if name == "op":
+            return "op", ""
+        if name in self.aliases:
+            return name, self.aliases[name]
+        return None
+
+    def visit_Call(self, node: ast.Call) -> None:
+        receiver = self._receiver(node)
+        if receiver is not None and _callee_name(node) != "batch_alter_table":
+            self.ops.append(self._op(node, batch_table=receiver[1], batch=receiver[0] != "op"))
+        self.generic_visit(node)
+
+    def _op(self, call: ast.Call, *, batch_table: str, batch: bool) -> MigrationOp:
+        kind = _callee_name(call)
+        segment = ast.get_source_segment(self.source, call) or kind
+        base = {"kind": kind, "line": call.lineno, "text": " ".join(segment.split())}
+        # Batch operations have no table argument: every index shifts by one.
+        shift = 1 if batch else 0
+        table = batch_table if batch else _literal(_argument(call, 0, "table_name"))
+        if kind == "create_table" and not batch:
+            columns = tuple(
+                name for name in (_column_name(arg) for arg in call.args[1:]) if name
+            )
+            return MigrationOp(**base, table=table, columns=columns)
+        if kind == "drop_table" and not batch:
+            return MigrationOp(**base, table=table)
+        if kind == "rename_table" and not batch:
+            return MigrationOp(
+                **base,
+                table=_literal(_argument(call, 0, "old_table_name")),
+                new_name=_literal(_argument(call, 1, "new_table_name")),
+            )
+        if kind == "add_column":
+            column = _column_name(_argument(call, 1 - shift, "column"))
+            return MigrationOp(**base, table=table, column=column)
+        if kind in ("drop_column", "alter_column"):
+            column = _literal(_argument(call, 1 - shift, "column_name"))
+            new_name = _literal(_keyword(call, "new_column_name"))
+            return MigrationOp(**base, table=table, column=column, new_name=new_name)
+        mentions = [_literal(arg) for arg in call.args] + [
+            _literal(item.value) for item in call.keywords
+        ]
+        if batch:
+            mentions.insert(0, batch_table)
+        return MigrationOp(**base, mentions=tuple(dict.fromkeys(item for item in mentions if item)))
+
+
+def extract_ops(source: str, filename: str = "<migration>") -> tuple[MigrationOp, ...] | None:
+    """Operations of the module-level `upgrade()` in source order (None on syntax errors)."""
+    try:
+        module = ast.parse(source, filename=filename)
+    except SyntaxError:
+        return None
+    for node in module.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "upgrade":
+            visitor = _UpgradeVisitor(source)
+            for statement in node.body:
+                visitor.visit(statement)
+            return tuple(visitor.ops)
+    return ()
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    filename: str
+    line: int
+    text: str
+
+
+@dataclass
+class SchemaState:
+    """Columns per table (in creation order) and the ops that touched each table."""
+
+    tables: dict[str, dict[str, None]] = field(default_factory=dict)
+    history: dict[str, list[HistoryEntry]] = field(default_factory=dict)
+
+    def columns(self, table: str) -> tuple[str, ...] | None:
+        """Current columns of `table` (None when the table does not exist)."""
+        columns = self.tables.get(table)
+        return None if columns is None else tuple(columns)
+
+    def copy(self) -> SchemaState:
+        return SchemaState(
+            tables={table: dict(columns) for table, columns in self.tables.items()},
+            history={table: list(entries) for table, entries in self.history.items()},
+        )
+
+    def _record(self, table: str, entry: HistoryEntry) -> None:
+        if table:
+            self.history.setdefault(table, []).append(entry)
+
+    def apply(self, filename: str, op: MigrationOp) -> None:
+        entry = HistoryEntry(filename, op.line, op.text)
+        tables = self.tables
+        if op.kind not in STATE_CHANGING_OPS:
+            for name in op.mentions:
+                if name in tables or name in self.history:
+                    self._record(name, entry)
+            return
+        self._record(op.table, entry)
+        if not op.table:
+            return
+        if op.kind == "create_table":
+            tables[op.table] = dict.fromkeys(op.columns)
+        elif op.kind == "drop_table":
+            tables.pop(op.table, None)
+        elif op.kind == "rename_table":
+            if op.new_name:
+                tables[op.new_name] = tables.pop(op.table, {})
+                self._record(op.new_name, entry)
+        elif op.kind == "add_column":
+            if op.column:
+                tables.setdefault(op.table, {})[op.column] = None
+        elif op.kind == "drop_column":
+            tables.get(op.table, {}).pop(op.column, None)
+        elif op.new_name and op.column:  # alter_column(new_column_name=...)
+            columns = tables.setdefault(op.table, {})
+            # Rebuilt so the renamed column keeps its position.
+            tables[op.table] = {
+                (op.new_name if name == op.column else name): None for name in columns
+            }
+            tables[op.table].setdefault(op.new_name, None)
+
+    def to_dict(self) -> dict:
+        return {
+            "tables": {table: list(columns) for table, columns in self.tables.items()},
+            "history": {
+                table: [[entry.filename, entry.line, entry.text] for entry in entries]
+                for table, entries in self.history.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> SchemaState:
+        return cls(
+            tables={
+                str(table): dict.fromkeys(str(column) for column in columns)
+                for table, columns in raw.get("tables", {}).items()
+            },
+            history={
+                str(table): [HistoryEntry(str(f), int(line), str(text)) for f, line, text in rows]
+                for table, rows in raw.get("history", {}).items()
+            },
+        )
+
+
+def replay(
+    migrations: Iterable[tuple[str, Iterable[MigrationOp]]], state: SchemaState | None = None
+) -> SchemaState:
+    """Apply (filename, ops) pairs in order on top of `state` (or an empty schema)."""
+    state = state or SchemaState()
+    for filename, ops in migrations:
+        for op in ops:
+            state.apply(filename, op)
+    return state
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+
+
+class SchemaSnapshotStore:
+    """Materialized schema of one versions directory, persisted as JSON.
+
+    `graphs` supplies the revision graph (shared with get_latest_migration);
+    `read_text` supplies file text (e.g. the tools' shared ReadCache).
+    `on_event` receives "hit" (state reused in memory), "extend" (only new
+    migrations replayed on the snapshot), "replay" (full replay of cached
+    ops) and "parse" (ops extracted from one file) for telemetry.
+    """
+
+    def __init__(
+        self,
+        graphs: MigrationGraphCache,
+        snapshot_path: Path | None = None,
+        read_text: Callable[[Path], str] | None = None,
+        *,
+        on_event: Callable[[str], None] | None = None,
+    ) -> None:
+        self.graphs = graphs
+        self.snapshot_path = snapshot_path
+        self.read_text = read_text or (lambda path: path.read_text(encoding="utf-8"))
+        self.on_event = on_event
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._files: dict[str, tuple[str, tuple[MigrationOp, ...]]] = {}  # name -> (hash, ops)
+        self._applied: list[tuple[str, str]] = []  # (revision, hash) in replay order
+        self._state = SchemaState()
+        self._graph: RevisionGraph | None = None
+        self._before: dict[str, SchemaState] = {}  # filename -> state at its parents
+
+    def _emit(self, event: str) -> None:
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def _load(self) -> None:
+        self._loaded = True
+        if self.snapshot_path is None or not self.snapshot_path.is_file():
+            return
+        try:
+            payload = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            if payload.get("format") != SNAPSHOT_FORMAT_VERSION:
+                return
+            self._files = {
+                str(name): (str(entry["hash"]), tuple(map(MigrationOp.from_dict, entry["ops"])))
+                for name, entry in payload.get("files", {}).items()
+            }
+            self._applied = [(str(rev), str(digest)) for rev, digest in payload["applied"]]
+            self._state = SchemaState.from_dict(payload)
+        except (OSError, ValueError, KeyError, TypeError):
+            self._files, self._applied, self._state = {}, [], SchemaState()
+
+    def _save(self) -> None:
+        if self.snapshot_path is None:
+            return
+        payload = {
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "files": {
+                name: {"hash": digest, "ops": [asdict(op) for op in ops]}
+                for name, (digest, ops) in sorted(self._files.items())
+            },
+            "applied": [list(item) for item in self._applied],
+            **self._state.to_dict(),
+        }
+        try:
+            atomic_write_text(self.snapshot_path, json.dumps(payload, ensure_ascii=False))
+        except OSError:
+            pass  # the in-memory state stays valid; the next run replays again
+
+    def _ops(self, versions_dir: Path, info: MigrationInfo) -> tuple[str, tuple[MigrationOp, ...]]:
+        try:
+            source = self.read_text(versions_dir / info.filename)
+        except (OSError, UnicodeDecodeError):
+            return "", ()
+        digest = _content_hash(source)
+        cached = self._files.get(info.filename)
+        if cached is not None and cached[0] == digest:
+            return cached
+        self._emit("parse")
+        entry = (digest, extract_ops(source, info.filename) or ())
+        self._files[info.filename] = entry
+        return entry
+
+    def _refresh(self, versions_dir: Path) -> RevisionGraph:
+        graph = self.graphs.graph(versions_dir)
+        if graph is self._graph:
+            self._emit("hit")
+            return graph
+        if not self._loaded:
+            self._load()
+        directory = versions_dir.resolve()
+        ordered = graph.ordered()
+        chain: list[tuple[str, str]] = []
+        ops: list[tuple[str, tuple[MigrationOp, ...]]] = []
+        for info in ordered:
+            digest, file_ops = self._ops(directory, info)
+            chain.append((info.revision, digest))
+            ops.append((info.filename, file_ops))
+
+        applied = len(self._applied)
+        if 0 < applied <= len(chain) and chain[:applied] == self._applied:
+            self._emit("extend")
+            self._state = replay(ops[applied:], self._state.copy())
+        else:
+            self._emit("replay")
+            self._state = replay(ops)
+        changed = chain != self._applied or self._graph is None
+        self._applied = chain
+        live = {info.filename for info in ordered}
+        self._files = {name: entry for name, entry in self._files.items() if name in live}
+        self._graph = graph
+        self._before = {}
+        if changed:
+            self._save()
+        return graph
+
+    def state(self, versions_dir: Path) -> SchemaState:
+        """Schema after every migration in `versions_dir`."""
+        with self._lock:
+            self._refresh(versions_dir)
+            return self._state
+
+    def state_before(self, versions_dir: Path, filename: str) -> SchemaState:
+        """Schema the migration `filename` runs against (its ancestors only).
+
+        Falls back to `state()` when the file is not part of the graph.
+        """
+        with self._lock:
+            graph = self._refresh(versions_dir)
+            if filename in self._before:
+                return self._before[filename]
+            target = next(
+                (info for info in graph.migrations.values() if info.filename == filename), None
+            )
+            if target is None:
+                return self._state
+            ancestors: set[str] = set()
+            pending = list(target.down_revisions)
+            while pending:
+                revision = pending.pop()
+                if revision in ancestors or revision not in graph.migrations:
+                    continue
+                ancestors.add(revision)
+                pending.extend(graph.migrations[revision].down_revisions)
+            state = replay(
+                (info.filename, self._files.get(info.filename, ("", ()))[1])
+                for info in graph.ordered()
+                if info.revision in ancestors
+            )
+            self._before[filename] = state
+            return state
@@ -0,0 +1,655 @@
+"""Persistent trigram index for regex search over a project tree.
+
+Agents used to find symbols by listing directories and reading whole files.
+`CodeSearchIndex` keeps a SQLite trigram index of the target repo so a
+regex query only has to open the few files that can possibly match:
+
+- Every searchable file content (a "blob", keyed by its git blob SHA-1) is
+  split into lowercase byte trigrams, stored as posting rows
+  (trigram -> blob). Binary and very large files are tracked but not
+  searchable.
+- Paths are stored per worktree root and point at blobs, so execution
+  worktrees of the same repo share one index and a fresh worktree only
+  trigrams the blobs the index has not seen yet (tracked files are seeded
+  from `git ls-files -s` without reading them).
+- `refresh()` is incremental: after the first sync it only revisits
+  `git diff --name-only <indexed HEAD>`, untracked files and paths that
+  differed from HEAD last time. Non-git roots fall back to a stat walk.
+- A regex is reduced to the literal strings any match must contain
+  (alternations become OR, optional parts are dropped); the candidate
+  blobs are the intersection of those literals' posting lists. Candidates
+  are then verified with the real regex, line by line.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import stat as stat_module
+import threading
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+try:  # Python 3.11+
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse  # type: ignore[no-redef]
+
+from .file_listing import SKIP_DIR_NAMES, _run_git, matches_any, walk_files
+
+MAX_INDEXED_FILE_BYTES = 1024 * 1024
+_BINARY_SNIFF_BYTES = 8192
+_MAX_QUERY_TRIGRAMS = 24
+_MAX_QUERY_ALTERNATIVES = 16
+_MAX_LINE_CHARS = 300
+_WRITE_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    id INTEGER PRIMARY KEY,
+    sha TEXT NOT NULL UNIQUE,
+    searchable INTEGER NOT NULL,
+    grams BLOB
+);
+CREATE TABLE IF NOT EXISTS postings (
+    gram INTEGER NOT NULL,
+    blob_id INTEGER NOT NULL,
+    PRIMARY KEY (gram, blob_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS paths (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    blob_id INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    dirty INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (root, path)
+);
+CREATE INDEX IF NOT EXISTS idx_paths_blob ON paths (blob_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+# ---------------------------------------------------------------------------
+# Trigrams and query planning
+# ---------------------------------------------------------------------------
+
+
+def extract_trigrams(data: bytes) -> set[int]:
+    """Return the distinct lowercase byte trigrams of `data` packed as ints."""
+    lowered = data.lower()
+    return {(a << 16) | (b << 8) | c for a, b, c in set(zip(lowered, lowered[1:], lowered[2:]))}
+
+
+def git_blob_sha(data: bytes) -> str:
+    """SHA-1 of `data` as git hashes blobs (matches `git ls-files -s`)."""
+    digest = hashlib.sha1(b"blob %d\0" % len(data))  # noqa: S324 - git object id
+    digest.update(data)
+    return digest.hexdigest()
+
+
+# A query is a disjunction of alternatives, each a set of literals that a
+# match must all contain; None means "no constraint" (scan everything).
+Query = list[frozenset[str]] | None
+
+
+def _and(left: Query, right: Query) -> Query:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    combined = [a | b for a in left for b in right]
+    if len(combined) > _MAX_QUERY_ALTERNATIVES:
+        # Dropping one side only widens the candidate set, which is safe.
+        return left if len(left) <= len(right) else right
+    return combined
+
+
+def _or(left: Query, right: Query) -> Query:
+    if left is None or right is None:
+        return None
+    return left + right
+
+
+def _sequence_query(items: Iterable[tuple[object, object]], ignore_case: bool) -> Query:
+    query: Query = None
+    run: list[str] = []
+
+    def flush() -> None:
+        nonlocal query
+        if run:
+            query = _and(query, [frozenset({"".join(run)})])
+            run.clear()
+
+    for op, av in items:
+        name = str(op)
+        if name == "LITERAL":
+            char = chr(av)  # type: ignore[arg-type]
+            if ignore_case and not char.isascii():
+                flush()  # byte-level lowercasing only folds ASCII
+            else:
+                run.append(char)
+            continue
+        flush()
+        if name == "SUBPATTERN":
+            _group, add_flags, _del_flags, pattern = av  # type: ignore[misc]
+            query = _and(query, _sequence_query(pattern, ignore_case or bool(add_flags & re.I)))
+        elif name == "BRANCH":
+            branch: Query = []
+            for alternative in av[1]:  # type: ignore[index]
+                branch = _or(branch, _sequence_query(alternative, ignore_case))
+            query = _and(query, branch or None)
+        elif name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"):
+            minimum, _maximum, pattern = av  # type: ignore[misc]
+            if minimum >= 1:
+                query = _and(query, _sequence_query(pattern, ignore_case))
+        elif name == "ATOMIC_GROUP":
+            query = _and(query, _sequence_query(av, ignore_case))  # type: ignore[arg-type]
+    flush()
+    return query
+
+
+def query_trigrams(pattern: str, *, ignore_case: bool = False) -> list[set[int]] | None:
+    """Trigram sets (one per alternative) that every match must contain.
+
+    Returns None when the pattern has no usable literal (every file is a
+    candidate), e.g. `.*`, `\\w+` or literals shorter than three bytes.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.I if ignore_case else 0)
+    except (re.error, RecursionError, OverflowError):
+        return None
+    ignore_case = ignore_case or bool(parsed.state.flags & re.I)
+    query = _sequence_query(parsed, ignore_case)
+    if not query:
+        return None
+    plans: list[set[int]] = []
+    for literals in query:
+        grams: set[int] = set()
+        for literal in literals:
+            grams |= extract_trigrams(literal.encode("utf-8"))
+        if not grams:
+            return None  # one alternative can match anything
+        plans.append(set(sorted(grams)[:_MAX_QUERY_TRIGRAMS]))
+    return plans
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    path: str
+    line_number: int
+    line: str
+    before: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    hits: tuple[SearchHit, ...]
+    candidate_files: int
+    total_files: int
+    truncated: bool
+
+
+@dataclass(frozen=True)
+class _Stat:
+    mtime_ns: int
+    size: int
+
+
+def _stat(path: Path) -> _Stat | None:
+    try:
+        info = path.stat()
+    except OSError:
+        return None
+    if not stat_module.S_ISREG(info.st_mode):
+        return None
+    return _Stat(info.st_mtime_ns, info.st_size)
+
+
+def _skipped(rel_path: str) -> bool:
+    return bool(SKIP_DIR_NAMES.intersection(rel_path.split("/")[:-1]))
+
+
+def _git_paths(root: Path, *args: str) -> list[str] | None:
+    output = _run_git(root, *args)
+    if output is None:
+        return None
+    return [path for path in output.split("\0") if path and not _skipped(path)]
+
+
+class CodeSearchIndex:
+    """SQLite trigram index shared by all worktrees of one repository."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._initialized = False
+
+    # -- connection -------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.db_path), timeout=30.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        if not self._initialized:
+            with self._write_lock, connection:
+                connection.executescript(_SCHEMA)
+            self._initialized = True
+        return connection
+
+    def close(self) -> None:
+        """Close the calling thread's connection (other threads keep theirs)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    # -- blobs ------------------------------------------------------------
+
+    def _blob_ids(self, connection: sqlite3.Connection, shas: Iterable[str]) -> dict[str, int]:
+        found: dict[str, int] = {}
+        pending = list(dict.fromkeys(shas))
+        for offset in range(0, len(pending), _WRITE_BATCH_SIZE):
+            batch = pending[offset : offset + _WRITE_BATCH_SIZE]
+            marks = ",".join("?" * len(batch))
+            found.update(
+                connection.execute(
+                    f"SELECT sha, id FROM blobs WHERE sha IN ({marks})", batch
+                ).fetchall()
+            )
+        return found
+
+    def _store_blob(self, connection: sqlite3.Connection, sha: str, data: bytes) -> int:
+        searchable = (
+            len(data) <= MAX_INDEXED_FILE_BYTES and b"\0" not in data[:_BINARY_SNIFF_BYTES]
+        )
+        grams = array("I", sorted(extract_trigrams(data))) if searchable else array("I")
+        cursor = connection.execute(
+            "INSERT INTO blobs (sha, searchable, grams) VALUES (?, ?, ?)",
+            (sha, int(searchable), grams.tobytes()),
+        )
+        blob_id = int(cursor.lastrowid or 0)
+        connection.executemany(
+            "INSERT OR IGNORE INTO postings (gram, blob_id) VALUES (?, ?)",
+            ((gram, blob_id) for gram in grams),
+        )
+        return blob_id
+
+    def _drop_orphans(self, connection: sqlite3.Connection, blob_ids: Iterable[int]) -> None:
+        for blob_id in set(blob_ids):
+            if connection.execute(
+                "SELECT 1 FROM paths WHERE blob_id = ? LIMIT 1", (blob_id,)
+            ).fetchone():
+                continue
+            row = connection.execute("SELECT grams FROM blobs WHERE id = ?", (blob_id,)).fetchone()
+            if row is None:
+                continue
+            grams = array("I")
+            grams.frombytes(row[0] or b"")
+            connection.executemany(
+                "DELETE FROM postings WHERE gram = ? AND blob_id = ?",
+                ((gram, blob_id) for gram in grams),
+            )
+            connection.execute("DELETE FROM blobs WHERE id = ?", (blob_id,))
+
+    # -- refresh ----------------------------------------------------------
+
+    def refresh(self, root: Path) -> int:
+        """Bring the index up to date for `root`; returns re-indexed paths."""
+        root = root.resolve()
+        connection = self._connection()
+        with self._write_lock, connection:
+            head_output = _run_git(root, "rev-parse", "HEAD")
+            if head_output is None:
+                return self._sync_walk(connection, root)
+            head = head_output.strip()
+            key = f"head:{root}"
+            row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                changed = self._sync_git_full(connection, root)
+            else:
+                changed = self._sync_git_incremental(connection, root, row[0])
+            if changed is None:
+                changed = self._sync_walk(connection, root)
+            if row is None or row[0] != head:
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, head)
+                )
+            return changed
+
+    def _known_paths(
+        self,
+        connection: sqlite3.Connection,
+        root: Path,
+        rel_paths: Sequence[str] | None = None,
+    ) -> dict[str, tuple[int, int, int, int]]:
+        select = "SELECT path, blob_id, mtime_ns, size, dirty FROM paths WHERE root = ?"
+        if rel_paths is None:
+            rows = connection.execute(select, (str(root),)).fetchall()
+        else:
+            rows = []
+            for offset in range(0, len(rel_paths), _WRITE_BATCH_SIZE):
+                batch = list(rel_paths[offset : offset + _WRITE_BATCH_SIZE])
+                marks = ",".join("?" * len(batch))
+                rows.extend(
+                    connection.execute(f"{select} AND path IN ({marks})", [str(root), *batch])
+                )
+        return {path: (blob_id, mtime, size, dirty) for path, blob_id, mtime, size, dirty in rows}
+
+    def _upsert_paths(
+        self,
+        connection: sqlite3.Connection,
+        root: Path,
+        rel_paths: Iterable[str],
+        known: dict[str, tuple[int, int, int, int]],
+        dirty_paths: set[str],
+        seeded: dict[str, str] | None = None,
+    ) -> int:
+        """Re-index changed paths (by stat) and delete vanished ones."""
+        changed = 0
+        released: list[int] = []
+        seeded = seeded or {}
+        pending: dict[str, tuple[str, _Stat]] = {}
+        for rel_path in rel_paths:
+            stat = _stat(root / rel_path)
+            previous = known.get(rel_path)
+            if stat is None:
+                if previous is not None:
+                    connection.execute(
+                        "DELETE FROM paths WHERE root = ? AND path = ?", (str(root), rel_path)
+                    )
+                    released.append(previous[0])
+                    changed += 1
+                continue
+            dirty = int(rel_path in dirty_paths)
+            if previous is not None and (previous[1], previous[2]) == (stat.mtime_ns, stat.size):
+                if previous[3] != dirty:
+                    connection.execute(
+                        "UPDATE paths SET dirty = ? WHERE root = ? AND path = ?",
+                        (dirty, str(root), rel_path),
+                    )
+                continue
+            sha = seeded.get(rel_path, "")
+            pending[rel_path] = (sha, stat)
+
+        known_blobs = self._blob_ids(connection, (sha for sha, _ in pending.values() if sha))
+        for rel_path, (sha, stat) in pending.items():
+            blob_id = known_blobs.get(sha) if sha else None
+            if blob_id is None:
+                try:
+                    data = (root / rel_path).read_bytes()
+                except OSError:
+                    continue
+                sha = git_blob_sha(data)
+                blob_id = self._blob_ids(connection, [sha]).get(sha)
+                if blob_id is None:
+                    blob_id = self._store_blob(connection, sha, data)
+            previous = known.get(rel_path)
+            if previous is not None and previous[0] != blob_id:
+                released.append(previous[0])
+            connection.execute(
+                "INSERT OR REPLACE INTO paths (root, path, blob_id, mtime_ns, size, dirty) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    str(root),
+                    rel_path,
+                    blob_id,
+                    stat.mtime_ns,
+                    stat.size,
+                    int(rel_path in dirty_paths),
+                ),
+            )
+            changed += 1
+        self._drop_orphans(connection, released)
+        return changed
+
+    def _sync_git_full(self, connection: sqlite3.Connection, root: Path) -> int | None:
+        staged = _run_git(root, "ls-files", "-s", "-z")
+        modified = _git_paths(root, "diff", "--name-only", "--relative", "-z")
+        untracked = _git_paths(root, "ls-files", "-z", "--others", "--exclude-standard")
+        if staged is None or modified is None or untracked is None:
+            return None
+        seeded: dict[str, str] = {}
+        for entry in staged.split("\0"):
+            meta, _, rel_path = entry.partition("\t")
+            fields = meta.split()
+            # Skip symlinks (120000) and submodules (160000).
+            if len(fields) == 3 and fields[0].startswith("100") and not _skipped(rel_path):
+                seeded[rel_path] = fields[1]
+        dirty = set(modified) | set(untracked)
+        for rel_path in dirty:
+            seeded.pop(rel_path, None)
+        known = self._known_paths(connection, root)
+        paths = set(seeded) | dirty | set(known)
+        return self._upsert_paths(connection, root, sorted(paths), known, dirty, seeded)
+
+    def _sync_git_incremental(
+        self, connection: sqlite3.Connection, root: Path, indexed_head: str
+    ) -> int | None:
+        changed = _git_paths(root, "diff", "--name-only", "--relative", "-z", indexed_head, "--")
+        untracked = _git_paths(root, "ls-files", "-z", "--others", "--exclude-standard")
+        if changed is None or untracked is None:
+            # Indexed HEAD is gone (history rewritten): resync from scratch.
+            return self._sync_git_full(connection, root)
+        dirty = set(changed) | set(untracked)
+        previously_dirty = {
+            row[0]
+            for row in connection.execute(
+                "SELECT path FROM paths WHERE root = ? AND dirty = 1", (str(root),)
+            )
+        }
+        candidates = sorted(dirty | previously_dirty)
+        known = self._known_paths(connection, root, candidates)
+        return self._upsert_paths(connection, root, candidates, known, dirty)
+
+    def _sync_walk(self, connection: sqlite3.Connection, root: Path) -> int:
+        known = self._known_paths(connection, root)
+        paths = set(walk_files(root)) | set(known)
+        return self._upsert_paths(connection, root, sorted(paths), known, set())
+
+    def forget_root(self, root: Path) -> None:
+        """Drop a worktree's paths (and blobs no other worktree uses)."""
+        root = root.resolve()
+        connection = self._connection()
+        with self._write_lock, connection:
+            blob_ids = [
+                row[0]
+                for row in connection.execute(
+                    "SELECT DISTINCT blob_id FROM paths WHERE root = ?", (str(root),)
+                )
+            ]
+            connection.execute("DELETE FROM paths WHERE root = ?", (str(root),))
+            connection.execute("DELETE FROM meta WHERE key = ?", (f"head:{root}",))
+            self._drop_orphans(connection, blob_ids)
+
+    def prune_missing_roots(self) -> list[str]:
+        """Forget roots whose directory no longer exists (removed worktrees)."""
+        roots = [row[0] for row in self._connection().execute("SELECT DISTINCT root FROM paths")]
+        missing = [root for root in roots if not Path(root).is_dir()]
+        for root in missing:
+            self.forget_root(Path(root))
+        return missing
+
+    # -- search -----------------------------------------------------------
+
+    def _candidates(
+        self, connection: sqlite3.Connection, root: Path, plans: list[set[int]] | None
+    ) -> tuple[list[str], int]:
+        (total,) = connection.execute(
+            "SELECT COUNT(*) FROM paths JOIN blobs ON blobs.id = paths.blob_id "
+            "WHERE paths.root = ? AND blobs.searchable = 1",
+            (str(root),),
+        ).fetchone()
+        if plans is None:
+            rows = connection.execute(
+                "SELECT paths.path FROM paths JOIN blobs ON blobs.id = paths.blob_id "
+                "WHERE paths.root = ? AND blobs.searchable = 1 ORDER BY paths.path",
+                (str(root),),
+            )
+            return [row[0] for row in rows], total
+        matching: set[int] = set()
+        for plan in plans:
+            matching |= self._intersect_postings(connection, plan)
+        if not matching:
+            return [], total
+        paths: list[str] = []
+        blob_ids = sorted(matching)
+        for offset in range(0, len(blob_ids), _WRITE_BATCH_SIZE):
+            batch = blob_ids[offset : offset + _WRITE_BATCH_SIZE]
+            marks = ",".join("?" * len(batch))
+            paths.extend(
+                row[0]
+                for row in connection.execute(
+                    f"SELECT path FROM paths WHERE root = ? AND blob_id IN ({marks})",
+                    [str(root), *batch],
+                )
+            )
+        return sorted(paths), total
+
+    @staticmethod
+    def _intersect_postings(connection: sqlite3.Connection, grams: set[int]) -> set[int]:
+        """Blob ids containing every gram, probing from the rarest gram up."""
+        counts = []
+        for gram in grams:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM postings WHERE gram = ?", (gram,)
+            ).fetchone()
+            if not count:
+                return set()
+            counts.append((count, gram))
+        ordered = [gram for _, gram in sorted(counts)]
+        joins = "".join(
+            f" JOIN postings p{index} ON p{index}.gram = ? AND p{index}.blob_id = p0.blob_id"
+            for index in range(1, len(ordered))
+        )
+        rows = connection.execute(
+            f"SELECT p0.blob_id FROM postings p0{joins} WHERE p0.gram = ?",
+            [*ordered[1:], ordered[0]],
+        )
+        return {row[0] for row in rows}
+
+    def search(
+        self,
+        root: Path,
+        pattern: str,
+        *,
+        ignore_case: bool = False,
+        prefix: str = "",
+        path_patterns: Sequence[str] = (),
+        context_lines: int = 0,
+        max_results: int = 50,
+        read_bytes: Callable[[Path], bytes] | None = None,
+        refresh: bool = True,
+    ) -> SearchResult:
+        """Regex search below `root`; raises re.error for invalid patterns."""
+        root = root.resolve()
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        if refresh:
+            self.refresh(root)
+        plans = query_trigrams(pattern, ignore_case=ignore_case)
+        candidates, total = self._candidates(self._connection(), root, plans)
+        prefix = prefix.strip("/")
+        if prefix:
+            candidates = [path for path in candidates if path.startswith(prefix + "/")]
+        if path_patterns:
+            candidates = [path for path in candidates if matches_any(path, path_patterns)]
+
+        reader = read_bytes or Path.read_bytes
+        hits: list[SearchHit] = []
+        truncated = False
+        for rel_path in candidates:
+            try:
+                text = reader(root / rel_path).decode("utf-8", errors="replace")
+            except OSError:
+                continue
+            file_hits = _match_lines(regex, text, rel_path, context_lines)
+            if len(hits) + len(file_hits) > max_results:
+                hits.extend(file_hits[: max_results - len(hits)])
+                truncated = True
+                break
+            hits.extend(file_hits)
+        return SearchResult(tuple(hits), len(candidates), total, truncated)
+
+
+def _clip(line: str) -> str:
+    return line if len(line) <= _MAX_LINE_CHARS else line[: _MAX_LINE_CHARS - 3] + "..."
+
+
+def _match_lines(
+    regex: re.Pattern[str], text: str, rel_path: str, context_lines: int
+) -> list[SearchHit]:
+    """Hits of `regex` searched one line at a time, so no match spans a newline."""
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        lines.pop()  # no line after the final newline
+    lines = [line.rstrip("\r") for line in lines]
+    hits: list[SearchHit] = []
+    for index, line in enumerate(lines):
+        if regex.search(line) is None:
+            continue
+        hits.append(
+            SearchHit(
+                rel_path,
+                index + 1,
+                _clip(line),
+                tuple(_clip(item) for item in lines[max(0, index - context_lines) : index]),
+                tuple(_clip(item) for item in lines[index + 1 : index + 1 + context_lines]),
+            )
+        )
+    return hits
+
+
+def render_hits(result: SearchResult) -> str:
+    """grep-style rendering: `path:line: text`, context as `path-line- text`."""
+    lines: list[str] = []
+    previous: SearchHit | None = None
+    for hit in result.hits:
+        if lines and (hit.before or hit.after or (previous and previous.path != hit.path)):
+            lines.append("--")
+        first = hit.line_number - len(hit.before)
+        for offset, line in enumerate(hit.before):
+            lines.append(f"{hit.path}-{first + offset}- {line}")
+        lines.append(f"{hit.path}:{hit.line_number}: {hit.line}")
+        for offset, line in enumerate(hit.after, start=1):
+            lines.append(f"{hit.path}-{hit.line_number + offset}- {line}")
+        previous = hit
+    return "\n".join(lines)
+
+
+_INDEXES: dict[Path, CodeSearchIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def code_search_index(db_path: Path) -> CodeSearchIndex:
+    """Process-wide index for `db_path` (one per repository)."""
+    key = db_path.resolve()
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = CodeSearchIndex(key)
+        return index
+
+
+def default_index_path(cache_dir: Path, repo_name: str) -> Path:
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", repo_name) or "project"
+    return cache_dir / f"{safe}.sqlite3"
+
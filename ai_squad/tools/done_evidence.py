@@ -0,0 +1,295 @@
+"""Declarative Done-evidence rules for `update_task_status`.
+
+Marking a functional task (APPn/WEBn/Bn) as Done requires evidence in the
+repository. The evidence used to be hardcoded per task; it now lives in
+rule files:
+
+- `ai_squad/config/done_evidence/<repo>.json` (shipped with the squad);
+- `<project>/.context/done_evidence_rules.json` (optional, per repo), whose
+  tasks replace the shipped ones with the same id.
+
+Format::
+
+    {"tasks": {"WEB3": [<rule>, ...]}}
+
+Rules run in order and the first failing one blocks with its `message`.
+Rule types:
+
+- `required_paths`: every `paths` entry exists (`{missing}` in the message
+  lists the missing ones).
+- `content`: files selected by `path`, or by `dir` + `pattern` (glob), must
+  match every `require` regex and no `forbid` regex (MULTILINE). `scope`
+  is "each" (default: every selected file) or "any" (at least one file).
+  A missing `path` matches nothing.
+- `compiles`: `path` is valid Python (`{error}` in the message).
+- `test_coverage`: a `content` rule with scope "any" over `tests/test_*.py`
+  by default: at least one test file matches every `require` regex.
+
+Each file is read once per check and all patterns requested for it are
+matched in one combined scan; `dir` selections are scanned on a thread pool
+and "any" rules stop at the first matching file.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from .file_listing import list_files
+
+RULE_TYPES = frozenset({"required_paths", "content", "compiles", "test_coverage"})
+OVERRIDE_RULES_PATH = Path(".context") / "done_evidence_rules.json"
+DEFAULT_EVIDENCE_WORKERS = 8
+
+
+class EvidenceRuleError(ValueError):
+    """A rules file is malformed."""
+
+
+@dataclass(frozen=True)
+class EvidenceRule:
+    type: str
+    message: str
+    paths: tuple[str, ...] = ()
+    path: str = ""
+    dir: str = ""
+    pattern: str = ""
+    require: tuple[str, ...] = ()
+    forbid: tuple[str, ...] = ()
+    scope: str = "each"  # each | any
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> EvidenceRule:
+        rule_type = str(raw.get("type", ""))
+        if rule_type not in RULE_TYPES:
+            raise EvidenceRuleError(f"unknown rule type: {rule_type!r}")
+        if not raw.get("message"):
+            raise EvidenceRuleError(f"{rule_type} rule without message")
+        defaults: dict = {}
+        if rule_type == "test_coverage":
+            defaults = {"dir": "tests", "pattern": "test_*.py", "scope": "any"}
+        rule = cls(
+            type=rule_type,
+            message=str(raw["message"]),
+            paths=tuple(str(item) for item in raw.get("paths", ())),
+            path=str(raw.get("path", "")),
+            dir=str(raw.get("dir", defaults.get("dir", ""))),
+            pattern=str(raw.get("pattern", defaults.get("pattern", "*"))),
+            require=tuple(str(item) for item in raw.get("require", ())),
+            forbid=tuple(str(item) for item in raw.get("forbid", ())),
+            scope=str(raw.get("scope", defaults.get("scope", "each"))),
+        )
+        if rule.scope not in ("each", "any"):
+            raise EvidenceRuleError(f"unknown scope: {rule.scope!r}")
+        if rule_type in ("content", "test_coverage") and not (rule.path or rule.dir):
+            raise EvidenceRuleError(f"{rule_type} rule needs 'path' or 'dir'")
+        if rule_type == "compiles" and not rule.path:
+            raise EvidenceRuleError("compiles rule needs 'path'")
+        for expression in (*rule.require, *rule.forbid):
+            try:
+                re.compile(expression)
+            except re.error as error:
+                raise EvidenceRuleError(f"invalid regex {expression!r}: {error}") from error
+        return rule
+
+    @property
+    def patterns(self) -> tuple[str, ...]:
+        return self.require + self.forbid
+
+
+EvidenceRules = dict[str, tuple[EvidenceRule, ...]]
+
+
+def parse_evidence_rules(payload: dict) -> EvidenceRules:
+    tasks = payload.get("tasks", {})
+    if not isinstance(tasks, dict):
+        raise EvidenceRuleError("'tasks' must be an object")
+    return {
+        str(task_id).strip().upper(): tuple(EvidenceRule.from_dict(rule) for rule in rules)
+        for task_id, rules in tasks.items()
+    }
+
+
+def load_evidence_rules(
+    repo: str,
+    config_dir: Path,
+    project_root: Path | None = None,
+    read_text: Callable[[Path], str] | None = None,
+) -> EvidenceRules:
+    """Shipped rules for `repo`, with the project's override file applied."""
+    reader = read_text or (lambda path: path.read_text(encoding="utf-8"))
+    rules: EvidenceRules = {}
+    sources = [config_dir / f"{repo}.json"]
+    if project_root is not None:
+        sources.append(project_root / OVERRIDE_RULES_PATH)
+    for source in sources:
+        if not source.is_file():
+            continue
+        try:
+            payload = json.loads(reader(source))
+        except ValueError as error:
+            raise EvidenceRuleError(f"{source}: invalid JSON ({error})") from error
+        rules.update(parse_evidence_rules(payload))
+    return rules
+
+
+@lru_cache(maxsize=1024)
+def _combinable(pattern: str) -> bool:
+    # Groups are renumbered inside the combined expression, so patterns with
+    # groups (and backreferences to them) are searched on their own.
+    return re.compile(pattern, re.MULTILINE).groups == 0
+
+
+@lru_cache(maxsize=128)
+def _combined_pattern(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    # Zero-width alternatives: a match never consumes text another pattern
+    # might need.
+    try:
+        return re.compile(
+            "|".join(f"(?=(?P<p{index}>{pattern}))" for index, pattern in enumerate(patterns)),
+            re.MULTILINE,
+        )
+    except re.error:
+        return None  # e.g. a global inline flag like (?i) that is not at the start
+
+
+def find_patterns(text: str, patterns: tuple[str, ...]) -> frozenset[str]:
+    """Subset of `patterns` that match `text`, from one combined scan.
+
+    Patterns that can only match where an earlier alternative already
+    matched, patterns with groups, and patterns that cannot be combined are
+    confirmed with an individual search.
+    """
+    if not patterns:
+        return frozenset()
+    found: set[str] = set()
+    combinable = tuple(dict.fromkeys(pattern for pattern in patterns if _combinable(pattern)))
+    combined = _combined_pattern(combinable) if combinable else None
+    if combined is not None:
+        for match in combined.finditer(text):
+            found.add(combinable[int(match.lastgroup[1:])])  # type: ignore[index]
+            if len(found) == len(combinable):
+                break
+    for pattern in patterns:
+        if pattern not in found and re.search(pattern, text, re.MULTILINE):
+            found.add(pattern)
+    return frozenset(found)
+
+
+class EvidenceChecker:
+    """Evaluates one task's rules against a project tree."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        read_text: Callable[[Path], str] | None = None,
+        list_source: str = "auto",
+        workers: int = DEFAULT_EVIDENCE_WORKERS,
+    ) -> None:
+        self.root = root
+        self.read_text = read_text or (lambda path: path.read_text(encoding="utf-8"))
+        self.list_source = list_source
+        self.workers = max(1, workers)
+        self._texts: dict[Path, str | None] = {}
+        self._found: dict[Path, tuple[frozenset[str], frozenset[str]]] = {}
+        self._planned: dict[Path, tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def _text(self, path: Path) -> str | None:
+        """File content, read once per checker (None when missing/not UTF-8)."""
+        with self._lock:
+            if path in self._texts:
+                return self._texts[path]
+        text: str | None
+        try:
+            text = self.read_text(path) if path.is_file() else None
+        except (OSError, UnicodeDecodeError):
+            text = None
+        with self._lock:
+            self._texts[path] = text
+        return text
+
+    def _plan(self, rules: Iterable[EvidenceRule]) -> None:
+        """Collect every pattern asked of each single-`path` file."""
+        for rule in rules:
+            if rule.type in ("content", "test_coverage") and rule.path:
+                path = self.root / rule.path
+                known = self._planned.get(path, ())
+                self._planned[path] = known + tuple(p for p in rule.patterns if p not in known)
+
+    def _patterns_found(self, path: Path, text: str, patterns: tuple[str, ...]) -> frozenset[str]:
+        with self._lock:
+            scanned, found = self._found.get(path, (frozenset(), frozenset()))
+        if scanned.issuperset(patterns):
+            return found
+        wanted = tuple(dict.fromkeys((*self._planned.get(path, ()), *patterns)))
+        found = find_patterns(text, wanted)
+        with self._lock:
+            self._found[path] = (frozenset(wanted), found)
+        return found
+
+    def _satisfies(self, path: Path, rule: EvidenceRule) -> bool:
+        text = self._text(path)
+        if text is None:
+            return not rule.require
+        found = self._patterns_found(path, text, rule.patterns)
+        return all(item in found for item in rule.require) and not any(
+            item in found for item in rule.forbid
+        )
+
+    def _selected(self, rule: EvidenceRule) -> list[Path]:
+        if rule.path:
+            return [self.root / rule.path]
+        start = self.root / rule.dir
+        if not start.is_dir():
+            return []
+        return [
+            self.root / rel_path
+            for rel_path in list_files(
+                self.root, start, patterns=[rule.pattern], source=self.list_source
+            )
+        ]
+
+    def _content_ok(self, rule: EvidenceRule) -> bool:
+        files = self._selected(rule)
+        if len(files) <= 1:
+            results: Iterable[bool] = (self._satisfies(path, rule) for path in files)
+            return any(results) if rule.scope == "any" else all(results)
+        wanted = rule.scope == "any"  # result that decides the rule early
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(files))) as executor:
+            pending = {executor.submit(self._satisfies, path, rule) for path in files}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                if any(future.result() is wanted for future in done):
+                    for future in pending:
+                        future.cancel()
+                    return wanted
+        return not wanted
+
+    def first_failure(self, rules: Iterable[EvidenceRule]) -> str | None:
+        """Message of the first failing rule, or None when all pass."""
+        rules = tuple(rules)
+        self._plan(rules)
+        for rule in rules:
+            if rule.type == "required_paths":
+                missing = [item for item in rule.paths if not (self.root / item).exists()]
+                if missing:
+                    return rule.message.replace("{missing}", ", ".join(missing))
+            elif rule.type == "compiles":
+                path = self.root / rule.path
+                try:
+                    compile(self.read_text(path), str(path), "exec")
+                except (SyntaxError, OSError, UnicodeDecodeError) as error:
+                    return rule.message.replace("{error}", str(error))
+            elif not self._content_ok(rule):
+                return rule.message
+        return None
@@ -0,0 +1,176 @@
+"""Encoding-corruption guard for `write_file_content`.
+
+The squad edits Portuguese-heavy files; a model that mangles accents
+(`ção` -> `cao`, `ção` -> `Ã§Ã£o`, `ção` -> `�`) must be stopped before the
+file is overwritten. The guard compares per-character histograms of the
+non-ASCII characters in the old and the new text:
+
+- losing more than half of the non-ASCII characters blocks the write (the
+  original rule);
+- accented characters disappearing while mojibake / replacement characters
+  (`Ã`, `Â`, `�`) appear blocks it too, even though a raw count would go
+  *up* in that case.
+
+Histograms are built from the UTF-8 bytes: ASCII-only content
+short-circuits on `bytes.isascii()`, otherwise `bytes.translate` drops the
+ASCII bytes and the (small) remainder is counted per distinct character.
+`HistogramCache` keeps the old file's histogram per (path, mtime_ns, size),
+so repeated writes to the same large file do not re-read or re-scan it.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+_ASCII_BYTES = bytes(range(0x80))
+_NON_ASCII_TEXT_RE = re.compile(r"[^\x00-\x7f]")
+# Above this many distinct characters, one Counter pass beats str.count().
+_MAX_COUNTED_CHARS = 64
+
+# Characters that show up when UTF-8 text is decoded as Latin-1/cp1252 or
+# when undecodable bytes are replaced.
+CORRUPTION_MARKERS = ("�", "Ã", "Â")
+
+MIN_NON_ASCII_CHARS = 5
+_MAX_LOSS_RATIO = 0.5
+_MESSAGE_PREVIEW_CHARS = 6
+DEFAULT_HISTOGRAM_CACHE_ENTRIES = 256
+
+Histogram = Counter  # non-ASCII character -> occurrences
+
+
+def histogram_of_bytes(data: bytes) -> Histogram | None:
+    """Non-ASCII character histogram of UTF-8 `data`; None if not valid UTF-8."""
+    if data.isascii():
+        return Counter()
+    try:
+        non_ascii = data.translate(None, _ASCII_BYTES).decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    distinct = set(non_ascii)
+    if len(distinct) > _MAX_COUNTED_CHARS:
+        return Counter(non_ascii)
+    return Counter({char: non_ascii.count(char) for char in distinct})
+
+
+def histogram_of_text(text: str) -> Histogram:
+    """Non-ASCII character histogram of `text`."""
+    if text.isascii():
+        return Counter()
+    histogram = histogram_of_bytes(text.encode("utf-8", "surrogatepass"))
+    if histogram is None:  # lone surrogates
+        return Counter(_NON_ASCII_TEXT_RE.findall(text))
+    return histogram
+
+
+def _describe(changes: list[tuple[str, int, int]]) -> str:
+    return ", ".join(
+        f"'{char}' {before}->{after}" for char, before, after in changes[:_MESSAGE_PREVIEW_CHARS]
+    )
+
+
+def corruption_message(old: Histogram, new: Histogram) -> str | None:
+    """BLOCKED message when `new` looks like a corrupted copy of `old`."""
+    old_total = sum(old.values())
+    new_total = sum(new.values())
+    if old_total <= MIN_NON_ASCII_CHARS:
+        return None
+
+    # If old file had accented chars and new content lost >50% of them
+    if new_total < old_total * _MAX_LOSS_RATIO:
+        return (
+            f"BLOCKED: encoding corruption detected. "
+            f"Existing file has {old_total} non-ASCII chars "
+            f"(accents, special chars) but new content has only "
+            f"{new_total}. The LLM likely corrupted accented "
+            f"characters. To fix: read the file again and preserve "
+            f"ALL original characters exactly as they are."
+        )
+
+    gained_markers = [
+        (char, old[char], new[char]) for char in CORRUPTION_MARKERS if new[char] > old[char]
+    ]
+    if not gained_markers:
+        return None
+    lost = sorted(
+        (
+            (char, count, new[char])
+            for char, count in old.items()
+            if char not in CORRUPTION_MARKERS and new[char] < count * _MAX_LOSS_RATIO
+        ),
+        key=lambda change: change[2] - change[1],
+    )
+    if not lost:
+        return None
+    return (
+        "BLOCKED: encoding corruption detected. "
+        f"Accented characters disappeared ({_describe(lost)}) while mojibake/replacement "
+        f"characters appeared ({_describe(gained_markers)}). The content was likely "
+        "decoded with the wrong encoding. To fix: read the file again and preserve "
+        "ALL original characters exactly as they are."
+    )
+
+
+class HistogramCache:
+    """Old-file histograms keyed by (resolved path, mtime_ns, size), LRU-bounded.
+
+    `reader` supplies the bytes on a miss (e.g. the tools' shared ReadCache).
+    `on_event` receives "hit" and "miss" for telemetry.
+    """
+
+    def __init__(
+        self,
+        reader: Callable[[Path], bytes] | None = None,
+        max_entries: int = DEFAULT_HISTOGRAM_CACHE_ENTRIES,
+        *,
+        on_event: Callable[[str], None] | None = None,
+    ) -> None:
+        self.reader = reader or (lambda path: path.read_bytes())
+        self.max_entries = max(1, max_entries)
+        self.on_event = on_event
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, int, int], Histogram | None] = OrderedDict()
+
+    def _emit(self, event: str) -> None:
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def histogram(self, path: Path) -> Histogram | None:
+        """Histogram of the file's current version (None when not UTF-8)."""
+        resolved = path.resolve()
+        stat_result = resolved.stat()
+        key = (str(resolved), stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                cached = self._entries[key]
+                hit = True
+            else:
+                hit = False
+        if hit:
+            self._emit("hit")
+            return cached
+
+        self._emit("miss")
+        histogram = histogram_of_bytes(self.reader(resolved))
+        with self._lock:
+            for stale in [entry for entry in self._entries if entry[0] == key[0]]:
+                del self._entries[stale]
+            self._entries[key] = histogram
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return histogram
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,537 @@
+"""File I/O primitives shared by the squad tools.
+
+Kept free of CrewAI imports so it can be used from `main.py`, from the
+tools and from tests.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import stat
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+
+try:  # POSIX only; on other platforms only the in-process lock applies.
+    import fcntl
+except ImportError:  # pragma: no cover - platform dependent
+    fcntl = None  # type: ignore[assignment]
+
+
+def _current_umask() -> int:
+    """Process umask, read without changing it when /proc allows."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+def atomic_write_text(path: Path, content: str, encoding: str = "utf-8") -> None:
+    """Write `content` to `path` via temp file + `os.replace`.
+
+    A crash mid-write leaves either the previous file or the new one, never a
+    truncated mix. The permission bits of an existing file are preserved; a
+    new file gets the mode a plain `open()` would give it (0o666 & ~umask)
+    rather than mkstemp's 0o600.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_current_umask()
+
+    fd, tmp_name = tempfile.mkstemp(
+        dir=str(path.parent),
+        prefix=f".{path.name}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "w", encoding=encoding, newline="") as handle:
+            handle.write(content)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_text_if_changed(path: Path, content: str, encoding: str = "utf-8") -> str:
+    """Atomically write `content` unless the file already holds exactly it.
+
+    Returns "created", "written" or "unchanged". A no-op write leaves the
+    file (and its mtime) untouched, so watchers and caches keyed on mtime
+    do not fire for it.
+    """
+    data = content.encode(encoding)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return "unchanged"
+        status = "written"
+    except FileNotFoundError:
+        status = "created"
+    atomic_write_text(path, content, encoding)
+    return status
+
+
+class JsonlAppender:
+    """Long-lived, thread- and process-safe JSONL appender.
+
+    - One file descriptor opened with O_APPEND is kept for the whole run.
+    - Each batch of records is encoded up front and written with a single
+      `os.write` while holding a thread lock plus an exclusive `flock`, so
+      lines from concurrent threads or processes never interleave or tear.
+    - fsync is group-committed: at most once every `fsync_every` lines or
+      `fsync_interval` seconds, and on `sync()`/`close()`.
+    - If the file ends with a torn line (crashed writer), a newline is
+      written first so the next record starts on its own line.
+    - `rotate()` renames the file away under the same locks; other writers
+      notice the inode change and reopen the path before their next write.
+      `exclusive()` holds those locks for other rewrites (e.g. trimming).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        fsync_every: int = 32,
+        fsync_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+        self._pending = 0
+        self._last_sync = monotonic()
+
+    def _open(self) -> int:
+        if self._fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(
+                str(self.path), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644
+            )
+        return self._fd
+
+    @staticmethod
+    def _needs_leading_newline(fd: int) -> bool:
+        size = os.fstat(fd).st_size
+        return size > 0 and os.pread(fd, 1, size - 1) != b"\n"
+
+    def append(self, record: dict[str, object]) -> None:
+        self.append_many([record])
+
+    def _lock_current(self) -> int:
+        """Open and flock the file currently at `path` (reopening if rotated)."""
+        while True:
+            fd = self._open()
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                current = os.stat(self.path)
+            except FileNotFoundError:
+                current = None
+            opened = os.fstat(fd)
+            if current is not None and (current.st_ino, current.st_dev) == (
+                opened.st_ino,
+                opened.st_dev,
+            ):
+                return fd
+            self._release(fd)
+            self._close_fd()
+
+    @staticmethod
+    def _release(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _close_fd(self) -> None:
+        if self._fd is not None:
+            if self._pending:
+                os.fsync(self._fd)
+                self._pending = 0
+            os.close(self._fd)
+            self._fd = None
+
+    def append_many(self, records: Iterable[dict[str, object]]) -> None:
+        lines = [json.dumps(record, ensure_ascii=True) + "\n" for record in records]
+        if not lines:
+            return
+        payload = "".join(lines).encode("utf-8")
+        with self._lock:
+            fd = self._lock_current()
+            try:
+                if self._needs_leading_newline(fd):
+                    payload = b"\n" + payload
+                view = memoryview(payload)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+            finally:
+                self._release(fd)
+            self._pending += len(lines)
+            if (
+                self._pending >= self.fsync_every
+                or monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync_locked()
+
+    def rotate(self, destination: Path) -> bool:
+        """Move the current file to `destination`; the next append starts a new one.
+
+        Returns False when there is nothing to rotate (missing or empty file).
+        """
+        with self._lock:
+            if not self.path.exists():
+                return False
+            fd = self._lock_current()
+            try:
+                if os.fstat(fd).st_size == 0:
+                    return False
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                os.fsync(fd)
+                os.replace(self.path, destination)
+            finally:
+                self._release(fd)
+            self._pending = 0
+            self._close_fd()
+            return True
+
+    @contextmanager
+    def exclusive(self) -> Iterator[int]:
+        """Hold the append locks on the current file and yield its descriptor.
+
+        Appends from other threads/processes wait until the block exits; a
+        block that replaces the path (temp file + `os.replace`) is safe, as
+        waiting writers reopen the new file. Do not append through this
+        instance inside the block.
+        """
+        with self._lock:
+            fd = self._lock_current()
+            try:
+                yield fd
+            finally:
+                self._release(fd)
+                self._close_fd()
+
+    def _sync_locked(self) -> None:
+        if self._fd is not None and self._pending:
+            os.fsync(self._fd)
+        self._pending = 0
+        self._last_sync = monotonic()
+
+    def sync(self) -> None:
+        """Flush pending lines to stable storage."""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_fd()
+
+
+# ---------------------------------------------------------------------------
+# Read cache
+# ---------------------------------------------------------------------------
+
+DEFAULT_READ_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class _CachedFile:
+    data: bytes
+    text: str | None = None
+
+    @property
+    def cost(self) -> int:
+        # str of mostly-ASCII source costs about as much as its bytes.
+        return len(self.data) + (len(self.text) if self.text is not None else 0)
+
+
+class ReadCache:
+    """Content cache keyed by (resolved path, mtime_ns, size) with an LRU byte budget.
+
+    Every lookup stats the file, so a changed file is never served stale;
+    `invalidate()`/`clear()` cover same-tick rewrites and git checkouts.
+    `on_event` receives "hit", "miss" and "eviction" for telemetry.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_READ_CACHE_MAX_BYTES,
+        *,
+        on_event: Callable[[str], None] | None = None,
+    ) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self.on_event = on_event
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, int, int], _CachedFile] = OrderedDict()
+        self._paths: dict[str, tuple[str, int, int]] = {}
+        self._used = 0
+
+    def _emit(self, event: str) -> None:
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def _entry(self, path: Path) -> tuple[_CachedFile, tuple[str, int, int] | None]:
+        """Return (entry, cache key); the key is None when not cached (too big)."""
+        resolved = path.resolve()
+        stat_result = resolved.stat()
+        key = (str(resolved), stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            self._emit("hit")
+            return entry, key
+
+        self._emit("miss")
+        entry = _CachedFile(resolved.read_bytes())
+        if len(entry.data) > self.max_bytes:
+            return entry, None
+        with self._lock:
+            self._drop_locked(key[0])
+            self._entries[key] = entry
+            self._paths[key[0]] = key
+            self._used += entry.cost
+            self._evict_locked()
+        return entry, key
+
+    def _drop_locked(self, resolved: str) -> None:
+        previous = self._paths.pop(resolved, None)
+        if previous is not None:
+            entry = self._entries.pop(previous, None)
+            if entry is not None:
+                self._used -= entry.cost
+
+    def _evict_locked(self) -> None:
+        while self._used > self.max_bytes and self._entries:
+            key, entry = self._entries.popitem(last=False)
+            self._paths.pop(key[0], None)
+            self._used -= entry.cost
+            self._emit("eviction")
+
+    def read_bytes(self, path: Path) -> bytes:
+        return self._entry(path)[0].data
+
+    def read_text(self, path: Path, encoding: str = "utf-8") -> str:
+        """Decode once per file version; raises UnicodeDecodeError like read_text."""
+        entry, key = self._entry(path)
+        if encoding != "utf-8":
+            return entry.data.decode(encoding)
+        if entry.text is None:
+            text = entry.data.decode("utf-8")
+            with self._lock:
+                if entry.text is None:
+                    entry.text = text
+                    if key is not None and self._entries.get(key) is entry:
+                        self._used += len(text)
+                        self._evict_locked()
+        return entry.text
+
+    def invalidate(self, path: Path) -> None:
+        with self._lock:
+            self._drop_locked(str(path.resolve()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._paths.clear()
+            self._used = 0
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+
+# ---------------------------------------------------------------------------
+# Ranged reads
+# ---------------------------------------------------------------------------
+
+DEFAULT_READ_MAX_BYTES = 256 * 1024
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+_LINE_INDEX_CACHE_SIZE = 32
+_DIGEST_CACHE_SIZE = 256
+
+
+def _line_starts(buffer: bytes | mmap.mmap) -> array:
+    """Byte offset of every line start (plus the end offset as sentinel)."""
+    starts = array("Q", [0])
+    size = len(buffer)
+    position = buffer.find(b"\n")
+    while position != -1:
+        if position + 1 < size:
+            starts.append(position + 1)
+        position = buffer.find(b"\n", position + 1)
+    starts.append(size)
+    return starts
+
+
+_LINE_INDEX_CACHE: OrderedDict[tuple[str, int, int], array] = OrderedDict()
+_LINE_INDEX_LOCK = threading.Lock()
+
+
+def _cached_line_starts(path: Path, signature: tuple[int, int], buffer: mmap.mmap) -> array:
+    key = (str(path), *signature)
+    with _LINE_INDEX_LOCK:
+        cached = _LINE_INDEX_CACHE.get(key)
+        if cached is not None:
+            _LINE_INDEX_CACHE.move_to_end(key)
+            return cached
+    starts = _line_starts(buffer)
+    with _LINE_INDEX_LOCK:
+        _LINE_INDEX_CACHE[key] = starts
+        while len(_LINE_INDEX_CACHE) > _LINE_INDEX_CACHE_SIZE:
+            _LINE_INDEX_CACHE.popitem(last=False)
+    return starts
+
+
+_DIGEST_CACHE: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 hex digest of a file, streamed once per (path, mtime, size)."""
+    stat_result = path.stat()
+    key = (str(path.resolve()), stat_result.st_mtime_ns, stat_result.st_size)
+    with _LINE_INDEX_LOCK:
+        cached = _DIGEST_CACHE.get(key)
+        if cached is not None:
+            _DIGEST_CACHE.move_to_end(key)
+            return cached
+    with path.open("rb") as handle:
+        digest = hashlib.file_digest(handle, "sha256").hexdigest()
+    with _LINE_INDEX_LOCK:
+        _DIGEST_CACHE[key] = digest
+        while len(_DIGEST_CACHE) > _DIGEST_CACHE_SIZE:
+            _DIGEST_CACHE.popitem(last=False)
+    return digest
+
+
+@dataclass(frozen=True)
+class FileRange:
+    """A slice of a text file, by 1-based inclusive line numbers."""
+
+    text: str
+    start_line: int
+    end_line: int
+    total_lines: int
+    next_line: int  # 0 when the requested range was fully returned
+    next_byte: int = 0  # byte offset into `next_line` when a long line was split
+    start_byte: int = 0  # byte offset into `start_line` the text begins at
+
+    @property
+    def complete(self) -> bool:
+        return (
+            self.start_line <= 1
+            and self.start_byte == 0
+            and self.next_line == 0
+            and self.end_line >= self.total_lines
+        )
+
+
+def _slice_lines(
+    buffer: bytes | mmap.mmap,
+    starts: array,
+    start_line: int,
+    end_line: int,
+    max_bytes: int,
+    start_byte: int = 0,
+) -> FileRange:
+    total = len(starts) - 1 if starts[-1] > 0 else 0
+    if total == 0:
+        return FileRange("", 0, 0, 0, 0)
+    first = min(max(start_line, 1), total)
+    last = total if end_line <= 0 else min(max(end_line, first), total)
+
+    line_begin = starts[first - 1]
+    begin = line_begin + min(max(start_byte, 0), starts[first] - line_begin)
+    # Largest `stop` with starts[stop] - begin <= max_bytes (whole lines only).
+    stop = last
+    if starts[stop] - begin > max_bytes:
+        low, high = first - 1, last
+        while low < high:
+            middle = (low + high + 1) // 2
+            if starts[middle] - begin <= max_bytes:
+                low = middle
+            else:
+                high = middle - 1
+        stop = low
+
+    if stop < first:
+        # A single line is larger than the budget: page within it, cutting on
+        # a UTF-8 character boundary, and continue from the same line.
+        end = begin + max_bytes
+        while end > begin and buffer[end] & 0xC0 == 0x80:
+            end -= 1
+        if end == begin:
+            end = begin + max_bytes
+        chunk = bytes(buffer[begin:end])
+        text = chunk.decode("utf-8", errors="replace")
+        return FileRange(
+            text, first, first, total, first, end - line_begin, begin - line_begin
+        )
+
+    chunk = bytes(buffer[begin : starts[stop]])
+    next_line = stop + 1 if stop < last else 0
+    return FileRange(
+        chunk.decode("utf-8", errors="replace"),
+        first,
+        stop,
+        total,
+        next_line,
+        start_byte=begin - line_begin,
+    )
+
+
+def read_line_range(
+    path: Path,
+    start_line: int = 1,
+    end_line: int = 0,
+    max_bytes: int = DEFAULT_READ_MAX_BYTES,
+    *,
+    cache: ReadCache | None = None,
+    start_byte: int = 0,
+) -> FileRange:
+    """Read lines `start_line..end_line` (0 = EOF) without exceeding `max_bytes`.
+
+    Files above `MMAP_THRESHOLD_BYTES` are memory-mapped and their line-start
+    offsets are indexed once per (path, mtime, size), so a mid-file range only
+    decodes the requested bytes. Only whole lines are returned unless a single
+    line exceeds the budget: that line is then paged, and `next_byte` is the
+    offset into `next_line` to pass back as `start_byte`. `next_line` is the
+    continuation cursor. Smaller files go through `cache` when given.
+    """
+    max_bytes = max(1, max_bytes)
+    stat_result = path.stat()
+    if stat_result.st_size < MMAP_THRESHOLD_BYTES:
+        data = cache.read_bytes(path) if cache is not None else path.read_bytes()
+        return _slice_lines(
+            data, _line_starts(data), start_line, end_line, max_bytes, start_byte
+        )
+
+    signature = (stat_result.st_mtime_ns, stat_result.st_size)
+    with path.open("rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        starts = _cached_line_starts(path.resolve(), signature, mapped)
+        return _slice_lines(mapped, starts, start_line, end_line, max_bytes, start_byte)
@@ -0,0 +1,489 @@
+"""Pruning, ignore-aware project file listing.
+
+`rglob("*")` descends into every directory, including the `node_modules` and
+`.venv` symlinks that `_hydrate_execution_worktree` attaches to worktrees.
+This walker uses `os.scandir` and prunes before descending:
+
+- dependency/build/cache directories (`SKIP_DIR_NAMES`) are never entered;
+- symlinked directories are never followed;
+- `.gitignore` files (root and nested, with negation) are honoured.
+
+Results come out in a deterministic depth-first order (names sorted per
+directory), which lets callers paginate with a continuation cursor: the
+cursor is the last returned path, and resuming skips whole subtrees that
+sort before it without scanning them.
+
+`GitFileIndex` answers the same queries from `git ls-files` (tracked plus
+untracked, minus deleted), cached per worktree and invalidated when the
+worktree's HEAD or index changes. Listing a directory is then a bisect
+prefix query on an in-memory sorted list. `list_files()` picks the git
+index when the root is a git worktree and falls back to the walker.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from time import monotonic
+
+SKIP_DIR_NAMES = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        ".venv",
+        "venv",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".tox",
+        ".nox",
+        ".cache",
+        ".turbo",
+        ".next",
+        ".nuxt",
+        ".output",
+        ".expo",
+        "dist",
+        "build",
+        "coverage",
+        "htmlcov",
+    }
+)
+
+DEFAULT_PAGE_LIMIT = 500
+GIT_TIMEOUT_SECONDS = 30
+
+
+@lru_cache(maxsize=512)
+def glob_to_regex(pattern: str) -> re.Pattern[str]:
+    """Translate a gitignore-style glob (`*`, `?`, `[...]`, `**`) to a regex."""
+    index = 0
+    parts: list[str] = []
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            close = pattern.find("]", index + 1)
+            if close == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[index + 1 : close].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                index = close
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    regex: re.Pattern[str]
+    negated: bool
+    dir_only: bool
+    anchored: bool
+    base: str  # posix dir of the .gitignore, relative to the walk root ("" = root)
+
+
+def parse_gitignore(text: str, base: str = "") -> list[IgnoreRule]:
+    rules: list[IgnoreRule] = []
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        line = line.lstrip("/")
+        rules.append(
+            IgnoreRule(
+                regex=glob_to_regex(line),
+                negated=negated,
+                dir_only=dir_only,
+                anchored=anchored,
+                base=base,
+            )
+        )
+    return rules
+
+
+def is_ignored(rules: Sequence[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """Apply rules in order; the last matching rule wins (gitignore semantics)."""
+    ignored = False
+    name = rel_path.rsplit("/", 1)[-1]
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.base:
+            prefix = rule.base + "/"
+            if not rel_path.startswith(prefix):
+                continue
+            local = rel_path[len(prefix) :]
+        else:
+            local = rel_path
+        target = local if rule.anchored else name
+        if rule.regex.match(target):
+            ignored = not rule.negated
+    return ignored
+
+
+def _load_rules(directory: Path, base: str) -> list[IgnoreRule]:
+    try:
+        text = (directory / ".gitignore").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+    return parse_gitignore(text, base)
+
+
+def matches_any(rel_path: str, patterns: Sequence[str]) -> bool:
+    """Glob filter: patterns without `/` match the basename, others the path."""
+    if not patterns:
+        return True
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        target = rel_path if "/" in pattern else name
+        if glob_to_regex(pattern).match(target):
+            return True
+    return False
+
+
+def _cursor_parts(cursor: str) -> tuple[str, ...]:
+    return tuple(part for part in cursor.strip().strip("/").split("/") if part)
+
+
+def walk_files(
+    root: Path,
+    start: Path | None = None,
+    *,
+    max_depth: int = 0,
+    patterns: Sequence[str] = (),
+    respect_gitignore: bool = True,
+    cursor: str = "",
+) -> Iterator[str]:
+    """Yield file paths (posix, relative to `root`) below `start`.
+
+    `max_depth` counts directory levels below `start` (0 = unlimited,
+    1 = only files directly in `start`). Paths sorting at or before
+    `cursor` are skipped.
+    """
+    start = start or root
+    after = _cursor_parts(cursor)
+    rules: list[IgnoreRule] = []
+    if respect_gitignore:
+        rules = _load_rules(root, "")
+        if start != root:
+            # Nested .gitignore files between root and start also apply
+            # (start's own file is loaded by _walk_dir).
+            current = root
+            for part in start.relative_to(root).parts[:-1]:
+                current = current / part
+                rules += _load_rules(current, current.relative_to(root).as_posix())
+
+    start_rel = "" if start == root else start.relative_to(root).as_posix()
+    yield from _walk_dir(start, start_rel, rules, 1, max_depth, patterns, respect_gitignore, after)
+
+
+def _walk_dir(
+    directory: Path,
+    rel: str,
+    rules: list[IgnoreRule],
+    depth: int,
+    max_depth: int,
+    patterns: Sequence[str],
+    respect_gitignore: bool,
+    after: tuple[str, ...],
+) -> Iterator[str]:
+    try:
+        with os.scandir(directory) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+    except OSError:
+        return
+
+    if respect_gitignore and rel and (directory / ".gitignore").is_file():
+        rules = rules + _load_rules(directory, rel)
+
+    for entry in entries:
+        child_rel = f"{rel}/{entry.name}" if rel else entry.name
+        if after:
+            child_parts = tuple(child_rel.split("/"))
+            bound = after[: len(child_parts)]
+            if child_parts < bound:
+                continue
+            on_cursor_path = child_parts == bound
+        else:
+            on_cursor_path = False
+
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+
+        if is_dir:
+            if entry.name in SKIP_DIR_NAMES:
+                continue
+            if respect_gitignore and is_ignored(rules, child_rel, True):
+                continue
+            if max_depth and depth >= max_depth:
+                continue
+            yield from _walk_dir(
+                Path(entry.path),
+                child_rel,
+                rules,
+                depth + 1,
+                max_depth,
+                patterns,
+                respect_gitignore,
+                after if on_cursor_path else (),
+            )
+            continue
+
+        if on_cursor_path:
+            continue
+        try:
+            if entry.is_symlink() and not entry.is_file():
+                continue  # symlinked directory or dangling link
+        except OSError:
+            continue
+        if respect_gitignore and is_ignored(rules, child_rel, False):
+            continue
+        if matches_any(child_rel, patterns):
+            yield child_rel
+
+
+@dataclass(frozen=True)
+class ListingPage:
+    paths: tuple[str, ...]
+    next_cursor: str
+
+
+def paginate(paths: Iterator[str], limit: int) -> ListingPage:
+    """Take up to `limit` paths; `next_cursor` is empty when nothing remains."""
+    limit = max(1, limit)
+    page: list[str] = []
+    for path in paths:
+        if len(page) == limit:
+            return ListingPage(tuple(page), page[-1])
+        page.append(path)
+    return ListingPage(tuple(page), "")
+
+
+PathKey = tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _GitSnapshot:
+    signature: tuple[int, int]
+    built_at: float
+    keys: tuple[PathKey, ...]  # sorted in walker (depth-first) order
+
+
+def _run_git(root: Path, *args: str) -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=str(root),
+            capture_output=True,
+            text=True,
+            timeout=GIT_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+class GitFileIndex:
+    """Sorted snapshot of a worktree's files from `git ls-files`.
+
+    Rebuilt when the worktree's HEAD or index mtime changes, when
+    `invalidate()` is called (tool writes) or after `max_age_seconds`,
+    since untracked files can appear without touching the index.
+    """
+
+    def __init__(self, root: Path, *, max_age_seconds: float = 30.0) -> None:
+        self.root = root
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._git_dir: Path | None = None
+        self._snapshot: _GitSnapshot | None = None
+
+    def _resolve_git_dir(self) -> Path | None:
+        if self._git_dir is None:
+            output = _run_git(self.root, "rev-parse", "--absolute-git-dir")
+            if output is None or not output.strip():
+                return None
+            self._git_dir = Path(output.strip())
+        return self._git_dir
+
+    def _signature(self, git_dir: Path) -> tuple[int, int]:
+        return (_mtime_ns(git_dir / "HEAD"), _mtime_ns(git_dir / "index"))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def keys(self) -> tuple[PathKey, ...] | None:
+        """Return the sorted path keys, or None when git is unavailable."""
+        with self._lock:
+            git_dir = self._resolve_git_dir()
+            if git_dir is None:
+                return None
+            signature = self._signature(git_dir)
+            snapshot = self._snapshot
+            if (
+                snapshot is not None
+                and snapshot.signature == signature
+                and monotonic() - snapshot.built_at < self.max_age_seconds
+            ):
+                return snapshot.keys
+
+            listed = _run_git(
+                self.root, "ls-files", "-z", "--cached", "--others", "--exclude-standard"
+            )
+            deleted = _run_git(self.root, "ls-files", "-z", "--deleted")
+            if listed is None or deleted is None:
+                return None
+            gone = set(deleted.split("\0"))
+            keys = sorted(
+                {
+                    tuple(path.split("/"))
+                    for path in listed.split("\0")
+                    if path and path not in gone
+                }
+            )
+            keys = [
+                key
+                for key in keys
+                if not SKIP_DIR_NAMES.intersection(key[:-1])
+                # symlinked dependency dirs (tracked or untracked) show up
+                # as single entries; the walker skips them too.
+                and not (key[-1] in SKIP_DIR_NAMES and self.root.joinpath(*key).is_dir())
+            ]
+            self._snapshot = _GitSnapshot(signature, monotonic(), tuple(keys))
+            return self._snapshot.keys
+
+    def query(
+        self,
+        prefix: str = "",
+        *,
+        max_depth: int = 0,
+        patterns: Sequence[str] = (),
+        cursor: str = "",
+    ) -> Iterator[str] | None:
+        """Prefix query with the walker's filters/ordering (None without git)."""
+        keys = self.keys()
+        if keys is None:
+            return None
+        prefix_key = _cursor_parts(prefix)
+        after = _cursor_parts(cursor)
+        if after and after > prefix_key:
+            start = bisect_right(keys, after)
+        else:
+            start = bisect_left(keys, prefix_key)
+        return _iter_prefix(keys, start, prefix_key, max_depth, patterns)
+
+
+def _iter_prefix(
+    keys: tuple[PathKey, ...],
+    start: int,
+    prefix_key: PathKey,
+    max_depth: int,
+    patterns: Sequence[str],
+) -> Iterator[str]:
+    width = len(prefix_key)
+    for index in range(start, len(keys)):
+        key = keys[index]
+        if key[:width] != prefix_key:
+            break
+        if len(key) == width:
+            continue  # the prefix itself is a file, not a directory
+        if max_depth and len(key) - width > max_depth:
+            continue
+        rel_path = "/".join(key)
+        if matches_any(rel_path, patterns):
+            yield rel_path
+
+
+_GIT_INDEXES: dict[Path, GitFileIndex] = {}
+_GIT_INDEXES_LOCK = threading.Lock()
+
+
+def git_file_index(root: Path) -> GitFileIndex:
+    key = root.resolve()
+    with _GIT_INDEXES_LOCK:
+        index = _GIT_INDEXES.get(key)
+        if index is None:
+            index = _GIT_INDEXES[key] = GitFileIndex(key)
+        return index
+
+
+def invalidate_git_file_index(root: Path) -> None:
+    """Drop the cached snapshot (call after creating or deleting files)."""
+    with _GIT_INDEXES_LOCK:
+        index = _GIT_INDEXES.get(root.resolve())
+    if index is not None:
+        index.invalidate()
+
+
+def list_files(
+    root: Path,
+    start: Path | None = None,
+    *,
+    max_depth: int = 0,
+    patterns: Sequence[str] = (),
+    cursor: str = "",
+    source: str = "auto",
+) -> Iterator[str]:
+    """List files below `start` from the git index ("auto"/"git") or a walk.
+
+    Both sources yield the same ordering, so cursors are interchangeable.
+    """
+    start = start or root
+    if source in ("auto", "git"):
+        prefix = "" if start == root else start.relative_to(root).as_posix()
+        result = git_file_index(root).query(
+            prefix, max_depth=max_depth, patterns=patterns, cursor=cursor
+        )
+        if result is not None:
+            return result
+    return walk_files(root, start, max_depth=max_depth, patterns=patterns, cursor=cursor)
@@ -0,0 +1,288 @@
+"""Patch application for `write_file_content(mode="patch")`.
+
+Editing one line of a 2,000-line module used to mean re-emitting the whole
+file. The patch mode accepts either:
+
+- a unified diff (`@@ -a,b +c,d @@` hunks; `---`/`+++` headers optional),
+  applied hunk by hunk at the stated position or, when the file moved, at
+  the nearest position where the hunk's context matches; or
+- one or more anchored SEARCH/REPLACE blocks::
+
+      <<<<<<< SEARCH
+      exact existing text
+      =======
+      replacement text
+      >>>>>>> REPLACE
+
+  where each SEARCH text must occur exactly once in the file.
+
+Patches apply all-or-nothing: any hunk or block that does not match raises
+`PatchError` and nothing is written. `content_hash()` lets callers reject
+patches built against a stale read (`base_hash`). The result carries the
+changed line numbers so policy checks can scan only the edited region.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from .file_io import file_sha256
+
+CONTENT_HASH_CHARS = 16
+_MIN_BASE_HASH_CHARS = 8
+
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_SEARCH_REPLACE_RE = re.compile(
+    r"^<{5,}[ \t]*SEARCH[ \t]*\r?\n(.*?)^={5,}[ \t]*\r?\n(.*?)^>{5,}[ \t]*REPLACE[ \t]*$",
+    re.DOTALL | re.MULTILINE,
+)
+
+
+class PatchError(ValueError):
+    """The patch is malformed or does not apply to the current content."""
+
+
+@dataclass(frozen=True)
+class PatchResult:
+    content: str
+    changed_lines: frozenset[int]  # 1-based line numbers in `content`
+    removed_text: str
+    added_text: str
+    hunks: int
+
+
+def content_hash(text: str) -> str:
+    """Short SHA-256 of the UTF-8 content, used as `base_hash`."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:CONTENT_HASH_CHARS]
+
+
+def file_content_hash(path: Path) -> str:
+    """content_hash() of a file on disk, computed once per file version."""
+    return file_sha256(path)[:CONTENT_HASH_CHARS]
+
+
+def base_hash_matches(base_hash: str, text: str) -> bool:
+    """True when `base_hash` is a prefix (>= 8 hex chars) of the content hash."""
+    expected = (base_hash or "").strip().lower()
+    if len(expected) < _MIN_BASE_HASH_CHARS:
+        return False
+    return hashlib.sha256(text.encode("utf-8")).hexdigest().startswith(expected)
+
+
+def detect_patch_format(patch: str) -> str:
+    """Return "search_replace" or "unified"; raise PatchError otherwise."""
+    if _SEARCH_REPLACE_RE.search(patch):
+        return "search_replace"
+    if any(_HUNK_HEADER_RE.match(line) for line in patch.splitlines()):
+        return "unified"
+    raise PatchError("patch is neither a unified diff (@@ hunks) nor SEARCH/REPLACE blocks.")
+
+
+def apply_patch(original: str, patch: str) -> PatchResult:
+    """Apply a unified diff or SEARCH/REPLACE blocks to `original`."""
+    if detect_patch_format(patch) == "search_replace":
+        content, hunks = _apply_search_replace(original, patch)
+    else:
+        content, hunks = _apply_unified_diff(original, patch)
+    return _summarize(original, content, hunks)
+
+
+def policy_line_window(
+    changed_lines: frozenset[int], total_lines: int, context: int
+) -> set[int]:
+    """Changed lines plus `context` lines around them (1-based, clamped)."""
+    window: set[int] = set()
+    for line_no in changed_lines:
+        window.update(
+            range(max(1, line_no - context), min(total_lines, line_no + context) + 1)
+        )
+    return window
+
+
+def _newline_of(text: str) -> str:
+    return "\r\n" if "\r\n" in text else "\n"
+
+
+def _summarize(original: str, content: str, hunks: int) -> PatchResult:
+    old_lines = original.splitlines(keepends=True)
+    new_lines = content.splitlines(keepends=True)
+    changed: set[int] = set()
+    removed: list[str] = []
+    added: list[str] = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        removed.extend(old_lines[old_start:old_end])
+        added.extend(new_lines[new_start:new_end])
+        if new_end > new_start:
+            changed.update(range(new_start + 1, new_end + 1))
+        elif new_lines:
+            # Pure deletion: flag the line that now sits at the seam.
+            changed.add(min(new_start + 1, len(new_lines)))
+    return PatchResult(content, frozenset(changed), "".join(removed), "".join(added), hunks)
+
+
+# ---------------------------------------------------------------------------
+# SEARCH/REPLACE blocks
+# ---------------------------------------------------------------------------
+
+
+def _apply_search_replace(original: str, patch: str) -> tuple[str, int]:
+    newline = _newline_of(original)
+    content = original
+    blocks = _SEARCH_REPLACE_RE.findall(patch)
+    for number, (search, replace) in enumerate(blocks, start=1):
+        search = search.replace("\r\n", "\n")
+        replace = replace.replace("\r\n", "\n")
+        if newline != "\n":
+            search = search.replace("\n", newline)
+            replace = replace.replace("\n", newline)
+        if not search.strip():
+            raise PatchError(f"block {number}: SEARCH text is empty.")
+        occurrences = content.count(search)
+        if occurrences == 0:
+            raise PatchError(
+                f"block {number}: SEARCH text not found in the current file "
+                "(re-read the file and copy the text exactly)."
+            )
+        if occurrences > 1:
+            raise PatchError(
+                f"block {number}: SEARCH text matches {occurrences} places; "
+                "include more surrounding lines so it is unique."
+            )
+        content = content.replace(search, replace, 1)
+    return content, len(blocks)
+
+
+# ---------------------------------------------------------------------------
+# Unified diffs
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Hunk:
+    old_start: int
+    body: list[tuple[str, str]]  # (" " | "-" | "+", text)
+    old_no_newline: bool = False
+    new_no_newline: bool = False
+
+    @property
+    def old_lines(self) -> list[str]:
+        return [text for marker, text in self.body if marker != "+"]
+
+
+def _parse_unified_diff(patch: str) -> list[_Hunk]:
+    hunks: list[_Hunk] = []
+    targets = 0
+    current: _Hunk | None = None
+    last_side = ""
+    lines = patch.splitlines()
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        index += 1
+        # A `--- a/x` + `+++ b/x` pair is a file header even right after a
+        # hunk; a lone `---`/`+++` line inside a hunk is a removed/added line.
+        if line.startswith("--- ") and index < len(lines) and lines[index].startswith("+++ "):
+            targets += 1
+            current = None
+            index += 1
+            continue
+        if line.startswith("diff --git "):
+            current = None
+            continue
+        header = _HUNK_HEADER_RE.match(line)
+        if header:
+            current = _Hunk(int(header.group(1)), [])
+            hunks.append(current)
+            continue
+        if current is None:
+            continue  # diff --git / index / --- headers and prose
+        if line.startswith("\\"):
+            if last_side in ("-", " "):
+                current.old_no_newline = True
+            if last_side in ("+", " "):
+                current.new_no_newline = True
+            continue
+        marker, text = (line[:1], line[1:]) if line else (" ", "")
+        if marker not in (" ", "-", "+"):
+            current = None  # end of hunk body
+            continue
+        current.body.append((marker, text))
+        last_side = marker
+    if targets > 1:
+        raise PatchError("the diff touches several files; send one patch per file.")
+    if not hunks:
+        raise PatchError("the diff has no hunks.")
+    return hunks
+
+
+def _find_block(
+    lines: list[str], block: list[str], expected: int, lower_bound: int
+) -> int | None:
+    """Index where `block` matches `lines` nearest to `expected`, or None."""
+    if not block:
+        return min(max(expected, lower_bound), len(lines))
+    stripped = [line.rstrip("\r\n") for line in lines]
+    last_start = len(lines) - len(block)
+    for loose in (False, True):
+        wanted = [line.rstrip() for line in block] if loose else block
+        for distance in range(0, max(last_start, 0) + 1 + abs(expected)):
+            candidates = (expected - distance, expected + distance) if distance else (expected,)
+            for start in candidates:
+                if start < lower_bound or start > last_start:
+                    continue
+                window = stripped[start : start + len(block)]
+                if loose:
+                    window = [line.rstrip() for line in window]
+                if window == wanted:
+                    return start
+            if expected - distance < lower_bound and expected + distance > last_start:
+                break
+    return None
+
+
+def _apply_unified_diff(original: str, patch: str) -> tuple[str, int]:
+    hunks = _parse_unified_diff(patch)
+    newline = _newline_of(original)
+    lines = original.splitlines(keepends=True)
+    output: list[str] = []
+    cursor = 0
+    for number, hunk in enumerate(hunks, start=1):
+        old_lines = hunk.old_lines
+        expected = hunk.old_start - 1 if old_lines else hunk.old_start
+        start = _find_block(lines, old_lines, expected, cursor)
+        if start is None:
+            raise PatchError(
+                f"hunk {number} (@@ -{hunk.old_start}) does not match the current file; "
+                "re-read the file and rebuild the patch."
+            )
+        output.extend(lines[cursor:start])
+        end = start + len(old_lines)
+        replaced: list[str] = []
+        position = start
+        for marker, text in hunk.body:
+            if marker == " ":
+                replaced.append(lines[position])  # keep the file's own line
+            if marker != "+":
+                position += 1
+            else:
+                replaced.append(text + newline)
+        if replaced and end >= len(lines):
+            file_had_newline = not lines or lines[-1].endswith(("\n", "\r"))
+            # Keep a missing final newline unless the diff explicitly adds one.
+            if hunk.new_no_newline or (not file_had_newline and not hunk.old_no_newline):
+                replaced[-1] = replaced[-1].rstrip("\r\n")
+            elif not replaced[-1].endswith(("\n", "\r")):
+                replaced[-1] += newline
+        output.extend(replaced)
+        cursor = end
+    output.extend(lines[cursor:])
+    return "".join(output), len(hunks)
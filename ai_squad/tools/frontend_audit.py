@@ -0,0 +1,365 @@
+"""Repo-wide frontend policy audit (auraxis-web / auraxis-app).
+
+`write_file_content` only checks the file being written. This command runs
+the same rules (`frontend_policy.check_frontend_policy`) over every
+frontend source of a repository, e.g. before a release:
+
+    cd ai_squad
+    python -m tools.frontend_audit --repo auraxis-web
+    python -m tools.frontend_audit --repo auraxis-app --changed
+
+- Files come from the git index (tracked + untracked) or a pruning walk.
+- Results are cached per file by content hash (and by a fingerprint of the
+  rules), so re-running on an unchanged tree only hashes files.
+- Cache misses are checked on a process pool.
+- `--changed` limits the audit to files changed since the merge base with
+  the default branch (`origin/HEAD`, else main/master), plus untracked ones.
+- The report is JSON; the exit code is 1 when any violation is found.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path, PurePosixPath
+
+from . import frontend_policy
+from .file_io import atomic_write_text
+from .file_listing import _run_git, list_files
+from .frontend_policy import FRONTEND_REPOS, FRONTEND_SOURCE_EXTENSIONS, check_frontend_policy
+
+PLATFORM_ROOT = Path(__file__).resolve().parents[2]
+CACHE_FORMAT_VERSION = 1
+# Below this many cache misses, forking workers costs more than it saves.
+PARALLEL_MIN_FILES = 64
+_DEFAULT_BRANCH_CANDIDATES = ("origin/main", "origin/master", "main", "master")
+
+
+def rules_fingerprint() -> str:
+    """Hash of the policy module; cached results are dropped when it changes."""
+    source = Path(frontend_policy.__file__).read_bytes()
+    return hashlib.sha256(source).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class FileResult:
+    path: str
+    content_hash: str
+    violations: tuple[tuple[str, int, str], ...]  # (rule, line, text)
+
+
+@dataclass
+class AuditReport:
+    repo: str
+    root: str
+    mode: str  # full | changed
+    base: str | None
+    rules_version: str
+    files_scanned: int = 0
+    cache_hits: int = 0
+    duration_seconds: float = 0.0
+    results: list[FileResult] = field(default_factory=list)
+
+    @property
+    def violations_total(self) -> int:
+        return sum(len(result.violations) for result in self.results)
+
+    def to_dict(self) -> dict:
+        by_rule = Counter(rule for result in self.results for rule, _, _ in result.violations)
+        return {
+            "generated_at": datetime.now(UTC).isoformat(),
+            "repo": self.repo,
+            "root": self.root,
+            "mode": self.mode,
+            "base": self.base,
+            "rules_version": self.rules_version,
+            "files_scanned": self.files_scanned,
+            "cache_hits": self.cache_hits,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "violations_total": self.violations_total,
+            "by_rule": dict(sorted(by_rule.items())),
+            "files": [
+                {
+                    "path": result.path,
+                    "violations": [
+                        {"rule": rule, "line": line, "text": text}
+                        for rule, line, text in result.violations
+                    ],
+                }
+                for result in self.results
+                if result.violations
+            ],
+        }
+
+
+class AuditCache:
+    """JSON file of path -> (content hash, violations) for one repository."""
+
+    def __init__(self, path: Path | None, rules_version: str) -> None:
+        self.path = path
+        self.rules_version = rules_version
+        self.entries: dict[str, dict] = {}
+        if path is not None and path.is_file():
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                payload = {}
+            if (
+                payload.get("format") == CACHE_FORMAT_VERSION
+                and payload.get("rules_version") == rules_version
+            ):
+                self.entries = payload.get("entries", {})
+
+    def get(self, path: str, content_hash: str) -> FileResult | None:
+        entry = self.entries.get(path)
+        if entry is None or entry.get("hash") != content_hash:
+            return None
+        violations = tuple(
+            (str(rule), int(line), str(text)) for rule, line, text in entry["violations"]
+        )
+        return FileResult(path, content_hash, violations)
+
+    def put(self, result: FileResult) -> None:
+        self.entries[result.path] = {
+            "hash": result.content_hash,
+            "violations": [list(item) for item in result.violations],
+        }
+
+    def retain(self, paths: Iterable[str]) -> None:
+        keep = set(paths)
+        self.entries = {path: entry for path, entry in self.entries.items() if path in keep}
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "format": CACHE_FORMAT_VERSION,
+            "rules_version": self.rules_version,
+            "entries": self.entries,
+        }
+        atomic_write_text(self.path, json.dumps(payload, ensure_ascii=False))
+
+
+def is_audited_path(path: str) -> bool:
+    return PurePosixPath(path).suffix.lower() in FRONTEND_SOURCE_EXTENSIONS
+
+
+def frontend_source_paths(root: Path) -> list[str]:
+    """Every frontend source below `root` (git index when available)."""
+    return sorted(path for path in list_files(root) if is_audited_path(path))
+
+
+def default_branch(root: Path) -> str | None:
+    """`origin/HEAD`'s target, else the first existing main/master ref."""
+    head = _run_git(root, "symbolic-ref", "--quiet", "refs/remotes/origin/HEAD")
+    if head and head.strip().startswith("refs/remotes/"):
+        return head.strip()[len("refs/remotes/") :]
+    for candidate in _DEFAULT_BRANCH_CANDIDATES:
+        if _run_git(root, "rev-parse", "--verify", "--quiet", candidate) is not None:
+            return candidate
+    return None
+
+
+def changed_source_paths(root: Path, base: str) -> list[str] | None:
+    """Frontend sources changed since the merge base with `base` (None on git errors)."""
+    merge_base = _run_git(root, "merge-base", "HEAD", base)
+    if merge_base is None:
+        return None
+    diff = _run_git(
+        root, "diff", "--name-only", "--relative", "--diff-filter=ACMR", "-z", merge_base.strip()
+    )
+    untracked = _run_git(root, "ls-files", "--others", "--exclude-standard", "-z")
+    if diff is None or untracked is None:
+        return None
+    paths = {path for path in (diff + untracked).split("\0") if path}
+    return sorted(path for path in paths if is_audited_path(path) and (root / path).is_file())
+
+
+def _check_file(job: tuple[str, str, str, str]) -> FileResult:
+    """Process-pool worker: evaluate one file's policies."""
+    repo, path, content_hash, content = job
+    report = check_frontend_policy(repo, path, content)
+    violations = tuple((item.rule, item.line, item.text) for item in report.violations)
+    return FileResult(path, content_hash, violations)
+
+
+def audit_paths(
+    root: Path,
+    repo: str,
+    paths: Sequence[str],
+    cache: AuditCache,
+    *,
+    workers: int = 0,
+) -> tuple[list[FileResult], int]:
+    """Check `paths`; returns (results in path order, cache hits)."""
+    results: dict[str, FileResult] = {}
+    jobs: list[tuple[str, str, str, str]] = []
+    for path in paths:
+        try:
+            data = (root / path).read_bytes()
+        except OSError:
+            continue
+        content_hash = hashlib.sha256(data).hexdigest()[:16]
+        cached = cache.get(path, content_hash)
+        if cached is not None:
+            results[path] = cached
+            continue
+        try:
+            content = data.decode("utf-8")
+        except UnicodeDecodeError:
+            continue  # write_file_content never produces non-UTF-8 sources
+        jobs.append((repo, path, content_hash, content))
+
+    hits = len(results)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_FILES:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            checked = list(executor.map(_check_file, jobs, chunksize=chunksize))
+    else:
+        checked = [_check_file(job) for job in jobs]
+    for result in checked:
+        cache.put(result)
+        results[result.path] = result
+    return [results[path] for path in paths if path in results], hits
+
+
+def run_audit(
+    root: Path,
+    repo: str,
+    *,
+    changed: bool = False,
+    base: str | None = None,
+    cache_path: Path | None = None,
+    workers: int = 0,
+) -> AuditReport:
+    """Audit a repository tree (or only its changed files)."""
+    started = time.perf_counter()
+    if repo not in FRONTEND_REPOS:
+        raise ValueError(f"not a frontend repository: {repo!r}")
+    if changed:
+        base = base or default_branch(root)
+        if base is None:
+            raise ValueError("cannot determine the default branch; pass --base")
+        paths = changed_source_paths(root, base)
+        if paths is None:
+            raise ValueError(f"git diff against '{base}' failed in {root}")
+    else:
+        paths = frontend_source_paths(root)
+
+    cache = AuditCache(cache_path, rules_fingerprint())
+    results, hits = audit_paths(root, repo, paths, cache, workers=workers)
+    if not changed:
+        cache.retain(paths)
+    cache.save()
+
+    return AuditReport(
+        repo=repo,
+        root=str(root),
+        mode="changed" if changed else "full",
+        base=base if changed else None,
+        rules_version=cache.rules_version,
+        files_scanned=len(results),
+        cache_hits=hits,
+        duration_seconds=time.perf_counter() - started,
+        results=results,
+    )
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Audit frontend sources against the write_file_content policies."
+    )
+    parser.add_argument("--repo", required=True, choices=sorted(FRONTEND_REPOS))
+    parser.add_argument(
+        "--root",
+        default="",
+        help="Repository checkout (default: <platform>/repos/<repo>).",
+    )
+    parser.add_argument(
+        "--changed",
+        action="store_true",
+        help="Only files changed since the merge base with the default branch.",
+    )
+    parser.add_argument("--base", default="", help="Branch/ref to diff against.")
+    parser.add_argument("--workers", type=int, default=0, help="Process pool size.")
+    parser.add_argument(
+        "--cache",
+        default="",
+        help="Result cache file (default: <platform>/.tmp/frontend-audit/<repo>.json).",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument(
+        "--output",
+        default="",
+        help=(
+            "JSON report path, or '-' for stdout "
+            "(default: <platform>/.context/reports/frontend_policy_audit_<repo>.json)."
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    repo = str(args.repo)
+    root = Path(args.root).resolve() if args.root else PLATFORM_ROOT / "repos" / repo
+    if not root.is_dir():
+        print(f"[frontend-audit] repository not found: {root}", file=sys.stderr)
+        return 2
+    cache_path = None
+    if not args.no_cache:
+        cache_path = (
+            Path(args.cache)
+            if args.cache
+            else PLATFORM_ROOT / ".tmp" / "frontend-audit" / f"{repo}.json"
+        )
+
+    try:
+        report = run_audit(
+            root,
+            repo,
+            changed=bool(args.changed),
+            base=str(args.base) or None,
+            cache_path=cache_path,
+            workers=int(args.workers),
+        )
+    except ValueError as error:
+        print(f"[frontend-audit] {error}", file=sys.stderr)
+        return 2
+
+    payload = json.dumps(report.to_dict(), ensure_ascii=False, indent=2) + "\n"
+    if args.output == "-":
+        sys.stdout.write(payload)
+    else:
+        output = (
+            Path(args.output).resolve()
+            if args.output
+            else PLATFORM_ROOT / ".context" / "reports" / f"frontend_policy_audit_{repo}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(payload, encoding="utf-8")
+        print(f"[frontend-audit] report: {output}")
+    print(
+        f"[frontend-audit] {report.mode}: {report.files_scanned} files "
+        f"({report.cache_hits} cached), {report.violations_total} violations "
+        f"in {report.duration_seconds:.2f}s",
+        file=sys.stderr if args.output == "-" else sys.stdout,
+    )
+    return 1 if report.violations_total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
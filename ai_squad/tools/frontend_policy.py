@@ -0,0 +1,419 @@
+"""Single-pass frontend policy engine for auraxis-web / auraxis-app writes.
+
+`write_file_content` used to run the web-root path, language/component and
+token detectors as separate passes, each re-splitting the content and
+looping over its own regex list per line. `check_frontend_policy()` splits
+the content once and scans it with one combined compiled matcher whose
+named groups are the trigger of each line rule that applies to the file
+(raw HTML tags, function signatures, raw style tokens). Lines without a
+trigger cannot violate any rule and are never looked at again; flagged
+lines are confirmed rule by rule with the original patterns, so the report
+is identical to running each rule separately.
+
+The result is a `PolicyReport` with every violation; `blocked_message()`
+renders the same BLOCKED texts the individual detectors produced.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import PurePosixPath
+
+FRONTEND_REPOS = frozenset({"auraxis-web", "auraxis-app"})
+
+FRONTEND_SOURCE_EXTENSIONS = frozenset(
+    {".css", ".scss", ".sass", ".less", ".vue", ".ts", ".tsx", ".js", ".jsx"}
+)
+TS_ONLY_BLOCKED_EXTENSIONS = frozenset({".js", ".jsx"})
+_LANGUAGE_RULE_EXTENSIONS = frozenset({".ts", ".tsx", ".vue"})
+
+WEB_FORBIDDEN_ROOT_SOURCE_PREFIXES = (
+    "components/",
+    "composables/",
+    "layouts/",
+    "middleware/",
+    "pages/",
+    "plugins/",
+    "stores/",
+    "shared/",
+    "types/",
+    "utils/",
+    "services/",
+)
+
+_SOURCE_PREFIXES = {
+    "auraxis-web": (
+        "app/",
+        "components/",
+        "composables/",
+        "layouts/",
+        "pages/",
+        "plugins/",
+        "stores/",
+        "shared/",
+        "types/",
+        "utils/",
+        "services/",
+    ),
+    "auraxis-app": (
+        "app/",
+        "src/",
+        "components/",
+        "hooks/",
+        "providers/",
+        "store/",
+        "stores/",
+        "shared/",
+        "types/",
+        "utils/",
+        "services/",
+        "config/",
+    ),
+}
+
+_TOKEN_FILE_INDICATORS = (
+    "/theme/",
+    "/tokens/",
+    "design-tokens",
+    "styles/variables",
+    "styles/theme",
+    "theme.ts",
+    "theme.js",
+    "theme.css",
+    "tokens.ts",
+    "tokens.js",
+    "tokens.css",
+)
+
+# Rule sources; each tuple is compiled into one alternation per rule and
+# into the combined per-profile matcher.
+WEB_RAW_HTML_TAG_PATTERNS = (
+    r"(?i:<\s*p\b)",
+    r"(?i:<\s*input\b)",
+    r"(?i:<\s*label\b)",
+    r"(?i:<\s*textarea\b)",
+    r"(?i:<\s*select\b)",
+    r"(?i:<\s*button\b)",
+)
+
+MISSING_RETURN_TYPE_PATTERNS = (
+    r"(?:export\s+)?(?:async\s+)?function\s+[A-Za-z_]\w*\s*\([^)]*\)\s*\{",
+    r"(?:export\s+)?const\s+[A-Za-z_]\w*\s*=\s*(?:async\s+)?\([^)]*\)\s*=>",
+    r"(?:export\s+)?const\s+[A-Za-z_]\w*\s*=\s*(?:async\s+)?[A-Za-z_]\w*\s*=>",
+)
+
+# Cheap "looks like a function" test that gates the JSDoc rule.
+_FUNCTION_SIGNATURE_PATTERN = r"function |=> \{|=>\Z"
+_JSDOC_SUBJECT_RE = re.compile(r"\bfunction\b|\bconst\s+[A-Za-z_]\w+\b")
+
+WEB_TOKEN_POLICY_PATTERNS = (
+    r"(?i:\bfont-size\s*:\s*[0-9.]+(?:px|rem|em)\b)",
+    r"(?i:\bfont-weight\s*:\s*[1-9]00\b)",
+    r"(?i:\bborder-radius\s*:\s*[0-9.]+(?:px|rem|em)\b)",
+    r"(?i:\b(?:padding|margin|gap)[-\w]*\s*:\s*[0-9.]+(?:px|rem|em)\b)",
+    r"(?i:\bborder(?:-(?:top|right|bottom|left))?\s*:\s*[0-9.]+px\b)",
+    r"(?i:\b(?:color|background(?:-color)?|border-color)\s*:\s*#[0-9a-fA-F]{3,8}\b)",
+)
+
+APP_TOKEN_POLICY_PATTERNS = (
+    r"\bfontSize\s*:\s*\d+(?:\.\d+)?\b",
+    r"\bfontWeight\s*:\s*['\"]?[1-9]00['\"]?\b",
+    r"\blineHeight\s*:\s*\d+(?:\.\d+)?\b",
+    r"\bborderRadius\s*:\s*\d+(?:\.\d+)?\b",
+    r"\bborderWidth\s*:\s*\d+(?:\.\d+)?\b",
+    r"\b(?:padding|paddingTop|paddingBottom|paddingLeft|paddingRight|paddingHorizontal"
+    r"|paddingVertical)\s*:\s*\d+(?:\.\d+)?\b",
+    r"\b(?:margin|marginTop|marginBottom|marginLeft|marginRight|marginHorizontal"
+    r"|marginVertical)\s*:\s*\d+(?:\.\d+)?\b",
+    r"\bgap\s*:\s*\d+(?:\.\d+)?\b",
+    r"\b(?:color|backgroundColor|borderColor)\s*:\s*['\"]#[0-9a-fA-F]{3,8}['\"]\b",
+)
+
+_LANGUAGE_PREVIEW_LIMIT = 8
+_TOKEN_PREVIEW_LIMIT = 5
+
+
+@dataclass(frozen=True)
+class PolicyViolation:
+    rule: str  # web_root_path | typescript_only | raw_html | missing_return_type
+    #            | missing_jsdoc | token
+    line: int  # 0 for path-level rules
+    text: str
+
+
+@dataclass(frozen=True)
+class PolicyReport:
+    repo: str
+    path: str
+    violations: tuple[PolicyViolation, ...]
+
+    @property
+    def blocked(self) -> bool:
+        return bool(self.violations)
+
+    def by_rule(self, *rules: str) -> list[PolicyViolation]:
+        return [item for item in self.violations if item.rule in rules]
+
+    def blocked_message(self) -> str | None:
+        """All violated policies, one BLOCKED section per policy."""
+        sections = [
+            section
+            for section in (
+                self._web_root_message(),
+                self._typescript_only_message(),
+                self._language_message(),
+                self._token_message(),
+            )
+            if section
+        ]
+        return "\n\n".join(sections) if sections else None
+
+    def _web_root_message(self) -> str | None:
+        if not self.by_rule("web_root_path"):
+            return None
+        return (
+            "BLOCKED: auraxis-web source files must live under `app/` "
+            "(ex.: `app/composables`, `app/layouts`, `app/middleware`). "
+            f"Invalid path: '{self.path}'."
+        )
+
+    def _typescript_only_message(self) -> str | None:
+        if not self.by_rule("typescript_only"):
+            return None
+        return (
+            "BLOCKED: JavaScript source files are forbidden in frontend code. "
+            "Use TypeScript only (`.ts`/`.tsx`)."
+        )
+
+    def _language_message(self) -> str | None:
+        labels = {
+            "raw_html": "raw HTML tag found",
+            "missing_return_type": "function without explicit return type",
+            "missing_jsdoc": "missing JSDoc block for function",
+        }
+        # Raw HTML findings first, then function findings (detector order).
+        items = self.by_rule("raw_html") + self.by_rule("missing_return_type", "missing_jsdoc")
+        if not items:
+            return None
+        preview = "\n".join(
+            f"- L{item.line}: {labels[item.rule]} (`{item.text[:120]}`)"
+            for item in items[:_LANGUAGE_PREVIEW_LIMIT]
+        )
+        return (
+            "BLOCKED: frontend language/component policy violation detected.\n"
+            "- TypeScript-only frontend source (`.ts`/`.tsx`).\n"
+            "- Explicit function return types (no implicit inference).\n"
+            "- JSDoc required for every function.\n"
+            "- Web templates must use Chakra UI components (no raw HTML controls).\n"
+            f"Detected lines:\n{preview}"
+        )
+
+    def _token_message(self) -> str | None:
+        items = self.by_rule("token")
+        if not items:
+            return None
+        preview = "\n".join(
+            f"- L{item.line}: {item.text[:140]}" for item in items[:_TOKEN_PREVIEW_LIMIT]
+        )
+        return (
+            "BLOCKED: front-end token policy violation detected.\n"
+            "Use theme/tokens and UI-library props (Chakra UI / RN Paper) "
+            "instead of raw style literals.\n"
+            "Allowed exception: files under theme/tokens for token definition.\n"
+            f"Detected lines:\n{preview}"
+        )
+
+
+def _normalize(path: str) -> str:
+    return path.replace("\\", "/").strip().lower()
+
+
+def is_theme_or_token_file(path: str) -> bool:
+    normalized = path.replace("\\", "/").lower()
+    return any(indicator in normalized for indicator in _TOKEN_FILE_INDICATORS)
+
+
+def is_frontend_source_path(repo: str, path: str) -> bool:
+    prefixes = _SOURCE_PREFIXES.get(repo)
+    return bool(prefixes) and _normalize(path).startswith(prefixes)
+
+
+def web_root_path_violation(repo: str, path: str) -> bool:
+    if repo != "auraxis-web":
+        return False
+    normalized = _normalize(path)
+    return not normalized.startswith("app/") and normalized.startswith(
+        WEB_FORBIDDEN_ROOT_SOURCE_PREFIXES
+    )
+
+
+def jsdoc_preceded_lines(lines: list[str]) -> list[bool]:
+    """Per line: is the nearest non-blank line above it the end of a JSDoc block?
+
+    A block counts when that line ends with `*/` and the closest line at or
+    above it that opens a comment (`/*`) opens a JSDoc one (`/**`). Built in
+    one forward pass, so checking every function of a file is linear.
+    """
+    preceded = [False] * len(lines)
+    previous_closes_jsdoc = False  # verdict for the last non-blank line
+    opener_is_jsdoc = False  # kind of the last line starting with `/*`
+    for index, line in enumerate(lines):
+        preceded[index] = previous_closes_jsdoc
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("/*"):
+            opener_is_jsdoc = stripped.startswith("/**")
+        previous_closes_jsdoc = opener_is_jsdoc and stripped.endswith("*/")
+    return preceded
+
+
+def _alternation(patterns: tuple[str, ...]) -> str:
+    return "|".join(f"(?:{pattern})" for pattern in patterns)
+
+
+# Trigger literals: every rule match contains one of them, so lines without
+# a trigger cannot violate that rule. Raw HTML uses the rule itself (it can
+# only consume `<`, whitespace and the tag name).
+_FUNCTION_TRIGGER = r"function|=>"
+_WEB_TOKEN_TRIGGER = r"(?i:font-|border|padding|margin|gap|color|background)"
+_APP_TOKEN_TRIGGER = (
+    r"fontSize|fontWeight|lineHeight|borderRadius|borderWidth|borderColor"
+    r"|backgroundColor|padding|margin|gap|color"
+)
+
+
+@dataclass(frozen=True)
+class _Profile:
+    """Compiled rules for one (repo, file kind) combination."""
+
+    triggers: re.Pattern[str] | None  # named groups: raw_html, function, token
+    raw_html: re.Pattern[str] | None
+    return_type: re.Pattern[str] | None
+    function_signature: re.Pattern[str] | None
+    token: re.Pattern[str] | None
+
+
+@lru_cache(maxsize=32)
+def _profile(repo: str, raw_html: bool, language: bool, token: bool) -> _Profile:
+    raw_html_rule = _alternation(WEB_RAW_HTML_TAG_PATTERNS)
+    token_rule = _alternation(
+        WEB_TOKEN_POLICY_PATTERNS if repo == "auraxis-web" else APP_TOKEN_POLICY_PATTERNS
+    )
+    triggers: list[str] = []
+    if raw_html:
+        triggers.append(f"(?P<raw_html>{raw_html_rule})")
+    if language:
+        triggers.append(f"(?P<function>{_FUNCTION_TRIGGER})")
+    if token:
+        token_trigger = _WEB_TOKEN_TRIGGER if repo == "auraxis-web" else _APP_TOKEN_TRIGGER
+        triggers.append(f"(?P<token>{token_trigger})")
+    return _Profile(
+        triggers=re.compile("|".join(triggers)) if triggers else None,
+        raw_html=re.compile(raw_html_rule) if raw_html else None,
+        return_type=(
+            re.compile(_alternation(MISSING_RETURN_TYPE_PATTERNS)) if language else None
+        ),
+        function_signature=re.compile(_FUNCTION_SIGNATURE_PATTERN) if language else None,
+        token=re.compile(token_rule) if token else None,
+    )
+
+
+def _is_comment(stripped: str) -> bool:
+    return stripped.startswith(("//", "/*", "*"))
+
+
+def _flagged_lines(
+    profile: _Profile, content: str, lines: list[str]
+) -> dict[int, set[str]]:
+    """Line index -> trigger groups found on it, from one scan of `content`."""
+    assert profile.triggers is not None
+    starts = list(accumulate((len(line) for line in lines), initial=0))
+    flagged: dict[int, set[str]] = {}
+    for match in profile.triggers.finditer(content):
+        index = bisect_right(starts, match.start()) - 1
+        flagged.setdefault(index, set()).add(match.lastgroup or "")
+    return flagged
+
+
+def check_frontend_policy(
+    repo: str,
+    path: str,
+    content: str,
+    only_lines: set[int] | None = None,
+) -> PolicyReport:
+    """Evaluate every frontend policy for one file in a single pass.
+
+    `only_lines` (1-based) restricts line rules to those lines, e.g. the
+    changed region of a patch; path rules always apply.
+    """
+    violations: list[PolicyViolation] = []
+    if repo not in FRONTEND_REPOS:
+        return PolicyReport(repo, path, ())
+
+    if web_root_path_violation(repo, path):
+        violations.append(PolicyViolation("web_root_path", 0, path))
+
+    suffix = PurePosixPath(path.replace("\\", "/")).suffix.lower()
+    source_path = is_frontend_source_path(repo, path)
+    theme_file = is_theme_or_token_file(path)
+    typescript_only = source_path and suffix in TS_ONLY_BLOCKED_EXTENSIONS
+    if typescript_only:
+        violations.append(PolicyViolation("typescript_only", 0, path))
+
+    profile = _profile(
+        repo,
+        raw_html=source_path and not typescript_only and repo == "auraxis-web" and suffix == ".vue",
+        language=(
+            source_path
+            and not typescript_only
+            and suffix in _LANGUAGE_RULE_EXTENSIONS
+            and not theme_file
+        ),
+        token=suffix in FRONTEND_SOURCE_EXTENSIONS and not theme_file,
+    )
+    if profile.triggers is None:
+        return PolicyReport(repo, path, tuple(violations))
+
+    # Lines keep their endings so offsets map back to line numbers; every
+    # rule works on the stripped line, exactly as the separate detectors did.
+    lines = content.splitlines(keepends=True)
+    raw_html: list[PolicyViolation] = []
+    functions: list[PolicyViolation] = []
+    tokens: list[PolicyViolation] = []
+    jsdoc_preceded: list[bool] | None = None  # built on the first function line
+    for index, groups in sorted(_flagged_lines(profile, content, lines).items()):
+        line_no = index + 1
+        if only_lines is not None and line_no not in only_lines:
+            continue
+        stripped = lines[index].strip()
+        if not stripped:
+            continue
+
+        if "raw_html" in groups and profile.raw_html.search(stripped):  # type: ignore[union-attr]
+            raw_html.append(PolicyViolation("raw_html", line_no, stripped))
+        if _is_comment(stripped):
+            continue
+
+        if "function" in groups:
+            if profile.return_type.match(stripped):  # type: ignore[union-attr]
+                functions.append(PolicyViolation("missing_return_type", line_no, stripped))
+            elif profile.function_signature.search(stripped):  # type: ignore[union-attr]
+                if jsdoc_preceded is None:
+                    jsdoc_preceded = jsdoc_preceded_lines(lines)
+                if not jsdoc_preceded[index] and _JSDOC_SUBJECT_RE.search(stripped):
+                    functions.append(PolicyViolation("missing_jsdoc", line_no, stripped))
+
+        if "token" in groups and profile.token.search(stripped):  # type: ignore[union-attr]
+            tokens.append(PolicyViolation("token", line_no, stripped))
+
+    violations.extend(raw_html)
+    violations.extend(functions)
+    violations.extend(tokens)
+    return PolicyReport(repo, path, tuple(violations))
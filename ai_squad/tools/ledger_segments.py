@@ -0,0 +1,253 @@
+"""Segment rotation and compaction for the JSONL execution ledger.
+
+Layout (next to the active ledger file `<stem>.jsonl`):
+
+    <stem>.jsonl                    active segment (appends go here)
+    <stem>.snapshot.jsonl           compacted snapshot: latest entry per key
+    ledger_segments/<stem>.<UTC>.jsonl          rotated, not yet compacted
+    ledger_segments/archive/<stem>.<UTC>.jsonl.gz   compacted, archived
+
+The key is (repo, task_id, briefing_hash). The active segment is rotated by
+size or age. Compaction folds the rotated segments into the snapshot and then
+gzips them into the archive, so lookups only read the snapshot (memoized by
+mtime) plus the few recent segments.
+
+Kept free of CrewAI imports so it can be used from `main.py` and from tests.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import shutil
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from .file_io import JsonlAppender, atomic_write_text
+
+try:  # POSIX only; on other platforms only the in-process lock applies.
+    import fcntl
+except ImportError:  # pragma: no cover - platform dependent
+    fcntl = None  # type: ignore[assignment]
+
+LedgerKey = tuple[str, str, str]
+
+_FIRST_LINE_PROBE_BYTES = 4096
+
+
+def ledger_key(entry: dict[str, object]) -> LedgerKey:
+    return (
+        str(entry.get("repo") or ""),
+        str(entry.get("task_id") or ""),
+        str(entry.get("briefing_hash") or ""),
+    )
+
+
+@dataclass(frozen=True)
+class LedgerLayout:
+    """File layout of a rotated ledger rooted at its active segment."""
+
+    active: Path
+
+    @property
+    def segment_dir(self) -> Path:
+        return self.active.parent / "ledger_segments"
+
+    @property
+    def archive_dir(self) -> Path:
+        return self.segment_dir / "archive"
+
+    @property
+    def snapshot(self) -> Path:
+        return self.active.with_name(f"{self.active.stem}.snapshot.jsonl")
+
+    def recent_segments(self) -> list[Path]:
+        """Rotated segments not yet compacted, oldest first."""
+        if not self.segment_dir.is_dir():
+            return []
+        return sorted(self.segment_dir.glob(f"{self.active.stem}.*.jsonl"))
+
+    def new_segment_path(self) -> Path:
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%fZ")
+        return self.segment_dir / f"{self.active.stem}.{stamp}.jsonl"
+
+    def sources(self) -> list[Path]:
+        """Every readable file in chronological order (snapshot first)."""
+        paths = [self.snapshot, *self.recent_segments(), self.active]
+        return [path for path in paths if path.exists()]
+
+
+@dataclass(frozen=True)
+class CompactionResult:
+    snapshot_entries: int
+    compacted_segments: int
+
+
+def _iter_entries(path: Path) -> Iterator[dict[str, object]]:
+    try:
+        file = path.open("r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with file:
+        for line in file:
+            text = line.strip()
+            if not text:
+                continue
+            try:
+                parsed = json.loads(text)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(parsed, dict):
+                yield parsed
+
+
+def _first_entry_timestamp(path: Path) -> datetime | None:
+    try:
+        with path.open("rb") as file:
+            head = file.read(_FIRST_LINE_PROBE_BYTES)
+    except FileNotFoundError:
+        return None
+    first_line = head.split(b"\n", 1)[0]
+    try:
+        raw = json.loads(first_line).get("timestamp", "")
+        stamp = datetime.fromisoformat(str(raw))
+    except (ValueError, AttributeError):
+        return None
+    return stamp if stamp.tzinfo else stamp.replace(tzinfo=UTC)
+
+
+def should_rotate(layout: LedgerLayout, *, max_bytes: int, max_age_seconds: float) -> bool:
+    """Return True when the active segment exceeds the size or age budget."""
+    try:
+        size = layout.active.stat().st_size
+    except FileNotFoundError:
+        return False
+    if size == 0:
+        return False
+    if size >= max_bytes:
+        return True
+    started = _first_entry_timestamp(layout.active)
+    if started is None:
+        return False
+    return (datetime.now(UTC) - started).total_seconds() >= max_age_seconds
+
+
+def rotate_active_segment(layout: LedgerLayout, appender: JsonlAppender) -> Path | None:
+    """Move the active segment into `ledger_segments/`; returns the new path."""
+    destination = layout.new_segment_path()
+    if appender.rotate(destination):
+        return destination
+    return None
+
+
+class _CompactionLock:
+    """Cross-process lock so only one compaction runs at a time."""
+
+    _thread_lock = threading.Lock()
+
+    def __init__(self, layout: LedgerLayout) -> None:
+        self._path = layout.segment_dir / ".compaction.lock"
+        self._fd: int | None = None
+
+    def __enter__(self) -> _CompactionLock:
+        self._thread_lock.acquire()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(str(self._path), os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._fd is not None:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+
+def _archive_segment(segment: Path, archive_dir: Path) -> None:
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    target = archive_dir / f"{segment.name}.gz"
+    partial = target.with_name(f".{target.name}.tmp")
+    with segment.open("rb") as source, gzip.open(partial, "wb") as sink:
+        shutil.copyfileobj(source, sink)
+    os.replace(partial, target)
+    segment.unlink()
+
+
+def compact_ledger(layout: LedgerLayout) -> CompactionResult:
+    """Fold rotated segments into the snapshot, then archive them (gzip).
+
+    The snapshot is rewritten atomically before any segment is archived, so
+    a crash in between only means the same segments are folded in again on
+    the next run (latest-per-key is idempotent).
+    """
+    with _CompactionLock(layout):
+        segments = layout.recent_segments()
+        if not segments:
+            return CompactionResult(len(_load_snapshot(layout.snapshot)), 0)
+
+        latest: dict[LedgerKey, dict[str, object]] = {}
+        for source in (layout.snapshot, *segments):
+            for entry in _iter_entries(source):
+                key = ledger_key(entry)
+                latest.pop(key, None)
+                latest[key] = entry
+
+        atomic_write_text(
+            layout.snapshot,
+            "".join(json.dumps(entry, ensure_ascii=True) + "\n" for entry in latest.values()),
+        )
+        for segment in segments:
+            _archive_segment(segment, layout.archive_dir)
+        return CompactionResult(len(latest), len(segments))
+
+
+_SNAPSHOT_CACHE: dict[Path, tuple[tuple[int, int], dict[LedgerKey, dict[str, object]]]] = {}
+_SNAPSHOT_CACHE_LOCK = threading.Lock()
+
+
+def _load_snapshot(path: Path) -> dict[LedgerKey, dict[str, object]]:
+    """Return the snapshot as a key -> entry map, memoized by (mtime, size)."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return {}
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _SNAPSHOT_CACHE_LOCK:
+        cached = _SNAPSHOT_CACHE.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    entries = {ledger_key(entry): entry for entry in _iter_entries(path)}
+    with _SNAPSHOT_CACHE_LOCK:
+        _SNAPSHOT_CACHE[path] = (signature, entries)
+    return entries
+
+
+def find_latest_entry(
+    layout: LedgerLayout,
+    *,
+    repo: str,
+    task_id: str,
+    briefing_hash: str,
+) -> dict[str, object] | None:
+    """Return the latest entry for a key without reading archived history.
+
+    The snapshot answers for everything compacted in O(1). Entries in the
+    recent segments are newer, so those (scanned newest first, and small by
+    construction) take precedence when they contain the key.
+    """
+    key = (repo, task_id, briefing_hash)
+    for segment in reversed([*layout.recent_segments(), layout.active]):
+        latest: dict[str, object] | None = None
+        for entry in _iter_entries(segment):
+            if ledger_key(entry) == key:
+                latest = entry
+        if latest is not None:
+            return latest
+    return _load_snapshot(layout.snapshot).get(key)
@@ -0,0 +1,295 @@
+"""Indexed SQLite store for the execution ledger.
+
+The JSONL ledger (`tasks_status/_execution_ledger.jsonl`) is append-only and
+grows forever, so scanning it for each idempotency check gets linearly slower.
+This store keeps the same entries in SQLite with an index on
+(repo, task_id, briefing_hash, timestamp), so lookups stay constant-time.
+
+- WAL journal mode: the orchestrator threads (and child processes) can write
+  concurrently without blocking readers.
+- One connection per thread (sqlite3 connections are not shared).
+- The existing JSONL files (snapshot, rotated segments, active segment) are
+  imported once, on first open; the import is recorded in the `meta` table
+  so it never runs twice. The check and the import share one write
+  transaction, so two processes opening a new store cannot both import.
+- The JSONL sources are resolved when they are read (pass a callable such
+  as `LedgerLayout.sources`), so files created or rotated after the store
+  was built are seen by the import and by rebuilds.
+- `export_jsonl()` rebuilds a JSONL file from the store for compatibility.
+- `mark_stale()` records (in a marker file next to the database, so every
+  process sees it) that the store missed an entry; the next access in any
+  process rebuilds it from the JSONL files before answering.
+
+Kept free of CrewAI imports so it can be used from `main.py` and from tests.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo TEXT NOT NULL DEFAULT '',
+    task_id TEXT NOT NULL DEFAULT '',
+    briefing_hash TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL DEFAULT '',
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ledger_lookup
+    ON ledger_entries (repo, task_id, briefing_hash, timestamp);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_LOOKUP_SQL = (
+    "SELECT payload FROM ledger_entries "
+    "WHERE repo = ? AND task_id = ? AND briefing_hash = ? "
+    "ORDER BY timestamp DESC, id DESC LIMIT 1"
+)
+_INSERT_SQL = (
+    "INSERT INTO ledger_entries (repo, task_id, briefing_hash, timestamp, payload) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_IMPORT_META_KEY = "jsonl_import"
+_IMPORT_BATCH_SIZE = 5_000
+_IMPORT_ATTEMPTS = 3
+
+
+def _entry_row(entry: dict[str, object]) -> tuple[str, str, str, str, str]:
+    return (
+        str(entry.get("repo") or ""),
+        str(entry.get("task_id") or ""),
+        str(entry.get("briefing_hash") or ""),
+        str(entry.get("timestamp") or ""),
+        json.dumps(entry, ensure_ascii=True),
+    )
+
+
+@contextmanager
+def _write_transaction(connection: sqlite3.Connection) -> Iterator[None]:
+    """BEGIN IMMEDIATE ... COMMIT: holds SQLite's write lock from the first read."""
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.rollback()
+        raise
+    connection.commit()
+
+
+class LedgerStore:
+    """SQLite-backed execution ledger with indexed idempotency lookups.
+
+    `jsonl_paths` is either a fixed list or a callable returning the current
+    JSONL sources, oldest first (e.g. `LedgerLayout.sources`).
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        jsonl_paths: Sequence[Path] | Callable[[], Sequence[Path]] = (),
+    ) -> None:
+        self.db_path = db_path
+        self._jsonl_paths = jsonl_paths if callable(jsonl_paths) else list(jsonl_paths)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.db_path), timeout=30.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        if not self._initialized:
+            self._initialize(connection)
+        if self.stale_marker.exists():
+            self._rebuild(connection)
+        return connection
+
+    @property
+    def stale_marker(self) -> Path:
+        return self.db_path.with_name(f"{self.db_path.name}.stale")
+
+    def mark_stale(self, reason: str) -> None:
+        """Force a rebuild from the JSONL files on the next access."""
+        try:
+            self.stale_marker.write_text(
+                f"{datetime.now(UTC).isoformat()} {reason}\n", encoding="utf-8"
+            )
+        except OSError:
+            pass
+
+    @property
+    def jsonl_paths(self) -> list[Path]:
+        """The JSONL sources as of now."""
+        paths = self._jsonl_paths
+        return list(paths() if callable(paths) else paths)
+
+    def _rebuild(self, connection: sqlite3.Connection) -> None:
+        """Replace every entry with a fresh import of the current JSONL files."""
+        with self._init_lock:
+            if not self.stale_marker.exists():
+                return  # another thread rebuilt first
+            # One transaction: readers see the old rows or the rebuilt ones,
+            # never an empty table.
+            with _write_transaction(connection):
+                connection.execute("DELETE FROM ledger_entries")
+                self._import_current(connection)
+            self.stale_marker.unlink(missing_ok=True)
+
+    def _initialize(self, connection: sqlite3.Connection) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            with connection:
+                connection.executescript(_SCHEMA)
+            self.import_jsonl(connection=connection)
+            self._initialized = True
+
+    def close(self) -> None:
+        """Close the calling thread's connection (other threads keep theirs)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def append(self, entry: dict[str, object]) -> None:
+        """Insert one ledger entry."""
+        connection = self._connection()
+        with connection:
+            connection.execute(_INSERT_SQL, _entry_row(entry))
+
+    def latest(
+        self,
+        *,
+        repo: str,
+        task_id: str,
+        briefing_hash: str,
+    ) -> dict[str, object] | None:
+        """Return the most recent entry for (repo, task_id, briefing_hash)."""
+        row = self._connection().execute(
+            _LOOKUP_SQL, (repo, task_id, briefing_hash)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def count(self) -> int:
+        return int(
+            self._connection().execute("SELECT COUNT(*) FROM ledger_entries").fetchone()[0]
+        )
+
+    def lookup_plan(self) -> str:
+        """Return SQLite's query plan for the idempotency lookup (diagnostics)."""
+        rows = self._connection().execute(
+            f"EXPLAIN QUERY PLAN {_LOOKUP_SQL}", ("", "", "")
+        ).fetchall()
+        return "\n".join(str(row[-1]) for row in rows)
+
+    def import_jsonl(
+        self,
+        paths: Sequence[Path] | None = None,
+        *,
+        force: bool = False,
+        connection: sqlite3.Connection | None = None,
+    ) -> int:
+        """Import JSONL ledger files (oldest first) once; returns the entry count.
+
+        `paths` defaults to the store's current sources. The import is
+        recorded in `meta`, so later calls are no-ops unless `force=True`;
+        the check runs in the import's write transaction. Malformed lines
+        are skipped, as in the JSONL reader.
+        """
+        connection = connection or self._connection()
+        with _write_transaction(connection):
+            if not force:
+                done = connection.execute(
+                    "SELECT value FROM meta WHERE key = ?", (_IMPORT_META_KEY,)
+                ).fetchone()
+                if done is not None:
+                    return 0
+            if paths is None:
+                return self._import_current(connection)
+            return self._import(connection, paths)
+
+    def _import_current(self, connection: sqlite3.Connection) -> int:
+        """Import the current sources, again if a rotation moved one meanwhile."""
+        for _ in range(_IMPORT_ATTEMPTS - 1):
+            paths = self.jsonl_paths
+            connection.execute("SAVEPOINT ledger_import")
+            imported = self._import(connection, paths)
+            if self.jsonl_paths == paths:
+                connection.execute("RELEASE ledger_import")
+                return imported
+            connection.execute("ROLLBACK TO ledger_import")
+            connection.execute("RELEASE ledger_import")
+        return self._import(connection, self.jsonl_paths)
+
+    @staticmethod
+    def _import(connection: sqlite3.Connection, paths: Sequence[Path]) -> int:
+        """Insert every entry of `paths` and record the import (caller commits)."""
+        imported = 0
+        for path in paths:
+            batch: list[tuple[str, str, str, str, str]] = []
+            try:
+                file = path.open("r", encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with file:
+                for line in file:
+                    text = line.strip()
+                    if not text:
+                        continue
+                    try:
+                        parsed = json.loads(text)
+                    except json.JSONDecodeError:
+                        continue
+                    if not isinstance(parsed, dict):
+                        continue
+                    batch.append(_entry_row(parsed))
+                    if len(batch) >= _IMPORT_BATCH_SIZE:
+                        connection.executemany(_INSERT_SQL, batch)
+                        imported += len(batch)
+                        batch.clear()
+            if batch:
+                connection.executemany(_INSERT_SQL, batch)
+                imported += len(batch)
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (
+                _IMPORT_META_KEY,
+                json.dumps(
+                    {
+                        "sources": [str(path) for path in paths],
+                        "entries": imported,
+                        "imported_at": datetime.now(UTC).isoformat(),
+                    }
+                ),
+            ),
+        )
+        return imported
+
+    def export_jsonl(self, path: Path) -> int:
+        """Write every entry, in insertion order, to a JSONL file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        exported = 0
+        cursor = self._connection().execute(
+            "SELECT payload FROM ledger_entries ORDER BY id"
+        )
+        with path.open("w", encoding="utf-8") as file:
+            for (payload,) in cursor:
+                file.write(payload + "\n")
+                exported += 1
+        return exported
@@ -0,0 +1,240 @@
+"""SQLAlchemy model columns read with `ast`, for migration consistency checks.
+
+`validate_migration_consistency` compares a migration's columns with the
+model's. Matching lines that contain `db.Column(` and `=` missed multi-line
+declarations, `mapped_column`, explicit column names (`db.Column("name",
+...)`) and which table a column belongs to. This module reads each model
+class instead:
+
+- a model is a class deriving from `db.Model` / `Model` / `Base` (or from
+  another model in the same file), or any class declaring `__tablename__`;
+  `__abstract__ = True` models declare no table;
+- a model also owns the columns of the mixins and abstract models it
+  derives from in the same file (the first base wins on a shared
+  attribute, the class itself over all bases);
+- columns are class-level assignments (plain or annotated) to `Column(...)`
+  or `mapped_column(...)` calls, with any receiver (`db.`, `sa.`, `orm.`);
+- the column name is the first string argument or `name=`, else the
+  attribute name;
+- the table is `__tablename__`, else Flask-SQLAlchemy's snake_case of the
+  class name.
+
+`ModelColumnCache` keeps the result per content hash, so checking many
+model files only parses the ones that changed.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+MODEL_BASE_NAMES = frozenset({"Model", "Base", "DeclarativeBase"})
+COLUMN_FACTORIES = frozenset({"Column", "mapped_column"})
+DEFAULT_MODEL_CACHE_ENTRIES = 512
+
+_CAMEL_BOUNDARY_RE = re.compile(r"((?<=[a-z0-9])[A-Z]|(?!^)[A-Z](?=[a-z]))")
+
+
+@dataclass(frozen=True)
+class ModelColumn:
+    attribute: str
+    name: str  # database column name
+    line: int
+
+
+@dataclass(frozen=True)
+class ModelTable:
+    class_name: str
+    table: str
+    columns: tuple[ModelColumn, ...]
+
+    @property
+    def column_names(self) -> tuple[str, ...]:
+        return tuple(column.name for column in self.columns)
+
+
+def default_table_name(class_name: str) -> str:
+    """Flask-SQLAlchemy's default `__tablename__` (`UserProfile` -> `user_profile`)."""
+    return _CAMEL_BOUNDARY_RE.sub(r"_\1", class_name).lower()
+
+
+def _dotted_name(node: ast.expr) -> str:
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Subscript):  # Generic[...] style bases
+        return _dotted_name(node.value)
+    return ""
+
+
+def _column_call(node: ast.expr | None) -> ast.Call | None:
+    if isinstance(node, ast.Call) and _dotted_name(node.func) in COLUMN_FACTORIES:
+        return node
+    return None
+
+
+def _explicit_name(call: ast.Call) -> str:
+    if call.args:
+        first = call.args[0]
+        if isinstance(first, ast.Constant) and isinstance(first.value, str):
+            return first.value
+    for item in call.keywords:
+        if (
+            item.arg == "name"
+            and isinstance(item.value, ast.Constant)
+            and isinstance(item.value.value, str)
+        ):
+            return item.value.value
+    return ""
+
+
+def _class_table(node: ast.ClassDef) -> tuple[str, tuple[ModelColumn, ...], bool]:
+    """(__tablename__ or "", columns, declares __tablename__) of one class body."""
+    table = ""
+    has_table = False
+    columns: list[ModelColumn] = []
+    for statement in node.body:
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1:
+            target, value = statement.targets[0], statement.value
+        elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            target, value = statement.target, statement.value
+        else:
+            continue
+        if not isinstance(target, ast.Name):
+            continue
+        if target.id == "__tablename__":
+            has_table = True
+            if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                table = value.value
+            continue
+        call = _column_call(value)
+        if call is not None:
+            columns.append(
+                ModelColumn(target.id, _explicit_name(call) or target.id, statement.lineno)
+            )
+    return table, tuple(columns), has_table
+
+
+def _declares_abstract(node: ast.ClassDef) -> bool:
+    for statement in node.body:
+        if (
+            isinstance(statement, ast.Assign)
+            and any(
+                isinstance(target, ast.Name) and target.id == "__abstract__"
+                for target in statement.targets
+            )
+            and isinstance(statement.value, ast.Constant)
+        ):
+            return statement.value.value is True
+    return False
+
+
+def _merge_columns(
+    own: tuple[ModelColumn, ...], inherited: list[tuple[ModelColumn, ...]]
+) -> tuple[ModelColumn, ...]:
+    """`own` followed by inherited columns it does not redefine, first base winning."""
+    seen = {column.attribute for column in own}
+    merged = list(own)
+    for columns in inherited:
+        for column in columns:
+            if column.attribute not in seen:
+                seen.add(column.attribute)
+                merged.append(column)
+    return tuple(merged)
+
+
+def extract_models(source: str, filename: str = "<model>") -> tuple[ModelTable, ...] | None:
+    """Model classes of one file in source order (None on syntax errors)."""
+    try:
+        module = ast.parse(source, filename=filename)
+    except SyntaxError:
+        return None
+    models: list[ModelTable] = []
+    model_classes: set[str] = set()
+    # Mixins and abstract models: their columns land in every subclass's table.
+    inheritable: dict[str, tuple[ModelColumn, ...]] = {}
+    for node in module.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        table, own, has_table = _class_table(node)
+        base_names = [_dotted_name(base) for base in node.bases]
+        columns = _merge_columns(
+            own, [inheritable[name] for name in base_names if name in inheritable]
+        )
+        bases = set(base_names)
+        if not (has_table or bases & MODEL_BASE_NAMES or bases & model_classes):
+            inheritable[node.name] = columns
+            continue
+        model_classes.add(node.name)
+        if _declares_abstract(node):
+            inheritable[node.name] = columns
+            continue
+        if node.name in MODEL_BASE_NAMES:
+            continue  # `class Base(DeclarativeBase)` declares no table
+        models.append(ModelTable(node.name, table or default_table_name(node.name), columns))
+    return tuple(models)
+
+
+class ModelColumnCache:
+    """extract_models() results keyed by content hash, LRU-bounded.
+
+    `reader` supplies file text (e.g. the tools' shared ReadCache).
+    `on_event` receives "hit" and "miss" for telemetry.
+    """
+
+    def __init__(
+        self,
+        reader: Callable[[Path], str] | None = None,
+        max_entries: int = DEFAULT_MODEL_CACHE_ENTRIES,
+        *,
+        on_event: Callable[[str], None] | None = None,
+    ) -> None:
+        self.reader = reader or (lambda path: path.read_text(encoding="utf-8"))
+        self.max_entries = max(1, max_entries)
+        self.on_event = on_event
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[ModelTable, ...] | None] = OrderedDict()
+
+    def _emit(self, event: str) -> None:
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def models(self, path: Path) -> tuple[ModelTable, ...] | None:
+        """Models declared in `path` (None when it is not valid Python)."""
+        source = self.reader(path)
+        key = hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                cached = self._entries[key]
+                hit = True
+            else:
+                hit = False
+        if hit:
+            self._emit("hit")
+            return cached
+
+        self._emit("miss")
+        models = extract_models(source, path.name)
+        with self._lock:
+            self._entries[key] = models
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return models
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -12,32 +12,132 @@ References:
 - .context/05_quality_and_gates.md — quality gates
 """
 
+import atexit
 import fnmatch
 import json
 import os
 import re
 import shutil
-from datetime import UTC, datetime
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, date, datetime
 from pathlib import Path
 
 from crewai.tools import BaseTool
 
+from .alembic_graph import MigrationGraphCache
+from .alembic_schema import (
+    MigrationOp,
+    SchemaSnapshotStore,
+    SchemaState,
+    extract_ops,
+    replay,
+)
+from .code_search import code_search_index, default_index_path, render_hits
+from .done_evidence import EvidenceChecker, EvidenceRuleError, load_evidence_rules
+from .encoding_guard import HistogramCache, corruption_message, histogram_of_text
+from .file_io import (
+    DEFAULT_READ_CACHE_MAX_BYTES,
+    DEFAULT_READ_MAX_BYTES,
+    ReadCache,
+    read_line_range,
+    write_text_if_changed,
+)
+from .file_listing import (
+    DEFAULT_PAGE_LIMIT,
+    invalidate_git_file_index,
+    list_files,
+    paginate,
+)
+from .file_patch import (
+    PatchError,
+    PatchResult,
+    apply_patch,
+    base_hash_matches,
+    content_hash,
+    file_content_hash,
+    policy_line_window,
+)
+from .frontend_policy import check_frontend_policy
+from .model_columns import ModelColumnCache, ModelTable
+from .python_outline import outline_python
+from .task_board import (
+    TASK_ID_RE,
+    TaskStatusUpdate,
+    apply_task_status_updates,
+    load_task_board,
+    render_pending_view,
+)
 from .tool_security import (
     CONVENTIONAL_BRANCH_PREFIXES,
     DEFAULT_TIMEOUT_SECONDS,
     GIT_STAGE_BLOCKLIST,
+    PLATFORM_ROOT,
     SHARED_CONTRACTS_DIR,
     PROJECT_ROOT,
     TARGET_REPO_NAME,
     audit_log,
+    increment_audit_counter,
     safe_subprocess,
     validate_shared_contract_path,
     validate_write_path,
 )
+from .write_journal import WriteEvent, WriteJournal, run_journal_path
 
 TASKS_FILE_CANDIDATES: tuple[str, ...] = ("TASKS.md", "tasks.md")
 
 
+def _read_cache_budget() -> int:
+    try:
+        return int(
+            os.getenv("AURAXIS_READ_CACHE_MAX_BYTES", str(DEFAULT_READ_CACHE_MAX_BYTES))
+        )
+    except ValueError:
+        return DEFAULT_READ_CACHE_MAX_BYTES
+
+
+# Shared by every read path in this module (read tool, policy checks, Done
+# evidence). Hits/misses/evictions show up in get_tool_audit_counters().
+_READ_CACHE = ReadCache(
+    _read_cache_budget(),
+    on_event=lambda event: increment_audit_counter(f"read_cache.{event}"),
+)
+
+
+def _write_journal_dir() -> Path:
+    override = os.getenv("AURAXIS_WRITE_JOURNAL_DIR", "").strip()
+    return Path(override) if override else PLATFORM_ROOT / "tasks_status" / ".write_journal"
+
+
+# Every write_file_content call is recorded here (JSONL per run). Caches
+# subscribe to it instead of being invalidated by hand at each write site.
+_WRITE_JOURNAL = WriteJournal(run_journal_path(_write_journal_dir(), pid=os.getpid()))
+atexit.register(_WRITE_JOURNAL.close)
+
+
+def _on_file_written(event: WriteEvent) -> None:
+    increment_audit_counter(f"write_file.{event.status}")
+    if not event.changed:
+        return
+    _READ_CACHE.invalidate(PROJECT_ROOT / event.path)
+    if event.status == "created":
+        invalidate_git_file_index(PROJECT_ROOT)
+
+
+_WRITE_JOURNAL.subscribe(_on_file_written)
+
+
+def get_write_journal() -> WriteJournal:
+    """The current run's write journal (subscribe to react to file writes)."""
+    return _WRITE_JOURNAL
+
+
+def _invalidate_worktree_caches() -> None:
+    """Forget cached file contents/listings after git rewrote the worktree."""
+    _READ_CACHE.clear()
+    invalidate_git_file_index(PROJECT_ROOT)
+
+
 def _resolve_tasks_file() -> Path:
     """Resolve task board filename across repositories."""
     for filename in TASKS_FILE_CANDIDATES:
@@ -56,55 +156,6 @@ GOVERNANCE_ALLOWLIST: list[str] = ["product.md", "steering.md"]
 # ---------------------------------------------------------------------------
 
 
-# ---------------------------------------------------------------------------
-# Helpers for ReadPendingTasksTool (extracted to keep cyclomatic complexity low)
-# ---------------------------------------------------------------------------
-
-_PENDING_STATUSES = ("| Todo", "| In Progress", "| Blocked")
-_PENDING_CHECKLIST_MARKERS = ("- [ ]", "- [~]", "- [!]")
-_ORDERED_LIST_PREFIXES = ("1.", "2.", "3.", "4.", "5.")
-_PENDING_BLOCK_MARKER = "Pendencias de execucao imediata"
-_TASK_ID_PATTERN = re.compile(r"^[A-Z]+-\d+$|^[A-Z]+\d+$")
-
-
-def _extract_pending_rows(lines: list[str]) -> list[str]:
-    """Return table rows whose status is Todo, In Progress, or Blocked."""
-    return [
-        line
-        for line in lines
-        if line.startswith("|") and any(s in line for s in _PENDING_STATUSES)
-    ]
-
-
-def _extract_pending_checklist(lines: list[str]) -> list[str]:
-    """Return checklist tasks marked as todo/in-progress/blocked."""
-    extracted: list[str] = []
-    for line in lines:
-        stripped = line.strip()
-        if not any(stripped.startswith(prefix) for prefix in _PENDING_CHECKLIST_MARKERS):
-            continue
-        extracted.append(line)
-    return extracted
-
-
-def _extract_pending_block(lines: list[str]) -> list[str]:
-    """Return the 'Pendencias de execucao imediata' ordered-list block."""
-    block: list[str] = []
-    in_block = False
-    for line in lines:
-        if _PENDING_BLOCK_MARKER in line:
-            in_block = True
-            block.append(line)
-            continue
-        if in_block:
-            if line.strip() == "" and any(
-                item.startswith(_ORDERED_LIST_PREFIXES) for item in block
-            ):
-                break
-            block.append(line)
-    return block
-
-
 class ReadTasksTool(BaseTool):
     name: str = "read_tasks"
     description: str = (
@@ -117,7 +168,7 @@ class ReadTasksTool(BaseTool):
         audit_log("read_tasks", {"path": str(path)}, "reading", status="OK")
         if not path.exists():
             return f"Error: tasks file not found at {path}"
-        return path.read_text(encoding="utf-8")
+        return _READ_CACHE.read_text(path)
 
 
 class ReadPendingTasksTool(BaseTool):
@@ -133,92 +184,94 @@ class ReadPendingTasksTool(BaseTool):
         if not path.exists():
             return f"Error: tasks file not found at {path}"
 
-        lines = path.read_text(encoding="utf-8").splitlines()
-        pending_lines = _extract_pending_rows(lines)
-        pending_checklist = _extract_pending_checklist(lines)
-        pending_block = _extract_pending_block(lines)
-
-        result_parts: list[str] = [
-            f"# {path.name} — Pending Tasks Only (Todo / In Progress / Blocked)",
-            "",
-        ]
-        if pending_block:
-            result_parts.extend(pending_block)
-            result_parts.append("")
-        if pending_lines:
-            result_parts.append("| ID | Area | Tarefa | Status | Progresso | Risco |")
-            result_parts.append("|---|---|---|---|---|---|")
-            result_parts.extend(pending_lines)
-        if pending_checklist:
-            if pending_lines:
-                result_parts.append("")
-            result_parts.append("Checklist pending tasks:")
-            result_parts.extend(pending_checklist)
-        if not pending_lines and not pending_checklist:
-            result_parts.append("No pending tasks found — all tasks are Done.")
-
-        output = "\n".join(result_parts)
+        board = load_task_board(path)
+        output = render_pending_view(board)
         audit_log(
             "read_pending_tasks",
             {
-                "pending_table_count": len(pending_lines),
-                "pending_checklist_count": len(pending_checklist),
+                "pending_table_count": len(board.pending_rows),
+                "pending_checklist_count": len(board.pending_checklist),
             },
             (
                 "returned pending tasks: "
-                f"table={len(pending_lines)} checklist={len(pending_checklist)}"
+                f"table={len(board.pending_rows)} "
+                f"checklist={len(board.pending_checklist)}"
             ),
             status="OK",
         )
         return output
 
 
+TASKS_SECTION_PAGE_LINES = 80
+
+
 class ReadTasksSectionTool(BaseTool):
     name: str = "read_tasks_section"
     description: str = (
-        "Reads a specific section of TASKS.md by heading keyword. "
+        "Reads a specific section of TASKS.md by heading keyword or task ID. "
         "Use this to read only the relevant part of the file. "
         "Example: section_keyword='Ciclo B' or 'B8' or 'Autenticacao'. "
-        "Returns the matching section and up to 40 lines of context."
+        "A task ID returns only that task (with its table header); a heading "
+        "keyword returns exactly that section. Long sections are paged: pass "
+        f"page=2, page=3... to continue ({TASKS_SECTION_PAGE_LINES} lines per page)."
     )
 
-    def _run(self, section_keyword: str) -> str:
+    def _run(self, section_keyword: str, page: int = 1) -> str:
         path = _resolve_tasks_file()
         if not path.exists():
             return f"Error: tasks file not found at {path}"
 
-        content = path.read_text(encoding="utf-8")
-        lines = content.splitlines()
-
-        # Find lines containing the keyword
-        matches: list[tuple[int, str]] = [
-            (i, line)
-            for i, line in enumerate(lines)
-            if section_keyword.lower() in line.lower()
-        ]
-
-        if not matches:
+        board = load_task_board(path)
+        located = board.locate_section(section_keyword)
+        if located is None:
             return (
                 f"No section found matching '{section_keyword}' in {path.name}. "
                 f"Try a broader keyword."
             )
 
-        # Return context around the first match: up to 40 lines after
-        first_idx = matches[0][0]
-        start = max(0, first_idx - 2)
-        end = min(len(lines), first_idx + 40)
-        excerpt = "\n".join(lines[start:end])
+        label, line_indices = located
+        total_pages = max(1, -(-len(line_indices) // TASKS_SECTION_PAGE_LINES))
+        try:
+            requested_page = int(page or 1)
+        except (TypeError, ValueError):
+            msg = (
+                f"Error: page must be a whole number (1..{total_pages}), got {page!r}. "
+                f"Call again with section_keyword={section_keyword!r} and page=1."
+            )
+            audit_log(
+                "read_tasks_section",
+                {"section_keyword": section_keyword, "page": str(page)},
+                msg,
+                status="ERROR",
+            )
+            return msg
+        current_page = min(max(1, requested_page), total_pages)
+        offset = (current_page - 1) * TASKS_SECTION_PAGE_LINES
+        page_indices = line_indices[offset : offset + TASKS_SECTION_PAGE_LINES]
+        excerpt = "\n".join(board.lines[index] for index in page_indices)
+        start = page_indices[0] + 1 if page_indices else 0
+        end = page_indices[-1] + 1 if page_indices else 0
 
         audit_log(
             "read_tasks_section",
-            {"section_keyword": section_keyword, "line": first_idx},
-            f"returned lines {start}-{end}",
+            {"section_keyword": section_keyword, "page": current_page},
+            f"returned '{label}' lines {start}-{end} page {current_page}/{total_pages}",
             status="OK",
         )
-        return (
-            f"# {path.name} — Section: '{section_keyword}' "
-            f"(lines {start + 1}-{end})\n\n{excerpt}"
+        header = (
+            f"# {path.name} — Section: '{label}' "
+            f"(lines {start}-{end}, page {current_page}/{total_pages})"
         )
+        if current_page < total_pages:
+            header += f"\n(more lines: call again with page={current_page + 1})"
+        return f"{header}\n\n{excerpt}"
+
+
+def _read_max_bytes() -> int:
+    try:
+        return max(1024, int(os.getenv("AURAXIS_READ_MAX_BYTES", str(DEFAULT_READ_MAX_BYTES))))
+    except ValueError:
+        return DEFAULT_READ_MAX_BYTES
 
 
 class ReadProjectFileTool(BaseTool):
@@ -228,10 +281,31 @@ class ReadProjectFileTool(BaseTool):
         "Path must be relative to project root "
         "(e.g., 'app/models/user.py', 'app/schemas/user_schemas.py'). "
         "ALWAYS use this before writing to a file that may already exist. "
-        "This is the primary tool for reading source code."
+        "This is the primary tool for reading source code.\n\n"
+        "Optional parameters for large files:\n"
+        "- start_line / end_line: 1-based inclusive line range (0 = until EOF)\n"
+        "- max_bytes: byte budget for this call (capped by AURAXIS_READ_MAX_BYTES)\n"
+        "When the output is cut, a trailer with NEXT_CURSOR: start_line=<n> "
+        "tells where to continue. A single line longer than the budget is "
+        "paged: the trailer then says the line was truncated and the cursor "
+        "adds start_byte=<b>. The trailer is not part of the file.\n"
+        "Every full or ranged read ends with CONTENT_HASH: <hash> of the whole "
+        "file; pass it as base_hash to write_file_content.\n"
+        "- start_byte: byte offset into start_line, from NEXT_CURSOR\n"
+        "- mode='outline' (Python only): classes, db.Column fields, method "
+        "signatures and line numbers instead of the body. Use it to map a "
+        "file, then read only the line ranges you need."
     )
 
-    def _run(self, path: str) -> str:
+    def _run(
+        self,
+        path: str,
+        start_line: int = 0,
+        end_line: int = 0,
+        max_bytes: int = 0,
+        mode: str = "full",
+        start_byte: int = 0,
+    ) -> str:
         resolved = (PROJECT_ROOT / path).resolve()
 
         if not resolved.is_relative_to(PROJECT_ROOT):
@@ -239,10 +313,87 @@ class ReadProjectFileTool(BaseTool):
             audit_log("read_project_file", {"path": path}, msg, status="BLOCKED")
             return msg
 
-        audit_log("read_project_file", {"path": path}, "reading", status="OK")
-        if not resolved.exists():
-            return f"FILE_NOT_FOUND: '{path}' does not exist yet."
-        return resolved.read_text(encoding="utf-8")
+        audit_log(
+            "read_project_file",
+            {"path": path, "start_line": start_line, "end_line": end_line, "mode": mode},
+            "reading",
+            status="OK",
+        )
+        hard_cap = _read_max_bytes()
+        budget = min(int(max_bytes), hard_cap) if max_bytes and int(max_bytes) > 0 else hard_cap
+        return _render_project_file(
+            path,
+            resolved,
+            start_line=int(start_line or 1),
+            end_line=int(end_line or 0),
+            budget=budget,
+            mode=mode,
+            start_byte=int(start_byte or 0),
+        )
+
+
+def _render_project_file(
+    path: str,
+    resolved: Path,
+    *,
+    start_line: int = 1,
+    end_line: int = 0,
+    budget: int,
+    mode: str = "full",
+    start_byte: int = 0,
+) -> str:
+    """Render one file for the read tools (full/ranged text or outline)."""
+    if not resolved.exists():
+        return f"FILE_NOT_FOUND: '{path}' does not exist yet."
+    if not resolved.is_file():
+        return f"NOT_A_FILE: '{path}' is a directory. Use list_project_files instead."
+
+    if (mode or "full").strip().lower() == "outline":
+        if resolved.suffix != ".py":
+            return (
+                f"OUTLINE_UNAVAILABLE: '{path}' is not a Python file. "
+                "Use start_line/end_line for a ranged read instead."
+            )
+        try:
+            return outline_python(_READ_CACHE.read_bytes(resolved), label=path)
+        except (SyntaxError, UnicodeDecodeError) as error:
+            return (
+                f"OUTLINE_UNAVAILABLE: '{path}' could not be parsed ({error}). "
+                "Use a full or ranged read instead."
+            )
+
+    chunk = read_line_range(
+        resolved,
+        start_line=start_line,
+        end_line=end_line,
+        max_bytes=budget,
+        cache=_READ_CACHE,
+        start_byte=start_byte,
+    )
+    digest = file_content_hash(resolved)
+    separator = "" if chunk.text.endswith("\n") or not chunk.text else "\n"
+    if chunk.complete:
+        return f"{chunk.text}{separator}--- read_project_file: CONTENT_HASH: {digest} ---"
+
+    trailer = (
+        f"--- read_project_file: lines {chunk.start_line}-{chunk.end_line} "
+        f"of {chunk.total_lines} ({path}); CONTENT_HASH: {digest}"
+    )
+    if chunk.start_byte:
+        trailer += f"; line {chunk.start_line} from byte {chunk.start_byte}"
+    if chunk.next_byte:
+        trailer += (
+            f"; line {chunk.next_line} truncated at byte {chunk.next_byte}"
+            f"; NEXT_CURSOR: start_line={chunk.next_line} start_byte={chunk.next_byte}"
+        )
+    elif chunk.next_line:
+        trailer += f"; NEXT_CURSOR: start_line={chunk.next_line}"
+    return f"{chunk.text}{separator}{trailer} ---"
+
+
+def _file_listing_source() -> str:
+    source = os.getenv("AURAXIS_FILE_LISTING_SOURCE", "auto").strip().lower()
+    return source if source in {"auto", "git", "walk"} else "auto"
 
 
 class ListProjectFilesTool(BaseTool):
@@ -251,10 +402,25 @@ class ListProjectFilesTool(BaseTool):
         "Lists files inside a project directory. "
         "Path must be relative to project root "
         "(e.g., 'app/models', 'app/graphql/mutations', 'migrations/versions'). "
-        "Use this to discover what files already exist before creating new ones."
+        "Use this to discover what files already exist before creating new ones.\n\n"
+        "Optional parameters:\n"
+        "- pattern: comma-separated globs (e.g. '*.py' or 'app/**/*.ts')\n"
+        "- max_depth: directory levels to descend (0 = unlimited, 1 = no subdirs)\n"
+        "- limit: max paths per page (default 500)\n"
+        "- cursor: value of NEXT_CURSOR from the previous page\n\n"
+        "Dependency/build dirs (node_modules, .venv, dist, ...), symlinked "
+        "dirs and .gitignore'd paths are skipped. Answers come from a cached "
+        "git ls-files snapshot when the project is a git worktree."
     )
 
-    def _run(self, directory: str) -> str:
+    def _run(
+        self,
+        directory: str,
+        pattern: str = "",
+        max_depth: int = 0,
+        cursor: str = "",
+        limit: int = DEFAULT_PAGE_LIMIT,
+    ) -> str:
         resolved = (PROJECT_ROOT / directory).resolve()
 
         if not resolved.is_relative_to(PROJECT_ROOT):
@@ -263,24 +429,300 @@ class ListProjectFilesTool(BaseTool):
         if not resolved.exists():
             return f"DIRECTORY_NOT_FOUND: '{directory}' does not exist."
 
-        files = sorted(
-            str(f.relative_to(PROJECT_ROOT))
-            for f in resolved.rglob("*")
-            if f.is_file() and "__pycache__" not in str(f)
+        patterns = [item.strip() for item in (pattern or "").split(",") if item.strip()]
+        page = paginate(
+            list_files(
+                PROJECT_ROOT,
+                resolved,
+                max_depth=max(0, int(max_depth or 0)),
+                patterns=patterns,
+                cursor=cursor,
+                source=_file_listing_source(),
+            ),
+            int(limit or DEFAULT_PAGE_LIMIT),
         )
         audit_log(
             "list_project_files",
-            {"directory": directory},
-            f"listed {len(files)} files",
+            {"directory": directory, "pattern": pattern, "cursor": cursor},
+            f"listed {len(page.paths)} files",
             status="OK",
         )
-        return f"Files in '{directory}':\n" + "\n".join(files)
+        output = f"Files in '{directory}':\n" + "\n".join(page.paths)
+        if page.next_cursor:
+            output += (
+                f"\n\n[page truncated at {len(page.paths)} files] "
+                f"NEXT_CURSOR: {page.next_cursor}"
+            )
+        return output
+
+
+_GLOB_CHARS_RE = re.compile(r"[*?\[]")
+
+
+def _parse_path_list(raw: str) -> list[str]:
+    """Accept a JSON array or comma/newline separated paths."""
+    normalized = (raw or "").strip()
+    if normalized.startswith("["):
+        try:
+            parsed = json.loads(normalized)
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, list):
+            return [str(item).strip() for item in parsed if str(item).strip()]
+    return [item.strip() for item in re.split(r"[,\n]", normalized) if item.strip()]
+
+
+def _expand_project_glob(pattern: str) -> list[str]:
+    """Expand 'app/models/*.py' style globs to project-relative paths."""
+    parts = pattern.strip("/").split("/")
+    base_parts: list[str] = []
+    for part in parts:
+        if _GLOB_CHARS_RE.search(part):
+            break
+        base_parts.append(part)
+    start = (PROJECT_ROOT.joinpath(*base_parts)).resolve()
+    if not start.is_relative_to(PROJECT_ROOT) or not start.is_dir():
+        return []
+    return list(
+        list_files(
+            PROJECT_ROOT,
+            start,
+            patterns=[pattern.strip("/")],
+            source=_file_listing_source(),
+        )
+    )
+
+
+def _read_batch_max_bytes() -> int:
+    try:
+        budget = int(os.getenv("AURAXIS_READ_BATCH_MAX_BYTES", str(2 * DEFAULT_READ_MAX_BYTES)))
+        return max(1024, budget)
+    except ValueError:
+        return 2 * DEFAULT_READ_MAX_BYTES
+
+
+READ_BATCH_MAX_FILES = 40
+READ_BATCH_WORKERS = 8
+
+
+class ReadProjectFilesTool(BaseTool):
+    name: str = "read_project_files"
+    description: str = (
+        "Reads SEVERAL project files in one call (use instead of repeated "
+        "read_project_file calls during READ/REVIEW phases).\n\n"
+        "Parameters:\n"
+        "- paths: comma/newline separated list (or JSON array) of paths "
+        "relative to project root; globs like 'app/models/*.py' are expanded\n"
+        "- max_bytes: total byte budget (capped by AURAXIS_READ_BATCH_MAX_BYTES)\n"
+        "- mode: 'full' (default) or 'outline' (Python outline per file)\n\n"
+        "Output: one section per file, delimited by '=== FILE: <path> ==='; "
+        "full and ranged sections end with the file's CONTENT_HASH (base_hash for writes). "
+        "Files cut by the budget end with a NEXT_CURSOR trailer; continue them "
+        "with read_project_file(path, start_line=<n>, start_byte=<b>) as given."
+    )
+
+    def _run(self, paths: str, max_bytes: int = 0, mode: str = "full") -> str:
+        requested = _parse_path_list(paths)
+        resolved_paths: list[tuple[str, Path]] = []
+        seen: set[str] = set()
+        blocked: list[str] = []
+        for item in requested:
+            expanded = _expand_project_glob(item) if _GLOB_CHARS_RE.search(item) else [item]
+            if not expanded:
+                resolved_paths.append((item, PROJECT_ROOT / item))  # reported as not found
+                continue
+            for rel_path in expanded:
+                resolved = (PROJECT_ROOT / rel_path).resolve()
+                if not resolved.is_relative_to(PROJECT_ROOT):
+                    blocked.append(rel_path)
+                    continue
+                if rel_path not in seen:
+                    seen.add(rel_path)
+                    resolved_paths.append((rel_path, resolved))
+
+        if blocked:
+            msg = f"BLOCKED: {', '.join(repr(item) for item in blocked)} escape project root."
+            audit_log("read_project_files", {"paths": paths}, msg, status="BLOCKED")
+            return msg
+        if not resolved_paths:
+            return "Error: no paths given."
+
+        overflow = resolved_paths[READ_BATCH_MAX_FILES:]
+        resolved_paths = resolved_paths[:READ_BATCH_MAX_FILES]
+        hard_cap = _read_batch_max_bytes()
+        total_budget = (
+            min(int(max_bytes), hard_cap) if max_bytes and int(max_bytes) > 0 else hard_cap
+        )
+        per_file_budget = min(total_budget, _read_max_bytes())
+
+        def render(item: tuple[str, Path]) -> str:
+            rel_path, resolved = item
+            try:
+                return _render_project_file(
+                    rel_path, resolved, budget=per_file_budget, mode=mode
+                )
+            except OSError as error:
+                return f"Error: could not read '{rel_path}' ({error})."
+
+        with ThreadPoolExecutor(
+            max_workers=min(READ_BATCH_WORKERS, len(resolved_paths))
+        ) as executor:
+            rendered = list(executor.map(render, resolved_paths))
+
+        sections: list[str] = []
+        used = 0
+        skipped: list[str] = []
+        for (rel_path, resolved), text in zip(resolved_paths, rendered):
+            header = f"=== FILE: {rel_path} ===\n"
+            size = len(header.encode("utf-8")) + len(text.encode("utf-8"))
+            # Status lines (not found, directory) are always reported.
+            if used + size > total_budget and resolved.is_file():
+                # Leave room for the header and the NEXT_CURSOR trailer.
+                remaining = total_budget - used - len(header.encode("utf-8")) - 256
+                if remaining < 1024 or mode == "outline":
+                    skipped.append(rel_path)
+                    continue
+                text = _render_project_file(rel_path, resolved, budget=remaining, mode=mode)
+                size = len(header.encode("utf-8")) + len(text.encode("utf-8"))
+            used += size
+            sections.append(header + text)
+
+        footer = f"=== END ({len(sections)} files, {used} bytes) ==="
+        not_read = skipped + [rel_path for rel_path, _ in overflow]
+        if not_read:
+            footer += (
+                "\nNOT READ (budget/file limit): "
+                + ", ".join(not_read)
+                + " — request them in another call."
+            )
+        audit_log(
+            "read_project_files",
+            {"paths": paths, "mode": mode},
+            f"read {len(sections)} files ({used} bytes), not read {len(not_read)}",
+            status="OK",
+        )
+        separator = "\n" if sections else ""
+        return "\n".join(
+            section if section.endswith("\n") else section + "\n" for section in sections
+        ) + separator + footer
+
+
+def _search_index_path() -> Path:
+    override = os.getenv("AURAXIS_SEARCH_INDEX_DIR", "").strip()
+    index_dir = Path(override) if override else PLATFORM_ROOT / ".tmp" / "search-index"
+    return default_index_path(index_dir, TARGET_REPO_NAME)
+
+
+class SearchProjectTool(BaseTool):
+    name: str = "search_project"
+    description: str = (
+        "Regex search over the project files (like `git grep -n`), backed by "
+        "a persistent trigram index — use it to find definitions, usages and "
+        "field names instead of listing directories and reading whole files.\n\n"
+        "Parameters:\n"
+        "- pattern: Python regex, matched per line (e.g. 'def get_user', "
+        "'class \\w+Schema', 'wallet_id')\n"
+        "- path: optional directory relative to project root to search in\n"
+        "- glob: optional comma-separated globs (e.g. '*.py' or 'app/**/*.ts')\n"
+        "- context_lines: lines of context around each match (default 2)\n"
+        "- max_results: max matching lines (default 50)\n"
+        "- ignore_case: case-insensitive match\n\n"
+        "Output: `path:line: text` per match, context as `path-line- text`."
+    )
+
+    def _run(
+        self,
+        pattern: str,
+        path: str = "",
+        glob: str = "",
+        context_lines: int = 2,
+        max_results: int = 50,
+        ignore_case: bool = False,
+    ) -> str:
+        args = {"pattern": pattern, "path": path, "glob": glob}
+        resolved = (PROJECT_ROOT / (path or ".")).resolve()
+        if not resolved.is_relative_to(PROJECT_ROOT):
+            msg = f"BLOCKED: '{path}' escapes project root."
+            audit_log("search_project", args, msg, status="BLOCKED")
+            return msg
+        if not resolved.is_dir():
+            return f"DIRECTORY_NOT_FOUND: '{path}' does not exist."
+        if not (pattern or "").strip():
+            return "Error: pattern is required."
+
+        patterns = [item.strip() for item in (glob or "").split(",") if item.strip()]
+        prefix = "" if resolved == PROJECT_ROOT else resolved.relative_to(PROJECT_ROOT).as_posix()
+        try:
+            result = code_search_index(_search_index_path()).search(
+                PROJECT_ROOT,
+                pattern,
+                ignore_case=bool(ignore_case),
+                prefix=prefix,
+                path_patterns=patterns,
+                context_lines=max(0, min(int(context_lines or 0), 10)),
+                max_results=max(1, min(int(max_results or 50), 200)),
+                read_bytes=_READ_CACHE.read_bytes,
+            )
+        except re.error as error:
+            return f"Error: invalid regex {pattern!r} ({error})."
+        except sqlite3.Error as error:
+            msg = f"Error: search index unavailable ({error})."
+            audit_log("search_project", args, msg, status="ERROR")
+            return msg
+
+        matched_files = len({hit.path for hit in result.hits})
+        audit_log(
+            "search_project",
+            args,
+            f"{len(result.hits)} matches, {result.candidate_files}/{result.total_files} "
+            "files verified",
+            status="OK",
+        )
+        if not result.hits:
+            return (
+                f"NO_MATCHES: {pattern!r} not found "
+                f"({result.candidate_files}/{result.total_files} indexed files checked)."
+            )
+        header = (
+            f"# search_project: {len(result.hits)} matches in {matched_files} files "
+            f"({result.candidate_files}/{result.total_files} indexed files checked)"
+        )
+        output = header + "\n" + render_hits(result)
+        if result.truncated:
+            output += "\n[TRUNCATED at max_results] Narrow the search with path/glob."
+        return output
+
+
+# Revision graph of migrations/versions, rebuilt only for changed files;
+# parses read through _READ_CACHE.
+_MIGRATION_GRAPHS = MigrationGraphCache(
+    _READ_CACHE.read_text,
+    on_event=lambda event: increment_audit_counter(f"migration_graph.{event}"),
+)
+
+
+def _schema_snapshot_path() -> Path:
+    override = os.getenv("AURAXIS_SCHEMA_SNAPSHOT_DIR", "").strip()
+    snapshot_dir = Path(override) if override else PLATFORM_ROOT / ".tmp" / "schema-snapshot"
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", TARGET_REPO_NAME) or "project"
+    return snapshot_dir / f"{safe}.json"
+
+
+# Per-table columns replayed from the migration graph; persisted so a new
+# run only replays migrations added since the last one.
+_SCHEMA_SNAPSHOT = SchemaSnapshotStore(
+    _MIGRATION_GRAPHS,
+    _schema_snapshot_path(),
+    _READ_CACHE.read_text,
+    on_event=lambda event: increment_audit_counter(f"schema_snapshot.{event}"),
+)
 
 
 class GetLatestMigrationTool(BaseTool):
     name: str = "get_latest_migration"
     description: str = (
-        "Returns the revision ID and filename of the latest Alembic migration. "
+        "Returns the revision ID and filename of the head Alembic migration "
+        "(every head, when the history is branched). "
         "ALWAYS call this before creating a new migration to get the correct "
         "down_revision value. Without this, the migration chain breaks."
     )
@@ -290,37 +732,59 @@ class GetLatestMigrationTool(BaseTool):
         if not versions_dir.exists():
             return "Error: migrations/versions/ directory not found."
 
-        migration_files = sorted(
-            f
-            for f in versions_dir.iterdir()
-            if f.is_file() and f.suffix == ".py" and f.name != "__init__.py"
-        )
-
-        if not migration_files:
+        graph = _MIGRATION_GRAPHS.graph(versions_dir)
+        if not graph.migrations and not graph.unparsed:
             return "No migrations found. Use down_revision = None for the first one."
+        heads = graph.heads
+        if not heads:
+            return (
+                "Error: could not determine the migration head "
+                f"({len(graph.migrations)} revisions parsed, "
+                f"unreadable files: {', '.join(graph.unparsed) or 'none'})."
+            )
 
-        latest = migration_files[-1]
-        content = latest.read_text(encoding="utf-8")
-
-        # Extract revision ID
-        revision_id = "unknown"
-        for line in content.splitlines():
-            if line.strip().startswith("revision"):
-                revision_id = line.split("=")[1].strip().strip('"').strip("'")
-                break
+        notes: list[str] = []
+        if graph.unparsed:
+            notes.append(
+                "WARNING: no revision/down_revision found in: " + ", ".join(graph.unparsed)
+            )
+        if graph.missing:
+            notes.append(
+                "WARNING: down_revision points to unknown revisions: "
+                + ", ".join(graph.missing)
+            )
+        if graph.duplicates:
+            notes.append(
+                "WARNING: revision declared by several files: " + ", ".join(graph.duplicates)
+            )
 
         audit_log(
             "get_latest_migration",
-            {"file": latest.name},
-            f"revision={revision_id}",
+            {"heads": list(heads)},
+            f"revisions={len(graph.migrations)} heads={len(heads)}",
             status="OK",
         )
-        return (
-            f"Latest migration:\n"
-            f"  File: migrations/versions/{latest.name}\n"
-            f"  Revision ID: {revision_id}\n\n"
-            f"Use this as down_revision in your new migration."
-        )
+        if len(heads) == 1:
+            head = graph.migrations[heads[0]]
+            output = (
+                f"Latest migration:\n"
+                f"  File: migrations/versions/{head.filename}\n"
+                f"  Revision ID: {head.revision}\n\n"
+                f"Use this as down_revision in your new migration."
+            )
+        else:
+            lines = [
+                f"  - {revision} (migrations/versions/{graph.migrations[revision].filename})"
+                for revision in heads
+            ]
+            output = (
+                f"MULTIPLE HEADS ({len(heads)}): the migration history is branched"
+                f" at {', '.join(graph.branch_points) or 'an unknown revision'}.\n"
+                + "\n".join(lines)
+                + "\n\nA new migration must merge them: "
+                f"down_revision = ({', '.join(repr(revision) for revision in heads)})"
+            )
+        return "\n\n".join([output, *notes])
 
 
 class ReadAlembicHistoryTool(BaseTool):
@@ -330,7 +794,8 @@ class ReadAlembicHistoryTool(BaseTool):
         "column operation (add, drop, rename, alter) ever applied to a table. "
         "Use this to know which columns ALREADY EXIST in the database "
         "before writing a migration. This prevents writing add_column "
-        "for a column that should be renamed, or adding a duplicate column."
+        "for a column that should be renamed, or adding a duplicate column. "
+        "Ends with the columns the table has after the latest migration."
     )
 
     def _run(self, table_name: str = "users") -> str:
@@ -338,28 +803,18 @@ class ReadAlembicHistoryTool(BaseTool):
         if not versions_dir.exists():
             return "Error: migrations/versions/ directory not found."
 
-        migration_files = sorted(
-            f
-            for f in versions_dir.iterdir()
-            if f.is_file() and f.suffix == ".py" and f.name != "__init__.py"
-        )
-
-        if not migration_files:
-            return f"No migrations found for table '{table_name}'."
-
-        ops: list[str] = []
-        for mf in migration_files:
-            content = mf.read_text(encoding="utf-8")
-            if table_name not in content:
-                continue
-            for line in content.splitlines():
-                stripped = line.strip()
-                if stripped.startswith("op.") and table_name in stripped:
-                    ops.append(f"  {mf.name}: {stripped}")
-
-        if not ops:
+        state = _SCHEMA_SNAPSHOT.state(versions_dir)
+        history = state.history.get(table_name, [])
+        if not history:
             return f"No operations found for table '{table_name}'."
 
+        ops = [f"  {entry.filename}:{entry.line}: {entry.text}" for entry in history]
+        columns = state.columns(table_name)
+        if columns is None:
+            current = f"Table '{table_name}' does not exist after the latest migration."
+        else:
+            current = f"Current columns ({len(columns)}): " + (", ".join(columns) or "(none)")
+
         audit_log(
             "read_alembic_history",
             {"table_name": table_name},
@@ -368,7 +823,7 @@ class ReadAlembicHistoryTool(BaseTool):
         )
         return (
             f"Alembic history for table '{table_name}' "
-            f"({len(ops)} operations):\n" + "\n".join(ops)
+            f"({len(ops)} operations):\n" + "\n".join(ops) + "\n\n" + current
         )
 
 
@@ -377,82 +832,78 @@ class ReadAlembicHistoryTool(BaseTool):
 # ---------------------------------------------------------------------------
 
 
-def _extract_model_columns(content: str) -> list[str]:
-    """Extract db.Column attribute names from a model file."""
-    cols: list[str] = []
-    for line in content.splitlines():
-        stripped = line.strip()
-        if "db.Column(" in stripped and "=" in stripped:
-            cols.append(stripped.split("=")[0].strip())
-    return cols
-
-
-def _extract_sa_column_name(line: str) -> str | None:
-    """Extract the column name from a sa.Column('name', ...) call."""
-    for quote in ['"', "'"]:
-        marker = f"sa.Column({quote}"
-        if marker in line:
-            return line.split(marker)[1].split(quote)[0]
-    return None
+# Model columns per content hash; reads go through _READ_CACHE.
+_MODEL_COLUMNS = ModelColumnCache(
+    _READ_CACHE.read_text,
+    on_event=lambda event: increment_audit_counter(f"model_columns.{event}"),
+)
 
 
-def _extract_migration_ops(content: str) -> tuple[list[str], list[str]]:
-    """Return (add_columns, alter_lines) from a migration file."""
-    add_cols: list[str] = []
-    alter_lines: list[str] = []
-    for line in content.splitlines():
-        stripped = line.strip()
-        if "op.add_column" in stripped:
-            col = _extract_sa_column_name(stripped)
-            if col:
-                add_cols.append(col)
-        if "op.alter_column" in stripped:
-            alter_lines.append(stripped)
-    return add_cols, alter_lines
-
-
-def _collect_existing_columns(versions_dir: Path, exclude_file: Path) -> set[str]:
-    """Scan previous migrations for column names already in the DB."""
-    existing: set[str] = set()
-    for mf in sorted(versions_dir.iterdir()):
-        if mf == exclude_file or mf.suffix != ".py":
-            continue
-        if mf.name == "__init__.py":
-            continue
-        for line in mf.read_text(encoding="utf-8").splitlines():
-            col = _extract_sa_column_name(line.strip())
-            if col and "sa.Column(" in line:
-                existing.add(col)
-    return existing
+def _collect_models(model_file: Path) -> tuple[list[ModelTable], list[str]]:
+    """(models, invalid files) of a model file or of every .py below a directory."""
+    files = sorted(model_file.rglob("*.py")) if model_file.is_dir() else [model_file]
+    models: list[ModelTable] = []
+    unparsable: list[str] = []
+    for path in files:
+        try:
+            found = _MODEL_COLUMNS.models(path)
+        except (OSError, UnicodeDecodeError):
+            found = None
+        if found is None:
+            unparsable.append(path.relative_to(PROJECT_ROOT).as_posix())
+        else:
+            models.extend(found)
+    return models, unparsable
 
 
 def _build_consistency_report(
-    mig_add_cols: list[str],
-    model_cols: list[str],
-    existing_cols: set[str],
+    migration_ops: tuple[MigrationOp, ...],
+    models: list[ModelTable],
+    existing: SchemaState,
+    after: SchemaState,
 ) -> tuple[list[str], list[str]]:
     """Return (issues, warnings) comparing migration ops vs model/DB."""
     issues: list[str] = []
     warnings: list[str] = []
-    for col in mig_add_cols:
-        if col in existing_cols:
+    model_columns: dict[str, set[str]] = {}
+    for model in models:
+        model_columns.setdefault(model.table, set()).update(model.column_names)
+    every_model_column = set().union(*model_columns.values())
+
+    for op in migration_ops:
+        if op.kind != "add_column" or not op.column:
+            continue
+        table, col = op.table, op.column
+        if col in (existing.columns(table) or ()):
             issues.append(
-                f"CONFLICT: add_column('{col}') but column already "
+                f"CONFLICT: add_column('{table}', '{col}') but column already "
                 f"exists in a previous migration. "
                 f"Use op.alter_column() to rename instead."
             )
-        if col not in model_cols:
+        # No model for this table: fall back to every model column.
+        if col not in model_columns.get(table, every_model_column):
             warnings.append(
-                f"WARNING: migration adds '{col}' but model has no "
-                f"matching db.Column attribute."
+                f"WARNING: migration adds '{table}.{col}' but model has no "
+                f"matching column."
             )
+    for model in models:
+        schema_columns = after.columns(model.table)
+        if schema_columns is None:
+            continue  # table not created by any migration
+        for column in model.columns:
+            if column.name not in schema_columns:
+                warnings.append(
+                    f"WARNING: model column '{model.class_name}.{column.attribute}' "
+                    f"('{model.table}.{column.name}') has no migration."
+                )
     return issues, warnings
 
 
 class ValidateMigrationConsistencyTool(BaseTool):
     name: str = "validate_migration_consistency"
     description: str = (
-        "Compares a model file against a migration file to check consistency. "
+        "Compares a model file (or a models directory) against a migration "
+        "file to check consistency, table by table. "
         "Detects: (1) columns in migration that do not match model, "
         "(2) model columns that have no migration, "
         "(3) add_column for a column that already exists in a previous migration "
@@ -469,19 +920,28 @@ class ValidateMigrationConsistencyTool(BaseTool):
         if not migration_file.exists():
             return f"Error: migration file not found: {migration_path}"
 
-        model_cols = _extract_model_columns(model_file.read_text(encoding="utf-8"))
-        mig_add_cols, _ = _extract_migration_ops(
-            migration_file.read_text(encoding="utf-8")
+        models, unparsable = _collect_models(model_file)
+        if unparsable and not model_file.is_dir():
+            return f"Error: model file is not valid Python: {model_path}"
+        migration_ops = extract_ops(
+            _READ_CACHE.read_text(migration_file), migration_file.name
         )
+        if migration_ops is None:
+            return f"Error: migration file is not valid Python: {migration_path}"
 
+        # Schema the migration runs against: its ancestors in the revision
+        # graph (everything replayed, when it lives outside migrations/versions).
         versions_dir = PROJECT_ROOT / "migrations" / "versions"
-        existing_cols = _collect_existing_columns(
-            versions_dir, migration_file.resolve()
-        )
+        if versions_dir.is_dir():
+            existing = _SCHEMA_SNAPSHOT.state_before(versions_dir, migration_file.name)
+        else:
+            existing = SchemaState()
 
-        issues, warnings = _build_consistency_report(
-            mig_add_cols, model_cols, existing_cols
-        )
+        after = replay([(migration_file.name, migration_ops)], existing.copy())
+
+        issues, warnings = _build_consistency_report(migration_ops, models, existing, after)
+        if unparsable:
+            warnings.append("WARNING: skipped invalid Python files: " + ", ".join(unparsable))
 
         if not issues and not warnings:
             result = "CONSISTENT: model and migration are aligned."
@@ -511,7 +971,7 @@ class ReadSchemaTool(BaseTool):
         audit_log("read_schema", {"path": str(path)}, "reading", status="OK")
         if not path.exists():
             return f"Error: schema.graphql not found at {path}"
-        return path.read_text(encoding="utf-8")
+        return _READ_CACHE.read_text(path)
 
 
 class ReadContextFileTool(BaseTool):
@@ -545,7 +1005,7 @@ class ReadContextFileTool(BaseTool):
         )
         if not resolved.exists():
             return f"Error: File not found: .context/{filename}"
-        return resolved.read_text(encoding="utf-8")
+        return _READ_CACHE.read_text(resolved)
 
 
 class ReadGovernanceFileTool(BaseTool):
@@ -577,7 +1037,7 @@ class ReadGovernanceFileTool(BaseTool):
         )
         if not path.exists():
             return f"Error: {filename} not found at project root."
-        return path.read_text(encoding="utf-8")
+        return _READ_CACHE.read_text(path)
 
 
 # ---------------------------------------------------------------------------
@@ -587,7 +1047,7 @@ class ReadGovernanceFileTool(BaseTool):
 
 def _normalize_contract_task_id(task_id: str) -> str:
     normalized = (task_id or "").strip().upper()
-    if not _TASK_ID_PATTERN.match(normalized):
+    if not TASK_ID_RE.match(normalized):
         raise ValueError(
             "invalid task_id format. Expected pattern like 'B11', 'WEB4', 'APP19'."
         )
@@ -1305,200 +1765,31 @@ class IntegrationTestTool(BaseTool):
 # ---------------------------------------------------------------------------
 
 
-def _parse_task_row(line: str) -> dict | None:
-    """Parse a TASKS.md table row into a dict of columns."""
-    if not line.startswith("|"):
-        return None
-    cells = [c.strip() for c in line.split("|")]
-    # cells[0] is empty (before first |), cells[-1] is empty (after last |)
-    cells = cells[1:-1]
-    if len(cells) < 8:
-        return None
-    return {
-        "id": cells[0].strip(),
-        "area": cells[1].strip(),
-        "tarefa": cells[2].strip(),
-        "status": cells[3].strip(),
-        "progresso": cells[4].strip(),
-        "risco": cells[5].strip(),
-        "commit": cells[6].strip(),
-        "data": cells[7].strip(),
-        "raw_cells": cells,
-    }
-
-
-def _rebuild_task_row(cells: list[str]) -> str:
-    """Rebuild a TASKS.md table row from a list of cell values."""
-    return "| " + " | ".join(cells) + " |"
-
-
-def _status_to_check_marker(status: str) -> str:
-    normalized = status.strip().lower()
-    if normalized in ("done", "completed"):
-        return "x"
-    if normalized in ("in progress", "in_progress", "progress"):
-        return "~"
-    if normalized in ("blocked", "block"):
-        return "!"
-    return " "
-
-
-def _update_checklist_task_line(line: str, task_id: str, status: str) -> tuple[str, bool]:
-    """Update checklist marker for a specific task ID line."""
-    marker = _status_to_check_marker(status)
-    pattern = re.compile(
-        rf"^(\s*-\s*\[)([ x~!])(\]\s+\*\*{re.escape(task_id)}\b.*)$"
-    )
-    match = pattern.match(line)
-    if not match:
-        return line, False
-    return f"{match.group(1)}{marker}{match.group(3)}", True
-
-
-def _file_contains(path: Path, pattern: str) -> bool:
-    if not path.exists() or not path.is_file():
-        return False
-    try:
-        return re.search(pattern, path.read_text(encoding="utf-8"), re.MULTILINE) is not None
-    except UnicodeDecodeError:
-        return False
+DONE_EVIDENCE_CONFIG_DIR = Path(__file__).resolve().parent.parent / "config" / "done_evidence"
 
 
 def _validate_done_task_evidence(task_id: str) -> str | None:
+    """Check the task's Done-evidence rules (config/done_evidence/<repo>.json
+    plus the project's .context/done_evidence_rules.json)."""
     normalized_task_id = task_id.strip().upper()
-
-    if TARGET_REPO_NAME == "auraxis-web" and normalized_task_id == "WEB3":
-        required_files = (
-            PROJECT_ROOT / "app/layouts/default.vue",
-            PROJECT_ROOT / "app/pages/login.vue",
-            PROJECT_ROOT / "app/middleware/authenticated.ts",
-            PROJECT_ROOT / "app/middleware/guest-only.ts",
-            PROJECT_ROOT / "app/composables/useAuth/index.ts",
-        )
-        missing_files = [
-            str(path.relative_to(PROJECT_ROOT))
-            for path in required_files
-            if not path.exists()
-        ]
-        if missing_files:
-            return (
-                "BLOCKED: WEB3 cannot be marked Done. Missing required files: "
-                + ", ".join(missing_files)
-            )
-
-        if _file_contains(PROJECT_ROOT / "app/pages/login.vue", r"<\s*(input|button|label)\b"):
-            return (
-                "BLOCKED: WEB3 cannot be marked Done. "
-                "Raw HTML controls still present in app/pages/login.vue."
-            )
-
-        server_auth_dir = PROJECT_ROOT / "app/server/api/auth"
-        if not server_auth_dir.exists():
-            return (
-                "BLOCKED: WEB3 requires server-side auth handlers with HttpOnly cookie support "
-                "(app/server/api/auth/*)."
-            )
-
-        has_http_only_cookie = False
-        for candidate in server_auth_dir.rglob("*.ts"):
-            if _file_contains(candidate, r"setCookie\s*\(") and _file_contains(
-                candidate, r"httpOnly\s*:\s*true"
-            ):
-                has_http_only_cookie = True
-                break
-        if not has_http_only_cookie:
-            return (
-                "BLOCKED: WEB3 requires setCookie(..., { httpOnly: true }) "
-                "in server auth handlers."
-            )
-        return None
-
-    if TARGET_REPO_NAME == "auraxis-app" and normalized_task_id == "APP3":
-        required_files = (
-            PROJECT_ROOT / "lib/secure-storage.ts",
-            PROJECT_ROOT / "stores/session-store.ts",
-            PROJECT_ROOT / "app/(public)/login.tsx",
-            PROJECT_ROOT / "app/(private)/_layout.tsx",
-        )
-        missing_files = [
-            str(path.relative_to(PROJECT_ROOT))
-            for path in required_files
-            if not path.exists()
-        ]
-        if missing_files:
-            return (
-                "BLOCKED: APP3 cannot be marked Done. Missing required files: "
-                + ", ".join(missing_files)
-            )
-
-        secure_storage_path = PROJECT_ROOT / "lib/secure-storage.ts"
-        if not (
-            _file_contains(secure_storage_path, r"SecureStore\.setItemAsync")
-            and _file_contains(secure_storage_path, r"SecureStore\.deleteItemAsync")
-        ):
-            return (
-                "BLOCKED: APP3 requires secure token persistence/cleanup via expo-secure-store."
-            )
-
-        session_store_path = PROJECT_ROOT / "stores/session-store.ts"
-        if not (
-            _file_contains(session_store_path, r"signIn\s*:")
-            and _file_contains(session_store_path, r"signOut\s*:")
-            and _file_contains(session_store_path, r"clearStoredSession")
-        ):
-            return (
-                "BLOCKED: APP3 requires signIn/signOut actions and storage cleanup in session store."
-            )
-        return None
-
-    if TARGET_REPO_NAME == "auraxis-api" and normalized_task_id == "B11":
-        required_paths = (
-            PROJECT_ROOT / "app/models/user.py",
-            PROJECT_ROOT / "app/schemas/user_schemas.py",
-            PROJECT_ROOT / "migrations/versions/20240614_add_investor_profile_suggestion_fields.py",
-        )
-        missing_paths = [
-            str(path.relative_to(PROJECT_ROOT))
-            for path in required_paths
-            if not path.exists()
-        ]
-        if missing_paths:
-            return (
-                "BLOCKED: B11 cannot be marked Done. Missing required files: "
-                + ", ".join(missing_paths)
-            )
-
-        user_model_path = PROJECT_ROOT / "app/models/user.py"
-        required_model_fields = (
-            r"investor_profile_suggested",
-            r"profile_quiz_score",
-            r"taxonomy_version",
+    try:
+        rules = load_evidence_rules(
+            TARGET_REPO_NAME,
+            DONE_EVIDENCE_CONFIG_DIR,
+            PROJECT_ROOT,
+            read_text=_READ_CACHE.read_text,
         )
-        if any(not _file_contains(user_model_path, field) for field in required_model_fields):
-            return "BLOCKED: B11 requires all profile suggestion fields in app/models/user.py."
-
-        schema_path = PROJECT_ROOT / "app/schemas/user_schemas.py"
-        try:
-            compile(schema_path.read_text(encoding="utf-8"), str(schema_path), "exec")
-        except SyntaxError as exc:
-            return f"BLOCKED: B11 schema has syntax error: {exc}."
-
-        test_has_field_coverage = False
-        for test_file in (PROJECT_ROOT / "tests").rglob("test_*.py"):
-            if _file_contains(
-                test_file,
-                r"(investor_profile_suggested|profile_quiz_score|taxonomy_version)",
-            ):
-                test_has_field_coverage = True
-                break
-        if not test_has_field_coverage:
-            return (
-                "BLOCKED: B11 requires at least one automated test asserting "
-                "investor profile suggestion fields."
-            )
+    except EvidenceRuleError as error:
+        return f"BLOCKED: Done evidence rules are invalid ({error})."
+    task_rules = rules.get(normalized_task_id)
+    if not task_rules:
         return None
-
-    return None
+    checker = EvidenceChecker(
+        PROJECT_ROOT,
+        read_text=_READ_CACHE.read_text,
+        list_source=_file_listing_source(),
+    )
+    return checker.first_failure(task_rules)
 
 
 def _commit_has_functional_changes(commit_hash: str) -> tuple[bool, str]:
@@ -1524,6 +1815,78 @@ def _commit_has_functional_changes(commit_hash: str) -> tuple[bool, str]:
     return True, ", ".join(functional_files[:5])
 
 
+def _validate_task_status_update(update: TaskStatusUpdate) -> str | None:
+    """Return a BLOCKED message when an update violates the Done/drift guards."""
+    expected_task_id = os.getenv("AURAXIS_RESOLVED_TASK_ID", "").strip().upper()
+    normalized_task_id = (update.task_id or "").strip().upper()
+    normalized_status = (update.status or "").strip().lower()
+    if expected_task_id and normalized_task_id != expected_task_id:
+        return (
+            f"BLOCKED: task_id drift detected. "
+            f"Expected '{expected_task_id}' but got '{normalized_task_id}'."
+        )
+
+    if normalized_status not in _DONE_STATUS_VALUES:
+        return None
+
+    commit_hash = update.commit_hash.strip()
+    if not commit_hash:
+        return (
+            "BLOCKED: status=Done requires commit_hash for traceability. "
+            "Commit first, then update task status with the hash."
+        )
+
+    if _FUNCTIONAL_TASK_PREFIX_RE.match(normalized_task_id):
+        has_changes, detail = _commit_has_functional_changes(commit_hash)
+        if not has_changes:
+            return (
+                "BLOCKED: Done requires functional code evidence. "
+                f"Commit '{update.commit_hash}' is not sufficient ({detail})."
+            )
+        return _validate_done_task_evidence(normalized_task_id)
+    return None
+
+
+def _parse_task_status_updates(raw: str) -> list[TaskStatusUpdate]:
+    """Parse batch updates from a JSON array or TOON object lines.
+
+    TOON example (one task per line):
+        - task_id=B8; status=Done; progress=100%; commit_hash=abc1234
+    """
+    normalized = (raw or "").strip()
+    if normalized.startswith("["):
+        try:
+            items = json.loads(normalized)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"updates is not valid JSON ({error})") from error
+        if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+            raise ValueError("updates JSON must be an array of objects.")
+    else:
+        items = []
+        for line in normalized.splitlines():
+            candidate = line.strip()
+            if not candidate or candidate.upper() == "TOON/1":
+                continue
+            if candidate.startswith("- "):
+                candidate = candidate[2:]
+            items.append(_parse_toon_object_line(candidate))
+
+    updates: list[TaskStatusUpdate] = []
+    for item in items:
+        task_id = str(item.get("task_id", "")).strip()
+        if not task_id:
+            raise ValueError(f"update without task_id: {item}")
+        updates.append(
+            TaskStatusUpdate(
+                task_id=task_id,
+                status=str(item.get("status", "Done")).strip(),
+                progress=str(item.get("progress", "100%")).strip(),
+                commit_hash=str(item.get("commit_hash", "")).strip(),
+            )
+        )
+    return updates
+
+
 class UpdateTaskStatusTool(BaseTool):
     name: str = "update_task_status"
     description: str = (
@@ -1532,159 +1895,91 @@ class UpdateTaskStatusTool(BaseTool):
         "- task_id: The task ID (e.g., 'B8', 'B9')\n"
         "- status: New status ('Done', 'In Progress', 'Todo', 'Blocked')\n"
         "- progress: Progress percentage (e.g., '100%')\n"
-        "- commit_hash: Git commit hash(es) to record for traceability\n\n"
-        "This tool reads TASKS.md, finds the row matching task_id, "
-        "updates status/progress/commit/date, and writes back.\n"
+        "- commit_hash: Git commit hash(es) to record for traceability\n"
+        "- updates: optional batch (replaces the single-task arguments), one "
+        "TOON line per task: '- task_id=B8; status=Done; progress=100%; "
+        "commit_hash=abc1234' (a JSON array of objects is also accepted)\n\n"
+        "This tool reads TASKS.md, finds the row(s) matching task_id, "
+        "updates status/progress/commit/date, and writes back atomically "
+        "in a single write (all-or-nothing for batches).\n"
         "It also updates the 'Ultima atualizacao' header date."
     )
 
     def _run(
         self,
-        task_id: str,
+        task_id: str = "",
         status: str = "Done",
         progress: str = "100%",
         commit_hash: str = "",
+        updates: str = "",
     ) -> str:
-        import os
-        import re
-        from datetime import date
-
-        expected_task_id = os.getenv("AURAXIS_RESOLVED_TASK_ID", "").strip().upper()
-        normalized_task_id = (task_id or "").strip().upper()
-        normalized_status = (status or "").strip().lower()
-        if expected_task_id and normalized_task_id != expected_task_id:
-            msg = (
-                f"BLOCKED: task_id drift detected. "
-                f"Expected '{expected_task_id}' but got '{normalized_task_id}'."
-            )
-            audit_log(
-                "update_task_status",
-                {"task_id": task_id, "expected_task_id": expected_task_id},
-                msg,
-                status="ERROR",
-            )
-            return msg
-
-        if normalized_status in _DONE_STATUS_VALUES:
-            if not commit_hash.strip():
-                msg = (
-                    "BLOCKED: status=Done requires commit_hash for traceability. "
-                    "Commit first, then update task status with the hash."
+        if (updates or "").strip():
+            try:
+                batch = _parse_task_status_updates(updates)
+            except ValueError as error:
+                msg = f"Error: {error}"
+                audit_log("update_task_status", {"updates": updates}, msg, status="ERROR")
+                return msg
+        else:
+            batch = [
+                TaskStatusUpdate(
+                    task_id=(task_id or "").strip(),
+                    status=status,
+                    progress=progress,
+                    commit_hash=commit_hash,
                 )
+            ]
+
+        for update in batch:
+            error_msg = _validate_task_status_update(update)
+            if error_msg:
                 audit_log(
                     "update_task_status",
-                    {"task_id": task_id, "status": status},
-                    msg,
+                    {
+                        "task_id": update.task_id,
+                        "status": update.status,
+                        "commit": update.commit_hash,
+                    },
+                    error_msg,
                     status="ERROR",
                 )
-                return msg
-
-            if _FUNCTIONAL_TASK_PREFIX_RE.match(normalized_task_id):
-                has_changes, detail = _commit_has_functional_changes(commit_hash.strip())
-                if not has_changes:
-                    msg = (
-                        "BLOCKED: Done requires functional code evidence. "
-                        f"Commit '{commit_hash}' is not sufficient ({detail})."
-                    )
-                    audit_log(
-                        "update_task_status",
-                        {"task_id": task_id, "status": status, "commit": commit_hash},
-                        msg,
-                        status="ERROR",
-                    )
-                    return msg
-
-                evidence_error = _validate_done_task_evidence(normalized_task_id)
-                if evidence_error:
-                    audit_log(
-                        "update_task_status",
-                        {"task_id": task_id, "status": status, "commit": commit_hash},
-                        evidence_error,
-                        status="ERROR",
-                    )
-                    return evidence_error
+                return error_msg
 
         tasks_path = _resolve_tasks_file()
         if not tasks_path.exists():
             return "Error: tasks file not found."
 
-        content = tasks_path.read_text(encoding="utf-8")
-        lines = content.splitlines()
-
-        # Find table row format (backend TASKS.md)
-        updated = False
-        for i, line in enumerate(lines):
-            if not line.startswith("|"):
-                continue
-            parsed = _parse_task_row(line)
-            if not parsed or parsed["id"] != task_id:
-                continue
-
-            # Update the fields
-            cells = parsed["raw_cells"]
-            cells[3] = f" {status} "  # Status column
-            cells[4] = f" {progress} "  # Progress column
-            if commit_hash:
-                cells[6] = f" {commit_hash} "  # Commit column
-            cells[7] = f" {date.today().isoformat()} "  # Date column
-
-            lines[i] = _rebuild_task_row(cells)
-            updated = True
-            break
-
-        # Fallback: checklist format (app/web tasks.md)
-        if not updated:
-            for i, line in enumerate(lines):
-                new_line, line_updated = _update_checklist_task_line(
-                    line=line,
-                    task_id=task_id,
-                    status=status,
-                )
-                if line_updated:
-                    lines[i] = new_line
-                    updated = True
-                    break
-
-        if not updated:
-            msg = f"Task '{task_id}' not found in {tasks_path.name}."
+        # Write back — tasks file is in project root, use direct write
+        # (not validate_write_path since TASKS.md is not in a writable dir)
+        missing = apply_task_status_updates(tasks_path, batch)
+        task_ids = [update.task_id for update in batch]
+        if missing:
+            msg = (
+                f"Task(s) {', '.join(repr(item) for item in missing)} "
+                f"not found in {tasks_path.name}. No changes written."
+            )
             audit_log(
                 "update_task_status",
-                {"task_id": task_id},
+                {"task_id": ", ".join(task_ids)},
                 msg,
                 status="ERROR",
             )
             return msg
 
-        # Update the header date
         today_str = date.today().isoformat()
-        for i, line in enumerate(lines):
-            if line.startswith("Ultima atualizacao:"):
-                lines[i] = re.sub(
-                    r"Ultima atualizacao: [\d-]+",
-                    f"Ultima atualizacao: {today_str}",
-                    line,
-                )
-                break
-            if line.startswith("Última atualização:"):
-                lines[i] = re.sub(
-                    r"Última atualização: [\d-]+",
-                    f"Última atualização: {today_str}",
-                    line,
-                )
-                break
-
-        # Write back — tasks file is in project root, use direct write
-        # (not validate_write_path since TASKS.md is not in a writable dir)
-        tasks_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-
-        msg = (
-            f"{tasks_path.name} updated: {task_id} → "
-            f"Status={status}, Progress={progress}, "
-            f"Commit={commit_hash or 'n/a'}, Date={today_str}"
+        msg = "\n".join(
+            f"{tasks_path.name} updated: {update.task_id} → "
+            f"Status={update.status}, Progress={update.progress}, "
+            f"Commit={update.commit_hash or 'n/a'}, Date={today_str}"
+            for update in batch
         )
         audit_log(
             "update_task_status",
-            {"task_id": task_id, "status": status, "commit": commit_hash},
+            {
+                "task_id": ", ".join(task_ids),
+                "status": ", ".join(update.status for update in batch),
+                "commit": ", ".join(update.commit_hash for update in batch),
+            },
             msg,
             status="OK",
         )
@@ -1695,317 +1990,51 @@ class UpdateTaskStatusTool(BaseTool):
 # Write tools
 # ---------------------------------------------------------------------------
 
-_FRONTEND_SOURCE_EXTENSIONS = {
-    ".css",
-    ".scss",
-    ".sass",
-    ".less",
-    ".vue",
-    ".ts",
-    ".tsx",
-    ".js",
-    ".jsx",
-}
-
-_FRONTEND_TS_ONLY_BLOCKED_EXTENSIONS = {".js", ".jsx"}
-
-_WEB_FORBIDDEN_ROOT_SOURCE_PREFIXES = (
-    "components/",
-    "composables/",
-    "layouts/",
-    "middleware/",
-    "pages/",
-    "plugins/",
-    "stores/",
-    "shared/",
-    "types/",
-    "utils/",
-    "services/",
-)
-
-_WEB_RAW_HTML_TAG_PATTERNS: tuple[re.Pattern[str], ...] = (
-    re.compile(r"<\s*p\b", re.IGNORECASE),
-    re.compile(r"<\s*input\b", re.IGNORECASE),
-    re.compile(r"<\s*label\b", re.IGNORECASE),
-    re.compile(r"<\s*textarea\b", re.IGNORECASE),
-    re.compile(r"<\s*select\b", re.IGNORECASE),
-    re.compile(r"<\s*button\b", re.IGNORECASE),
-)
-
-_MISSING_RETURN_TYPE_FUNCTION_DECL_RE = re.compile(
-    r"^\s*(?:export\s+)?(?:async\s+)?function\s+[A-Za-z_]\w*\s*\([^)]*\)\s*\{"
-)
-_MISSING_RETURN_TYPE_ARROW_RE = re.compile(
-    r"^\s*(?:export\s+)?const\s+[A-Za-z_]\w*\s*=\s*(?:async\s+)?\([^)]*\)\s*=>"
-)
-_MISSING_RETURN_TYPE_ARROW_SINGLE_ARG_RE = re.compile(
-    r"^\s*(?:export\s+)?const\s+[A-Za-z_]\w*\s*=\s*(?:async\s+)?[A-Za-z_]\w*\s*=>"
-)
-
 _DONE_STATUS_VALUES = {"done", "completed"}
 _FUNCTIONAL_TASK_PREFIX_RE = re.compile(r"^(APP|WEB|B)\d+$")
 _TASKBOARD_ONLY_FILES = {"tasks.md", "TASKS.md"}
 
-_WEB_TOKEN_POLICY_PATTERNS: tuple[re.Pattern[str], ...] = (
-    re.compile(r"\bfont-size\s*:\s*[0-9.]+(?:px|rem|em)\b", re.IGNORECASE),
-    re.compile(r"\bfont-weight\s*:\s*[1-9]00\b", re.IGNORECASE),
-    re.compile(r"\bborder-radius\s*:\s*[0-9.]+(?:px|rem|em)\b", re.IGNORECASE),
-    re.compile(r"\b(?:padding|margin|gap)[-\w]*\s*:\s*[0-9.]+(?:px|rem|em)\b", re.IGNORECASE),
-    re.compile(r"\bborder(?:-(?:top|right|bottom|left))?\s*:\s*[0-9.]+px\b", re.IGNORECASE),
-    re.compile(r"\b(?:color|background(?:-color)?|border-color)\s*:\s*#[0-9a-fA-F]{3,8}\b", re.IGNORECASE),
-)
 
-_APP_TOKEN_POLICY_PATTERNS: tuple[re.Pattern[str], ...] = (
-    re.compile(r"\bfontSize\s*:\s*\d+(?:\.\d+)?\b"),
-    re.compile(r"\bfontWeight\s*:\s*['\"]?[1-9]00['\"]?\b"),
-    re.compile(r"\blineHeight\s*:\s*\d+(?:\.\d+)?\b"),
-    re.compile(r"\bborderRadius\s*:\s*\d+(?:\.\d+)?\b"),
-    re.compile(r"\bborderWidth\s*:\s*\d+(?:\.\d+)?\b"),
-    re.compile(r"\b(?:padding|paddingTop|paddingBottom|paddingLeft|paddingRight|paddingHorizontal|paddingVertical)\s*:\s*\d+(?:\.\d+)?\b"),
-    re.compile(r"\b(?:margin|marginTop|marginBottom|marginLeft|marginRight|marginHorizontal|marginVertical)\s*:\s*\d+(?:\.\d+)?\b"),
-    re.compile(r"\bgap\s*:\s*\d+(?:\.\d+)?\b"),
-    re.compile(r"\b(?:color|backgroundColor|borderColor)\s*:\s*['\"]#[0-9a-fA-F]{3,8}['\"]\b"),
-)
+def _frontend_policy_message(
+    path: str, content: str, only_lines: set[int] | None = None
+) -> str | None:
+    """All frontend policy violations for one write, as one BLOCKED message."""
+    report = check_frontend_policy(TARGET_REPO_NAME, path, content, only_lines)
+    return report.blocked_message()
 
 
-def _is_theme_or_token_file(path: str) -> bool:
-    normalized = path.replace("\\", "/").lower()
-    token_indicators = (
-        "/theme/",
-        "/tokens/",
-        "design-tokens",
-        "styles/variables",
-        "styles/theme",
-        "theme.ts",
-        "theme.js",
-        "theme.css",
-        "tokens.ts",
-        "tokens.js",
-        "tokens.css",
-    )
-    return any(indicator in normalized for indicator in token_indicators)
-
-
-def _is_frontend_source_path(path: str) -> bool:
-    normalized = path.replace("\\", "/").strip().lower()
-    if TARGET_REPO_NAME == "auraxis-web":
-        prefixes = (
-            "app/",
-            "components/",
-            "composables/",
-            "layouts/",
-            "pages/",
-            "plugins/",
-            "stores/",
-            "shared/",
-            "types/",
-            "utils/",
-            "services/",
-        )
-    elif TARGET_REPO_NAME == "auraxis-app":
-        prefixes = (
-            "app/",
-            "src/",
-            "components/",
-            "hooks/",
-            "providers/",
-            "store/",
-            "stores/",
-            "shared/",
-            "types/",
-            "utils/",
-            "services/",
-            "config/",
-        )
-    else:
-        return False
-    return normalized.startswith(prefixes)
-
-
-def _detect_frontend_web_root_path_violation(path: str) -> str | None:
-    if TARGET_REPO_NAME != "auraxis-web":
-        return None
-    normalized = path.replace("\\", "/").strip().lower()
-    if normalized.startswith("app/"):
-        return None
-    if normalized.startswith(_WEB_FORBIDDEN_ROOT_SOURCE_PREFIXES):
-        return (
-            "BLOCKED: auraxis-web source files must live under `app/` "
-            "(ex.: `app/composables`, `app/layouts`, `app/middleware`). "
-            f"Invalid path: '{path}'."
-        )
-    return None
-
-
-def _has_jsdoc_block(lines: list[str], line_index: int) -> bool:
-    cursor = line_index - 1
-    while cursor >= 0 and not lines[cursor].strip():
-        cursor -= 1
-    if cursor < 0:
-        return False
-    if lines[cursor].strip().startswith("/**") and lines[cursor].strip().endswith("*/"):
-        return True
-    if not lines[cursor].strip().endswith("*/"):
-        return False
-    while cursor >= 0:
-        stripped = lines[cursor].strip()
-        if stripped.startswith("/**"):
-            return True
-        if stripped.startswith("/*") and not stripped.startswith("/**"):
-            return False
-        cursor -= 1
-    return False
-
-
-def _detect_frontend_language_policy_violation(path: str, content: str) -> str | None:
-    if TARGET_REPO_NAME not in {"auraxis-web", "auraxis-app"}:
-        return None
-    if not _is_frontend_source_path(path):
-        return None
-
-    suffix = Path(path).suffix.lower()
-
-    if suffix in _FRONTEND_TS_ONLY_BLOCKED_EXTENSIONS:
-        return (
-            "BLOCKED: JavaScript source files are forbidden in frontend code. "
-            "Use TypeScript only (`.ts`/`.tsx`)."
-        )
-
-    violations: list[str] = []
-    lines = content.splitlines()
-
-    if TARGET_REPO_NAME == "auraxis-web" and suffix == ".vue":
-        for line_no, raw_line in enumerate(lines, start=1):
-            stripped = raw_line.strip()
-            if not stripped:
-                continue
-            for pattern in _WEB_RAW_HTML_TAG_PATTERNS:
-                if pattern.search(stripped):
-                    violations.append(
-                        f"L{line_no}: raw HTML tag found (`{stripped[:120]}`)"
-                    )
-                    break
-
-    if suffix in {".ts", ".tsx", ".vue"} and not _is_theme_or_token_file(path):
-        for index, raw_line in enumerate(lines):
-            stripped = raw_line.strip()
-            if (
-                not stripped
-                or stripped.startswith("//")
-                or stripped.startswith("*")
-                or stripped.startswith("/*")
-            ):
-                continue
-
-            missing_return_type = (
-                _MISSING_RETURN_TYPE_FUNCTION_DECL_RE.match(stripped)
-                or _MISSING_RETURN_TYPE_ARROW_RE.match(stripped)
-                or _MISSING_RETURN_TYPE_ARROW_SINGLE_ARG_RE.match(stripped)
-            )
-            if missing_return_type:
-                line_no = index + 1
-                violations.append(
-                    f"L{line_no}: function without explicit return type (`{stripped[:120]}`)"
-                )
-                continue
-
-            has_function_signature = (
-                "function " in stripped
-                or "=> {" in stripped
-                or stripped.endswith("=>")
-            )
-            if has_function_signature and not _has_jsdoc_block(lines, index):
-                if re.search(r"\bfunction\b", stripped) or re.search(
-                    r"\bconst\s+[A-Za-z_]\w+\b", stripped
-                ):
-                    line_no = index + 1
-                    violations.append(
-                        f"L{line_no}: missing JSDoc block for function (`{stripped[:120]}`)"
-                    )
-
-    if not violations:
-        return None
-
-    preview = "\n".join(f"- {item}" for item in violations[:8])
-    return (
-        "BLOCKED: frontend language/component policy violation detected.\n"
-        "- TypeScript-only frontend source (`.ts`/`.tsx`).\n"
-        "- Explicit function return types (no implicit inference).\n"
-        "- JSDoc required for every function.\n"
-        "- Web templates must use Chakra UI components (no raw HTML controls).\n"
-        f"Detected lines:\n{preview}"
-    )
-
-
-def _detect_frontend_token_policy_violation(path: str, content: str) -> str | None:
-    if TARGET_REPO_NAME not in {"auraxis-web", "auraxis-app"}:
-        return None
-
-    suffix = Path(path).suffix.lower()
-    if suffix not in _FRONTEND_SOURCE_EXTENSIONS:
-        return None
-
-    if _is_theme_or_token_file(path):
-        return None
-
-    patterns = (
-        _WEB_TOKEN_POLICY_PATTERNS
-        if TARGET_REPO_NAME == "auraxis-web"
-        else _APP_TOKEN_POLICY_PATTERNS
-    )
-    violations: list[str] = []
-    for line_no, raw_line in enumerate(content.splitlines(), start=1):
-        line = raw_line.strip()
-        if not line or line.startswith("//") or line.startswith("/*") or line.startswith("*"):
-            continue
-        for pattern in patterns:
-            if pattern.search(line):
-                violations.append(f"L{line_no}: {line[:140]}")
-                break
-
-    if not violations:
-        return None
-
-    preview = "\n".join(f"- {item}" for item in violations[:5])
-    return (
-        "BLOCKED: front-end token policy violation detected.\n"
-        "Use theme/tokens and UI-library props (Chakra UI / RN Paper) instead of raw style literals.\n"
-        "Allowed exception: files under theme/tokens for token definition.\n"
-        f"Detected lines:\n{preview}"
-    )
+# Old-file histograms for the encoding guard, reused while the file's
+# (mtime, size) is unchanged; misses read through _READ_CACHE.
+_ENCODING_HISTOGRAMS = HistogramCache(
+    _READ_CACHE.read_bytes,
+    on_event=lambda event: increment_audit_counter(f"encoding_histogram.{event}"),
+)
 
 
 def _detect_encoding_corruption(existing_path: Path, new_content: str) -> str | None:
     """Detect if a write would corrupt non-ASCII characters.
 
-    Compares non-ASCII characters in the existing file vs the new content.
-    If the existing file has accented characters (e.g., Portuguese) but
-    the new content has significantly fewer, the LLM likely corrupted them.
+    Compares the non-ASCII character histogram of the existing file with
+    the new content's (see tools/encoding_guard.py).
 
     Returns a warning message if corruption is detected, None if safe.
     """
     if not existing_path.exists():
         return None
 
-    try:
-        old_content = existing_path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
+    old_histogram = _ENCODING_HISTOGRAMS.histogram(existing_path)
+    if old_histogram is None:
         return None
 
-    old_non_ascii = sum(1 for ch in old_content if ord(ch) > 127)
-    new_non_ascii = sum(1 for ch in new_content if ord(ch) > 127)
+    return corruption_message(old_histogram, histogram_of_text(new_content))
 
-    # If old file had accented chars and new content lost >50% of them
-    if old_non_ascii > 5 and new_non_ascii < old_non_ascii * 0.5:
-        return (
-            f"BLOCKED: encoding corruption detected. "
-            f"Existing file has {old_non_ascii} non-ASCII chars "
-            f"(accents, special chars) but new content has only "
-            f"{new_non_ascii}. The LLM likely corrupted accented "
-            f"characters. To fix: read the file again and preserve "
-            f"ALL original characters exactly as they are."
-        )
-    return None
+
+def _encoding_corruption_message(old_text: str, new_text: str) -> str | None:
+    """Compare the replaced text of a patch with its replacement."""
+    return corruption_message(histogram_of_text(old_text), histogram_of_text(new_text))
+
+
+PATCH_POLICY_CONTEXT_LINES = 3
 
 
 class WriteFileTool(BaseTool):
@@ -2016,10 +2045,26 @@ class WriteFileTool(BaseTool):
         "no blocked extensions. "
         "IMPORTANT: This tool will BLOCK writes that corrupt non-ASCII "
         "characters (accents like ã, é, ç, ô). If blocked, re-read the "
-        "original file and preserve all characters exactly."
+        "original file and preserve all characters exactly.\n\n"
+        "Modes:\n"
+        "- mode='full' (default): content is the complete new file.\n"
+        "- mode='patch': content is a unified diff (@@ hunks) or one or more "
+        "SEARCH/REPLACE blocks:\n"
+        "<<<<<<< SEARCH\n<exact existing lines>\n=======\n<new lines>\n"
+        ">>>>>>> REPLACE\n"
+        "Prefer patch mode for small edits to existing files.\n"
+        "- base_hash (optional): CONTENT_HASH returned by read_project_file(s) "
+        "or by the previous write; the write is rejected if the file changed "
+        "or was deleted since."
     )
 
-    def _run(self, path: str, content: str) -> str:
+    def _run(
+        self,
+        path: str,
+        content: str = "",
+        mode: str = "full",
+        base_hash: str = "",
+    ) -> str:
         try:
             validated = validate_write_path(path)
         except PermissionError as e:
@@ -2032,38 +2077,70 @@ class WriteFileTool(BaseTool):
             )
             return msg
 
-        web_root_path_msg = _detect_frontend_web_root_path_violation(path)
-        if web_root_path_msg:
-            audit_log(
-                "write_file_content",
-                {"path": path},
-                web_root_path_msg,
-                status="BLOCKED",
+        mode = (mode or "full").strip().lower()
+        if mode not in {"full", "patch"}:
+            return f"Error: unknown mode '{mode}'. Use 'full' or 'patch'."
+
+        existing: str | None = None
+        if validated.exists():
+            try:
+                existing = _READ_CACHE.read_text(validated)
+            except UnicodeDecodeError:
+                existing = None
+        if base_hash and existing is None:
+            reason = "is not UTF-8 text" if validated.exists() else "no longer exists"
+            msg = (
+                f"STALE_WRITE: '{path}' {reason}, but base_hash {base_hash} was given. "
+                "Re-read the file and rebuild the change."
+            )
+            audit_log("write_file_content", {"path": path}, msg, status="BLOCKED")
+            return msg
+        if base_hash and not base_hash_matches(base_hash, existing):
+            msg = (
+                f"STALE_WRITE: '{path}' changed since base_hash {base_hash} "
+                f"(current CONTENT_HASH: {content_hash(existing)}). "
+                "Re-read the file and rebuild the change."
             )
-            return web_root_path_msg
+            audit_log("write_file_content", {"path": path}, msg, status="BLOCKED")
+            return msg
 
-        language_policy_msg = _detect_frontend_language_policy_violation(path, content)
-        if language_policy_msg:
-            audit_log(
-                "write_file_content",
-                {"path": path},
-                language_policy_msg,
-                status="BLOCKED",
+        patch: PatchResult | None = None
+        only_lines: set[int] | None = None
+        if mode == "patch":
+            if existing is None:
+                return (
+                    f"FILE_NOT_FOUND: '{path}' cannot be patched (missing or not UTF-8). "
+                    "Use mode='full' to create it."
+                )
+            try:
+                patch = apply_patch(existing, content)
+            except PatchError as error:
+                msg = f"PATCH_REJECTED: {error}"
+                audit_log("write_file_content", {"path": path}, msg, status="BLOCKED")
+                return msg
+            content = patch.content
+            only_lines = policy_line_window(
+                patch.changed_lines, content.count("\n") + 1, PATCH_POLICY_CONTEXT_LINES
             )
-            return language_policy_msg
 
-        token_policy_msg = _detect_frontend_token_policy_violation(path, content)
-        if token_policy_msg:
+        # One pass over the final content evaluates every frontend rule
+        # (path, TypeScript-only, language/component, tokens).
+        policy_msg = _frontend_policy_message(path, content, only_lines)
+        if policy_msg:
             audit_log(
                 "write_file_content",
                 {"path": path},
-                token_policy_msg,
+                policy_msg,
                 status="BLOCKED",
             )
-            return token_policy_msg
+            return policy_msg
 
-        # Guard: detect encoding corruption before writing
-        corruption_msg = _detect_encoding_corruption(validated, content)
+        # Guard: detect encoding corruption before writing (patches only
+        # compare the replaced text against its replacement).
+        if patch is not None:
+            corruption_msg = _encoding_corruption_message(patch.removed_text, patch.added_text)
+        else:
+            corruption_msg = _detect_encoding_corruption(validated, content)
         if corruption_msg:
             audit_log(
                 "write_file_content",
@@ -2073,13 +2150,31 @@ class WriteFileTool(BaseTool):
             )
             return corruption_msg
 
-        validated.parent.mkdir(parents=True, exist_ok=True)
-        validated.write_text(content, encoding="utf-8")
+        digest = content_hash(content)
+        status = write_text_if_changed(validated, content)
+        _WRITE_JOURNAL.record(
+            validated.relative_to(PROJECT_ROOT).as_posix(),
+            status,
+            digest,
+            len(content.encode("utf-8")),
+        )
 
-        msg = f"File {path} written successfully."
+        if status == "unchanged":
+            msg = (
+                f"File {path} unchanged: content is identical, nothing written. "
+                f"CONTENT_HASH: {digest}"
+            )
+        elif patch is not None:
+            msg = (
+                f"File {path} patched successfully ({patch.hunks} hunk(s), "
+                f"{len(patch.changed_lines)} line(s) changed). "
+                f"CONTENT_HASH: {digest}"
+            )
+        else:
+            msg = f"File {path} written successfully. CONTENT_HASH: {digest}"
         audit_log(
             "write_file_content",
-            {"path": path, "size": len(content)},
+            {"path": path, "size": len(content), "mode": mode, "status": status},
             msg,
             status="OK",
         )
@@ -2151,6 +2246,7 @@ def _git_create_branch(branch_name: str) -> str:
         checkout_result = safe_subprocess(["git", "checkout", branch_name], timeout=15)
         if checkout_result["returncode"] != 0:
             return f"Error checking out existing branch: {checkout_result['stderr']}"
+        _invalidate_worktree_caches()
         return f"Branch '{branch_name}' checked out."
 
     create_result = safe_subprocess(["git", "checkout", "-b", branch_name], timeout=15)
@@ -2205,6 +2301,7 @@ def _git_checkout_or_create_branch(branch_name: str) -> str | None:
         return None
     checkout_result = safe_subprocess(["git", "checkout", branch_name], timeout=15)
     if checkout_result["returncode"] == 0:
+        _invalidate_worktree_caches()
         return None
     create_result = safe_subprocess(["git", "checkout", "-b", branch_name], timeout=15)
     if create_result["returncode"] == 0:
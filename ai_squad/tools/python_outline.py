@@ -0,0 +1,116 @@
+"""AST outline of Python files for `read_project_file(mode="outline")`.
+
+The READ phase only needs the shape of a module (classes, model columns,
+method signatures, line numbers); bodies can be pulled afterwards with a
+ranged read. Outlines are cached by the SHA-256 of the file content, so an
+unchanged file is parsed once per process no matter how often it is read.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import threading
+from collections import OrderedDict
+
+_COLUMN_FACTORIES = frozenset(
+    {"Column", "mapped_column", "relationship", "column_property", "synonym"}
+)
+_OUTLINE_CACHE_SIZE = 256
+_VALUE_PREVIEW_CHARS = 120
+
+_OUTLINE_CACHE: OrderedDict[str, str] = OrderedDict()
+_OUTLINE_LOCK = threading.Lock()
+
+
+def _preview(node: ast.AST) -> str:
+    text = ast.unparse(node)
+    if len(text) > _VALUE_PREVIEW_CHARS:
+        return text[: _VALUE_PREVIEW_CHARS - 3] + "..."
+    return text
+
+
+def _is_column_call(value: ast.AST | None) -> bool:
+    if not isinstance(value, ast.Call):
+        return False
+    func = value.func
+    name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+    return name in _COLUMN_FACTORIES
+
+
+def _span(node: ast.AST) -> str:
+    start = getattr(node, "lineno", 0)
+    end = getattr(node, "end_lineno", start) or start
+    return f"L{start}" if end == start else f"L{start}-{end}"
+
+
+def _signature(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    return f"{prefix} {node.name}({ast.unparse(node.args)}){returns}"
+
+
+def _decorators(node: ast.AST, indent: str) -> list[str]:
+    return [f"{indent}@{_preview(item)}" for item in getattr(node, "decorator_list", [])]
+
+
+def _assignment_names(node: ast.Assign | ast.AnnAssign) -> str:
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+    return ", ".join(ast.unparse(target) for target in targets)
+
+
+def _outline_body(body: list[ast.stmt], indent: str, lines: list[str]) -> None:
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            bases = ", ".join(_preview(base) for base in [*node.bases, *node.keywords])
+            lines.extend(_decorators(node, indent))
+            header = f"class {node.name}({bases})" if bases else f"class {node.name}"
+            lines.append(f"{indent}{header}  [{_span(node)}]")
+            _outline_body(node.body, indent + "    ", lines)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            lines.extend(_decorators(node, indent))
+            lines.append(f"{indent}{_signature(node)}  [{_span(node)}]")
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            value = node.value
+            names = _assignment_names(node)
+            if _is_column_call(value):
+                lines.append(f"{indent}{names} = {_preview(value)}  [{_span(node)}]")
+            elif indent == "" or isinstance(node, ast.AnnAssign):
+                annotation = (
+                    f": {ast.unparse(node.annotation)}"
+                    if isinstance(node, ast.AnnAssign)
+                    else ""
+                )
+                lines.append(f"{indent}{names}{annotation}  [{_span(node)}]")
+        elif isinstance(node, (ast.Import, ast.ImportFrom)) and indent == "":
+            lines.append(f"{_preview(node)}  [{_span(node)}]")
+
+
+def build_outline(source: str, *, label: str = "") -> str:
+    """Render the outline of `source`; raises SyntaxError for invalid code."""
+    tree = ast.parse(source)
+    total_lines = source.count("\n") + (0 if source.endswith("\n") or not source else 1)
+    lines = [f"# outline: {label or '<source>'} ({total_lines} lines)"]
+    docstring = ast.get_docstring(tree, clean=True)
+    if docstring:
+        lines.append(f'"""{docstring.splitlines()[0]}"""')
+    _outline_body(tree.body, "", lines)
+    return "\n".join(lines) + "\n"
+
+
+def outline_python(data: bytes, *, label: str = "") -> str:
+    """Outline raw file bytes, memoized by content hash (and label)."""
+    key = hashlib.sha256(data).hexdigest() + "|" + label
+    with _OUTLINE_LOCK:
+        cached = _OUTLINE_CACHE.get(key)
+        if cached is not None:
+            _OUTLINE_CACHE.move_to_end(key)
+            return cached
+    outline = build_outline(data.decode("utf-8"), label=label)
+    with _OUTLINE_LOCK:
+        _OUTLINE_CACHE[key] = outline
+        while len(_OUTLINE_CACHE) > _OUTLINE_CACHE_SIZE:
+            _OUTLINE_CACHE.popitem(last=False)
+    return outline
@@ -0,0 +1,265 @@
+"""Bounded, structured per-task status journals.
+
+Each task keeps one JSONL journal (`<TASK>.journal.jsonl`) with one small
+record per status entry. The potentially huge `details` text (crew output,
+stack traces) is stored out-of-line as a gzip blob addressed by its SHA-256
+(`.details/<TASK>/<hash>.txt.gz`), so repeated details are stored once.
+
+The journal is capped at `max_records`; trimming rewrites it atomically
+under the same file lock appends take, and drops detail blobs no kept
+record references anymore (blobs touched within the grace period are
+kept: they may belong to an append waiting for that lock). The markdown
+view (`<TASK>.md`) is rendered from the last N records only, with details
+truncated, so it stays small no matter how long the task lives. Appends
+never render it: `ensure_view()` does, when the view is read and the
+journal changed since (the view carries the journal's mtime).
+
+Kept free of CrewAI imports so it can be used from `main.py` and from tests.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .file_io import JsonlAppender, atomic_write_text
+
+_PREVIEW_CHARS = 240
+BLOB_GRACE_SECONDS = 300.0
+
+
+@dataclass(frozen=True)
+class StatusRecord:
+    timestamp: str
+    repo: str
+    task_id: str
+    phase: str
+    status: str
+    notify_manager: bool
+    notify_parallel_agents: bool
+    implemented: str
+    next_task_suggestion: str
+    details_ref: str = ""
+    details_bytes: int = 0
+    details_preview: str = ""
+
+
+def _parse_records(lines: Iterable[str]) -> list[StatusRecord]:
+    parsed: list[StatusRecord] = []
+    for line in lines:
+        text = line.strip()
+        if not text:
+            continue
+        try:
+            parsed.append(StatusRecord(**json.loads(text)))
+        except (json.JSONDecodeError, TypeError):
+            continue
+    return parsed
+
+
+def _read_fd(fd: int) -> bytes:
+    size = os.fstat(fd).st_size
+    chunks: list[bytes] = []
+    offset = 0
+    while offset < size:
+        chunk = os.pread(fd, size - offset, offset)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        offset += len(chunk)
+    return b"".join(chunks)
+
+
+def safe_task_stem(task_id: str) -> str:
+    normalized = (task_id or "UNSPECIFIED").strip().upper()
+    return re.sub(r"[^A-Z0-9_-]", "-", normalized)
+
+
+class StatusJournal:
+    """Journal + detail blobs + markdown view for one task."""
+
+    def __init__(
+        self,
+        status_dir: Path,
+        task_id: str,
+        *,
+        blob_grace_seconds: float = BLOB_GRACE_SECONDS,
+    ) -> None:
+        self.status_dir = status_dir
+        self.stem = safe_task_stem(task_id)
+        self.blob_grace_seconds = blob_grace_seconds
+
+    @property
+    def journal_path(self) -> Path:
+        return self.status_dir / f"{self.stem}.journal.jsonl"
+
+    @property
+    def view_path(self) -> Path:
+        return self.status_dir / f"{self.stem}.md"
+
+    @property
+    def details_dir(self) -> Path:
+        return self.status_dir / ".details" / self.stem
+
+    def _store_details(self, details: str) -> tuple[str, int]:
+        encoded = details.encode("utf-8")
+        digest = hashlib.sha256(encoded).hexdigest()[:32]
+        blob = self.details_dir / f"{digest}.txt.gz"
+        try:
+            os.utime(blob)  # reused blob: fresh again for retention's grace period
+        except FileNotFoundError:
+            self.details_dir.mkdir(parents=True, exist_ok=True)
+            partial = blob.with_name(f".{blob.name}.{os.getpid()}.tmp")
+            with gzip.open(partial, "wb") as handle:
+                handle.write(encoded)
+            os.replace(partial, blob)
+        return blob.name, len(encoded)
+
+    def load_details(self, record: StatusRecord) -> str:
+        if not record.details_ref:
+            return ""
+        try:
+            with gzip.open(self.details_dir / record.details_ref, "rb") as handle:
+                return handle.read().decode("utf-8")
+        except FileNotFoundError:
+            return record.details_preview
+
+    def records(self) -> list[StatusRecord]:
+        if not self.journal_path.exists():
+            return []
+        with self.journal_path.open("r", encoding="utf-8") as file:
+            return _parse_records(file)
+
+    def append(
+        self,
+        record: StatusRecord,
+        details: str,
+        *,
+        max_records: int,
+    ) -> StatusRecord:
+        """Store `details` out-of-line, append the record and enforce retention."""
+        details = details.strip()
+        if details:
+            ref, size = self._store_details(details)
+            record = StatusRecord(
+                **{
+                    **asdict(record),
+                    "details_ref": ref,
+                    "details_bytes": size,
+                    "details_preview": details[:_PREVIEW_CHARS],
+                }
+            )
+        self._preserve_legacy_view()
+        appender = JsonlAppender(self.journal_path, fsync_every=1)
+        try:
+            appender.append(asdict(record))
+        finally:
+            appender.close()
+        self._enforce_retention(max(1, max_records))
+        return record
+
+    def _preserve_legacy_view(self) -> None:
+        """Keep pre-journal markdown history instead of overwriting it."""
+        if self.view_path.exists() and not self.journal_path.exists():
+            os.replace(self.view_path, self.status_dir / f"{self.stem}.legacy.md")
+
+    def _enforce_retention(self, max_records: int) -> None:
+        if len(self.records()) <= max_records:
+            return
+        with JsonlAppender(self.journal_path).exclusive() as fd:
+            snapshot_at = time.time()
+            records = _parse_records(_read_fd(fd).decode("utf-8", "replace").splitlines())
+            if len(records) <= max_records:
+                return  # another process trimmed first
+            kept = records[-max_records:]
+            atomic_write_text(
+                self.journal_path,
+                "".join(json.dumps(asdict(item), ensure_ascii=True) + "\n" for item in kept),
+            )
+            self._collect_blobs(
+                {item.details_ref for item in kept if item.details_ref},
+                older_than=snapshot_at - self.blob_grace_seconds,
+            )
+
+    def _collect_blobs(self, referenced: set[str], *, older_than: float) -> None:
+        if not self.details_dir.is_dir():
+            return
+        for blob in self.details_dir.glob("*.txt.gz"):
+            if blob.name in referenced:
+                continue
+            try:
+                if blob.stat().st_mtime < older_than:
+                    blob.unlink()
+            except FileNotFoundError:
+                continue
+
+    def render_markdown(self, *, last: int, details_chars: int) -> str:
+        """Render the human view from the last `last` records (oldest first)."""
+        blocks: list[str] = []
+        for record in self.records()[-max(1, last):]:
+            details = self.load_details(record)
+            if len(details) > details_chars:
+                details = (
+                    f"{details[:details_chars]}\n\n"
+                    f"[... truncated {record.details_bytes} bytes; full text in "
+                    f"`.details/{self.stem}/{record.details_ref}`]"
+                )
+            blocks.append(
+                f"## {record.timestamp}\n"
+                f"- repo: `{record.repo}`\n"
+                f"- task_id: `{record.task_id}`\n"
+                f"- phase: `{record.phase}`\n"
+                f"- status: `{record.status}`\n"
+                f"- notify_manager: `{str(record.notify_manager).lower()}`\n"
+                f"- notify_parallel_agents: `{str(record.notify_parallel_agents).lower()}`\n"
+                f"- implemented: {record.implemented}\n"
+                f"- next_task_suggestion: {record.next_task_suggestion}\n"
+                f"- details:\n\n{details}\n\n"
+            )
+        return "".join(blocks)
+
+    def _journal_mtime_ns(self) -> int | None:
+        try:
+            return self.journal_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def view_is_current(self) -> bool:
+        """True when the view was rendered from the journal as it is now."""
+        journal_mtime = self._journal_mtime_ns()
+        if journal_mtime is None:
+            return True  # nothing to render (a legacy view stays as is)
+        try:
+            return self.view_path.stat().st_mtime_ns == journal_mtime
+        except FileNotFoundError:
+            return False
+
+    def ensure_view(self, *, last: int, details_chars: int) -> Path:
+        """Render the view only if the journal changed since the last render."""
+        if not self.view_is_current():
+            self.write_view(last=last, details_chars=details_chars)
+        return self.view_path
+
+    def write_view(self, *, last: int, details_chars: int) -> Path:
+        # Stamp the view with the journal mtime read *before* rendering, so an
+        # append landing meanwhile still makes the view stale. If the journal
+        # changed in the same clock tick as this write, a later append in that
+        # tick could keep the same mtime: stamp the view stale instead, and
+        # the next read renders it again.
+        journal_mtime = self._journal_mtime_ns()
+        atomic_write_text(
+            self.view_path,
+            self.render_markdown(last=last, details_chars=details_chars),
+        )
+        if journal_mtime is not None:
+            if journal_mtime >= self.view_path.stat().st_mtime_ns:
+                journal_mtime -= 1
+            os.utime(self.view_path, ns=(journal_mtime, journal_mtime))
+        return self.view_path
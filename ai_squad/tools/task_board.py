@@ -0,0 +1,504 @@
+"""Shared parsed model of the target task board (`TASKS.md`/`tasks.md`).
+
+Every task board consumer (pending view, section reader, status updater and
+the orchestrator task resolver) goes through `load_task_board()`, which parses
+the file once per version and caches the result by (path, mtime, size).
+
+This module has no external dependencies so it can be imported by `main.py`,
+by the CrewAI tools and by tests alike.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass, field, replace
+from datetime import date
+from functools import cached_property
+from pathlib import Path
+
+from .file_io import atomic_write_text
+
+TASK_ID_RE = re.compile(r"^[A-Z]+-\d+$|^[A-Z]+\d+$")
+STATUS_VALUES: frozenset[str] = frozenset({"todo", "in progress", "blocked", "done"})
+PENDING_STATUS_VALUES: frozenset[str] = frozenset({"todo", "in progress", "blocked"})
+# Status cells may carry a note after the status ("Blocked (waiting API)").
+_STATUS_PREFIX_RE = re.compile(
+    "(" + "|".join(sorted(map(re.escape, STATUS_VALUES))) + r")\b"
+)
+PENDING_CHECKLIST_MARKERS: frozenset[str] = frozenset({" ", "~", "!"})
+PENDING_BLOCK_MARKER = "Pendencias de execucao imediata"
+HEADER_DATE_PREFIXES: tuple[str, ...] = ("Ultima atualizacao:", "Última atualização:")
+_HEADER_DATE_RE = re.compile(r"(Ultima atualizacao|Última atualização): [\d-]+")
+
+_ORDERED_LIST_PREFIXES = ("1.", "2.", "3.", "4.", "5.")
+# One anchored match classifies a line; only the first matching branch counts.
+_LINE_KIND_RE = re.compile(
+    r"(?P<heading>(?P<hashes>#{1,6})\s+(?P<title>.*?)\s*$)"
+    r"|(?P<checklist>\s*-\s*\[(?P<marker>[ x~!])\]\s+"
+    r"(?:\*\*(?P<check_id>[A-Z]+-\d+|[A-Z]+\d+)\b)?)"
+    r"|(?P<table>\s*\|)"
+)
+_TABLE_SEPARATOR_RE = re.compile(r"^:?-+:?$")
+
+
+@dataclass(frozen=True)
+class TaskRow:
+    """A markdown table row (backend `TASKS.md` format)."""
+
+    line_index: int
+    task_id: str
+    cells: tuple[str, ...]
+    status: str
+    table_start: int
+
+
+@dataclass(frozen=True)
+class ChecklistItem:
+    """A `- [ ] **ID** ...` checklist line (app/web `tasks.md` format)."""
+
+    line_index: int
+    task_id: str
+    marker: str
+
+
+@dataclass(frozen=True)
+class Section:
+    """A markdown heading and the line range it covers (end is exclusive)."""
+
+    line_index: int
+    level: int
+    title: str
+    end_index: int
+    parent: int
+
+
+@dataclass(frozen=True)
+class TaskBoard:
+    path: Path
+    lines: tuple[str, ...]
+    rows: tuple[TaskRow, ...]
+    checklist: tuple[ChecklistItem, ...]
+    sections: tuple[Section, ...]
+    pending_block: tuple[str, ...]
+    pending_rows: tuple[str, ...]
+    pending_checklist: tuple[str, ...]
+    header_date_index: int
+    next_task_id: str
+    _rows_by_id: dict[str, TaskRow] = field(repr=False, compare=False)
+    _checklist_by_id: dict[str, ChecklistItem] = field(repr=False, compare=False)
+    _section_starts: tuple[int, ...] = field(repr=False, compare=False)
+    # Invalid UTF-8 bytes were replaced while decoding: readable, not writable.
+    lossy: bool = False
+
+    def find_row(self, task_id: str) -> TaskRow | None:
+        return self._rows_by_id.get(task_id)
+
+    def find_checklist_item(self, task_id: str) -> ChecklistItem | None:
+        return self._checklist_by_id.get(task_id)
+
+    @cached_property
+    def _lowered_lines(self) -> tuple[str, ...]:
+        return tuple(line.lower() for line in self.lines)
+
+    @cached_property
+    def _sections_by_title(self) -> dict[str, Section]:
+        by_title: dict[str, Section] = {}
+        for section in self.sections:
+            by_title.setdefault(section.title.lower(), section)
+        return by_title
+
+    def enclosing_section(self, line_index: int) -> Section | None:
+        """Return the innermost section containing `line_index` (bisect + parents)."""
+        position = bisect_right(self._section_starts, line_index) - 1
+        while position >= 0:
+            section = self.sections[position]
+            if line_index < section.end_index:
+                return section
+            position = section.parent
+        return None
+
+    def task_excerpt(self, task_id: str) -> tuple[int, ...]:
+        """Return the line indices that describe a single task.
+
+        Table rows come with their table header; checklist items come with
+        their indented continuation lines.
+        """
+        row = self.find_row(task_id)
+        if row is not None:
+            header = [
+                index
+                for index in (row.table_start, row.table_start + 1)
+                if index < row.line_index
+            ]
+            return (*header, row.line_index)
+
+        item = self.find_checklist_item(task_id)
+        if item is None:
+            return ()
+        item_line = self.lines[item.line_index]
+        indent = len(item_line) - len(item_line.lstrip())
+        end = item.line_index + 1
+        while end < len(self.lines):
+            candidate = self.lines[end]
+            if not candidate.strip() or len(candidate) - len(candidate.lstrip()) <= indent:
+                break
+            end += 1
+        return tuple(range(item.line_index, end))
+
+    def locate_section(self, keyword: str) -> tuple[str, tuple[int, ...]] | None:
+        """Resolve a keyword to (label, line indices).
+
+        Lookup order: exact task ID, exact heading title, heading title
+        containing the keyword, then the section enclosing the first line
+        that contains the keyword.
+        """
+        normalized = keyword.strip()
+        if not normalized:
+            return None
+
+        task_lines = self.task_excerpt(normalized.upper())
+        if task_lines:
+            section = self.enclosing_section(task_lines[-1])
+            label = f"{normalized.upper()} ({section.title})" if section else normalized
+            return label, task_lines
+
+        lowered = normalized.lower()
+        section = self._sections_by_title.get(lowered) or next(
+            (item for item in self.sections if lowered in item.title.lower()),
+            None,
+        )
+        if section is None:
+            line_index = next(
+                (
+                    index
+                    for index, line in enumerate(self._lowered_lines)
+                    if lowered in line
+                ),
+                -1,
+            )
+            if line_index < 0:
+                return None
+            section = self.enclosing_section(line_index)
+            if section is None:
+                first_heading = self._section_starts[0] if self.sections else len(self.lines)
+                return normalized, tuple(range(0, first_heading))
+        return section.title, tuple(range(section.line_index, section.end_index))
+
+
+def _split_table_cells(stripped: str) -> tuple[str, ...]:
+    body = stripped[1:]
+    if body.endswith("|"):
+        body = body[:-1]
+    return tuple(cell.strip() for cell in body.split("|"))
+
+
+def _cell_status(cell: str) -> str:
+    matched = _STATUS_PREFIX_RE.match(cell.lower())
+    return matched.group(1) if matched else ""
+
+
+def _row_status(cells: tuple[str, ...], status_column: int) -> str:
+    """Status of a table row, read from the `Status` column when the header has one."""
+    if 0 <= status_column < len(cells):
+        return _cell_status(cells[status_column])
+    return next((cell.lower() for cell in cells if cell.lower() in STATUS_VALUES), "")
+
+
+def _checklist_status(marker: str) -> str:
+    if marker == "~":
+        return "in progress"
+    if marker == " ":
+        return "todo"
+    if marker == "!":
+        return "blocked"
+    return "done"
+
+
+def parse_task_board(path: Path, text: str) -> TaskBoard:
+    """Parse task board text into a `TaskBoard` (no caching)."""
+    lines = tuple(text.splitlines())
+    rows: list[TaskRow] = []
+    checklist: list[ChecklistItem] = []
+    section_specs: list[list] = []
+    open_sections: list[int] = []
+    table_start = -1
+    status_column = -1
+    pending_block: list[str] = []
+    block_state = "idle"
+    block_has_ordered_item = False
+    header_date_index = -1
+    first_in_progress = ""
+    first_todo = ""
+
+    pending_rows: list[str] = []
+    pending_checklist: list[str] = []
+    match_kind = _LINE_KIND_RE.match
+
+    for index, line in enumerate(lines):
+        if block_state == "open":
+            if block_has_ordered_item and not line.strip():
+                block_state = "closed"
+            else:
+                pending_block.append(line)
+                block_has_ordered_item = block_has_ordered_item or line.startswith(
+                    _ORDERED_LIST_PREFIXES
+                )
+        elif block_state == "idle" and PENDING_BLOCK_MARKER in line:
+            block_state = "open"
+            pending_block.append(line)
+            block_has_ordered_item = line.startswith(_ORDERED_LIST_PREFIXES)
+
+        matched = match_kind(line)
+        if matched is None:
+            table_start = -1
+            if header_date_index < 0 and line.startswith(HEADER_DATE_PREFIXES):
+                header_date_index = index
+            continue
+
+        kind = matched.lastgroup
+        if kind != "table":
+            table_start = -1
+        if kind == "heading":
+            level = len(matched.group("hashes"))
+            while open_sections and section_specs[open_sections[-1]][1] >= level:
+                section_specs[open_sections.pop()][3] = index
+            parent = open_sections[-1] if open_sections else -1
+            open_sections.append(len(section_specs))
+            section_specs.append([index, level, matched.group("title"), -1, parent])
+            continue
+
+        if kind == "checklist":
+            marker = matched.group("marker")
+            task_id = matched.group("check_id") or ""
+            checklist.append(ChecklistItem(index, task_id, marker))
+            status = _checklist_status(marker)
+            if marker in PENDING_CHECKLIST_MARKERS:
+                pending_checklist.append(line)
+        else:
+            cells = _split_table_cells(line.strip())
+            if table_start < 0:
+                table_start = index
+                lowered = [cell.lower() for cell in cells]
+                status_column = lowered.index("status") if "status" in lowered else -1
+            if all(_TABLE_SEPARATOR_RE.match(cell) for cell in cells if cell):
+                continue
+            task_id = cells[0] if TASK_ID_RE.match(cells[0]) else ""
+            status = _row_status(cells, status_column)
+            rows.append(TaskRow(index, task_id, cells, status, table_start))
+            if status in PENDING_STATUS_VALUES:
+                pending_rows.append(line)
+
+        if not task_id:
+            continue
+        if status == "in progress" and not first_in_progress:
+            first_in_progress = task_id
+        elif status == "todo" and not first_todo:
+            first_todo = task_id
+
+    for spec_index in open_sections:
+        section_specs[spec_index][3] = len(lines)
+    sections = tuple(Section(*spec) for spec in section_specs)
+
+    rows_by_id: dict[str, TaskRow] = {}
+    for row in rows:
+        if row.task_id:
+            rows_by_id.setdefault(row.task_id, row)
+    checklist_by_id: dict[str, ChecklistItem] = {}
+    for item in checklist:
+        if item.task_id:
+            checklist_by_id.setdefault(item.task_id, item)
+
+    return TaskBoard(
+        path=path,
+        lines=lines,
+        rows=tuple(rows),
+        checklist=tuple(checklist),
+        sections=sections,
+        pending_block=tuple(pending_block),
+        pending_rows=tuple(pending_rows),
+        pending_checklist=tuple(pending_checklist),
+        header_date_index=header_date_index,
+        next_task_id=first_in_progress or first_todo or "UNSPECIFIED",
+        _rows_by_id=rows_by_id,
+        _checklist_by_id=checklist_by_id,
+        _section_starts=tuple(section.line_index for section in sections),
+    )
+
+
+def render_pending_view(board: TaskBoard) -> str:
+    """Render the focused Todo / In Progress / Blocked view of a board."""
+    result_parts: list[str] = [
+        f"# {board.path.name} — Pending Tasks Only (Todo / In Progress / Blocked)",
+        "",
+    ]
+    if board.pending_block:
+        result_parts.extend(board.pending_block)
+        result_parts.append("")
+    if board.pending_rows:
+        result_parts.append("| ID | Area | Tarefa | Status | Progresso | Risco |")
+        result_parts.append("|---|---|---|---|---|---|")
+        result_parts.extend(board.pending_rows)
+    if board.pending_checklist:
+        if board.pending_rows:
+            result_parts.append("")
+        result_parts.append("Checklist pending tasks:")
+        result_parts.extend(board.pending_checklist)
+    if not board.pending_rows and not board.pending_checklist:
+        result_parts.append("No pending tasks found — all tasks are Done.")
+    return "\n".join(result_parts)
+
+
+# ---------------------------------------------------------------------------
+# Version-keyed cache shared by all tools and orchestrator threads.
+# ---------------------------------------------------------------------------
+_BOARD_CACHE: dict[Path, tuple[int, int, TaskBoard]] = {}
+_BOARD_CACHE_LOCK = threading.Lock()
+
+
+def load_task_board(path: Path) -> TaskBoard:
+    """Return the parsed board for `path`, re-parsing only when it changed.
+
+    Invalid UTF-8 bytes are replaced (U+FFFD) so the board stays readable;
+    such a board is flagged `lossy` and `apply_task_status_updates` refuses
+    to write it back.
+
+    Raises:
+        OSError: when the file cannot be read.
+    """
+    resolved = path.resolve()
+    stat = resolved.stat()
+    with _BOARD_CACHE_LOCK:
+        cached = _BOARD_CACHE.get(resolved)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    data = resolved.read_bytes()
+    try:
+        board = parse_task_board(resolved, data.decode("utf-8"))
+    except UnicodeDecodeError:
+        board = replace(
+            parse_task_board(resolved, data.decode("utf-8", errors="replace")), lossy=True
+        )
+    with _BOARD_CACHE_LOCK:
+        _BOARD_CACHE[resolved] = (stat.st_mtime_ns, stat.st_size, board)
+    return board
+
+
+def invalidate_task_board(path: Path) -> None:
+    """Drop the cached board for `path` (call after writing the file)."""
+    with _BOARD_CACHE_LOCK:
+        _BOARD_CACHE.pop(path.resolve(), None)
+
+
+# ---------------------------------------------------------------------------
+# Status updates (single read-modify-write for N tasks).
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class TaskStatusUpdate:
+    task_id: str
+    status: str
+    progress: str = ""
+    commit_hash: str = ""
+
+
+def rebuild_task_row(cells: list[str]) -> str:
+    """Rebuild a TASKS.md table row from a list of cell values."""
+    return "| " + " | ".join(cell.strip() for cell in cells) + " |"
+
+
+def status_to_check_marker(status: str) -> str:
+    normalized = status.strip().lower()
+    matched = _STATUS_PREFIX_RE.match(normalized)
+    if matched:
+        normalized = matched.group(1)
+    if normalized in ("done", "completed"):
+        return "x"
+    if normalized in ("in progress", "in_progress", "progress"):
+        return "~"
+    if normalized in ("blocked", "block"):
+        return "!"
+    return " "
+
+
+def update_checklist_task_line(line: str, task_id: str, status: str) -> tuple[str, bool]:
+    """Update checklist marker for a specific task ID line."""
+    marker = status_to_check_marker(status)
+    pattern = re.compile(
+        rf"^(\s*-\s*\[)([ x~!])(\]\s+\*\*{re.escape(task_id)}\b.*)$"
+    )
+    match = pattern.match(line)
+    if not match:
+        return line, False
+    return f"{match.group(1)}{marker}{match.group(3)}", True
+
+
+def _patch_task_line(
+    board: TaskBoard, lines: list[str], update: TaskStatusUpdate, today_str: str
+) -> bool:
+    row = board.find_row(update.task_id)
+    if row is not None and len(row.cells) >= 8:
+        cells = list(_split_table_cells(lines[row.line_index].strip()))
+        cells[3] = update.status  # Status column
+        cells[4] = update.progress  # Progress column
+        if update.commit_hash:
+            cells[6] = update.commit_hash  # Commit column
+        cells[7] = today_str  # Date column
+        lines[row.line_index] = rebuild_task_row(cells)
+        return True
+
+    item = board.find_checklist_item(update.task_id)
+    if item is None:
+        return False
+    new_line, updated = update_checklist_task_line(
+        lines[item.line_index], update.task_id, update.status
+    )
+    if updated:
+        lines[item.line_index] = new_line
+    return updated
+
+
+def apply_task_status_updates(
+    path: Path,
+    updates: list[TaskStatusUpdate],
+    today: date | None = None,
+) -> list[str]:
+    """Apply N status updates to a board in one atomic read-modify-write.
+
+    Rows are located through the cached board index, so only the affected
+    lines (plus the "Ultima atualizacao" header) are rewritten. The batch is
+    all-or-nothing: when any task ID is missing, the file is left untouched.
+
+    Returns:
+        Task IDs that were not found on the board (empty on success).
+
+    Raises:
+        UnicodeDecodeError: when the board is not valid UTF-8 (rewriting it
+            would replace the invalid bytes for good).
+    """
+    board = load_task_board(path)
+    if board.lossy:
+        board.path.read_bytes().decode("utf-8")  # raises with the offending position
+    lines = list(board.lines)
+    today_str = (today or date.today()).isoformat()
+    missing = [
+        update.task_id
+        for update in updates
+        if not _patch_task_line(board, lines, update, today_str)
+    ]
+    if missing or not updates:
+        return missing
+
+    if board.header_date_index >= 0:
+        lines[board.header_date_index] = _HEADER_DATE_RE.sub(
+            rf"\1: {today_str}",
+            lines[board.header_date_index],
+            count=1,
+        )
+
+    atomic_write_text(board.path, "\n".join(lines) + "\n")
+    invalidate_task_board(board.path)
+    return missing
@@ -1,21 +1,93 @@
 """Runtime task status reporting for multi-agent coordination.
 
-This module writes local markdown run logs to `<platform>/tasks_status/`.
-These files are operational telemetry only and are intentionally excluded from git.
+This module writes local run logs to `<platform>/tasks_status/`: a bounded
+structured journal per task plus a rendered markdown view (see
+`status_journal.py`). These files are operational telemetry only and are
+intentionally excluded from git.
+
+The execution ledger is kept twice: the append-only JSONL audit log and an
+indexed SQLite store used for idempotency lookups (see `ledger_store.py`).
+Set `AURAXIS_LEDGER_BACKEND=jsonl` to fall back to JSONL-only lookups.
+
+The JSONL is rotated by size/age. Once `AURAXIS_LEDGER_COMPACT_SEGMENTS`
+rotated segments pile up, a background thread compacts them into a
+latest-per-key snapshot and archives them as gzip (see `ledger_segments.py`),
+so appends never wait for the rewrite.
 """
 
 from __future__ import annotations
 
-import json
+import atexit
+import os
 import re
+import sqlite3
+import threading
 from datetime import UTC, datetime
 from pathlib import Path
 
-from .tool_security import PLATFORM_ROOT, TARGET_REPO_NAME
+from .file_io import JsonlAppender
+from .ledger_segments import (
+    CompactionResult,
+    LedgerLayout,
+    compact_ledger,
+    find_latest_entry,
+    rotate_active_segment,
+    should_rotate,
+)
+from .ledger_store import LedgerStore
+from .status_journal import StatusJournal, StatusRecord
+from .tool_security import PLATFORM_ROOT, TARGET_REPO_NAME, audit_log, increment_audit_counter
 
 TASK_STATUS_DIR: Path = PLATFORM_ROOT / "tasks_status"
 _TASK_ID_RE = re.compile(r"\b([A-Z]+-\d+|[A-Z]+\d+)\b")
 LEDGER_FILE: Path = TASK_STATUS_DIR / "_execution_ledger.jsonl"
+LEDGER_DB_FILE: Path = TASK_STATUS_DIR / "_execution_ledger.sqlite3"
+LEDGER_LAYOUT = LedgerLayout(LEDGER_FILE)
+
+_LEDGER_STORE: LedgerStore | None = None
+_LEDGER_STORE_LOCK = threading.Lock()
+_LEDGER_APPENDER: JsonlAppender | None = None
+_LEDGER_COMPACTION: threading.Thread | None = None
+
+
+def _ledger_backend() -> str:
+    backend = os.getenv("AURAXIS_LEDGER_BACKEND", "sqlite").strip().lower()
+    return backend if backend in {"sqlite", "jsonl"} else "sqlite"
+
+
+def _ledger_store() -> LedgerStore:
+    global _LEDGER_STORE
+    with _LEDGER_STORE_LOCK:
+        if _LEDGER_STORE is None:
+            # Sources are listed on each import/rebuild: the active file may
+            # not exist yet and later rotations rename it into segments.
+            _LEDGER_STORE = LedgerStore(LEDGER_DB_FILE, jsonl_paths=LEDGER_LAYOUT.sources)
+        return _LEDGER_STORE
+
+
+def _ledger_store_failed(operation: str, error: sqlite3.Error) -> None:
+    """Record a SQLite failure and make the store rebuild from the JSONL."""
+    increment_audit_counter(f"ledger_store.{operation}_error")
+    audit_log(
+        "ledger_store",
+        {"operation": operation, "db": str(LEDGER_DB_FILE)},
+        f"{type(error).__name__}: {error}; store marked stale",
+        status="ERROR",
+    )
+    _ledger_store().mark_stale(f"{operation} failed: {error}")
+
+
+def _status_float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _ledger_rotation_limits() -> tuple[int, float]:
+    max_mb = _status_float_env("AURAXIS_LEDGER_SEGMENT_MAX_MB", 16.0)
+    max_age_hours = _status_float_env("AURAXIS_LEDGER_SEGMENT_MAX_AGE_HOURS", 168.0)
+    return int(max(max_mb, 0.001) * 1024 * 1024), max(max_age_hours, 0.0) * 3600
 
 
 def infer_task_id(text: str) -> str:
@@ -25,10 +97,11 @@ def infer_task_id(text: str) -> str:
     return match.group(1)
 
 
-def _safe_task_filename(task_id: str) -> str:
-    normalized = (task_id or "UNSPECIFIED").strip().upper()
-    normalized = re.sub(r"[^A-Z0-9_-]", "-", normalized)
-    return f"{normalized}.md"
+def _status_int_env(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
 
 
 def write_status_entry(
@@ -42,41 +115,119 @@ def write_status_entry(
     notify_manager: bool = True,
     notify_parallel_agents: bool = True,
 ) -> Path:
+    """Append a status entry to the task journal; returns the journal path.
+
+    The markdown view is not rendered here: call `render_status_view()`
+    where the view is handed to a reader.
+    """
     TASK_STATUS_DIR.mkdir(parents=True, exist_ok=True)
-    entry_file = TASK_STATUS_DIR / _safe_task_filename(task_id)
-    timestamp = datetime.now(UTC).isoformat()
-    content = (
-        f"## {timestamp}\n"
-        f"- repo: `{TARGET_REPO_NAME}`\n"
-        f"- task_id: `{task_id}`\n"
-        f"- phase: `{phase}`\n"
-        f"- status: `{status}`\n"
-        f"- notify_manager: `{str(notify_manager).lower()}`\n"
-        f"- notify_parallel_agents: `{str(notify_parallel_agents).lower()}`\n"
-        f"- implemented: {implemented}\n"
-        f"- next_task_suggestion: {next_task_suggestion}\n"
-        f"- details:\n\n{details.strip()}\n\n"
+    journal = StatusJournal(TASK_STATUS_DIR, task_id)
+    journal.append(
+        StatusRecord(
+            timestamp=datetime.now(UTC).isoformat(),
+            repo=TARGET_REPO_NAME,
+            task_id=task_id,
+            phase=phase,
+            status=status,
+            notify_manager=notify_manager,
+            notify_parallel_agents=notify_parallel_agents,
+            implemented=implemented,
+            next_task_suggestion=next_task_suggestion,
+        ),
+        details,
+        max_records=_status_int_env("AURAXIS_STATUS_JOURNAL_MAX_RECORDS", 200),
     )
-    with entry_file.open("a", encoding="utf-8") as file:
-        file.write(content)
-    return entry_file
+    return journal.journal_path
+
+
+def render_status_view(task_id: str) -> Path:
+    """Return the markdown view path (`tasks_status/<TASK>.md`), up to date.
+
+    Rendered from the last `AURAXIS_STATUS_VIEW_RECORDS` journal records, and
+    only when the journal changed since the previous render.
+    """
+    return StatusJournal(TASK_STATUS_DIR, task_id).ensure_view(
+        last=_status_int_env("AURAXIS_STATUS_VIEW_RECORDS", 20),
+        details_chars=_status_int_env("AURAXIS_STATUS_VIEW_DETAILS_CHARS", 4000),
+    )
+
+
+def _ledger_appender() -> JsonlAppender:
+    global _LEDGER_APPENDER
+    with _LEDGER_STORE_LOCK:
+        if _LEDGER_APPENDER is None:
+            _LEDGER_APPENDER = JsonlAppender(LEDGER_FILE)
+            atexit.register(_LEDGER_APPENDER.close)
+        return _LEDGER_APPENDER
 
 
 def append_ledger_entry(
     entry: dict[str, object], *, repo: str | None = None
 ) -> Path:
-    """Append structured execution telemetry for idempotency and recovery."""
+    """Append structured execution telemetry for idempotency and recovery.
+
+    Safe to call from the parallel orchestrator threads: the JSONL line is
+    written whole under a thread + file lock (see `JsonlAppender`).
+    """
     TASK_STATUS_DIR.mkdir(parents=True, exist_ok=True)
     payload = {
         "timestamp": datetime.now(UTC).isoformat(),
         "repo": repo or TARGET_REPO_NAME,
         **entry,
     }
-    with LEDGER_FILE.open("a", encoding="utf-8") as file:
-        file.write(json.dumps(payload, ensure_ascii=True) + "\n")
+    if _ledger_backend() == "sqlite":
+        # Open the store first so the one-shot JSONL import runs before this
+        # entry lands in the JSONL (otherwise it would be imported twice).
+        try:
+            _ledger_store().append(payload)
+        except sqlite3.Error as error:
+            _ledger_store_failed("append", error)
+    appender = _ledger_appender()
+    appender.append(payload)
+    max_bytes, max_age_seconds = _ledger_rotation_limits()
+    if should_rotate(LEDGER_LAYOUT, max_bytes=max_bytes, max_age_seconds=max_age_seconds):
+        if rotate_active_segment(LEDGER_LAYOUT, appender) is not None:
+            _schedule_ledger_compaction()
     return LEDGER_FILE
 
 
+def _compact_in_background() -> None:
+    try:
+        compact_ledger(LEDGER_LAYOUT)
+    except OSError as error:
+        increment_audit_counter("ledger_compaction.error")
+        audit_log(
+            "ledger_compaction",
+            {"segments": str(LEDGER_LAYOUT.segment_dir)},
+            f"{type(error).__name__}: {error}",
+            status="ERROR",
+        )
+
+
+def _schedule_ledger_compaction() -> threading.Thread | None:
+    """Start a background compaction once enough rotated segments piled up."""
+    global _LEDGER_COMPACTION
+    threshold = _status_int_env("AURAXIS_LEDGER_COMPACT_SEGMENTS", 4)
+    if len(LEDGER_LAYOUT.recent_segments()) < threshold:
+        return None
+    with _LEDGER_STORE_LOCK:
+        if _LEDGER_COMPACTION is not None and _LEDGER_COMPACTION.is_alive():
+            return None  # the running compaction picks up the new segment next time
+        if _LEDGER_COMPACTION is None:
+            atexit.register(_wait_for_ledger_compaction)
+        _LEDGER_COMPACTION = threading.Thread(
+            target=_compact_in_background, name="ledger-compaction", daemon=True
+        )
+        _LEDGER_COMPACTION.start()
+        return _LEDGER_COMPACTION
+
+
+def _wait_for_ledger_compaction() -> None:
+    compaction = _LEDGER_COMPACTION
+    if compaction is not None:
+        compaction.join()
+
+
 def get_latest_ledger_entry(
     *,
     repo: str,
@@ -84,22 +235,29 @@ def get_latest_ledger_entry(
     briefing_hash: str,
 ) -> dict[str, object] | None:
     """Return latest matching execution ledger entry."""
-    if not LEDGER_FILE.exists():
-        return None
-    latest: dict[str, object] | None = None
-    with LEDGER_FILE.open("r", encoding="utf-8") as file:
-        for line in file:
-            text = line.strip()
-            if not text:
-                continue
-            try:
-                parsed = json.loads(text)
-            except json.JSONDecodeError:
-                continue
-            if (
-                parsed.get("repo") == repo
-                and parsed.get("task_id") == task_id
-                and parsed.get("briefing_hash") == briefing_hash
-            ):
-                latest = parsed
-    return latest
+    if _ledger_backend() == "sqlite":
+        try:
+            return _ledger_store().latest(
+                repo=repo,
+                task_id=task_id,
+                briefing_hash=briefing_hash,
+            )
+        except sqlite3.Error as error:
+            _ledger_store_failed("lookup", error)
+    return find_latest_entry(
+        LEDGER_LAYOUT,
+        repo=repo,
+        task_id=task_id,
+        briefing_hash=briefing_hash,
+    )
+
+
+def compact_execution_ledger() -> CompactionResult:
+    """Rotate the active ledger segment and compact all rotated segments."""
+    rotate_active_segment(LEDGER_LAYOUT, _ledger_appender())
+    return compact_ledger(LEDGER_LAYOUT)
+
+
+def export_ledger_jsonl(path: Path) -> int:
+    """Export the SQLite ledger to a JSONL file (compatibility/debugging)."""
+    return _ledger_store().export_jsonl(path)
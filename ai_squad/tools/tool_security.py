@@ -31,6 +31,7 @@ References:
 
 import logging
 import os
+import threading
 from functools import wraps
 from pathlib import Path
 from typing import Optional
@@ -269,11 +270,15 @@ if not _audit_logger.handlers:
     _audit_logger.setLevel(logging.INFO)
 
 _TOOL_AUDIT_EVENTS: list[dict[str, object]] = []
+_TOOL_AUDIT_COUNTERS: dict[str, int] = {}
+_TOOL_AUDIT_COUNTERS_LOCK = threading.Lock()
 
 
 def reset_tool_audit_snapshot() -> None:
-    """Reset in-memory tool audit events for current process run."""
+    """Reset in-memory tool audit events and counters for current process run."""
     _TOOL_AUDIT_EVENTS.clear()
+    with _TOOL_AUDIT_COUNTERS_LOCK:
+        _TOOL_AUDIT_COUNTERS.clear()
 
 
 def get_tool_audit_snapshot() -> list[dict[str, object]]:
@@ -281,6 +286,18 @@ def get_tool_audit_snapshot() -> list[dict[str, object]]:
     return list(_TOOL_AUDIT_EVENTS)
 
 
+def increment_audit_counter(name: str, amount: int = 1) -> None:
+    """Bump a named run counter (e.g. 'read_cache.hit')."""
+    with _TOOL_AUDIT_COUNTERS_LOCK:
+        _TOOL_AUDIT_COUNTERS[name] = _TOOL_AUDIT_COUNTERS.get(name, 0) + amount
+
+
+def get_tool_audit_counters() -> dict[str, int]:
+    """Return a copy of the run counters recorded via increment_audit_counter()."""
+    with _TOOL_AUDIT_COUNTERS_LOCK:
+        return dict(_TOOL_AUDIT_COUNTERS)
+
+
 # ---------------------------------------------------------------------------
 # audit_log — structured logging for every tool invocation.
 # ---------------------------------------------------------------------------
@@ -0,0 +1,106 @@
+"""Per-run journal of files written by the squad tools.
+
+Every `write_file_content` call records what happened to the file
+(created, written or unchanged) together with its content hash. The
+journal serves two purposes:
+
+- In-process listeners (read cache, git listing snapshot, ...) subscribe
+  to it and invalidate exactly the paths that changed, instead of each
+  write site calling every cache by hand.
+- The JSONL file (one per run) lets later phases and tools see which files
+  a run touched, e.g. to re-run checks only on changed files.
+
+Kept free of CrewAI imports so it can be used from tools and from tests.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from .file_io import JsonlAppender
+
+WRITE_STATUSES = frozenset({"created", "written", "unchanged"})
+
+
+@dataclass(frozen=True)
+class WriteEvent:
+    path: str  # relative to the project root
+    status: str  # created | written | unchanged
+    content_hash: str
+    size: int
+    timestamp: str = ""
+
+    @property
+    def changed(self) -> bool:
+        return self.status != "unchanged"
+
+
+WriteListener = Callable[[WriteEvent], None]
+
+
+class WriteJournal:
+    """Append-only list of WriteEvents for one run, mirrored to JSONL."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._events: list[WriteEvent] = []
+        self._listeners: list[WriteListener] = []
+        self._appender = JsonlAppender(path) if path is not None else None
+
+    def subscribe(self, listener: WriteListener) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: WriteListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def record(self, path: str, status: str, content_hash: str, size: int) -> WriteEvent:
+        """Store one write and notify listeners (listeners run in order)."""
+        if status not in WRITE_STATUSES:
+            raise ValueError(f"unknown write status: {status!r}")
+        event = WriteEvent(
+            path=path,
+            status=status,
+            content_hash=content_hash,
+            size=size,
+            timestamp=datetime.now(UTC).isoformat(timespec="seconds"),
+        )
+        with self._lock:
+            self._events.append(event)
+            listeners = list(self._listeners)
+        if self._appender is not None:
+            self._appender.append(asdict(event))
+        for listener in listeners:
+            listener(event)
+        return event
+
+    def events(self, since: int = 0) -> list[WriteEvent]:
+        """Events recorded after the first `since` (use len() as a cursor)."""
+        with self._lock:
+            return self._events[since:]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def changed_paths(self) -> list[str]:
+        """Paths created or modified in this run, in first-write order."""
+        with self._lock:
+            return list(dict.fromkeys(event.path for event in self._events if event.changed))
+
+    def close(self) -> None:
+        if self._appender is not None:
+            self._appender.close()
+
+
+def run_journal_path(journal_dir: Path, now: datetime | None = None, pid: int = 0) -> Path:
+    """`<dir>/<UTC timestamp>-<pid>.jsonl`: one file per run (process)."""
+    stamp = (now or datetime.now(UTC)).strftime("%Y%m%dT%H%M%SZ")
+    return journal_dir / f"{stamp}-{pid}.jsonl"